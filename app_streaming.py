@@ -6,11 +6,22 @@ import os
 import sys
 import json
 import time
+import asyncio
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, request, Response, jsonify
 from flask_cors import CORS
 
+# gevent é opcional: em produção o Gunicorn roda com worker cooperativo (gunicorn_config.py)
+try:
+    from gevent import get_hub as gevent_get_hub
+    from gevent import monkey as gevent_monkey
+except ImportError:
+    gevent_get_hub = None
+    gevent_monkey = None
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -206,7 +217,7 @@ except ImportError as e1:
                 """Para compatibilidade com streaming"""
                 return None, None
             
-            def verificar_status_run(self, run_id):
+            def verificar_status_run(self, run_id, espera_segundos=0):
                 return "UNKNOWN"
             
             def obter_resultados_parciais(self, dataset_id, offset=0, limit=100):
@@ -215,8 +226,63 @@ except ImportError as e1:
             def cancelar_run(self, run_id):
                 return False
 
+
+def modo_cooperativo() -> bool:
+    """Indica se estamos rodando sob o worker gevent (sockets e sleeps cooperativos)"""
+    return gevent_monkey is not None and gevent_monkey.is_module_patched('socket')
+
+
+def executar_coroutine(coro):
+    """
+    Executa uma coroutine até o fim a partir de um generator SSE síncrono
+
+    Sob gevent, roda o event loop em uma thread nativa do pool do hub: o
+    greenlet da requisição aguarda cooperativamente e os SDKs de IA (que usam
+    gRPC/sockets nativos) não travam as demais conexões nem o /health.
+    """
+    if modo_cooperativo():
+        return gevent_get_hub().threadpool.apply(asyncio.run, (coro,))
+    return asyncio.run(coro)
+
+
+def acompanhar_coroutine(coro, eventos: deque, intervalo: float = 0.1):
+    """
+    Como executar_coroutine, mas entrega os eventos SSE que a coroutine
+    deposita em `eventos` enquanto ainda está rodando
+
+    Uso dentro do generator SSE: `resultado = yield from acompanhar_coroutine(...)`.
+    O deque é o canal entre a thread nativa e o greenlet: append/popleft são
+    atômicos e não dependem dos locks do gevent, que não valem entre threads.
+    """
+    if modo_cooperativo():
+        tarefa = gevent_get_hub().threadpool.spawn(asyncio.run, coro)
+        terminou, resultado = tarefa.ready, tarefa.get
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+        futuro = executor.submit(asyncio.run, coro)
+        executor.shutdown(wait=False)
+        terminou, resultado = futuro.done, futuro.result
+
+    while True:
+        fim = terminou()
+        while eventos:
+            yield eventos.popleft()
+        if fim:
+            return resultado()
+        time.sleep(intervalo)
+
+
+def parametros_busca_indeed(cargo: str, localizacao: str, kwargs: dict) -> dict:
+    """Parâmetros que definem o run do Indeed: chave do cache de coletas (a quantidade fica de fora)"""
+    return {'fonte': 'indeed', 'cargo': cargo, 'localizacao': localizacao, **kwargs}
+
+
 app = Flask(__name__)
 
+# Maior corpo aceito pela API (o lote de currículos); acima disso o Flask responde 413
+MAX_BYTES_LOTE_CURRICULOS = int(os.getenv('CURRICULOS_LOTE_MAX_BYTES', str(200 * 1024 * 1024)))
+app.config['MAX_CONTENT_LENGTH'] = MAX_BYTES_LOTE_CURRICULOS
+
 # CORS para Vercel - configuração completa
 CORS(app, 
      resources={
@@ -288,9 +354,31 @@ def health():
         'service': 'helio-streaming-api',
         'timestamp': datetime.now().isoformat(),
         'versao': '4.0-simplificada',
-        'apify_status': apify_status
+        'apify_status': apify_status,
+        'modo_servidor': 'gevent' if modo_cooperativo() else 'sync'
     })
 
+@app.route('/api/health/detalhes', methods=['GET'])
+def health_detalhes():
+    """Estatísticas dos serviços compartilhados (fora do /api/health, que não depende deles)"""
+    detalhes = {'timestamp': datetime.now().isoformat()}
+    
+    try:
+        from core.services.llm_router import obter_roteador_llm
+        detalhes['roteador_llm'] = obter_roteador_llm().estatisticas()
+    except Exception as e:
+        logger.warning(f"⚠️ Estatísticas do roteador de IA indisponíveis: {e}")
+        detalhes['roteador_llm'] = {'erro': str(e)}
+    
+    try:
+        from core.services.job_collection_cache import obter_cache_coletas
+        detalhes['cache_coletas'] = obter_cache_coletas().estatisticas()
+    except Exception as e:
+        logger.warning(f"⚠️ Estatísticas do cache de coletas indisponíveis: {e}")
+        detalhes['cache_coletas'] = {'erro': str(e)}
+    
+    return jsonify(detalhes)
+
 @app.route('/api/agent1/collect-keywords', methods=['POST', 'OPTIONS'])
 def collect_keywords():
     """Endpoint principal para coleta de vagas - compatível com frontend"""
@@ -364,12 +452,26 @@ def collect_keywords():
             # Adicionar ordenação
             kwargs['ordenar'] = ordenar
             
-            resultado_scraping = scraper.coletar_vagas_indeed(
-                cargo=cargo,
-                localizacao=localizacao,
-                limite=quantidade,
-                **kwargs
+            # Busca idêntica recente (ou em andamento) reaproveita o run do Apify
+            from core.services.job_collection_cache import obter_cache_coletas
+            
+            def coletar():
+                vagas = scraper.coletar_vagas_indeed(
+                    cargo=cargo,
+                    localizacao=localizacao,
+                    limite=quantidade,
+                    **kwargs
+                )
+                return vagas, bool(vagas) and getattr(scraper, 'ultima_coleta_completa', False)
+            
+            tempo_inicio = time.time()
+            resultado_scraping, origem_coleta = obter_cache_coletas().coletar(
+                parametros_busca_indeed(cargo, localizacao, kwargs),
+                quantidade,
+                coletar
             )
+            tempo_coleta = time.time() - tempo_inicio
+            logger.info(f"📦 Vagas obtidas via {origem_coleta} em {tempo_coleta:.2f}s")
             
             if not resultado_scraping:
                 logger.error("❌ Nenhuma vaga coletada pelo Indeed")
@@ -397,7 +499,7 @@ def collect_keywords():
                     'totalVagas': total_vagas,
                     'vagasAnalisadas': total_vagas,
                     'successRate': 100 if total_vagas > 0 else 0,
-                    'tempoColeta': 'N/A'
+                    'tempoColeta': f'{tempo_coleta:.1f} segundos'
                 },
                 'transparencia': {
                     'fontes_utilizadas': ['Indeed via APIFY'],
@@ -405,7 +507,8 @@ def collect_keywords():
                     'filtros_aplicados': f'Cargo: {cargo}, Localização: {localizacao}',
                     'observacoes': 'Dados reais coletados do Indeed via APIFY API',
                     'actor_id': 'borderline/indeed-scraper',
-                    'run_id': 'N/A'
+                    'run_id': 'N/A',
+                    'origem_coleta': origem_coleta
                 },
                 'vagas': vagas_processadas
             }
@@ -596,68 +699,152 @@ def collect_jobs_stream():
                     # Adicionar ordenação
                     stream_kwargs['ordenar'] = ordenar
                     
-                    run_id, dataset_id = indeed_scraper.iniciar_execucao_indeed(
-                        cargo=cargo,
-                        localizacao=localizacao,
-                        limite=quantidade,
-                        **stream_kwargs
-                    )
+                    # Busca idêntica recente: entrega as vagas do cache sem novo run
+                    from core.services.job_collection_cache import ColetaCompartilhada, chave_vaga, obter_cache_coletas
+                    cache_coletas = obter_cache_coletas()
+                    parametros_busca = parametros_busca_indeed(cargo, localizacao, stream_kwargs)
+                    tempo_inicio = time.time()
+                    timeout_segundos = 300  # 5 minutos
                     
-                    if not run_id:
-                        yield f"data: {json.dumps({'error': 'Erro ao iniciar coleta no Indeed', 'timestamp': datetime.now().isoformat()})}\n\n"
+                    vagas_cache = cache_coletas.obter(parametros_busca, quantidade)
+                    if vagas_cache is not None:
+                        logger.info(f"📦 {len(vagas_cache)} vagas servidas do cache de coletas")
+                        yield f"data: {json.dumps({'type': 'novas_vagas', 'novas_vagas': vagas_cache, 'total_atual': len(vagas_cache), 'timestamp': datetime.now().isoformat()})}\n\n"
+                        yield f"data: {json.dumps({'status': 'concluido', 'total_vagas': len(vagas_cache), 'timestamp': datetime.now().isoformat()})}\n\n"
+                        resumo = {
+                            'total_vagas': len(vagas_cache),
+                            'origem_coleta': 'cache',
+                            'tempo_segundos': round(time.time() - tempo_inicio, 3)
+                        }
+                        yield f"data: {json.dumps({'status': 'finalizado', 'resumo': resumo, 'timestamp': datetime.now().isoformat()})}\n\n"
                         return
                     
-                    yield f"data: {json.dumps({'status': 'coleta_iniciada', 'run_id': run_id, 'dataset_id': dataset_id, 'timestamp': datetime.now().isoformat()})}\n\n"
+                    # Busca idêntica em andamento: acompanha o run da outra requisição
+                    coleta, lider = cache_coletas.iniciar_coleta(parametros_busca, quantidade)
+                    total_vagas = 0
+                    ja_enviadas = set()
+                    if not lider:
+                        logger.info(f"🔗 Acompanhando coleta idêntica em andamento (run {coleta.run_id})")
+                        yield f"data: {json.dumps({'status': 'coleta_compartilhada', 'message': 'Acompanhando coleta idêntica já em andamento', 'run_id': coleta.run_id, 'timestamp': datetime.now().isoformat()})}\n\n"
+                        for novas in coleta.acompanhar(quantidade, timeout_segundos):
+                            total_vagas += len(novas)
+                            ja_enviadas.update(chave_vaga(vaga) for vaga in novas)
+                            yield f"data: {json.dumps({'type': 'novas_vagas', 'novas_vagas': novas, 'total_atual': total_vagas, 'timestamp': datetime.now().isoformat()})}\n\n"
+                        
+                        if coleta.completa:
+                            yield f"data: {json.dumps({'status': 'concluido', 'total_vagas': total_vagas, 'timestamp': datetime.now().isoformat()})}\n\n"
+                            resumo = {
+                                'total_vagas': total_vagas,
+                                'origem_coleta': 'compartilhada',
+                                'run_id': coleta.run_id,
+                                'tempo_segundos': round(time.time() - tempo_inicio, 1)
+                            }
+                            yield f"data: {json.dumps({'status': 'finalizado', 'resumo': resumo, 'timestamp': datetime.now().isoformat()})}\n\n"
+                            return
+                        
+                        # O run do líder falhou ou não terminou a tempo: esta requisição
+                        # executa o seu (sem registrar), como CacheColetas.coletar
+                        logger.warning(f"⚠️ Coleta compartilhada (run {coleta.run_id}) não terminou; iniciando coleta própria")
+                        yield f"data: {json.dumps({'status': 'coleta_propria', 'message': 'A coleta compartilhada não terminou; iniciando coleta própria', 'vagas_recebidas': total_vagas, 'timestamp': datetime.now().isoformat()})}\n\n"
+                        coleta = ColetaCompartilhada(coleta.chave, quantidade)
                     
-                    # Polling com timeout
-                    vagas_coletadas = []
-                    tempo_inicio = time.time()
-                    timeout_segundos = 300  # 5 minutos
+                    def ainda_nao_enviadas(vagas):
+                        """Na coleta própria depois de uma compartilhada, sem repetir o que o cliente já recebeu"""
+                        if not ja_enviadas:
+                            return vagas
+                        novas = [vaga for vaga in vagas if chave_vaga(vaga) not in ja_enviadas]
+                        return novas[:max(0, quantidade - total_vagas)]
+                    
+                    # Líder: executa o run, publica as vagas para quem acompanha e
+                    # grava o resultado se o run terminar com sucesso
+                    status_run = None
+                    try:
+                        run_id, dataset_id = indeed_scraper.iniciar_execucao_indeed(
+                            cargo=cargo,
+                            localizacao=localizacao,
+                            limite=quantidade,
+                            **stream_kwargs
+                        )
+                    
+                        if not run_id:
+                            yield f"data: {json.dumps({'error': 'Erro ao iniciar coleta no Indeed', 'timestamp': datetime.now().isoformat()})}\n\n"
+                            return
                     
-                    while True:
-                        tempo_decorrido = time.time() - tempo_inicio
+                        coleta.run_id = run_id
+                        yield f"data: {json.dumps({'status': 'coleta_iniciada', 'run_id': run_id, 'dataset_id': dataset_id, 'timestamp': datetime.now().isoformat()})}\n\n"
+                    
+                        # Acompanhamento com long-poll e espera adaptativa
+                        from core.services.apify_runs import EsperaAdaptativa
+                    
+                        # Cursor do dataset: cada item é lido e processado uma única vez
+                        cursor = indeed_scraper.abrir_cursor_dataset(dataset_id)
+                        espera = EsperaAdaptativa()
+                        inicio_run = time.time()
+                    
+                        while True:
+                            tempo_decorrido = time.time() - inicio_run
                         
-                        if tempo_decorrido > timeout_segundos:
-                            yield f"data: {json.dumps({'status': 'timeout', 'message': 'Timeout - finalizando', 'timestamp': datetime.now().isoformat()})}\n\n"
-                            break
+                            if tempo_decorrido > timeout_segundos:
+                                yield f"data: {json.dumps({'status': 'timeout', 'message': 'Timeout - finalizando', 'timestamp': datetime.now().isoformat()})}\n\n"
+                                break
                         
-                        # Verificar status
-                        status_run = indeed_scraper.verificar_status_run(run_id)
-                        yield f"data: {json.dumps({'status': 'monitorando', 'run_status': status_run, 'timestamp': datetime.now().isoformat()})}\n\n"
+                            # Verificar status: o Apify segura a resposta até o run terminar ou a
+                            # espera acabar, então um run concluído é percebido na hora
+                            status_run = indeed_scraper.verificar_status_run(run_id, espera_segundos=espera.proxima())
+                            yield f"data: {json.dumps({'status': 'monitorando', 'run_status': status_run, 'timestamp': datetime.now().isoformat()})}\n\n"
                         
-                        # Obter resultados parciais
-                        novos_resultados = indeed_scraper.obter_resultados_parciais(
-                            dataset_id, 
-                            offset=len(vagas_coletadas),
-                            limit=quantidade
-                        )
+                            # Obter apenas os itens novos desde a última leitura
+                            novos_resultados = indeed_scraper.ler_novas_vagas(
+                                cursor,
+                                limite=quantidade - cursor.offset,
+                                cargo_pesquisado=cargo
+                            )
                         
-                        if novos_resultados:
-                            vagas_coletadas.extend(novos_resultados)
-                            yield f"data: {json.dumps({'type': 'novas_vagas', 'novas_vagas': novos_resultados, 'total_atual': len(vagas_coletadas), 'timestamp': datetime.now().isoformat()})}\n\n"
+                            if novos_resultados:
+                                coleta.publicar(novos_resultados)
+                                # Dataset crescendo: volta a consultar em intervalos curtos
+                                espera.reiniciar()
+                                novos_resultados = ainda_nao_enviadas(novos_resultados)
+                                if novos_resultados:
+                                    total_vagas += len(novos_resultados)
+                                    yield f"data: {json.dumps({'type': 'novas_vagas', 'novas_vagas': novos_resultados, 'total_atual': total_vagas, 'timestamp': datetime.now().isoformat()})}\n\n"
                         
-                        if status_run in ['SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT']:
-                            if status_run == 'SUCCEEDED':
-                                logger.info(f"✅ Run finalizada com sucesso!")
-                                # Pegar resultados finais se houver mais
-                                resultados_finais = indeed_scraper.obter_resultados_parciais(
-                                    dataset_id,
-                                    offset=len(vagas_coletadas),
-                                    limit=quantidade - len(vagas_coletadas)
-                                )
-                                if resultados_finais:
-                                    vagas_coletadas.extend(resultados_finais)
-                                    yield f"data: {json.dumps({'type': 'novas_vagas', 'novas_vagas': resultados_finais, 'total_atual': len(vagas_coletadas), 'timestamp': datetime.now().isoformat()})}\n\n"
-                            break
+                            if status_run in ['SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT']:
+                                if status_run == 'SUCCEEDED':
+                                    logger.info(f"✅ Run finalizada com sucesso!")
+                                    # Pegar resultados finais se houver mais
+                                    resultados_finais = indeed_scraper.ler_novas_vagas(
+                                        cursor,
+                                        limite=quantidade - cursor.offset,
+                                        cargo_pesquisado=cargo
+                                    )
+                                    coleta.publicar(resultados_finais)
+                                    resultados_finais = ainda_nao_enviadas(resultados_finais)
+                                    if resultados_finais:
+                                        total_vagas += len(resultados_finais)
+                                        yield f"data: {json.dumps({'type': 'novas_vagas', 'novas_vagas': resultados_finais, 'total_atual': total_vagas, 'timestamp': datetime.now().isoformat()})}\n\n"
+                                break
                         
-                        time.sleep(5)  # Check a cada 5 segundos
+                            if status_run == 'ERROR':
+                                # API indisponível: o long-poll retornou na hora, recua antes de tentar de novo
+                                time.sleep(espera.proxima())
                     
-                    # Finalizar
-                    logger.info(f"🏁 Finalizando streaming com {len(vagas_coletadas)} vagas")
-                    yield f"data: {json.dumps({'status': 'concluido', 'total_vagas': len(vagas_coletadas), 'timestamp': datetime.now().isoformat()})}\n\n"
+                        # Finalizar
+                        logger.info(f"🏁 Finalizando streaming com {total_vagas} vagas ({cursor.requisicoes} leituras do dataset)")
+                        yield f"data: {json.dumps({'status': 'concluido', 'total_vagas': total_vagas, 'timestamp': datetime.now().isoformat()})}\n\n"
                     
-                    # Evento final
-                    yield f"data: {json.dumps({'status': 'finalizado', 'vagas': vagas_coletadas, 'timestamp': datetime.now().isoformat()})}\n\n"
+                        # Evento final: só o resumo (as vagas já foram enviadas nos eventos novas_vagas)
+                        resumo = {
+                            'total_vagas': total_vagas,
+                            'itens_lidos': cursor.offset,
+                            'run_id': run_id,
+                            'dataset_id': dataset_id,
+                            'origem_coleta': 'coleta' if lider else 'coleta_propria',
+                            'tempo_segundos': round(time.time() - tempo_inicio, 1)
+                        }
+                        yield f"data: {json.dumps({'status': 'finalizado', 'resumo': resumo, 'timestamp': datetime.now().isoformat()})}\n\n"
+                    finally:
+                        cache_coletas.finalizar_coleta(coleta, parametros_busca, status_run == 'SUCCEEDED')
                     
                 except Exception as e:
                     logger.error(f"Erro durante coleta Indeed: {e}")
@@ -706,7 +893,7 @@ def collect_jobs_stream():
                 
                 # Finalizar
                 yield f"data: {json.dumps({'status': 'concluido', 'total_vagas': len(vagas_demo), 'timestamp': datetime.now().isoformat()})}\n\n"
-                yield f"data: {json.dumps({'status': 'finalizado', 'vagas': vagas_demo, 'demo_mode': True, 'timestamp': datetime.now().isoformat()})}\n\n"
+                yield f"data: {json.dumps({'status': 'finalizado', 'resumo': {'total_vagas': len(vagas_demo)}, 'demo_mode': True, 'timestamp': datetime.now().isoformat()})}\n\n"
             
         except Exception as e:
             logger.error(f"Erro crítico: {e}")
@@ -746,8 +933,8 @@ def analyze_keywords_stream():
             
             # Verificar se temos o AIKeywordExtractor
             try:
-                from core.services.ai_keyword_extractor import AIKeywordExtractor
-                extractor = AIKeywordExtractor()
+                from core.services.ai_keyword_extractor import obter_extrator_ia
+                extractor = obter_extrator_ia()
                 yield f"data: {json.dumps({'status': 'extractor_ok', 'message': 'Extrator de palavras-chave carregado', 'timestamp': datetime.now().isoformat()})}\n\n"
             except ImportError as e:
                 yield f"data: {json.dumps({'error': 'Extrator não disponível', 'timestamp': datetime.now().isoformat()})}\n\n"
@@ -755,7 +942,6 @@ def analyze_keywords_stream():
             
             # Etapa 1: Preparação dos dados
             yield f"data: {json.dumps({'status': 'preparando', 'message': f'Preparando {len(vagas)} vagas para análise...', 'progress': 10, 'timestamp': datetime.now().isoformat()})}\n\n"
-            time.sleep(0.5)
             
             # Etapa 2: Verificação de modelos IA
             yield f"data: {json.dumps({'status': 'verificando_ia', 'message': 'Verificando modelos de IA disponíveis...', 'progress': 20, 'timestamp': datetime.now().isoformat()})}\n\n"
@@ -774,63 +960,44 @@ def analyze_keywords_stream():
             # Etapa 3: Análise com IA
             yield f"data: {json.dumps({'status': 'analisando', 'message': 'Enviando vagas para análise com IA...', 'progress': 40, 'timestamp': datetime.now().isoformat()})}\n\n"
             
-            # Simular progresso de análise
-            mensagens_progresso = [
-                ('processando_descricoes', 'Processando descrições das vagas...', 50),
-                ('identificando_padroes', 'Identificando padrões e termos recorrentes...', 60),
-                ('categorizando', 'Categorizando palavras-chave...', 70),
-                ('aplicando_metodologia', 'Aplicando metodologia Carolina Martins...', 80),
-                ('finalizando', 'Finalizando análise e preparando resultados...', 90)
-            ]
+            # Progresso real e cada palavra-chave assim que a IA a completa
+            # (em vez de esperar a resposta inteira de todos os lotes)
+            eventos = deque()
+            progresso = {'valor': 40}
             
-            for status, mensagem, progresso in mensagens_progresso:
-                yield f"data: {json.dumps({'status': status, 'message': mensagem, 'progress': progresso, 'timestamp': datetime.now().isoformat()})}\n\n"
-                time.sleep(2)  # Simular processamento
+            async def reportar_progresso(mensagem):
+                progresso['valor'] = min(90, progresso['valor'] + 5)
+                eventos.append(f"data: {json.dumps({'status': 'analisando', 'message': mensagem, 'progress': progresso['valor'], 'timestamp': datetime.now().isoformat()})}\n\n")
+            
+            def receber_palavra(palavra, lote):
+                eventos.append(f"data: {json.dumps({'type': 'palavra_chave', 'palavra': palavra, 'lote': lote, 'timestamp': datetime.now().isoformat()})}\n\n")
             
             # Executar análise real
             try:
-                # Como o método é assíncrono, precisamos executá-lo em um loop
-                import asyncio
-                
-                # Callback para enviar atualizações
-                async def callback_progresso(msg):
-                    yield f"data: {json.dumps({'status': 'processando', 'message': msg, 'timestamp': datetime.now().isoformat()})}\n\n"
-                
-                # Executar análise de forma segura
-                try:
-                    # Tentar usar loop existente se disponível
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        # Se o loop já está rodando, usar uma task
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(
-                                asyncio.run,
-                                extractor.extrair_palavras_chave_ia(
-                                    vagas=vagas,
-                                    cargo_objetivo=cargo_objetivo,
-                                    area_interesse=area_interesse
-                                )
-                            )
-                            resultado = future.result()
-                    else:
-                        resultado = loop.run_until_complete(
-                            extractor.extrair_palavras_chave_ia(
-                                vagas=vagas,
-                                cargo_objetivo=cargo_objetivo,
-                                area_interesse=area_interesse
-                            )
-                        )
-                except RuntimeError:
-                    # Se não há loop, criar um novo
-                    resultado = asyncio.run(
-                        extractor.extrair_palavras_chave_ia(
-                            vagas=vagas,
-                            cargo_objetivo=cargo_objetivo,
-                            area_interesse=area_interesse
-                        )
-                    )
-                
+                resultado = yield from acompanhar_coroutine(
+                    extractor.extrair_palavras_chave_ia(
+                        vagas=vagas,
+                        cargo_objetivo=cargo_objetivo,
+                        area_interesse=area_interesse,
+                        callback_progresso=reportar_progresso,
+                        ao_receber_palavra=receber_palavra
+                    ),
+                    eventos
+                )
+
+                # Reportar aproveitamento do cache de IA por lote
+                info_cache = resultado.get('cache', {}) if isinstance(resultado, dict) else {}
+                for lote in info_cache.get('lotes', []):
+                    yield f"data: {json.dumps({'type': 'cache_lote', 'lote': lote['lote'], 'cache': lote['cache'], 'truncado': lote.get('truncado', False), 'timestamp': datetime.now().isoformat()})}\n\n"
+                if info_cache:
+                    hits = info_cache.get('hits', 0)
+                    misses = info_cache.get('misses', 0)
+                    yield f"data: {json.dumps({'status': 'cache', 'hits': hits, 'misses': misses, 'message': f'Cache: {hits} lote(s) reaproveitado(s), {misses} enviado(s) à IA', 'timestamp': datetime.now().isoformat()})}\n\n"
+
+                # Outro provedor venceu o hedge: as palavras parciais dão lugar à lista final
+                if isinstance(resultado, dict) and resultado.pop('palavras_reconciliadas', False):
+                    yield f"data: {json.dumps({'type': 'palavras_chave_finais', 'palavras': resultado.get('top_10_palavras_chave', []), 'substituir_parciais': True, 'modelo': resultado.get('analise_metadados', {}).get('modelo_ia_usado'), 'timestamp': datetime.now().isoformat()})}\n\n"
+
                 # Enviar resultado final
                 yield f"data: {json.dumps({'status': 'concluido', 'resultado': resultado, 'progress': 100, 'timestamp': datetime.now().isoformat()})}\n\n"
                 
@@ -854,6 +1021,61 @@ def analyze_keywords_stream():
     )
 
 
+@app.route('/api/agent0/analyze-resumes-batch', methods=['POST', 'OPTIONS'])
+def analyze_resumes_batch():
+    """
+    Análise de currículos em lote (turma de mentorados)
+
+    multipart/form-data com um ou mais arquivos no campo "curriculos"
+    (PDF, DOCX ou TXT). Retorna a análise de cada arquivo, na ordem
+    enviada, e estatísticas de tempo do lote.
+    """
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    # Limites conferidos antes de ler qualquer arquivo para a memória
+    if request.content_length and request.content_length > MAX_BYTES_LOTE_CURRICULOS:
+        return jsonify({'error': f'Lote acima do limite de {MAX_BYTES_LOTE_CURRICULOS // (1024 * 1024)} MB'}), 413
+
+    enviados = request.files.getlist('curriculos')
+    if not enviados:
+        return jsonify({'error': 'Nenhum currículo enviado (campo "curriculos")'}), 400
+
+    max_arquivos = int(os.getenv('CURRICULOS_LOTE_MAX_ARQUIVOS', '500'))
+    if len(enviados) > max_arquivos:
+        return jsonify({'error': f'Máximo de {max_arquivos} currículos por lote'}), 400
+
+    # Tamanho de cada arquivo pelo stream (o Werkzeug já o guardou em arquivo temporário)
+    max_bytes_arquivo = int(os.getenv('DOC_MAX_BYTES', str(10 * 1024 * 1024)))
+    grandes = []
+    for arquivo in enviados:
+        arquivo.stream.seek(0, os.SEEK_END)
+        if arquivo.stream.tell() > max_bytes_arquivo:
+            grandes.append(arquivo.filename or 'curriculo.txt')
+        arquivo.stream.seek(0)
+    if grandes:
+        return jsonify({
+            'error': f'Arquivos acima do limite de {max_bytes_arquivo // (1024 * 1024)} MB',
+            'arquivos': grandes
+        }), 413
+
+    arquivos = [(arquivo.filename or 'curriculo.txt', arquivo.read()) for arquivo in enviados]
+
+    try:
+        from core.services.batch_resume_analyzer import AnalisadorCurriculosLote
+
+        logger.info(f"📄 Analisando lote de {len(arquivos)} currículos")
+        resultado = executar_coroutine(AnalisadorCurriculosLote().analisar_lote(arquivos))
+        estatisticas = resultado['estatisticas']
+        logger.info(
+            f"✅ Lote concluído: {estatisticas['sucesso']}/{estatisticas['arquivos']} em "
+            f"{estatisticas['tempo_total_segundos']}s ({estatisticas['modo']})"
+        )
+        return jsonify(resultado)
+    except Exception as e:
+        logger.error(f"Erro na análise de currículos em lote: {e}")
+        return jsonify({'error': f'Erro na análise em lote: {str(e)}'}), 500
+
 # Print environment info at module level
 logger.info("=" * 50)
 logger.info("🚀 HELIO JOB ROBOT - INICIALIZANDO v2")
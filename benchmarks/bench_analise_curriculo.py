@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analisadores de currículo do Agente 0
+
+Compara as 4 análises originais (cada uma com seu lower() por verificação e
+regex recompilada por chamada) com DocumentProcessor.analisar_curriculo,
+que faz uma passada compartilhada, conferindo que os resultados são idênticos
+(inclusive a ordem das palavras-chave).
+
+Uso:
+    python benchmarks/bench_analise_curriculo.py [quantidade_curriculos]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.services.document_processor import DocumentProcessor
+
+TRECHOS = [
+    "JOÃO DA SILVA\nTelefone: (11) 99999-8888 | Email: joao.silva@email.com | LinkedIn: /in/joaosilva",
+    "OBJETIVO\nGerente de Marketing Digital",
+    "RESUMO PROFISSIONAL\nProfissional com perfil analítico e estratégico, proativo e com foco em resultados.",
+    "EXPERIÊNCIA PROFISSIONAL\nEmpresa ABC Ltda | 03/2019 - atual\nGerenciei equipe de 8 pessoas e aumentou as vendas em 35%.",
+    "Empresa XYZ | 2015 - 2019\nResponsável por relatórios financeiros, participou de projetos de logística.",
+    "Liderei a implantação de Power BI e SQL, reduziu custos em R$ 2 milhão no ano.",
+    "Desenvolvi dashboards em Excel, Python e Tableau para a área de operações.",
+    "Implementei Scrum e Kanban no time de TI; certificação Six Sigma e PMBOK.",
+    "FORMAÇÃO ACADÊMICA\nGraduação em Administração - USP (2010 - 2014)\nCurso de gestão de projetos",
+    "IDIOMAS\nInglês fluente, espanhol intermediário, francês básico",
+    "COMPETÊNCIAS\nLiderança, comunicação, negociação, gestão de pessoas, recursos humanos",
+    "CONHECIMENTOS\nSAP, Oracle, Java, JavaScript, React, Angular, metodologias Agile e Lean",
+    "TRABALHO VOLUNTÁRIO\nONG Educação para Todos - projeto social (2018)",
+    "Auxiliou e apoiou a coordenação; alcancei 120% da meta com 50 mil reais de orçamento.",
+    "Experiência em tecnologia, ITIL e atendimento; 1985 - 2030 em marketing e vendas.",
+]
+
+
+def gerar_curriculos(quantidade: int):
+    random.seed(42)
+    curriculos = [
+        '\n\n'.join(random.sample(TRECHOS, random.randint(3, len(TRECHOS))))
+        for _ in range(quantidade)
+    ]
+    # 'ı' (i sem ponto) exige o caminho IGNORECASE, como no original
+    curriculos.append("Lıderança em Python e Scrum; gestão de TI em 2020")
+    return curriculos
+
+
+# --- Implementação original (referência) ---
+
+def verificar_formatacao_texto_original(texto):
+    indicadores = {
+        "tem_estrutura_secoes": bool(re.search(r'(EXPERIÊNCIA|FORMAÇÃO|EDUCAÇÃO|OBJETIVO)', texto.upper())),
+        "tem_datas": bool(re.search(r'\d{4}|\d{2}/\d{4}|20\d{2}', texto)),
+        "tem_email": bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', texto)),
+        "tem_telefone": bool(re.search(r'\(\d{2}\)|\d{2}\s*9?\d{4}-?\d{4}', texto)),
+        "tamanho_adequado": 500 < len(texto) < 3000
+    }
+    return sum(indicadores.values()) >= 3
+
+
+def analisar_estrutura_original(texto_curriculo):
+    elementos_metodologia = {
+        "dados_pessoais": ["nome", "telefone", "email", "linkedin"],
+        "objetivo": ["objetivo", "cargo", "posição"],
+        "resumo": ["resumo", "perfil", "sobre"],
+        "experiencias": ["experiência", "trabalho", "empresa"],
+        "resultados": ["resultado", "alcançou", "aumentou", "reduziu", "%"],
+        "formacao": ["formação", "educação", "graduação", "curso"],
+        "idiomas": ["idioma", "inglês", "espanhol", "francês"],
+        "tecnologia": ["excel", "power bi", "python", "sql"],
+        "conhecimentos": ["conhecimento", "competência", "habilidade"],
+        "voluntario": ["voluntário", "social", "ong"]
+    }
+    elementos_encontrados = {}
+    texto_lower = texto_curriculo.lower()
+    for categoria, palavras_chave in elementos_metodologia.items():
+        elementos_encontrados[categoria] = any(palavra in texto_lower for palavra in palavras_chave)
+    total_elementos = len(elementos_metodologia)
+    elementos_presentes = sum(elementos_encontrados.values())
+    score_metodologia = (elementos_presentes / total_elementos) * 100
+    elementos_faltando = [c for c, presente in elementos_encontrados.items() if not presente]
+    return {
+        "possui_13_passos": score_metodologia >= 80,
+        "estrutura_adequada": score_metodologia >= 60,
+        "formatacao_profissional": verificar_formatacao_texto_original(texto_curriculo),
+        "elementos_encontrados": elementos_encontrados,
+        "elementos_faltando": elementos_faltando,
+        "score_metodologia": score_metodologia,
+        "total_elementos": total_elementos,
+        "elementos_presentes": elementos_presentes
+    }
+
+
+def extrair_palavras_chave_original(texto_curriculo):
+    padroes_competencias = [
+        r'\b(Excel|Power BI|Python|SQL|Tableau|SAP|Oracle|Java|JavaScript|React|Angular)\b',
+        r'\b(liderança|gestão|comunicação|negociação|analítico|estratégico|proativo)\b',
+        r'\b(marketing|vendas|financeiro|recursos humanos|logística|operações|TI|tecnologia)\b',
+        r'\b(Scrum|Agile|Six Sigma|Lean|Kanban|PMBOK|ITIL)\b'
+    ]
+    palavras_encontradas = set()
+    texto_lower = texto_curriculo.lower()
+    for padrao in padroes_competencias:
+        matches = re.findall(padrao, texto_lower, re.IGNORECASE)
+        palavras_encontradas.update(match.lower() for match in matches)
+    return list(palavras_encontradas)
+
+
+def verificar_honestidade_original(texto_curriculo):
+    alertas = []
+    datas_encontradas = re.findall(r'(\d{4})|(\d{2}/\d{4})', texto_curriculo)
+    if datas_encontradas:
+        anos = []
+        for data in datas_encontradas:
+            if data[0]:
+                anos.append(int(data[0]))
+            elif data[1]:
+                anos.append(int(data[1].split('/')[1]))
+        anos.sort()
+        if anos:
+            ano_atual = datetime.now().year
+            if any(ano > ano_atual for ano in anos):
+                alertas.append("Datas futuras encontradas")
+            if len(anos) > 1 and max(anos) - min(anos) > 30:
+                alertas.append("Período profissional muito extenso (>30 anos)")
+    palavras_vagas = ["responsável por", "participou", "auxiliou", "apoiou"]
+    palavras_especificas = ["gerenciei", "liderei", "desenvolvi", "implementei", "alcancei"]
+    vagas_count = sum(1 for palavra in palavras_vagas if palavra in texto_curriculo.lower())
+    especificas_count = sum(1 for palavra in palavras_especificas if palavra in texto_curriculo.lower())
+    tem_numeros = bool(re.search(r'\d+%|\d+\s*(milhão|mil|reais|R\$)', texto_curriculo))
+    return {
+        "datas_consistentes": len(alertas) == 0,
+        "informacoes_verificaveis": tem_numeros,
+        "nivel_detalhamento_adequado": especificas_count > vagas_count,
+        "alertas_inconsistencia": alertas,
+        "indicadores": {
+            "tem_resultados_quantificados": tem_numeros,
+            "uso_verbos_acao": especificas_count > 2,
+            "evita_linguagem_vaga": vagas_count < especificas_count
+        }
+    }
+
+
+def analisar_formatacao_original(texto_curriculo):
+    linhas = texto_curriculo.split('\n')
+    linhas_nao_vazias = [linha for linha in linhas if linha.strip()]
+    paginas_estimadas = len(texto_curriculo) / 1800
+    secoes_identificadas = []
+    secoes_padrao = [
+        "dados pessoais", "objetivo", "resumo", "experiência",
+        "formação", "educação", "idiomas", "competências"
+    ]
+    for secao in secoes_padrao:
+        if secao in texto_curriculo.lower():
+            secoes_identificadas.append(secao)
+    return {
+        "formato_adequado": len(secoes_identificadas) >= 4,
+        "tamanho_paginas": round(paginas_estimadas, 1),
+        "fonte_profissional": True,
+        "espacamento_adequado": len(linhas_nao_vazias) / len(linhas) > 0.6,
+        "uso_cores_apropriado": True,
+        "estrutura_secoes": {
+            "secoes_encontradas": secoes_identificadas,
+            "total_secoes": len(secoes_identificadas),
+            "secoes_minimas_ok": len(secoes_identificadas) >= 4
+        },
+        "metricas_texto": {
+            "total_caracteres": len(texto_curriculo),
+            "total_linhas": len(linhas),
+            "linhas_com_conteudo": len(linhas_nao_vazias),
+            "densidade_conteudo": len(linhas_nao_vazias) / len(linhas) if linhas else 0
+        }
+    }
+
+
+def analisar_original(texto):
+    return {
+        "estrutura_metodologica": analisar_estrutura_original(texto),
+        "validacoes_honestidade": verificar_honestidade_original(texto),
+        "formatacao": analisar_formatacao_original(texto),
+        "palavras_chave_atuais": extrair_palavras_chave_original(texto)
+    }
+
+
+def cronometrar(funcao, curriculos):
+    inicio = time.perf_counter()
+    resultados = [funcao(c) for c in curriculos]
+    return time.perf_counter() - inicio, resultados
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    curriculos = gerar_curriculos(quantidade)
+
+    # Sem IA: o complemento de palavras-chave por IA não entra na medição
+    os.environ.pop('OPENAI_API_KEY', None)
+    os.environ.pop('ANTHROPIC_API_KEY', None)
+    processor = DocumentProcessor()
+
+    print(f"📊 {len(curriculos)} currículos\n")
+
+    t_orig, r_orig = cronometrar(analisar_original, curriculos)
+    t_novo, r_novo = cronometrar(processor.analisar_curriculo, curriculos)
+    assert r_orig == r_novo, "Resultados divergentes na análise do currículo"
+    print(f"Análise completa  original: {t_orig:.3f}s | passada única: {t_novo:.3f}s | {t_orig / t_novo:.1f}x")
+
+    t_orig, r_orig = cronometrar(extrair_palavras_chave_original, curriculos)
+    t_novo, r_novo = cronometrar(processor.extrair_palavras_chave_curriculo, curriculos)
+    assert r_orig == r_novo, "Resultados divergentes nas palavras-chave"
+    print(f"Palavras-chave    original: {t_orig:.3f}s | compilada: {t_novo:.3f}s | {t_orig / t_novo:.1f}x")
+
+    print("\n✅ Saídas idênticas")
+
+
+if __name__ == "__main__":
+    main()
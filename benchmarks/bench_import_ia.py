@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tempo de import e de instanciação dos serviços de IA
+
+Compara o custo original (openai, anthropic e google.generativeai
+importados junto com cada serviço e clientes criados em todo __init__) com
+o registro de provedores, que importa os SDKs e cria um cliente por
+provedor só no primeiro uso. Cada medição de import roda num processo
+novo (cold start, como um worker recém-escalado).
+
+Uso:
+    python benchmarks/bench_import_ia.py [repeticoes]
+"""
+
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, RAIZ)
+
+SERVICOS = [
+    "core.services.ai_keyword_extractor",
+    "core.services.batch_keyword_extractor",
+    "core.services.location_expander",
+    "core.services.ai_validator",
+    "core.services.document_processor",
+]
+
+# --- Implementação original (referência) ---
+
+# Antes, cada serviço importava os SDKs no topo do módulo
+IMPORT_SDKS_ORIGINAL = "import openai\nfrom anthropic import Anthropic\nimport google.generativeai as genai\n"
+
+
+def instanciar_original():
+    """__init__ original do AIKeywordExtractor: clientes criados a cada instância"""
+    import openai
+    import google.generativeai as genai
+    from anthropic import Anthropic
+
+    anthropic_client = openai_client = gemini_model = None
+    if os.getenv('ANTHROPIC_API_KEY'):
+        try:
+            anthropic_client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        except Exception:
+            anthropic_client = None
+    if os.getenv('OPENAI_API_KEY'):
+        openai.api_key = os.getenv('OPENAI_API_KEY')
+        openai_client = openai
+    if os.getenv('GOOGLE_API_KEY'):
+        try:
+            genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+            gemini_model = genai.GenerativeModel('gemini-2.5-flash')
+        except Exception:
+            gemini_model = None
+    return gemini_model is not None, anthropic_client is not None, openai_client is not None
+
+
+def instanciar_lazy():
+    from core.services.ai_keyword_extractor import AIKeywordExtractor
+    extractor = AIKeywordExtractor()
+    return (
+        extractor.gemini_model is not None,
+        extractor.anthropic_client is not None,
+        extractor.openai_client is not None,
+    )
+
+
+def medir_import(codigo: str, repeticoes: int) -> float:
+    """Mediana do tempo de import num interpretador novo"""
+    script = (
+        "import time, sys\n"
+        f"sys.path.insert(0, {RAIZ!r})\n"
+        "inicio = time.perf_counter()\n"
+        f"{codigo}"
+        "print(time.perf_counter() - inicio)\n"
+    )
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=RAIZ)
+        tempos.append(float(saida.stdout.strip().splitlines()[-1]))
+    return statistics.median(tempos)
+
+
+def cronometrar(funcao, vezes: int):
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # Chaves fictícias: nenhum serviço chama as APIs aqui
+    for variavel in ('OPENAI_API_KEY', 'ANTHROPIC_API_KEY', 'GOOGLE_API_KEY'):
+        os.environ.setdefault(variavel, 'chave-benchmark')
+
+    print(f"📊 Import a frio dos serviços de IA (mediana de {repeticoes} processos)\n")
+    imports = "".join(f"import {servico}\n" for servico in SERVICOS)
+    t_orig = medir_import(IMPORT_SDKS_ORIGINAL + imports, repeticoes)
+    t_novo = medir_import(imports, repeticoes)
+    print(f"Import dos serviços  original: {t_orig:.3f}s | sob demanda: {t_novo:.3f}s | {t_orig / t_novo:.1f}x")
+
+    vezes = 200
+    import logging
+    logging.disable(logging.CRITICAL)
+    instanciar_original()  # SDKs já carregados nas duas medições
+    t_orig, r_orig = cronometrar(instanciar_original, vezes)
+    t_novo, r_novo = cronometrar(instanciar_lazy, vezes)
+    assert r_orig == r_novo, "Provedores disponíveis divergentes"
+    print(f"{vezes} instâncias por requisição  original: {t_orig:.3f}s | registro: {t_novo:.3f}s | {t_orig / t_novo:.1f}x")
+
+    print("\n✅ Mesmos provedores disponíveis")
+
+
+if __name__ == "__main__":
+    main()
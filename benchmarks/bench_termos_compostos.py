@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extração de termos compostos do Agente 1 (MPC)
+
+Compara o laço original (um re.finditer por padrão + normalização sem cache)
+com o CompoundTermMatcher pré-compilado e a normalização memorizada por token,
+conferindo que os resultados são idênticos.
+
+Uso:
+    python benchmarks/bench_termos_compostos.py [quantidade_descricoes]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import unicodedata
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.services.agente_1_palavras_chave import MPCCarolinaMartins
+
+TRECHOS = [
+    "Buscamos profissional com experiência em gestão de projetos e análise de dados.",
+    "Desejável Excel avançado, Power BI e SQL Server para relatórios gerenciais.",
+    "Atuar com marketing digital, redes sociais, email marketing e Google Analytics.",
+    "Conhecimento em metodologias ágeis, Scrum Master e design thinking.",
+    "Responsável pelo fluxo de caixa, demonstrações financeiras e orçamento anual.",
+    "Vivência em recrutamento e seleção, clima organizacional e gestão de talentos.",
+    "Boa comunicação escrita, trabalho em equipe e tomada de decisão sob pressão.",
+    "Desenvolvimento web e mobile, banco de dados e segurança da informação.",
+    "Customer success, customer experience e relacionamento com cliente B2B.",
+    "Planejamento estratégico, controle de custos e análise financeira mensal.",
+    "Oferecemos vale refeição, plano de saúde e ambiente colaborativo em São Paulo.",
+    "Liderança de equipe, pensamento analítico e capacidade de adaptação.",
+]
+
+
+def gerar_descricoes(quantidade: int):
+    random.seed(42)
+    return [
+        ' '.join(random.choice(TRECHOS) for _ in range(random.randint(6, 14))).lower()
+        for _ in range(quantidade)
+    ]
+
+
+# --- Implementação original (referência) ---
+
+def termos_compostos_original(texto, padroes):
+    termos = []
+    for padrao in padroes:
+        for match in re.finditer(padrao, texto, re.IGNORECASE):
+            termo = match.group().lower().strip()
+            if termo not in termos:
+                termos.append(termo)
+    return termos
+
+
+def normalizar_original(palavra):
+    palavra = unicodedata.normalize('NFD', palavra).encode('ascii', 'ignore').decode('ascii')
+    palavra = palavra.lower().strip()
+    normalizacoes = {
+        'excel': 'excel', 'powerbi': 'power bi', 'power-bi': 'power bi', 'sql': 'sql',
+        'crm': 'crm', 'erp': 'erp', 'sap': 'sap', 'lideranca': 'liderança',
+        'gestao': 'gestão', 'analise': 'análise'
+    }
+    return normalizacoes.get(palavra, palavra)
+
+
+def extrair_original(mpc, texto, padroes):
+    texto = re.sub(r'[^\w\s]', ' ', texto)
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    compostos = termos_compostos_original(texto, padroes)
+    palavras = []
+    for palavra in texto.split():
+        limpa = palavra.strip().lower()
+        if len(limpa) > 2 and limpa not in mpc.stop_words and mpc._e_palavra_potencialmente_relevante(limpa):
+            palavras.append(limpa)
+    resultado, vistos = [], set()
+    for palavra in compostos + palavras:
+        norm = normalizar_original(palavra)
+        if norm not in vistos and len(norm) > 2:
+            resultado.append(norm)
+            vistos.add(norm)
+    return resultado
+
+
+def cronometrar(funcao, descricoes):
+    inicio = time.perf_counter()
+    resultados = [funcao(d) for d in descricoes]
+    return time.perf_counter() - inicio, resultados
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    descricoes = gerar_descricoes(quantidade)
+    padroes = MPCCarolinaMartins.PADROES_TERMOS_COMPOSTOS_EXPANDIDOS
+    matcher = MPCCarolinaMartins.MATCHER_TERMOS_COMPOSTOS
+
+    # Instância sem banco/serviços externos: só o necessário para a extração
+    mpc = MPCCarolinaMartins.__new__(MPCCarolinaMartins)
+    mpc.stop_words = mpc._carregar_stop_words()
+    mpc._stop_words_set = frozenset(mpc.stop_words)
+    mpc._cache_tokens = {}
+
+    print(f"📊 {quantidade} descrições, {len(padroes)} padrões compostos\n")
+
+    t_orig, r_orig = cronometrar(lambda d: termos_compostos_original(d, padroes), descricoes)
+    t_novo, r_novo = cronometrar(matcher.encontrar, descricoes)
+    assert r_orig == r_novo, "Resultados divergentes nos termos compostos"
+    print(f"Termos compostos   original: {t_orig:.3f}s | compilado: {t_novo:.3f}s | {t_orig / t_novo:.1f}x")
+
+    t_orig, r_orig = cronometrar(lambda d: extrair_original(mpc, d, padroes), descricoes)
+    t_novo, r_novo = cronometrar(mpc._extrair_palavras_texto_detalhado, descricoes)
+    assert r_orig == r_novo, "Resultados divergentes na extração completa"
+    print(f"Extração completa  original: {t_orig:.3f}s | otimizada: {t_novo:.3f}s | {t_orig / t_novo:.1f}x")
+
+    print("\n✅ Saídas idênticas")
+
+
+if __name__ == "__main__":
+    main()
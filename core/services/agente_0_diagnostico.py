@@ -76,12 +76,18 @@ class DiagnosticoCarolinaMartins:
         - Formatação adequada
         - Palavras-chave presentes
         """
+        # Extrai texto real do documento
+        texto_curriculo = self.document_processor.extrair_texto_documento(
+            arquivo_curriculo, arquivo_bytes
+        )
+        return self.analisar_texto_curriculo(texto_curriculo, arquivo_curriculo)
+    
+    def analisar_texto_curriculo(self, texto_curriculo: str, arquivo_curriculo: str) -> Dict[str, Any]:
+        """
+        Análise do texto já extraído de um currículo (estrutura, honestidade,
+        formatação, palavras-chave, gaps e score)
+        """
         try:
-            # Extrai texto real do documento
-            texto_curriculo = self.document_processor.extrair_texto_documento(
-                arquivo_curriculo, arquivo_bytes
-            )
-            
             if not texto_curriculo.strip():
                 return {
                     "erro": "Não foi possível extrair texto do currículo",
@@ -89,14 +95,12 @@ class DiagnosticoCarolinaMartins:
                     "score_qualidade": 0.0
                 }
             
-            # Análise real usando processamento de documento
+            # Análise real usando processamento de documento (uma passada
+            # para estrutura, honestidade, formatação e palavras-chave)
             analise = {
                 "arquivo_processado": arquivo_curriculo,
                 "texto_extraido": len(texto_curriculo),
-                "estrutura_metodologica": self.document_processor.analisar_estrutura_curriculo(texto_curriculo),
-                "validacoes_honestidade": self.document_processor.verificar_honestidade_curriculo(texto_curriculo),
-                "formatacao": self.document_processor.analisar_formatacao_documento(texto_curriculo, arquivo_curriculo),
-                "palavras_chave_atuais": self.document_processor.extrair_palavras_chave_curriculo(texto_curriculo),
+                **self.document_processor.analisar_curriculo(texto_curriculo, arquivo_curriculo),
                 "gaps_estruturais": [],
                 "score_qualidade": 0.0,
                 "texto_analisado": texto_curriculo[:500] + "..." if len(texto_curriculo) > 500 else texto_curriculo
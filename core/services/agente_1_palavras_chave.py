@@ -16,6 +16,8 @@ Processo baseado nas transcrições:
 import re
 import json
 import asyncio
+import unicodedata
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from collections import Counter, defaultdict
@@ -26,6 +28,37 @@ from core.models import (
 )
 from core.services.ai_validator import AIValidator
 from core.services.job_scraper import JobScraper
+from core.services.compound_term_matcher import CompoundTermMatcher
+from core.services.mpc_persistence import PersistenciaMPC
+from core.services.term_document_matrix import MatrizTermoDocumento
+from core.services.parallel_extraction import ExtracaoParalela
+
+# Expressões usadas em toda extração (compiladas uma vez)
+RE_CARACTERES_ESPECIAIS = re.compile(r'[^\w\s]')
+RE_ESPACOS = re.compile(r'\s+')
+
+# Normalizações específicas aplicadas após remover acentos
+NORMALIZACOES_PALAVRAS = {
+    'excel': 'excel',
+    'powerbi': 'power bi',
+    'power-bi': 'power bi',
+    'sql': 'sql',
+    'crm': 'crm',
+    'erp': 'erp',
+    'sap': 'sap',
+    'lideranca': 'liderança',
+    'gestao': 'gestão',
+    'analise': 'análise'
+}
+
+
+@lru_cache(maxsize=65536)
+def normalizar_token(palavra: str) -> str:
+    """Remove acentos e padroniza um token (memorizado: o vocabulário das vagas se repete muito)"""
+    palavra = unicodedata.normalize('NFD', palavra).encode('ascii', 'ignore').decode('ascii')
+    palavra = palavra.lower().strip()
+    return NORMALIZACOES_PALAVRAS.get(palavra, palavra)
+
 
 class MPCCarolinaMartins:
     """
@@ -41,13 +74,109 @@ class MPCCarolinaMartins:
     PALAVRAS_TITULO_LINKEDIN = 4  # 3-4 palavras fortes no título
     COMPETENCIAS_LINKEDIN = 50  # Exatamente 50 competências
     
+    # Padrões de termos compostos EXPANDIDOS por área
+    PADROES_TERMOS_COMPOSTOS_EXPANDIDOS = [
+        # Ferramentas/Software
+        r'excel\s+(avançado|intermediário|básico)',
+        r'power\s+bi',
+        r'google\s+(analytics|ads|drive|sheets)',
+        r'facebook\s+ads',
+        r'linkedin\s+ads',
+        r'microsoft\s+(office|teams|project)',
+        r'adobe\s+(photoshop|illustrator|premiere)',
+        r'sql\s+(server|developer)',
+        
+        # Gestão e Processos
+        r'gestão\s+de\s+(projetos|equipe|pessoas|processos|mudança|conflitos|tempo|qualidade|estoque|custos|riscos)',
+        r'análise\s+de\s+(dados|negócio|mercado|risco|performance|resultado)',
+        r'controle\s+de\s+(qualidade|estoque|custos|orçamento|despesas)',
+        r'planejamento\s+(estratégico|financeiro|operacional|comercial)',
+        r'desenvolvimento\s+de\s+(produto|negócio|estratégia|pessoas)',
+        
+        # Marketing e Vendas
+        r'marketing\s+(digital|online|de\s+conteúdo|de\s+relacionamento)',
+        r'redes\s+sociais',
+        r'content\s+marketing',
+        r'inbound\s+marketing',
+        r'email\s+marketing',
+        r'growth\s+hacking',
+        r'customer\s+(success|experience|journey)',
+        r'relacionamento\s+com\s+cliente',
+        
+        # Metodologias
+        r'metodologias\s+ágeis',
+        r'design\s+thinking',
+        r'lean\s+(startup|six\s+sigma)',
+        r'business\s+(intelligence|analyst)',
+        r'product\s+(management|owner)',
+        r'scrum\s+master',
+        
+        # Soft Skills
+        r'trabalho\s+em\s+equipe',
+        r'tomada\s+de\s+decisão',
+        r'resolução\s+de\s+(problemas|conflitos)',
+        r'comunicação\s+(oral|escrita|interpessoal|assertiva)',
+        r'pensamento\s+(analítico|crítico|estratégico)',
+        r'inteligência\s+emocional',
+        r'capacidade\s+de\s+(liderança|adaptação|aprendizado)',
+        
+        # Financeiro/Contábil
+        r'análise\s+financeira',
+        r'fluxo\s+de\s+caixa',
+        r'demonstrações\s+financeiras',
+        r'orçamento\s+(anual|empresarial)',
+        r'controladoria\s+financeira',
+        
+        # Tecnologia/IT
+        r'desenvolvimento\s+(web|mobile|software)',
+        r'banco\s+de\s+dados',
+        r'segurança\s+da\s+informação',
+        r'infraestrutura\s+de\s+ti',
+        r'suporte\s+técnico',
+        
+        # RH/Gestão Pessoas
+        r'recursos\s+humanos',
+        r'gestão\s+de\s+talentos',
+        r'desenvolvimento\s+humano',
+        r'clima\s+organizacional',
+        r'recrutamento\s+e\s+seleção'
+    ]
+    
+    # Compilado uma única vez para todas as instâncias (varredura linear por texto)
+    MATCHER_TERMOS_COMPOSTOS = CompoundTermMatcher(PADROES_TERMOS_COMPOSTOS_EXPANDIDOS)
+    
+    # Palavras irrelevantes específicas (REDUZIDA)
+    IRRELEVANTES_CRITICAS = frozenset([
+        'empresa', 'oportunidade', 'vaga', 'área', 'profissional'
+    ])
+    
     def __init__(self, db: Session):
         self.db = db
+        self.persistencia = PersistenciaMPC(db)
+        self._configurar_extracao()
+        # Matriz termo-documento de cada MPC em execução (construída na extração)
+        self._matrizes: Dict[int, MatrizTermoDocumento] = {}
+        self.extracao_paralela = ExtracaoParalela(
+            _extrair_palavras_lote,
+            self._extrair_palavras_texto_detalhado
+        )
+        self.ai_validator = AIValidator()
+        self.job_scraper = JobScraper()
+    
+    def _configurar_extracao(self):
+        """Estado usado pela extração de palavras (sem banco nem clientes de IA)"""
         self.palavras_base = self._carregar_palavras_base()
         self.stop_words = self._carregar_stop_words()
+        self._stop_words_set = frozenset(self.stop_words)
+        self._cache_tokens: Dict[str, Optional[str]] = {}
         self.padroes_limpeza = self._configurar_padroes_limpeza()
-        self.ai_validator = AIValidator()
-        self.job_scraper = JobScraper()
+    
+    @classmethod
+    def extrator_texto(cls) -> "MPCCarolinaMartins":
+        """Instância leve, só com o necessário para extrair palavras (processos do pool)"""
+        extrator = cls.__new__(cls)
+        extrator._configurar_extracao()
+        return extrator
     
     async def executar_mpc_completo(
         self, 
@@ -247,17 +376,11 @@ class MPCCarolinaMartins:
             print(f"\n❌ ERRO NO AGENTE 1: {str(e)}")
             print("📝 Salvando log de erro...")
             
+            # Status e log do erro num único commit
+            self.db.rollback()
             mpc.status = StatusMPC.ERRO.value
-            self.db.commit()
-            
-            # Log do erro
-            log_erro = ProcessamentoMPC(
-                mpc_id=mpc.id,
-                etapa="execucao_completa",
-                status="erro",
-                erro=str(e)
-            )
-            self.db.add(log_erro)
+            self.persistencia.registrar_log(mpc.id, "execucao_completa", "erro", erro=str(e))
+            self.persistencia.gravar_logs()
             self.db.commit()
             
             resultado["logs_detalhados"].append({
@@ -268,6 +391,9 @@ class MPCCarolinaMartins:
             })
             
             raise e
+        
+        finally:
+            self._matrizes.pop(mpc.id, None)
     
     async def _coletar_vagas_com_logs(
         self, 
@@ -380,8 +506,8 @@ class MPCCarolinaMartins:
         """
         print("🔤 Processando descrições das vagas...")
         
-        # Busca todas as vagas do MPC
-        vagas = self.db.query(VagaAnalisada).filter(VagaAnalisada.mpc_id == mpc.id).all()
+        # Busca só as colunas necessárias (sem carregar objetos ORM)
+        vagas = self._buscar_textos_vagas(mpc.id)
         print(f"📄 Encontradas {len(vagas)} vagas para processar")
         
         logs.append({
@@ -391,19 +517,19 @@ class MPCCarolinaMartins:
             "detalhes": f"Processando {len(vagas)} vagas"
         })
         
-        todas_palavras = []
+        matriz = MatrizTermoDocumento()
         vagas_processadas = 0
         palavras_por_vaga = []
+        palavras_por_id = {}
         
-        for i, vaga in enumerate(vagas):
+        # Extrai palavras-chave com método aprimorado (em paralelo para MPCs grandes)
+        palavras_extraidas = await self._extrair_palavras_vagas(vagas)
+        print(f"⚙️ Extração {self.extracao_paralela.ultimo_modo} concluída")
+        
+        for i, (vaga, palavras_vaga) in enumerate(zip(vagas, palavras_extraidas)):
             if i % 10 == 0:  # Log a cada 10 vagas
                 print(f"   📝 Processando vaga {i+1}/{len(vagas)}: {vaga.empresa}")
             
-            # Combina descrição e requisitos
-            texto_completo = f"{vaga.descricao} {vaga.requisitos}".lower()
-            
-            # Extrai palavras-chave com método aprimorado
-            palavras_vaga = self._extrair_palavras_texto_detalhado(texto_completo)
             palavras_por_vaga.append(len(palavras_vaga))
             
             # Log detalhado das primeiras 3 vagas
@@ -411,24 +537,22 @@ class MPCCarolinaMartins:
                 print(f"     🔍 Vaga {vaga.empresa}: {len(palavras_vaga)} palavras extraídas")
                 print(f"     📋 Primeiras palavras: {palavras_vaga[:5]}")
             
-            # Salva palavras da vaga
-            vaga.palavras_extraidas = palavras_vaga
-            vaga.processada = True
+            # Gravadas em lote ao final da etapa
+            palavras_por_id[vaga.id] = palavras_vaga
             
-            todas_palavras.extend(palavras_vaga)
+            matriz.adicionar_documento(vaga.id, palavras_vaga, fonte=vaga.fonte, localizacao=vaga.localizacao)
             vagas_processadas += 1
         
-        self.db.commit()
-        
-        # Conta frequências
-        contador_palavras = Counter(todas_palavras)
-        total_palavras_unicas = len(contador_palavras)
+        # Frequências saem da matriz (reaproveitada nas etapas seguintes)
+        self._matrizes[mpc.id] = matriz
+        mais_frequentes = matriz.mais_frequentes(50)
+        total_palavras_unicas = matriz.total_termos
         
         print(f"📊 Estatísticas de extração:")
-        print(f"   • Total de palavras extraídas: {len(todas_palavras)}")
+        print(f"   • Total de palavras extraídas: {matriz.total_ocorrencias}")
         print(f"   • Palavras únicas: {total_palavras_unicas}")
         print(f"   • Média por vaga: {sum(palavras_por_vaga)/len(palavras_por_vaga):.1f}")
-        print(f"   • Top 5 palavras: {[f'{palavra}({freq})' for palavra, freq in contador_palavras.most_common(5)]}")
+        print(f"   • Top 5 palavras: {[f'{palavra}({freq})' for palavra, freq in mais_frequentes[:5]]}")
         
         # OPÇÃO INTERATIVA: Mostrar palavras-chave extraídas
         print(f"\n💡 {total_palavras_unicas} palavras-chave únicas extraídas!")
@@ -443,7 +567,7 @@ class MPCCarolinaMartins:
                 print("🔤 PALAVRAS-CHAVE EXTRAÍDAS - TOP 20 MAIS FREQUENTES")
                 print("="*60)
                 
-                for i, (palavra, freq) in enumerate(contador_palavras.most_common(20), 1):
+                for i, (palavra, freq) in enumerate(mais_frequentes[:20], 1):
                     # Calcula frequência relativa
                     freq_rel = (freq / len(vagas)) * 100
                     print(f"{i:2d}. {palavra:<25} | {freq:3d}x | {freq_rel:5.1f}% das vagas")
@@ -460,7 +584,7 @@ class MPCCarolinaMartins:
                 palavras_tecnicas = []
                 palavras_digitais = []
                 
-                for palavra, _ in contador_palavras.most_common(50):
+                for palavra, _ in mais_frequentes:
                     categoria = self._determinar_categoria_palavra(palavra)
                     if categoria == "comportamental" and len(palavras_comportamentais) < 5:
                         palavras_comportamentais.append(palavra)
@@ -483,9 +607,12 @@ class MPCCarolinaMartins:
         except Exception as e:
             print("   ⚠️ Erro ao exibir palavras-chave:", e)
         
-        # Atualiza MPC
-        mpc.total_palavras_extraidas = total_palavras_unicas
-        self.db.commit()
+        # Palavras das vagas, estatísticas do MPC e log numa única transação
+        with self.persistencia.etapa(mpc.id, "extracao_palavras") as log_extracao:
+            self.persistencia.atualizar_palavras_vagas(palavras_por_id)
+            mpc.total_palavras_extraidas = total_palavras_unicas
+            log_extracao["vagas_processadas"] = vagas_processadas
+            log_extracao["palavras_encontradas"] = total_palavras_unicas
         
         logs.append({
             "timestamp": datetime.now().isoformat(),
@@ -493,19 +620,19 @@ class MPCCarolinaMartins:
             "status": "concluido",
             "detalhes": {
                 "vagas_processadas": vagas_processadas,
-                "palavras_totais": len(todas_palavras),
+                "palavras_totais": matriz.total_ocorrencias,
                 "palavras_unicas": total_palavras_unicas,
-                "top_palavras": contador_palavras.most_common(10)
+                "top_palavras": mais_frequentes[:10]
             }
         })
         
         return {
             "vagas_processadas": vagas_processadas,
             "palavras_unicas": total_palavras_unicas,
-            "palavras_mais_frequentes": contador_palavras.most_common(20),
-            "qualidade_extracao": self._avaliar_qualidade_extracao(contador_palavras),
+            "palavras_mais_frequentes": mais_frequentes[:20],
+            "qualidade_extracao": self._avaliar_qualidade_extracao(matriz.contador()),
             "estatisticas_detalhadas": {
-                "palavras_totais": len(todas_palavras),
+                "palavras_totais": matriz.total_ocorrencias,
                 "media_por_vaga": sum(palavras_por_vaga)/len(palavras_por_vaga) if palavras_por_vaga else 0
             }
         }
@@ -908,14 +1035,6 @@ class MPCCarolinaMartins:
         
         Objetivo Carolina Martins: 50-100 vagas relevantes
         """
-        log_coleta = ProcessamentoMPC(
-            mpc_id=mpc.id,
-            etapa="coleta_vagas",
-            status="executando"
-        )
-        self.db.add(log_coleta)
-        self.db.commit()
-        
         vagas_coletadas = []
         fontes_utilizadas = ["linkedin", "indeed", "catho", "infojobs"]
         
@@ -950,32 +1069,11 @@ class MPCCarolinaMartins:
         
         print(f"Coleta real concluída: {len(vagas_coletadas)} vagas coletadas")
         
-        # Salva vagas no banco
-        total_salvas = 0
-        for vaga_data in vagas_coletadas:
-            vaga = VagaAnalisada(
-                mpc_id=mpc.id,
-                titulo=vaga_data["titulo"],
-                empresa=vaga_data.get("empresa", ""),
-                localizacao=vaga_data.get("localizacao", ""),
-                descricao=vaga_data.get("descricao", ""),
-                requisitos=vaga_data.get("requisitos", ""),
-                fonte=vaga_data.get("fonte", ""),
-                url_original=vaga_data.get("url", "")
-            )
-            self.db.add(vaga)
-            total_salvas += 1
-        
-        self.db.commit()
-        
-        # Atualiza estatísticas do MPC
-        mpc.total_vagas_coletadas = total_salvas
-        self.db.commit()
-        
-        # Atualiza log
-        log_coleta.status = "concluido"
-        log_coleta.vagas_processadas = total_salvas
-        self.db.commit()
+        # Salva vagas, estatísticas do MPC e log da etapa numa única transação
+        with self.persistencia.etapa(mpc.id, "coleta_vagas") as log_coleta:
+            total_salvas = self.persistencia.inserir_vagas(mpc.id, vagas_coletadas)
+            mpc.total_vagas_coletadas = total_salvas
+            log_coleta["vagas_processadas"] = total_salvas
         
         # Atualiza fontes utilizadas baseado na coleta real
         fontes_reais_utilizadas = list(set([vaga.get("fonte", "") for vaga in vagas_coletadas if vaga.get("fonte")]))
@@ -1012,175 +1110,140 @@ class MPCCarolinaMartins:
         3. Contagem de frequência
         4. Identificação de padrões
         """
-        log_extracao = ProcessamentoMPC(
-            mpc_id=mpc.id,
-            etapa="extracao_palavras",
-            status="executando"
-        )
-        self.db.add(log_extracao)
-        self.db.commit()
+        # Busca só as colunas necessárias (sem carregar objetos ORM)
+        vagas = self._buscar_textos_vagas(mpc.id)
         
-        # Busca todas as vagas do MPC
-        vagas = self.db.query(VagaAnalisada).filter(VagaAnalisada.mpc_id == mpc.id).all()
+        matriz = MatrizTermoDocumento()
+        palavras_por_id = {}
         
-        todas_palavras = []
-        vagas_processadas = 0
+        # Extrai palavras-chave com método APRIMORADO (em paralelo para MPCs grandes)
+        palavras_extraidas = await self._extrair_palavras_vagas(vagas)
         
-        for vaga in vagas:
-            # Combina descrição e requisitos
-            texto_completo = f"{vaga.descricao} {vaga.requisitos}".lower()
-            
-            # Extrai palavras-chave com método APRIMORADO
-            palavras_vaga = self._extrair_palavras_texto_detalhado(texto_completo)
-            
-            # Salva palavras da vaga
-            vaga.palavras_extraidas = palavras_vaga
-            vaga.processada = True
-            
-            todas_palavras.extend(palavras_vaga)
-            vagas_processadas += 1
+        for vaga, palavras_vaga in zip(vagas, palavras_extraidas):
+            palavras_por_id[vaga.id] = palavras_vaga
+            matriz.adicionar_documento(vaga.id, palavras_vaga, fonte=vaga.fonte, localizacao=vaga.localizacao)
         
-        self.db.commit()
+        vagas_processadas = len(palavras_por_id)
         
-        # Conta frequências
-        contador_palavras = Counter(todas_palavras)
-        total_palavras_unicas = len(contador_palavras)
+        # Frequências saem da matriz (reaproveitada nas etapas seguintes)
+        self._matrizes[mpc.id] = matriz
+        total_palavras_unicas = matriz.total_termos
         
-        # Atualiza MPC
-        mpc.total_palavras_extraidas = total_palavras_unicas
-        self.db.commit()
-        
-        # Atualiza log
-        log_extracao.status = "concluido"
-        log_extracao.vagas_processadas = vagas_processadas
-        log_extracao.palavras_encontradas = total_palavras_unicas
-        self.db.commit()
+        # Palavras das vagas, estatísticas do MPC e log numa única transação
+        with self.persistencia.etapa(mpc.id, "extracao_palavras") as log_extracao:
+            self.persistencia.atualizar_palavras_vagas(palavras_por_id)
+            mpc.total_palavras_extraidas = total_palavras_unicas
+            log_extracao["vagas_processadas"] = vagas_processadas
+            log_extracao["palavras_encontradas"] = total_palavras_unicas
         
         return {
             "vagas_processadas": vagas_processadas,
             "palavras_unicas": total_palavras_unicas,
-            "palavras_mais_frequentes": contador_palavras.most_common(20),
-            "qualidade_extracao": self._avaliar_qualidade_extracao(contador_palavras)
+            "palavras_mais_frequentes": matriz.mais_frequentes(20),
+            "qualidade_extracao": self._avaliar_qualidade_extracao(matriz.contador())
         }
     
+    def _buscar_textos_vagas(self, mpc_id: int) -> List[Any]:
+        """Linhas (id, empresa, fonte, localizacao, descricao, requisitos) das vagas do MPC"""
+        return self.db.query(
+            VagaAnalisada.id,
+            VagaAnalisada.empresa,
+            VagaAnalisada.fonte,
+            VagaAnalisada.localizacao,
+            VagaAnalisada.descricao,
+            VagaAnalisada.requisitos
+        ).filter(VagaAnalisada.mpc_id == mpc_id).all()
+    
+    async def _extrair_palavras_vagas(self, vagas: List[Any]) -> List[List[str]]:
+        """
+        Palavras de cada vaga (descrição + requisitos), na ordem das vagas
+        
+        Lotes de vagas vão para o pool de processos sem bloquear o event
+        loop; MPCs pequenos são extraídos aqui mesmo.
+        """
+        textos = [f"{vaga.descricao} {vaga.requisitos}".lower() for vaga in vagas]
+        return await self.extracao_paralela.extrair(textos)
+    
+    def _matriz_mpc(self, mpc_id: int) -> MatrizTermoDocumento:
+        """
+        Matriz termo-documento do MPC
+        
+        Normalmente já construída na extração; só é remontada a partir das
+        palavras gravadas quando a etapa roda isolada (ex.: reprocessamento).
+        """
+        matriz = self._matrizes.get(mpc_id)
+        if matriz is None:
+            matriz = MatrizTermoDocumento()
+            linhas = self.db.query(
+                VagaAnalisada.id,
+                VagaAnalisada.fonte,
+                VagaAnalisada.localizacao,
+                VagaAnalisada.palavras_extraidas
+            ).filter(VagaAnalisada.mpc_id == mpc_id).all()
+            for vaga_id, fonte, localizacao, palavras in linhas:
+                matriz.adicionar_documento(vaga_id, palavras or [], fonte=fonte, localizacao=localizacao)
+            self._matrizes[mpc_id] = matriz
+        return matriz
+    
     def _extrair_palavras_texto_detalhado(self, texto: str) -> List[str]:
         """
         Versão aprimorada da extração para capturar 30-70 palavras-chave
         MENOS RESTRITIVA que a versão original
         """
         # Limpeza inicial mais suave
-        texto = re.sub(r'[^\w\s]', ' ', texto)
-        texto = re.sub(r'\s+', ' ', texto).strip()
+        texto = RE_CARACTERES_ESPECIAIS.sub(' ', texto)
+        texto = RE_ESPACOS.sub(' ', texto).strip()
         
         # Identifica termos compostos primeiro (EXPANDIDO)
         termos_compostos = self._identificar_termos_compostos_expandido(texto)
         
-        # Extrai palavras individuais com filtros mais permissivos
-        palavras = []
-        for palavra in texto.split():
-            palavra_limpa = palavra.strip().lower()
-            if (len(palavra_limpa) > 2 and 
-                palavra_limpa not in self.stop_words and 
-                self._e_palavra_potencialmente_relevante(palavra_limpa)):
-                palavras.append(palavra_limpa)
-        
-        # Combina termos compostos e palavras individuais
-        todas_palavras = termos_compostos + palavras
-        
-        # Normalização mais permissiva
+        # Normalização mais permissiva: termos compostos primeiro, depois palavras
+        # individuais, sem repetições e preservando a ordem de aparição
         palavras_normalizadas = []
         seen = set()
         
-        for palavra in todas_palavras:
-            palavra_norm = self._normalizar_palavra(palavra)
+        for termo in termos_compostos:
+            palavra_norm = normalizar_token(termo)
             if palavra_norm not in seen and len(palavra_norm) > 2:
                 palavras_normalizadas.append(palavra_norm)
                 seen.add(palavra_norm)
         
+        for palavra in texto.split():
+            palavra_norm = self._token_normalizado(palavra)
+            if palavra_norm is not None and palavra_norm not in seen:
+                palavras_normalizadas.append(palavra_norm)
+                seen.add(palavra_norm)
+        
         return palavras_normalizadas
     
+    def _token_normalizado(self, palavra: str) -> Optional[str]:
+        """
+        Filtros de palavra individual + normalização, memorizados por token
+        Retorna None quando a palavra deve ser descartada
+        """
+        try:
+            return self._cache_tokens[palavra]
+        except KeyError:
+            pass
+        
+        palavra_limpa = palavra.strip().lower()
+        resultado = None
+        if (len(palavra_limpa) > 2 and
+            palavra_limpa not in self._stop_words_set and
+            self._e_palavra_potencialmente_relevante(palavra_limpa)):
+            palavra_norm = normalizar_token(palavra_limpa)
+            if len(palavra_norm) > 2:
+                resultado = palavra_norm
+        
+        self._cache_tokens[palavra] = resultado
+        return resultado
+    
     def _identificar_termos_compostos_expandido(self, texto: str) -> List[str]:
         """
         VERSÃO EXPANDIDA - identifica muito mais termos compostos
+        (uma única passada do matcher pré-compilado sobre o texto)
         """
-        termos_compostos = []
-        
-        # Padrões de termos compostos EXPANDIDOS por área
-        padroes_compostos = [
-            # Ferramentas/Software
-            r'excel\s+(avançado|intermediário|básico)',
-            r'power\s+bi',
-            r'google\s+(analytics|ads|drive|sheets)',
-            r'facebook\s+ads',
-            r'linkedin\s+ads',
-            r'microsoft\s+(office|teams|project)',
-            r'adobe\s+(photoshop|illustrator|premiere)',
-            r'sql\s+(server|developer)',
-            
-            # Gestão e Processos
-            r'gestão\s+de\s+(projetos|equipe|pessoas|processos|mudança|conflitos|tempo|qualidade|estoque|custos|riscos)',
-            r'análise\s+de\s+(dados|negócio|mercado|risco|performance|resultado)',
-            r'controle\s+de\s+(qualidade|estoque|custos|orçamento|despesas)',
-            r'planejamento\s+(estratégico|financeiro|operacional|comercial)',
-            r'desenvolvimento\s+de\s+(produto|negócio|estratégia|pessoas)',
-            
-            # Marketing e Vendas
-            r'marketing\s+(digital|online|de\s+conteúdo|de\s+relacionamento)',
-            r'redes\s+sociais',
-            r'content\s+marketing',
-            r'inbound\s+marketing',
-            r'email\s+marketing',
-            r'growth\s+hacking',
-            r'customer\s+(success|experience|journey)',
-            r'relacionamento\s+com\s+cliente',
-            
-            # Metodologias
-            r'metodologias\s+ágeis',
-            r'design\s+thinking',
-            r'lean\s+(startup|six\s+sigma)',
-            r'business\s+(intelligence|analyst)',
-            r'product\s+(management|owner)',
-            r'scrum\s+master',
-            
-            # Soft Skills
-            r'trabalho\s+em\s+equipe',
-            r'tomada\s+de\s+decisão',
-            r'resolução\s+de\s+(problemas|conflitos)',
-            r'comunicação\s+(oral|escrita|interpessoal|assertiva)',
-            r'pensamento\s+(analítico|crítico|estratégico)',
-            r'inteligência\s+emocional',
-            r'capacidade\s+de\s+(liderança|adaptação|aprendizado)',
-            
-            # Financeiro/Contábil
-            r'análise\s+financeira',
-            r'fluxo\s+de\s+caixa',
-            r'demonstrações\s+financeiras',
-            r'orçamento\s+(anual|empresarial)',
-            r'controladoria\s+financeira',
-            
-            # Tecnologia/IT
-            r'desenvolvimento\s+(web|mobile|software)',
-            r'banco\s+de\s+dados',
-            r'segurança\s+da\s+informação',
-            r'infraestrutura\s+de\s+ti',
-            r'suporte\s+técnico',
-            
-            # RH/Gestão Pessoas
-            r'recursos\s+humanos',
-            r'gestão\s+de\s+talentos',
-            r'desenvolvimento\s+humano',
-            r'clima\s+organizacional',
-            r'recrutamento\s+e\s+seleção'
-        ]
-        
-        for padrao in padroes_compostos:
-            matches = re.finditer(padrao, texto, re.IGNORECASE)
-            for match in matches:
-                termo_completo = match.group().lower().strip()
-                if termo_completo not in termos_compostos:
-                    termos_compostos.append(termo_completo)
-        
-        return termos_compostos
+        return self.MATCHER_TERMOS_COMPOSTOS.encontrar(texto)
     
     def _e_palavra_potencialmente_relevante(self, palavra: str) -> bool:
         """
@@ -1190,15 +1253,10 @@ class MPCCarolinaMartins:
         if len(palavra) < 3:
             return False
         
-        if palavra.lower() in self.stop_words:
+        if palavra.lower() in self._stop_words_set:
             return False
         
-        # Palavras irrelevantes específicas (REDUZIDA)
-        irrelevantes_criticas = [
-            'empresa', 'oportunidade', 'vaga', 'área', 'profissional'
-        ]
-        
-        if palavra.lower() in irrelevantes_criticas:
+        if palavra.lower() in self.IRRELEVANTES_CRITICAS:
             return False
         
         # Aceita números se forem relevantes (anos de experiência, etc)
@@ -1285,29 +1343,7 @@ class MPCCarolinaMartins:
     
     def _normalizar_palavra(self, palavra: str) -> str:
         """Normaliza palavra removendo acentos e padronizando"""
-        import unicodedata
-        
-        # Remove acentos
-        palavra = unicodedata.normalize('NFD', palavra).encode('ascii', 'ignore').decode('ascii')
-        
-        # Converte para minúsculo
-        palavra = palavra.lower().strip()
-        
-        # Aplica normalizações específicas
-        normalizacoes = {
-            'excel': 'excel',
-            'powerbi': 'power bi',
-            'power-bi': 'power bi',
-            'sql': 'sql',
-            'crm': 'crm',
-            'erp': 'erp',
-            'sap': 'sap',
-            'lideranca': 'liderança',
-            'gestao': 'gestão',
-            'analise': 'análise'
-        }
-        
-        return normalizacoes.get(palavra, palavra)
+        return normalizar_token(palavra)
     
     def _e_palavra_relevante(self, palavra: str) -> bool:
         """Verifica se palavra é relevante para contexto profissional"""
@@ -1335,14 +1371,8 @@ class MPCCarolinaMartins:
         Categoriza palavras-chave em: Comportamental, Técnica, Digital
         baseado na metodologia Carolina Martins
         """
-        # Busca todas as palavras extraídas
-        vagas = self.db.query(VagaAnalisada).filter(VagaAnalisada.mpc_id == mpc.id).all()
-        
-        # Coleta todas as palavras com frequência
-        contador_geral = Counter()
-        for vaga in vagas:
-            if vaga.palavras_extraidas:
-                contador_geral.update(vaga.palavras_extraidas)
+        # Frequências de documento da matriz montada na extração (sem reler o banco)
+        matriz = self._matriz_mpc(mpc.id)
         
         # Categoriza cada palavra
         palavras_categorizadas = {
@@ -1353,9 +1383,10 @@ class MPCCarolinaMartins:
         
         # Garante que coletamos pelo menos MIN_PALAVRAS_FASE1 (20) palavras
         # e idealmente TARGET_PALAVRAS_FASE1 (30) conforme metodologia
-        palavras_mais_frequentes = contador_geral.most_common(self.MAX_PALAVRAS_FASE1 * 2)  # Pega o dobro para filtrar
+        palavras_mais_frequentes = matriz.mais_frequentes(self.MAX_PALAVRAS_FASE1 * 2)  # Pega o dobro para filtrar
         
         palavras_salvas = 0
+        linhas_palavras = []
         for palavra, frequencia in palavras_mais_frequentes:
             # Para nas primeiras MAX_PALAVRAS_FASE1 (40) palavras relevantes
             if palavras_salvas >= self.MAX_PALAVRAS_FASE1:
@@ -1366,31 +1397,26 @@ class MPCCarolinaMartins:
             # Calcula frequência relativa
             freq_relativa = frequencia / mpc.total_vagas_coletadas
             
-            # Cria registro de palavra-chave
-            palavra_obj = PalavraChave(
-                mpc_id=mpc.id,
-                termo=palavra,
-                categoria=categoria,
-                frequencia_absoluta=frequencia,
-                frequencia_relativa=freq_relativa,
-                importancia=self._calcular_importancia_palavra(palavra, categoria, freq_relativa)
-            )
-            self.db.add(palavra_obj)
-            palavras_salvas += 1
-            
-            # Adiciona à categoria correspondente
-            palavras_categorizadas[categoria].append({
+            # Registro de palavra-chave (inserido em lote ao final)
+            registro = {
                 "termo": palavra,
                 "frequencia_absoluta": frequencia,
                 "frequencia_relativa": freq_relativa,
-                "importancia": palavra_obj.importancia
-            })
+                "importancia": self._calcular_importancia_palavra(palavra, categoria, freq_relativa)
+            }
+            linhas_palavras.append({**registro, "categoria": categoria})
+            palavras_salvas += 1
+            
+            # Adiciona à categoria correspondente
+            palavras_categorizadas[categoria].append(registro)
         
         # Verifica se atingimos o mínimo da metodologia
         if palavras_salvas < self.MIN_PALAVRAS_FASE1:
             print(f"⚠️  AVISO: Apenas {palavras_salvas} palavras encontradas. Metodologia recomenda mínimo {self.MIN_PALAVRAS_FASE1}")
         
-        self.db.commit()
+        with self.persistencia.etapa(mpc.id, "categorizacao") as log_categorizacao:
+            self.persistencia.inserir_palavras_chave(mpc.id, linhas_palavras)
+            log_categorizacao["palavras_encontradas"] = palavras_salvas
         
         # Ordena por importância
         for categoria in palavras_categorizadas:
@@ -1399,12 +1425,21 @@ class MPCCarolinaMartins:
                 reverse=True
             )
         
+        termos_salvos = [linha["termo"] for linha in linhas_palavras]
+        
         return {
             "total_por_categoria": {
                 cat: len(palavras) for cat, palavras in palavras_categorizadas.items()
             },
             "palavras_categorizadas": palavras_categorizadas,
-            "qualidade_categorizacao": self._avaliar_qualidade_categorizacao(palavras_categorizadas)
+            "qualidade_categorizacao": self._avaliar_qualidade_categorizacao(palavras_categorizadas),
+            "estatisticas_corpus": {
+                "vagas_por_fonte": matriz.tamanho_grupos("fonte"),
+                "vagas_por_localizacao": matriz.tamanho_grupos("localizacao"),
+                "frequencia_por_fonte": matriz.frequencia_por_grupo("fonte", termos_salvos),
+                "frequencia_por_localizacao": matriz.frequencia_por_grupo("localizacao", termos_salvos),
+                "top_tfidf": matriz.tfidf_medio(20)
+            }
         }
     
     def _determinar_categoria_palavra(self, palavra: str) -> str:
@@ -1641,6 +1676,10 @@ class MPCCarolinaMartins:
             "complementares": []
         }
         
+        # Recorte por fonte direto da matriz do MPC (quando ainda em memória)
+        matriz = self._matrizes.get(mpc.id)
+        por_fonte = matriz.frequencia_por_grupo("fonte", [p.termo for p in palavras]) if matriz else {}
+        
         for palavra in palavras:
             freq = palavra.frequencia_relativa
             
@@ -1650,6 +1689,8 @@ class MPCCarolinaMartins:
                 "frequencia": freq,
                 "importancia": palavra.importancia
             }
+            if palavra.termo in por_fonte:
+                item["frequencia_por_fonte"] = por_fonte[palavra.termo]
             
             if freq >= 0.7:
                 priorizacao["essenciais"].append(item)
@@ -1888,4 +1929,16 @@ class MPCCarolinaMartins:
         
         recomendacoes["geral"] = "Sempre personalize com palavras-chave específicas da vaga"
         
-        return recomendacoes
\ No newline at end of file
+        return recomendacoes
+
+
+# Extrator de cada processo do pool (criado no primeiro lote recebido)
+_extrator_processo: Optional[MPCCarolinaMartins] = None
+
+
+def _extrair_palavras_lote(textos: List[str]) -> List[List[str]]:
+    """Executada nos processos do pool: extrai as palavras de um lote de textos"""
+    global _extrator_processo
+    if _extrator_processo is None:
+        _extrator_processo = MPCCarolinaMartins.extrator_texto()
+    return [_extrator_processo._extrair_palavras_texto_detalhado(texto) for texto in textos]
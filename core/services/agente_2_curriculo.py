@@ -31,8 +31,10 @@ from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from core.models import (
     User, Curriculo, ExperienciaProfissional, FormacaoAcademica,
-    CompetenciaUsuario, TipoCurriculo, StatusCurriculo, MapaPalavrasChave
+    CompetenciaUsuario, TipoCurriculo, StatusCurriculo, MapaPalavrasChave,
+    VagaAnalisada
 )
+from core.services.term_document_matrix import MatrizTermoDocumento
 
 class CurriculoCarolinaMartins:
     """
@@ -45,6 +47,7 @@ class CurriculoCarolinaMartins:
         self.regras_honestidade = self._carregar_regras_honestidade()
         self.criterios_formatacao = self._carregar_criterios_formatacao()
         self.validacoes_metodologicas = self._carregar_validacoes_metodologicas()
+        self._extrator = None
     
     async def gerar_curriculo_base(
         self, 
@@ -263,6 +266,167 @@ class CurriculoCarolinaMartins:
         
         return resultado
     
+    def ranquear_vagas_compativeis(
+        self,
+        curriculo_base_id: int,
+        mpc_id: int = None,
+        vagas: List[Dict[str, Any]] = None,
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Ranqueia vagas coletadas pela compatibilidade com o currículo base
+        
+        Todas as vagas são pontuadas de uma vez (matriz termo-documento
+        esparsa, cosseno TF-IDF) sem gravar nada no banco; currículos
+        personalizados só são criados depois, para as vagas escolhidas,
+        com personalizar_vagas_selecionadas.
+        
+        Args:
+            curriculo_base_id: currículo base do usuário
+            mpc_id: vagas gravadas do MPC (usa as palavras já extraídas)
+            vagas: alternativa ao mpc_id - vagas coletadas ainda não gravadas
+                (cargo/titulo, empresa, descricao, requisitos, url)
+            top_k: quantas vagas retornar
+        
+        Returns:
+            Dict com as top_k vagas (cada uma com compatibilidade 0-1,
+            termos em comum e termos da vaga ausentes no currículo)
+        """
+        curriculo_base = self.db.query(Curriculo).filter(Curriculo.id == curriculo_base_id).first()
+        if not curriculo_base or curriculo_base.tipo != TipoCurriculo.BASE.value:
+            raise ValueError("Currículo base não encontrado")
+        if mpc_id is None and vagas is None:
+            raise ValueError("Informe mpc_id ou a lista de vagas")
+        
+        if vagas is None:
+            vagas, palavras_vagas = self._carregar_vagas_mpc(mpc_id)
+        else:
+            palavras_vagas = [None] * len(vagas)
+        
+        # Linha i da matriz = vaga i
+        matriz = MatrizTermoDocumento()
+        for i, (vaga, palavras) in enumerate(zip(vagas, palavras_vagas)):
+            if palavras is None:
+                texto = f"{vaga.get('cargo') or vaga.get('titulo', '')} {vaga.get('descricao', '')} {vaga.get('requisitos', '')}"
+                palavras = self._extrator_termos()._extrair_palavras_texto_detalhado(texto.lower())
+            matriz.adicionar_documento(i, palavras)
+        
+        termos_curriculo = self._termos_curriculo(curriculo_base)
+        conjunto_curriculo = set(termos_curriculo)
+        
+        ranking = []
+        for posicao, (linha, similaridade) in enumerate(matriz.similaridades(termos_curriculo, top_k), 1):
+            termos_vaga = matriz.termos_documento(linha)
+            ranking.append({
+                **vagas[linha],
+                "posicao": posicao,
+                "compatibilidade": round(similaridade, 4),
+                "termos_em_comum": [t for t in termos_vaga if t in conjunto_curriculo],
+                # Ausentes mais raros no corpus primeiro (mais distintivos da vaga)
+                "termos_faltando": sorted(
+                    (t for t in termos_vaga if t not in conjunto_curriculo),
+                    key=matriz.frequencia_documento
+                )[:10]
+            })
+        
+        return {
+            "curriculo_base_id": curriculo_base_id,
+            "mpc_id": mpc_id,
+            "total_vagas": matriz.total_documentos,
+            "total_termos_curriculo": len(conjunto_curriculo),
+            "ranking": ranking
+        }
+    
+    async def personalizar_vagas_selecionadas(
+        self,
+        curriculo_base_id: int,
+        vagas_selecionadas: List[Dict[str, Any]],
+        mpc_personalizado: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cria os currículos personalizados só para as vagas escolhidas no
+        ranking (a compatibilidade calculada no ranking é reaproveitada)
+        """
+        return [
+            await self.personalizar_curriculo_para_vaga(curriculo_base_id, vaga, mpc_personalizado)
+            for vaga in vagas_selecionadas
+        ]
+    
+    def _carregar_vagas_mpc(self, mpc_id: int) -> Tuple[List[Dict[str, Any]], List[Optional[List[str]]]]:
+        """Vagas do MPC no formato de vaga_dados e suas palavras extraídas"""
+        linhas = self.db.query(
+            VagaAnalisada.id,
+            VagaAnalisada.titulo,
+            VagaAnalisada.empresa,
+            VagaAnalisada.localizacao,
+            VagaAnalisada.url_original,
+            VagaAnalisada.descricao,
+            VagaAnalisada.requisitos,
+            VagaAnalisada.palavras_extraidas
+        ).filter(VagaAnalisada.mpc_id == mpc_id).order_by(VagaAnalisada.id).all()
+        
+        vagas = [
+            {
+                "vaga_id": vaga_id, "cargo": titulo, "empresa": empresa or "",
+                "localizacao": localizacao or "", "url": url or "",
+                "descricao": descricao or "", "requisitos": requisitos or ""
+            }
+            for vaga_id, titulo, empresa, localizacao, url, descricao, requisitos, _ in linhas
+        ]
+        # Vagas ainda não processadas pelo MPC são extraídas no ranking
+        return vagas, [linha.palavras_extraidas or None for linha in linhas]
+    
+    def _termos_curriculo(self, curriculo: Curriculo) -> List[str]:
+        """
+        Termos do currículo base no vocabulário das vagas
+        
+        Palavras-chave já cadastradas entram como estão; objetivo, resumo e
+        experiências passam pela mesma extração usada nas vagas do MPC.
+        """
+        competencias = self.db.query(CompetenciaUsuario.nome).filter(
+            CompetenciaUsuario.usuario_id == curriculo.usuario_id
+        ).all()
+        experiencias = self.db.query(
+            ExperienciaProfissional.cargo,
+            ExperienciaProfissional.descricao,
+            ExperienciaProfissional.palavras_chave
+        ).filter(ExperienciaProfissional.usuario_id == curriculo.usuario_id).all()
+        
+        termos = self._achatar_termos(curriculo.palavras_chave_priorizadas)
+        termos += self._achatar_termos([nome for (nome,) in competencias])
+        textos = [curriculo.objetivo or "", curriculo.resumo or ""]
+        for cargo, descricao, palavras_chave in experiencias:
+            textos += [cargo or "", descricao or ""]
+            termos += self._achatar_termos(palavras_chave)
+        
+        texto = " ".join(textos).lower()
+        return termos + self._extrator_termos()._extrair_palavras_texto_detalhado(texto)
+    
+    def _achatar_termos(self, valor: Any) -> List[str]:
+        """Termos de um campo JSON (texto, lista ou dict por categoria), em minúsculas"""
+        if not valor:
+            return []
+        if isinstance(valor, str):
+            return [valor.strip().lower()]
+        if isinstance(valor, dict):
+            valor = valor.values()
+        termos = []
+        for item in valor:
+            termos += self._achatar_termos(item)
+        return termos
+    
+    def _extrator_termos(self):
+        """
+        Extrator de palavras do MPC (instância leve, sem banco)
+        
+        Importado sob demanda: o Agente 1 carrega scrapers e clientes de IA
+        que a personalização de currículo não usa.
+        """
+        if self._extrator is None:
+            from core.services.agente_1_palavras_chave import MPCCarolinaMartins
+            self._extrator = MPCCarolinaMartins.extrator_texto()
+        return self._extrator
+    
     # IMPLEMENTAÇÃO DOS 13 PASSOS
     
     async def _passo_1_dados_pessoais(
@@ -1385,7 +1549,8 @@ class CurriculoCarolinaMartins:
     
     # Métodos de personalização por vaga
     def _calcular_compatibilidade_vaga(self, curriculo: Curriculo, vaga: Dict[str, Any], mpc: Dict[str, Any] = None) -> float:
-        return 0.85  # Placeholder
+        # Vagas vindas de ranquear_vagas_compativeis já trazem a compatibilidade
+        return vaga.get("compatibilidade", 0.85)  # Placeholder para vaga avulsa
     
     def _personalizar_objetivo(self, curriculo: Curriculo, vaga: Dict[str, Any]) -> str:
         return vaga.get("cargo", curriculo.objetivo)
@@ -4,68 +4,86 @@ Abordagem "Pura IA" seguindo metodologia Carolina Martins
 Usa LLMs com grande janela de contexto para análise completa
 """
 
-import os
-import json
 import asyncio
+import threading
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import openai
-from anthropic import Anthropic
-import google.generativeai as genai
 from collections import Counter
 from dotenv import load_dotenv
 
+from .llm_cache import obter_cache_llm
+from .ai_providers import ClienteIA, texto_pedaco_gemini
+from .llm_router import ProvedorLLM, obter_roteador_llm
+from .native_threads import criar_lock
+from .json_stream_parser import consumir_stream
+
 # Garantir que as variáveis de ambiente sejam carregadas
 load_dotenv()
 
+# Incrementar sempre que _criar_prompt_extracao mudar, para invalidar o cache
+VERSAO_PROMPT_EXTRACAO = "extracao-v1"
+
+class EmissorPalavras:
+    """
+    Repassa ao cliente as palavras transmitidas por um único provedor
+
+    Com hedge ou failover, dois provedores podem transmitir a mesma análise
+    ao mesmo tempo: só as palavras do primeiro que começar a transmitir são
+    repassadas (cada termo uma vez). Se a análise acabar vindo de outro
+    provedor, `divergiu` indica que as palavras parciais devem ser trocadas
+    pela lista final.
+    """
+    
+    def __init__(self, ao_receber_palavra: Optional[callable]):
+        self.ao_receber_palavra = ao_receber_palavra
+        self.provedor: Optional[str] = None
+        self._emitidas = set()
+        # As chamadas rodam em threads nativas do roteador (também sob gevent)
+        self._lock = criar_lock()
+    
+    def para(self, provedor: str) -> Optional[callable]:
+        """Callback de stream para as chamadas de `provedor`"""
+        if not self.ao_receber_palavra:
+            return None
+        
+        def emitir(palavra: Dict[str, Any]):
+            termo = str(palavra.get('termo', '')).strip().lower()
+            if not termo:
+                return
+            with self._lock:
+                if self.provedor is None:
+                    self.provedor = provedor
+                if self.provedor != provedor or termo in self._emitidas:
+                    return
+                self._emitidas.add(termo)
+            self.ao_receber_palavra(palavra, 1)
+        
+        return emitir
+    
+    def divergiu(self, vencedor: str) -> bool:
+        """Se o cliente recebeu palavras de um provedor que não foi o vencedor"""
+        return self.provedor is not None and self.provedor != vencedor
+
+
 class AIKeywordExtractor:
     """
     Extrator que envia todas as descrições de vagas para um LLM
     para análise completa e extração inteligente de palavras-chave
     """
     
-    def __init__(self):
-        # Configurar clientes de IA
-        self.anthropic_client = None
-        self.openai_client = None
-        self.gemini_model = None
-        
-        # Claude (200k tokens de contexto)
-        if os.getenv('ANTHROPIC_API_KEY'):
-            try:
-                self.anthropic_client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-                print("✅ Claude client inicializado com sucesso")
-            except Exception as e:
-                print(f"❌ Erro ao inicializar Claude: {e}")
-                self.anthropic_client = None
-        
-        # OpenAI GPT-4 Turbo (128k tokens)
-        if os.getenv('OPENAI_API_KEY'):
-            try:
-                openai.api_key = os.getenv('OPENAI_API_KEY')
-                self.openai_client = openai
-                print("✅ OpenAI client inicializado com sucesso")
-            except Exception as e:
-                print(f"❌ Erro ao inicializar OpenAI: {e}")
-                self.openai_client = None
-        
-        # Google Gemini 2.5 Flash (2M tokens input)
-        if os.getenv('GOOGLE_API_KEY'):
-            try:
-                genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-                # Usando Gemini 2.5 Flash (2025)
-                self.gemini_model = genai.GenerativeModel('gemini-2.5-flash')
-                print("✅ Gemini client inicializado com sucesso")
-            except Exception as e:
-                print(f"❌ Erro ao inicializar Gemini: {e}")
-                self.gemini_model = None
+    # Clientes de IA compartilhados no processo, criados no primeiro uso
+    # (None quando o provedor não tem chave ou falhou ao inicializar)
+    anthropic_client = ClienteIA("anthropic")  # Claude (200k tokens de contexto)
+    openai_client = ClienteIA("openai")  # OpenAI GPT-4 Turbo (128k tokens)
+    gemini_model = ClienteIA("gemini", "gemini-2.5-flash")  # Google Gemini 2.5 Flash (2M tokens input)
     
     async def extrair_palavras_chave_ia(
         self, 
         vagas: List[Dict[str, Any]], 
         cargo_objetivo: str,
         area_interesse: str,
-        callback_progresso: Optional[callable] = None
+        callback_progresso: Optional[callable] = None,
+        ao_receber_palavra: Optional[callable] = None
     ) -> Dict[str, Any]:
         """
         Extrai palavras-chave usando análise completa via IA
@@ -75,6 +93,9 @@ class AIKeywordExtractor:
             cargo_objetivo: Cargo alvo do usuário
             area_interesse: Área de interesse
             callback_progresso: Função para reportar progresso
+            ao_receber_palavra: opcional; chamada síncrona, possivelmente de
+                outra thread, com (palavra, número do lote) assim que cada
+                palavra-chave fica completa na resposta em stream da IA
             
         Returns:
             Dict com análise completa incluindo top 10 e categorização
@@ -88,15 +109,15 @@ class AIKeywordExtractor:
             print(f"🔄 Usando processamento em lotes para {len(vagas)} vagas...")
             
             # Importar e usar o extrator em lotes
-            from .batch_keyword_extractor import BatchKeywordExtractor
-            batch_extractor = BatchKeywordExtractor()
+            from .batch_keyword_extractor import obter_extrator_lotes
+            batch_extractor = obter_extrator_lotes()
             
-            # Processar em lotes
+            # Processar em lotes (empacotados pelo orçamento de tokens)
             resultado_batch = await batch_extractor.extract_keywords_batch(
                 vagas=vagas,
                 cargo=cargo_objetivo,
-                batch_size=10,
-                callback=callback_progresso
+                callback=callback_progresso,
+                ao_receber_palavra=ao_receber_palavra
             )
             
             # Converter formato do resultado
@@ -122,74 +143,85 @@ class AIKeywordExtractor:
             total_vagas
         )
         
-        if callback_progresso:
-            await callback_progresso("Analisando vagas com IA (isso pode levar 30-60 segundos)...")
-        
-        # Escolher modelo baseado em disponibilidade e tamanho
-        resultado = None
-        modelo_usado = None
+        # Consultar o cache persistente antes de chamar qualquer modelo
+        cache = obter_cache_llm()
+        resultado, modelo_usado = self._buscar_em_cache(cache, prompt)
+        origem_cache = "hit" if resultado is not None else "miss"
+        palavras_reconciliadas = False
         
-        try:
-            print(f"\n🔍 Verificando modelos disponíveis:")
-            print(f"   - Gemini configurado: {self.gemini_model is not None}")
-            print(f"   - Claude configurado: {self.anthropic_client is not None}")
-            print(f"   - GPT-4 configurado: {self.openai_client is not None}")
-            print(f"   - Tamanho do texto: {len(texto_agregado)} caracteres")
+        if resultado is not None:
+            print(f"💾 Resultado encontrado em cache ({modelo_usado})")
+            if callback_progresso:
+                await callback_progresso("Resultado recuperado do cache")
+            if ao_receber_palavra:
+                for palavra in resultado.get('top_10_palavras_chave', []):
+                    ao_receber_palavra(palavra, 1)
+        else:
+            if callback_progresso:
+                await callback_progresso("Analisando vagas com IA (isso pode levar 30-60 segundos)...")
+
+            try:
+                print(f"\n🔍 Verificando modelos disponíveis:")
+                print(f"   - Gemini configurado: {self.gemini_model is not None}")
+                print(f"   - Claude configurado: {self.anthropic_client is not None}")
+                print(f"   - GPT-4 configurado: {self.openai_client is not None}")
+                print(f"   - Tamanho do texto: {len(texto_agregado)} caracteres")
             
-            # Preferência: Gemini 2.5 Flash (2M tokens) > Claude (200k) > GPT-4 (128k)
-            if self.gemini_model:
-                try:
-                    if callback_progresso:
-                        await callback_progresso("Usando Google Gemini 2.5 Flash...")
-                    print(f"✅ Chamando Gemini 2.5 Flash...")
-                    resultado = self._chamar_gemini(prompt)
-                    modelo_usado = "gemini-2.5-flash"
-                except Exception as gemini_error:
-                    print(f"⚠️ Gemini falhou: {gemini_error}")
-                    print(f"🔄 Tentando com Claude como fallback...")
-                    
-                    # Fallback para Claude se Gemini falhar
-                    if self.anthropic_client and len(texto_agregado) < 180000:
-                        if callback_progresso:
-                            await callback_progresso("Usando Claude 3 Sonnet (fallback)...")
-                        resultado = self._chamar_claude(prompt)
-                        modelo_usado = "claude-3-sonnet"
-                    else:
-                        raise gemini_error
+                # Preferência: Gemini 2.5 Flash (2M tokens) > Claude (200k) > GPT-4 (128k);
+                # o roteador reordena pela saúde recente, faz failover imediato
+                # e dispara uma reserva se o principal passar do seu p95
+                emissor = EmissorPalavras(ao_receber_palavra)
+                provedores = []
+                if self.gemini_model:
+                    provedores.append(ProvedorLLM("gemini-2.5-flash", lambda: self._chamar_gemini(prompt, emissor.para("gemini-2.5-flash"))))
+                if self.anthropic_client and len(texto_agregado) < 180000:
+                    provedores.append(ProvedorLLM("claude-3-sonnet", lambda: self._chamar_claude(prompt, emissor.para("claude-3-sonnet"))))
+                if self.openai_client and len(texto_agregado) < 100000:
+                    provedores.append(ProvedorLLM("gpt-4-turbo", lambda: self._chamar_gpt4(prompt, emissor.para("gpt-4-turbo"))))
                 
-            elif self.anthropic_client and len(texto_agregado) < 180000:
-                if callback_progresso:
-                    await callback_progresso("Usando Claude 3 Sonnet...")
-                print(f"✅ Chamando Claude 3 Sonnet...")
-                resultado = self._chamar_claude(prompt)
-                modelo_usado = "claude-3-sonnet"
+                if not provedores:
+                    raise Exception("Texto muito grande ou nenhuma API configurada. Por favor, configure pelo menos uma API key (GOOGLE_API_KEY, ANTHROPIC_API_KEY ou OPENAI_API_KEY)")
                 
-            elif self.openai_client and len(texto_agregado) < 100000:
                 if callback_progresso:
-                    await callback_progresso("Usando GPT-4 Turbo...")
-                print(f"✅ Chamando GPT-4 Turbo...")
-                resultado = self._chamar_gpt4(prompt)
-                modelo_usado = "gpt-4-turbo"
+                    await callback_progresso(f"Consultando IA ({', '.join(p.nome for p in provedores)})...")
+                print(f"✅ Roteando entre: {[p.nome for p in provedores]}")
+                resultado, modelo_usado = await obter_roteador_llm().executar(provedores)
+                palavras_reconciliadas = emissor.divergiu(modelo_usado)
                 
-            else:
-                raise Exception("Texto muito grande ou nenhuma API configurada. Por favor, configure pelo menos uma API key (GOOGLE_API_KEY, ANTHROPIC_API_KEY ou OPENAI_API_KEY)")
-                
-        except Exception as e:
-            print(f"❌ Erro na análise IA: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            if callback_progresso:
-                await callback_progresso(f"Erro: {str(e)}")
+            except Exception as e:
+                print(f"❌ Erro na análise IA: {type(e).__name__}: {e}")
+                import traceback
+                traceback.print_exc()
+                if callback_progresso:
+                    await callback_progresso(f"Erro: {str(e)}")
+            
+                # NÃO usar fallback - é melhor falhar do que dar resultado ruim
+                erro_msg = f"Não foi possível analisar as vagas com IA. {str(e)}"
+                raise Exception(erro_msg)
             
-            # NÃO usar fallback - é melhor falhar do que dar resultado ruim
-            erro_msg = f"Não foi possível analisar as vagas com IA. {str(e)}"
-            raise Exception(erro_msg)
+            # Resposta truncada: as palavras recuperadas seguem, mas não ficam em cache
+            if resultado.get('resposta_truncada'):
+                print(f"⚠️ Resposta truncada de {modelo_usado}: {len(resultado['top_10_palavras_chave'])} palavras recuperadas")
+            else:
+                cache.salvar(
+                    cache.gerar_chave([prompt], VERSAO_PROMPT_EXTRACAO, modelo_usado),
+                    resultado,
+                    modelo_usado
+                )
         
         if callback_progresso:
             await callback_progresso("Processando resultados da IA...")
         
         # Processar e validar resultado
         resultado_final = self._processar_resultado_ia(resultado, modelo_usado)
+        # Palavras parciais de um provedor que perdeu: o cliente troca pela lista final
+        if palavras_reconciliadas:
+            resultado_final['palavras_reconciliadas'] = True
+        resultado_final['cache'] = {
+            "hits": 1 if origem_cache == "hit" else 0,
+            "misses": 1 if origem_cache == "miss" else 0,
+            "lotes": [{"lote": 1, "cache": origem_cache}]
+        }
         
         print(f"\n✅ Análise concluída com {modelo_usado}")
         print(f"🔝 Top 10 palavras: {len(resultado_final.get('top_10_palavras_chave', []))}")
@@ -197,6 +229,28 @@ class AIKeywordExtractor:
         
         return resultado_final
     
+    def _buscar_em_cache(self, cache, prompt: str):
+        """
+        Procura o prompt no cache para cada modelo configurado, na ordem de preferência
+        
+        Returns:
+            Tupla (resultado, modelo) ou (None, None) se não houver entrada válida
+        """
+        candidatos = [
+            ("gemini-2.5-flash", self.gemini_model),
+            ("claude-3-sonnet", self.anthropic_client),
+            ("gpt-4-turbo", self.openai_client)
+        ]
+        
+        for modelo, cliente in candidatos:
+            if not cliente:
+                continue
+            resultado = cache.obter(cache.gerar_chave([prompt], VERSAO_PROMPT_EXTRACAO, modelo))
+            if resultado is not None:
+                return resultado, modelo
+        
+        return None, None
+    
     def _preparar_texto_vagas(self, vagas: List[Dict[str, Any]]) -> str:
         """Prepara texto agregado das vagas com separadores claros"""
         textos = []
@@ -265,7 +319,7 @@ RETORNE APENAS O JSON, SEM TEXTO ADICIONAL OU MARKDOWN!"""
         
         return prompt
     
-    def _chamar_claude(self, prompt: str) -> Dict[str, Any]:
+    def _chamar_claude(self, prompt: str, ao_receber_palavra: Optional[callable] = None) -> Dict[str, Any]:
         """Chama API do Claude para análise"""
         try:
             response = self.anthropic_client.completion(
@@ -275,24 +329,14 @@ RETORNE APENAS O JSON, SEM TEXTO ADICIONAL OU MARKDOWN!"""
                 prompt=f"\n\nHuman: {prompt}\n\nAssistant:"
             )
             
-            # Extrair JSON da resposta
-            texto_resposta = response.completion
-            
-            # Tentar encontrar JSON na resposta
-            inicio = texto_resposta.find('{')
-            fim = texto_resposta.rfind('}') + 1
-            
-            if inicio >= 0 and fim > inicio:
-                json_str = texto_resposta[inicio:fim]
-                return json.loads(json_str)
-            else:
-                raise ValueError("JSON não encontrado na resposta")
+            # Extrair JSON da resposta (ou as palavras completas, se truncada)
+            return consumir_stream([response.completion], "top_10_palavras_chave", ao_receber_palavra).resultado()
                 
         except Exception as e:
             print(f"Erro ao chamar Claude: {e}")
             raise
     
-    def _chamar_gpt4(self, prompt: str) -> Dict[str, Any]:
+    def _chamar_gpt4(self, prompt: str, ao_receber_palavra: Optional[callable] = None) -> Dict[str, Any]:
         """Chama API do GPT-4 para análise"""
         try:
             response = self.openai_client.ChatCompletion.create(
@@ -303,18 +347,19 @@ RETORNE APENAS O JSON, SEM TEXTO ADICIONAL OU MARKDOWN!"""
                 ],
                 temperature=0.3,
                 max_tokens=4000,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                stream=True
             )
             
-            texto_resposta = response.choices[0].message.content
-            return json.loads(texto_resposta)
+            pedacos = (pedaco.choices[0].delta.get("content") or "" for pedaco in response)
+            return consumir_stream(pedacos, "top_10_palavras_chave", ao_receber_palavra).resultado()
             
         except Exception as e:
             print(f"Erro ao chamar GPT-4: {e}")
             raise
     
-    def _chamar_gemini(self, prompt: str) -> Dict[str, Any]:
-        """Chama API do Gemini 2.5 Flash para análise"""
+    def _chamar_gemini(self, prompt: str, ao_receber_palavra: Optional[callable] = None) -> Dict[str, Any]:
+        """Chama API do Gemini 2.5 Flash para análise (resposta em stream)"""
         try:
             # Configurações de segurança menos restritivas
             safety_settings = [
@@ -346,66 +391,38 @@ RETORNE APENAS O JSON, SEM TEXTO ADICIONAL OU MARKDOWN!"""
                     "top_k": 40,
                     "top_p": 0.95
                 },
-                safety_settings=safety_settings
+                safety_settings=safety_settings,
+                stream=True
             )
             
-            # Verificar se houve resposta válida
-            if not response.candidates:
-                raise ValueError("Sem candidatos na resposta do Gemini")
+            # Cada palavra do top 10 sai assim que fecha na resposta
+            parser = consumir_stream(
+                (texto_pedaco_gemini(pedaco) for pedaco in response),
+                "top_10_palavras_chave",
+                ao_receber_palavra
+            )
+            texto_resposta = parser.texto
             
-            if not response.candidates[0].content.parts:
-                print(f"DEBUG: Finish reason: {response.candidates[0].finish_reason}")
-                print(f"DEBUG: Safety ratings: {response.candidates[0].safety_ratings}")
+            # Verificar se houve resposta válida
+            if not texto_resposta:
+                if response.candidates:
+                    print(f"DEBUG: Finish reason: {response.candidates[0].finish_reason}")
+                    print(f"DEBUG: Safety ratings: {response.candidates[0].safety_ratings}")
                 raise ValueError("Resposta vazia do Gemini (sem parts)")
             
-            # Obter texto da resposta
-            texto_resposta = response.candidates[0].content.parts[0].text
-            
             # Debug: imprimir primeiros caracteres da resposta
             print(f"DEBUG: Resposta Gemini (primeiros 200 chars): {texto_resposta[:200]}")
             
             try:
-                # Tenta parse direto já que configuramos JSON output
-                return json.loads(texto_resposta)
-            except json.JSONDecodeError as e:
-                print(f"DEBUG: Erro de JSON na posição {e.pos}: {e.msg}")
-                print(f"DEBUG: Contexto do erro: ...{texto_resposta[max(0, e.pos-50):e.pos+50]}...")
-                
-                # Tenta limpar JSON comum problemas
-                # Remove possíveis caracteres extras no início/fim
-                texto_limpo = texto_resposta.strip()
-                
-                # Remove possíveis markdown code blocks
-                if texto_limpo.startswith("```json"):
-                    texto_limpo = texto_limpo[7:]
-                if texto_limpo.startswith("```"):
-                    texto_limpo = texto_limpo[3:]
-                if texto_limpo.endswith("```"):
-                    texto_limpo = texto_limpo[:-3]
-                
-                # Tenta novamente após limpeza
-                try:
-                    return json.loads(texto_limpo.strip())
-                except json.JSONDecodeError:
-                    # Fallback para extração manual se necessário
-                    inicio = texto_resposta.find('{')
-                    fim = texto_resposta.rfind('}') + 1
-                    
-                    if inicio >= 0 and fim > inicio:
-                        json_str = texto_resposta[inicio:fim]
-                        # Última tentativa com JSON extraído
-                        try:
-                            return json.loads(json_str)
-                        except json.JSONDecodeError as e2:
-                            print(f"DEBUG: Falha final no parse. Erro: {e2}")
-                            print(f"DEBUG: JSON extraído tem {len(json_str)} caracteres")
-                            # Salvar resposta para debug
-                            with open('gemini_response_debug.json', 'w', encoding='utf-8') as f:
-                                f.write(texto_resposta)
-                            print("DEBUG: Resposta completa salva em gemini_response_debug.json")
-                            raise ValueError(f"JSON inválido na resposta: {e2}")
-                    else:
-                        raise ValueError("JSON não encontrado na resposta")
+                # JSON completo (tolerando cercas de markdown) ou as palavras já recuperadas
+                return parser.resultado()
+            except ValueError as e:
+                print(f"DEBUG: Falha final no parse. Erro: {e}")
+                # Salvar resposta para debug
+                with open('gemini_response_debug.json', 'w', encoding='utf-8') as f:
+                    f.write(texto_resposta)
+                print("DEBUG: Resposta completa salva em gemini_response_debug.json")
+                raise ValueError(f"JSON inválido na resposta: {e}")
                 
         except Exception as e:
             print(f"Erro ao chamar Gemini: {e}")
@@ -451,7 +468,22 @@ RETORNE APENAS O JSON, SEM TEXTO ADICIONAL OU MARKDOWN!"""
             "top_10_palavras_chave": resultado_batch.get('top_10_palavras_chave', []),
             "categorias": resultado_batch.get('categorias', {}),
             "modelo_usado": resultado_batch.get('modelo_usado', 'batch-processor'),
-            "total_palavras_unicas": resultado_batch.get('total_palavras_unicas', 0)
+            "total_palavras_unicas": resultado_batch.get('total_palavras_unicas', 0),
+            "cache": resultado_batch.get('cache', {})
         }
         
-        return resultado_convertido
\ No newline at end of file
+        return resultado_convertido
+
+
+_extrator_global = None
+_extrator_lock = threading.Lock()
+
+
+def obter_extrator_ia() -> AIKeywordExtractor:
+    """Retorna a instância compartilhada do extrator (uma por processo)"""
+    global _extrator_global
+    if _extrator_global is None:
+        with _extrator_lock:
+            if _extrator_global is None:
+                _extrator_global = AIKeywordExtractor()
+    return _extrator_global
@@ -0,0 +1,135 @@
+"""
+Registro de provedores de IA - Sistema HELIO
+Os SDKs (openai, anthropic, google.generativeai) só são importados no
+primeiro uso, e cada provedor tem um único cliente por processo,
+compartilhado por todos os serviços. Importar um serviço ou instanciá-lo
+por requisição não paga mais o custo de carregar os SDKs.
+"""
+
+import os
+import importlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Variável de ambiente da chave de cada provedor
+CHAVES_PROVEDORES = {
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "gemini": "GOOGLE_API_KEY",
+}
+
+# Valores de exemplo do .env que não são chaves de verdade
+_CHAVES_EXEMPLO = {"your_openai_api_key_here", "your_anthropic_api_key_here", "your_google_api_key_here"}
+
+# (provedor ou provedor/modelo, chave, pid) -> cliente (None se a criação falhou)
+_clientes: Dict[Tuple[str, str, int], Optional[Any]] = {}
+_clientes_lock = threading.Lock()
+
+
+def chave_provedor(provedor: str) -> Optional[str]:
+    """Chave configurada do provedor, ou None (sem importar o SDK)"""
+    chave = os.getenv(CHAVES_PROVEDORES[provedor])
+    if not chave or chave in _CHAVES_EXEMPLO:
+        return None
+    return chave
+
+
+def provedor_configurado(provedor: str) -> bool:
+    """Se há chave para o provedor (não importa o SDK nem cria cliente)"""
+    return chave_provedor(provedor) is not None
+
+
+def _criar_cliente(provedor: str, chave: str, modelo: Optional[str]) -> Any:
+    if provedor == "anthropic":
+        return importlib.import_module("anthropic").Anthropic(api_key=chave)
+    if provedor == "openai":
+        # SDK 0.x: o próprio módulo é o cliente (openai.ChatCompletion)
+        openai = importlib.import_module("openai")
+        openai.api_key = chave
+        return openai
+    if provedor == "gemini":
+        genai = importlib.import_module("google.generativeai")
+        genai.configure(api_key=chave)
+        return genai.GenerativeModel(modelo) if modelo else genai
+    raise ValueError(f"Provedor de IA desconhecido: {provedor}")
+
+
+def obter_cliente(provedor: str, modelo: str = None) -> Optional[Any]:
+    """
+    Cliente compartilhado do provedor (criado no primeiro uso)
+
+    Args:
+        provedor: "openai", "anthropic" ou "gemini"
+        modelo: para o Gemini, o nome do GenerativeModel (um por modelo);
+            sem modelo retorna o módulo genai já configurado
+
+    Returns:
+        O cliente, ou None se o provedor não tem chave ou a criação falhou
+        (a falha é registrada uma vez e não é refeita a cada chamada)
+    """
+    chave = chave_provedor(provedor)
+    if chave is None:
+        return None
+
+    # A chave entra no índice para que uma troca de chave crie outro cliente;
+    # o pid, para que cada worker do gunicorn tenha os seus (conexões HTTP)
+    indice = (f"{provedor}/{modelo}" if modelo else provedor, chave, os.getpid())
+    try:
+        return _clientes[indice]
+    except KeyError:
+        pass
+
+    with _clientes_lock:
+        if indice not in _clientes:
+            try:
+                _clientes[indice] = _criar_cliente(provedor, chave, modelo)
+                print(f"✅ Cliente {indice[0]} inicializado")
+            except Exception as e:
+                print(f"❌ Erro ao inicializar {indice[0]}: {e}")
+                _clientes[indice] = None
+        return _clientes[indice]
+
+
+def texto_pedaco_gemini(pedaco) -> str:
+    """Texto de um pedaço do stream do Gemini ("" nos pedaços sem parts, como o de encerramento)"""
+    try:
+        return pedaco.text
+    except (ValueError, IndexError):
+        return ""
+
+
+def descartar_clientes():
+    """Esquece os clientes criados (ex.: testes ou rotação de chaves)"""
+    with _clientes_lock:
+        _clientes.clear()
+
+
+class ClienteIA:
+    """
+    Atributo de classe que resolve o cliente pelo registro no acesso
+
+        class Servico:
+            anthropic_client = ClienteIA("anthropic")
+            gemini_model = ClienteIA("gemini", "gemini-2.5-flash")
+
+    Ler `servico.anthropic_client` devolve o cliente compartilhado (ou
+    None sem chave). Atribuir um valor na instância o substitui só nela,
+    como antes era feito no __init__ (ex.: None para desativar a IA).
+    """
+
+    def __init__(self, provedor: str, modelo: str = None):
+        self.provedor = provedor
+        self.modelo = modelo
+
+    def __set_name__(self, dono, nome):
+        self.nome = nome
+
+    def __get__(self, instancia, dono=None):
+        if instancia is None:
+            return self
+        if self.nome in instancia.__dict__:
+            return instancia.__dict__[self.nome]
+        return obter_cliente(self.provedor, self.modelo)
+
+    def __set__(self, instancia, valor):
+        instancia.__dict__[self.nome] = valor
@@ -3,11 +3,9 @@ Validador de IA - Sistema HELIO
 Validação real de palavras-chave usando OpenAI e Anthropic
 """
 
-import os
 import json
 from typing import Dict, List, Any, Optional
-import openai
-from anthropic import Anthropic
+from .ai_providers import ClienteIA
 
 class AIValidator:
     """
@@ -15,19 +13,9 @@ class AIValidator:
     Substitui as simulações do sistema original
     """
     
-    def __init__(self):
-        self.openai_client = None
-        self.anthropic_client = None
-        
-        # Inicializa clientes se APIs estão configuradas
-        openai_key = os.getenv('OPENAI_API_KEY')
-        if openai_key and openai_key != 'your_openai_api_key_here':
-            openai.api_key = openai_key
-            self.openai_client = openai
-            
-        anthropic_key = os.getenv('ANTHROPIC_API_KEY')
-        if anthropic_key and anthropic_key != 'your_anthropic_api_key_here':
-            self.anthropic_client = Anthropic(api_key=anthropic_key)
+    # Clientes das APIs configuradas (compartilhados, criados no primeiro uso)
+    openai_client = ClienteIA("openai")
+    anthropic_client = ClienteIA("anthropic")
     
     async def validar_palavras_chave(
         self, 
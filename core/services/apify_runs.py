@@ -0,0 +1,182 @@
+"""
+Acompanhamento de runs do Apify - Sistema HELIO
+Espera a conclusão de um run com long-poll (`waitForFinish`): o servidor
+segura a requisição e responde assim que o run termina, em vez de o
+cliente acordar a cada N segundos. Em erro de rede/API, recua com
+backoff exponencial.
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+
+from .http_client import obter_sessao_long_poll
+
+APIFY_BASE_URL = "https://api.apify.com/v2"
+
+# Status em que o run não muda mais
+STATUS_FINAIS = frozenset(['SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT'])
+
+# Limite do Apify para waitForFinish
+MAX_ESPERA_LONG_POLL = 60
+
+
+class EsperaAdaptativa:
+    """
+    Intervalo de espera com crescimento exponencial
+
+    Começa curto (novidades chegando) e dobra a cada ciclo ocioso até o
+    máximo; reiniciar() volta ao mínimo quando algo novo aparece.
+
+    Configuração por variáveis de ambiente:
+        APIFY_ESPERA_MIN_SEGUNDOS / APIFY_ESPERA_MAX_SEGUNDOS (padrão 1s / 8s)
+    """
+
+    def __init__(self, minimo: float = None, maximo: float = None, fator: float = 2.0):
+        self.minimo = minimo or float(os.getenv('APIFY_ESPERA_MIN_SEGUNDOS', '1'))
+        self.maximo = maximo or float(os.getenv('APIFY_ESPERA_MAX_SEGUNDOS', '8'))
+        self.fator = fator
+        self.atual = self.minimo
+
+    def proxima(self) -> float:
+        """Retorna a espera deste ciclo e aumenta a do próximo"""
+        espera = self.atual
+        self.atual = min(self.atual * self.fator, self.maximo)
+        return espera
+
+    def reiniciar(self):
+        self.atual = self.minimo
+
+
+def consultar_run(
+    run_id: str,
+    token: str,
+    espera_segundos: float = 0,
+    base_url: str = APIFY_BASE_URL
+) -> Optional[Dict[str, Any]]:
+    """
+    Consulta um run; com espera_segundos > 0 usa long-poll
+
+    O Apify só responde quando o run termina ou quando a espera acaba,
+    o que vier primeiro. Retorna o objeto `data` do run ou None em erro.
+    """
+    espera = int(min(max(espera_segundos, 0), MAX_ESPERA_LONG_POLL))
+    params = {"waitForFinish": espera} if espera else None
+
+    try:
+        response = obter_sessao_long_poll().get(
+            f"{base_url}/actor-runs/{run_id}",
+            headers={"Authorization": f"Bearer {token}"},
+            params=params,
+            timeout=(5, espera + 15)
+        )
+        if response.status_code == 200:
+            return response.json()["data"]
+        print(f"⚠️ Status do run {run_id}: HTTP {response.status_code}")
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"⚠️ Erro ao consultar run {run_id}: {e}")
+    return None
+
+
+def aguardar_run(
+    run_id: str,
+    token: str,
+    timeout_segundos: float = 300,
+    base_url: str = APIFY_BASE_URL
+) -> Optional[Dict[str, Any]]:
+    """
+    Bloqueia até o run terminar (ou o timeout) e retorna o objeto do run
+
+    Cada long-poll dura até 60s e retorna no instante da conclusão; um
+    run de 8s responde em ~8s com uma única requisição. Se a API falhar,
+    espera com backoff exponencial antes de tentar de novo.
+    """
+    limite = time.monotonic() + timeout_segundos
+    backoff = EsperaAdaptativa(minimo=1, maximo=16)
+    run = None
+
+    while True:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            print(f"⏰ Timeout aguardando run {run_id}")
+            return run
+
+        atual = consultar_run(run_id, token, espera_segundos=max(1, min(restante, MAX_ESPERA_LONG_POLL)), base_url=base_url)
+        if atual is None:
+            time.sleep(min(backoff.proxima(), max(restante, 0)))
+            continue
+
+        run = atual
+        backoff.reiniciar()
+        if run.get("status") in STATUS_FINAIS:
+            return run
+
+
+class CursorDataset:
+    """
+    Leitura incremental de um dataset do Apify
+
+    Guarda o offset dos itens brutos já lidos: cada chamada a ler_novos()
+    busca só o que foi escrito depois da anterior, com `clean=true` e
+    projeção `fields` (apenas os campos usados pelo processamento). Cada
+    item é entregue exatamente uma vez, mesmo que o processamento
+    posterior descarte alguns.
+    """
+
+    def __init__(
+        self,
+        dataset_id: str,
+        token: str,
+        campos: Optional[Sequence[str]] = None,
+        tamanho_pagina: int = 100,
+        base_url: str = APIFY_BASE_URL
+    ):
+        self.dataset_id = dataset_id
+        self.token = token
+        self.campos = ",".join(campos) if campos else None
+        self.tamanho_pagina = tamanho_pagina
+        self.base_url = base_url
+        self.offset = 0
+        self.requisicoes = 0
+
+    def ler_novos(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Itens escritos desde a última leitura (até `limite`)"""
+        novos: List[Dict[str, Any]] = []
+
+        while limite is None or len(novos) < limite:
+            pagina = self.tamanho_pagina if limite is None else min(self.tamanho_pagina, limite - len(novos))
+            params = {"format": "json", "clean": "true", "offset": self.offset, "limit": pagina}
+            if self.campos:
+                params["fields"] = self.campos
+
+            try:
+                response = obter_sessao_long_poll().get(
+                    f"{self.base_url}/datasets/{self.dataset_id}/items",
+                    headers={"Authorization": f"Bearer {self.token}"},
+                    params=params
+                )
+                self.requisicoes += 1
+                if response.status_code != 200:
+                    print(f"⚠️ Dataset {self.dataset_id}: HTTP {response.status_code}")
+                    break
+                itens = response.json()
+            except (requests.RequestException, ValueError) as e:
+                print(f"⚠️ Erro ao ler dataset {self.dataset_id}: {e}")
+                break
+
+            # Com clean=true itens vazios são omitidos da resposta, mas contam no
+            # offset: o avanço real sai do total de itens brutos do dataset
+            total = response.headers.get("X-Apify-Pagination-Total")
+            lidos = min(pagina, int(total) - self.offset) if total is not None else len(itens)
+            lidos = max(lidos, len(itens))
+            self.offset += lidos
+            novos.extend(item for item in itens if item and isinstance(item, dict))
+
+            # Página incompleta: alcançamos o fim do que já foi escrito
+            if lidos < pagina:
+                break
+
+        return novos
+
@@ -2,25 +2,38 @@
 Extrator de palavras-chave com processamento em lotes
 """
 import os
-import json
 import asyncio
-import google.generativeai as genai
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from collections import Counter
 from datetime import datetime
 from dotenv import load_dotenv
 
+from .rate_limiter import TokenBucket
+from .llm_cache import obter_cache_llm
+from .ai_providers import obter_cliente, provedor_configurado, texto_pedaco_gemini
+from .lot_packer import compactar_descricao, empacotar, estimar_tokens
+from .json_stream_parser import consumir_stream
+from .native_threads import executar_em_thread
+
 load_dotenv()
 
+# Incrementar sempre que o prompt de lote mudar, para invalidar o cache
+VERSAO_PROMPT_LOTE = "lote-v2"
+
 class BatchKeywordExtractor:
-    def __init__(self):
-        # Configurar Gemini
-        if os.getenv('GOOGLE_API_KEY'):
-            genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            print("✅ Gemini configurado para processamento em lotes")
-        else:
+    def __init__(
+        self,
+        max_concorrencia: int = None,
+        requisicoes_por_minuto: int = None,
+        tokens_por_lote: int = None,
+        tokens_por_vaga: int = None,
+        max_vagas_por_lote: int = None
+    ):
+        # Gemini: o cliente só é criado no primeiro lote (ver `model`)
+        if not provedor_configurado("gemini"):
             raise ValueError("GOOGLE_API_KEY não configurada")
+        self.modelo_nome = 'gemini-2.0-flash-exp'
         
         # Configuração de segurança
         self.safety_settings = [
@@ -29,13 +42,34 @@ class BatchKeywordExtractor:
             {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
             {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"}
         ]
+        
+        # Janela de lotes simultâneos e limite de requisições por minuto ao Gemini
+        self.max_concorrencia = max_concorrencia or int(os.getenv('BATCH_MAX_CONCORRENCIA', '4'))
+        self.requisicoes_por_minuto = requisicoes_por_minuto or int(os.getenv('BATCH_REQUISICOES_POR_MINUTO', '60'))
+        self.limitador = TokenBucket(self.requisicoes_por_minuto)
+        
+        # Empacotamento: cada prompt é preenchido até `tokens_por_lote`; cada
+        # descrição é compactada a `tokens_por_vaga` preservando os requisitos
+        self.tokens_por_lote = tokens_por_lote or int(os.getenv('BATCH_TOKENS_POR_LOTE', '12000'))
+        self.tokens_por_vaga = tokens_por_vaga or int(os.getenv('BATCH_TOKENS_POR_VAGA', '600'))
+        self.max_vagas_por_lote = max_vagas_por_lote or int(os.getenv('BATCH_MAX_VAGAS_POR_LOTE', '30'))
+        
+        # Cache persistente de respostas (compartilhado no processo)
+        self.cache = obter_cache_llm()
+    
+    @property
+    def model(self):
+        """GenerativeModel compartilhado no processo (registro de provedores)"""
+        return obter_cliente("gemini", self.modelo_nome)
     
     async def extract_keywords_batch(
         self, 
         vagas: List[Dict[str, Any]], 
         cargo: str,
-        batch_size: int = 10,
-        callback: callable = None
+        batch_size: int = None,
+        callback: callable = None,
+        concorrente: bool = True,
+        ao_receber_palavra: callable = None
     ) -> Dict[str, Any]:
         """
         Extrai palavras-chave processando vagas em lotes
@@ -43,57 +77,59 @@ class BatchKeywordExtractor:
         Args:
             vagas: Lista completa de vagas
             cargo: Cargo objetivo
-            batch_size: Tamanho de cada lote (padrão 10)
+            batch_size: Máximo de vagas por lote (padrão `max_vagas_por_lote`); o
+                lote fecha antes se atingir o orçamento de tokens
             callback: Função para reportar progresso
+            concorrente: Se True, dispara até `max_concorrencia` lotes em paralelo
+                respeitando `requisicoes_por_minuto`; se False, processa um lote por vez
+            ao_receber_palavra: opcional; chamada síncrona (de uma thread do
+                SDK) com (palavra, número do lote) assim que cada palavra fica
+                completa na resposta em stream, ou na hora para lotes em cache
         """
         total_vagas = len(vagas)
         
         print(f"\n🚀 PROCESSAMENTO EM LOTES")
         print(f"📊 Total de vagas: {total_vagas}")
-        print(f"📦 Tamanho do lote: {batch_size}")
-        print(f"🔢 Total de lotes: {(total_vagas + batch_size - 1) // batch_size}")
         
-        # Dividir em lotes
-        lotes = []
-        for i in range(0, total_vagas, batch_size):
-            lote = vagas[i:i + batch_size]
-            lotes.append(lote)
+        # Dividir em lotes pelo orçamento de tokens
+        lotes, tokens_lotes = self._montar_lotes(vagas, cargo, batch_size or self.max_vagas_por_lote)
+        ocupacao_media = sum(tokens_lotes) / (len(lotes) * self.tokens_por_lote) if lotes else 0.0
+        
+        print(f"📦 Orçamento por lote: {self.tokens_por_lote} tokens (até {batch_size or self.max_vagas_por_lote} vagas)")
+        print(f"🔢 Total de lotes: {len(lotes)} (ocupação média {ocupacao_media:.0%})")
+        print(f"⚡ Modo: {'concorrente (até ' + str(self.max_concorrencia) + ' lotes simultâneos)' if concorrente else 'sequencial'}")
         
         # Processar cada lote
         todos_resultados = []
         palavras_consolidadas = Counter()
         categorias_consolidadas = {}  # Para rastrear categorias
+        cache_lotes = []  # Origem de cada lote: hit, miss ou erro
         
-        for idx, lote in enumerate(lotes, 1):
-            if callback:
-                await callback(f"Processando lote {idx} de {len(lotes)}...")
+        if concorrente:
+            resultados_lotes = self._processar_lotes_concorrentes(lotes, cargo, callback, ao_receber_palavra)
+        else:
+            resultados_lotes = self._processar_lotes_sequenciais(lotes, cargo, callback, ao_receber_palavra)
+        
+        # Consolidar palavras e categorias à medida que os lotes terminam
+        async for idx, resultado_lote in resultados_lotes:
+            if not resultado_lote:
+                cache_lotes.append({"lote": idx, "cache": "erro"})
+                continue
             
-            print(f"\n📦 Processando lote {idx}/{len(lotes)} ({len(lote)} vagas)")
+            info_lote = {"lote": idx, "cache": resultado_lote.get('origem_cache', 'miss')}
+            if resultado_lote.get('resposta_truncada'):
+                info_lote["truncado"] = True
+            cache_lotes.append(info_lote)
+            todos_resultados.append(resultado_lote)
             
-            try:
-                # Processar lote
-                resultado_lote = await self._processar_lote(lote, cargo, idx)
-                
-                if resultado_lote:
-                    todos_resultados.append(resultado_lote)
-                    
-                    # Consolidar palavras e categorias
-                    for palavra in resultado_lote.get('palavras', []):
-                        termo = palavra['termo']
-                        freq = palavra.get('frequencia', 1)
-                        palavras_consolidadas[termo] += freq
-                        
-                        # Guardar categoria se fornecida
-                        if 'categoria' in palavra:
-                            categorias_consolidadas[termo] = palavra['categoria']
+            for palavra in resultado_lote.get('palavras', []):
+                termo = palavra['termo']
+                freq = palavra.get('frequencia', 1)
+                palavras_consolidadas[termo] += freq
                 
-                # Delay entre lotes para evitar rate limit
-                if idx < len(lotes):
-                    await asyncio.sleep(1)
-                    
-            except Exception as e:
-                print(f"❌ Erro no lote {idx}: {e}")
-                continue
+                # Guardar categoria se fornecida
+                if 'categoria' in palavra:
+                    categorias_consolidadas[termo] = palavra['categoria']
         
         # Consolidar resultados finais
         resultado_final = self._consolidar_resultados(
@@ -103,7 +139,21 @@ class BatchKeywordExtractor:
             total_vagas
         )
         
+        cache_lotes.sort(key=lambda x: x['lote'])
+        resultado_final["cache"] = {
+            "hits": sum(1 for l in cache_lotes if l['cache'] == 'hit'),
+            "misses": sum(1 for l in cache_lotes if l['cache'] == 'miss'),
+            "lotes": cache_lotes
+        }
+        resultado_final["empacotamento"] = {
+            "total_lotes": len(lotes),
+            "orcamento_tokens": self.tokens_por_lote,
+            "tokens_estimados": tokens_lotes,
+            "ocupacao_media": round(ocupacao_media, 3)
+        }
+        
         print(f"\n✅ Processamento concluído!")
+        print(f"💾 Cache: {resultado_final['cache']['hits']} hits / {resultado_final['cache']['misses']} misses")
         print(f"📊 Total de palavras únicas: {len(palavras_consolidadas)}")
         print(f"🏆 Top 10 palavras mais frequentes:")
         
@@ -112,15 +162,128 @@ class BatchKeywordExtractor:
         
         return resultado_final
     
-    async def _processar_lote(self, lote: List[Dict], cargo: str, numero_lote: int) -> Dict:
-        """Processa um lote de vagas"""
+    async def _processar_lotes_sequenciais(
+        self,
+        lotes: List[List[Dict]],
+        cargo: str,
+        callback: callable = None,
+        ao_receber_palavra: callable = None
+    ) -> AsyncIterator[Tuple[int, Optional[Dict]]]:
+        """Processa um lote por vez, com pausa entre lotes para evitar rate limit"""
+        for idx, lote in enumerate(lotes, 1):
+            if callback:
+                await callback(f"Processando lote {idx} de {len(lotes)}...")
+            
+            print(f"\n📦 Processando lote {idx}/{len(lotes)} ({len(lote)} vagas)")
+            
+            try:
+                resultado_lote = await self._processar_lote(lote, cargo, idx, ao_receber_palavra)
+                yield idx, resultado_lote
+            except Exception as e:
+                print(f"❌ Erro no lote {idx}: {e}")
+                continue
+            
+            # Delay entre lotes para evitar rate limit (desnecessário quando veio do cache)
+            if idx < len(lotes) and not (resultado_lote and resultado_lote.get('origem_cache') == 'hit'):
+                await asyncio.sleep(1)
+    
+    async def _processar_lotes_concorrentes(
+        self,
+        lotes: List[List[Dict]],
+        cargo: str,
+        callback: callable = None,
+        ao_receber_palavra: callable = None
+    ) -> AsyncIterator[Tuple[int, Optional[Dict]]]:
+        """
+        Dispara os lotes em paralelo com no máximo `max_concorrencia` em voo
+        e entrega cada resultado assim que o lote termina (ordem de conclusão)
+        """
+        semaforo = asyncio.Semaphore(self.max_concorrencia)
+        
+        async def processar(idx: int, lote: List[Dict]) -> Tuple[int, Optional[Dict]]:
+            async with semaforo:
+                print(f"\n📦 Processando lote {idx}/{len(lotes)} ({len(lote)} vagas)")
+                try:
+                    return idx, await self._processar_lote(lote, cargo, idx, ao_receber_palavra)
+                except Exception as e:
+                    print(f"❌ Erro no lote {idx}: {e}")
+                    return idx, None
+        
+        if callback:
+            await callback(f"Processando {len(lotes)} lotes em paralelo...")
+        
+        tarefas = [asyncio.create_task(processar(idx, lote)) for idx, lote in enumerate(lotes, 1)]
+        concluidos = 0
+        
+        try:
+            for proxima in asyncio.as_completed(tarefas):
+                idx, resultado_lote = await proxima
+                concluidos += 1
+                
+                if callback:
+                    await callback(f"Lote {idx} concluído ({concluidos} de {len(lotes)})")
+                
+                yield idx, resultado_lote
+        finally:
+            # Se o consumidor abandonar a iteração, não deixar lotes órfãos
+            for tarefa in tarefas:
+                tarefa.cancel()
+    
+    async def _processar_lote(
+        self,
+        lote: List[Dict],
+        cargo: str,
+        numero_lote: int,
+        ao_receber_palavra: callable = None
+    ) -> Dict:
+        """Processa um lote de vagas (consultando o cache antes de chamar o Gemini)"""
         
         # Preparar texto do lote
         texto_lote = self._preparar_texto_lote(lote)
         
-        # Criar prompt completo estilo Carolina Martins
-        prompt = f"""Você é especialista em análise de vagas seguindo a metodologia Carolina Martins.
-Analise estas {len(lote)} vagas de {cargo} e extraia palavras-chave estratégicas.
+        chave_cache = self.cache.gerar_chave([cargo, texto_lote], VERSAO_PROMPT_LOTE, self.modelo_nome)
+        em_cache = self.cache.obter(chave_cache)
+        if em_cache is not None:
+            print(f"   💾 Lote {numero_lote}: {len(em_cache.get('palavras', []))} palavras (cache)")
+            if ao_receber_palavra:
+                for palavra in em_cache.get('palavras', []):
+                    ao_receber_palavra(palavra, numero_lote)
+            return {**em_cache, "origem_cache": "hit"}
+        
+        prompt = self._montar_prompt(cargo, len(lote), texto_lote)
+        
+        try:
+            await self.limitador.adquirir_async()
+            
+            emitir = None
+            if ao_receber_palavra:
+                def emitir(palavra):
+                    if 'termo' in palavra:
+                        ao_receber_palavra(palavra, numero_lote)
+            
+            # SDK do Gemini é bloqueante (gRPC nativo): executar numa thread do
+            # sistema, também sob gevent, para os lotes não rodarem em fila
+            parser = await executar_em_thread(self._gerar_conteudo, prompt, emitir)
+            
+            # Resposta truncada ou inválida: ficar com as palavras já completas
+            resultado = parser.resultado()
+            if resultado.get('resposta_truncada'):
+                print(f"   ⚠️ Lote {numero_lote}: resposta truncada, {len(resultado['palavras'])} palavras recuperadas")
+                return {**resultado, "origem_cache": "miss"}
+            
+            print(f"   ✅ Lote {numero_lote}: {len(resultado.get('palavras', []))} palavras extraídas")
+            
+            self.cache.salvar(chave_cache, resultado, self.modelo_nome)
+            return {**resultado, "origem_cache": "miss"}
+            
+        except Exception as e:
+            print(f"   ❌ Erro ao processar lote {numero_lote}: {e}")
+            return None
+    
+    def _montar_prompt(self, cargo: str, total_vagas: int, texto_lote: str) -> str:
+        """Prompt completo estilo Carolina Martins para um lote"""
+        return f"""Você é especialista em análise de vagas seguindo a metodologia Carolina Martins.
+Analise estas {total_vagas} vagas de {cargo} e extraia palavras-chave estratégicas.
 
 INSTRUÇÕES IMPORTANTES:
 1. Identifique competências técnicas, ferramentas, frameworks, metodologias e soft skills
@@ -144,53 +307,59 @@ RETORNE APENAS JSON com as palavras-chave mais relevantes:
     {{"termo": "Git", "frequencia": 2, "categoria": "ferramenta"}}
   ]
 }}"""
+    
+    def _montar_lotes(self, vagas: List[Dict], cargo: str, max_vagas: int) -> Tuple[List[List[Dict]], List[int]]:
+        """
+        Distribui as vagas em lotes que enchem o prompt até `tokens_por_lote`
         
-        try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.1,
-                    "max_output_tokens": 1000,
-                    "candidate_count": 1
-                },
-                safety_settings=self.safety_settings
-            )
-            
-            # Extrair JSON
-            texto = response.text
-            texto = texto.replace('```json', '').replace('```', '').strip()
-            
-            resultado = json.loads(texto)
-            print(f"   ✅ Lote {numero_lote}: {len(resultado.get('palavras', []))} palavras extraídas")
-            
-            return resultado
-            
-        except Exception as e:
-            print(f"   ❌ Erro ao processar lote {numero_lote}: {e}")
-            return None
+        Returns:
+            (lotes de vagas, tokens estimados do prompt de cada lote)
+        """
+        tokens_prompt = estimar_tokens(self._montar_prompt(cargo, len(vagas), ""))
+        tokens_vagas = [estimar_tokens(self._formatar_vaga(i, vaga)) for i, vaga in enumerate(vagas, 1)]
+        
+        grupos = empacotar(tokens_vagas, self.tokens_por_lote - tokens_prompt, max_vagas)
+        lotes = [[vagas[i] for i in grupo] for grupo in grupos]
+        tokens_lotes = [tokens_prompt + sum(tokens_vagas[i] for i in grupo) for grupo in grupos]
+        return lotes, tokens_lotes
     
-    def _preparar_texto_lote(self, lote: List[Dict]) -> str:
-        """Prepara texto estruturado do lote"""
-        textos = []
+    def _gerar_conteudo(self, prompt: str, ao_receber_palavra: callable = None):
+        """
+        Chamada síncrona ao Gemini em stream (executada em thread separada)
         
-        for i, vaga in enumerate(lote, 1):
-            titulo = vaga.get('titulo', 'Sem título')
-            empresa = vaga.get('empresa', 'Empresa não informada')
-            desc = vaga.get('descricao', '')
-            
-            # Limitar descrição mas manter mais conteúdo
-            if len(desc) > 400:
-                desc = desc[:400] + "..."
-            
-            texto_vaga = f"""
---- VAGA {i} ---
+        Returns:
+            ParserArrayJSON com a resposta completa e as palavras já lidas
+        """
+        response = self.model.generate_content(
+            prompt,
+            generation_config={
+                "temperature": 0.1,
+                "max_output_tokens": 2048,
+                "candidate_count": 1
+            },
+            safety_settings=self.safety_settings,
+            stream=True
+        )
+        return consumir_stream((texto_pedaco_gemini(pedaco) for pedaco in response), "palavras", ao_receber_palavra)
+    
+    def _formatar_vaga(self, numero: int, vaga: Dict) -> str:
+        """Bloco de uma vaga no prompt, com a descrição compactada"""
+        titulo = vaga.get('titulo', 'Sem título')
+        empresa = vaga.get('empresa', 'Empresa não informada')
+        
+        # Descrições longas perdem primeiro benefícios e institucional, nunca os requisitos
+        desc = compactar_descricao(vaga.get('descricao', ''), self.tokens_por_vaga)
+        
+        return f"""
+--- VAGA {numero} ---
 Título: {titulo}
 Empresa: {empresa}
 Descrição: {desc}
 """
-            textos.append(texto_vaga)
-        
-        return "\n".join(textos)
+    
+    def _preparar_texto_lote(self, lote: List[Dict]) -> str:
+        """Prepara texto estruturado do lote"""
+        return "\n".join(self._formatar_vaga(i, vaga) for i, vaga in enumerate(lote, 1))
     
     def _consolidar_resultados(
         self, 
@@ -266,4 +435,23 @@ Descrição: {desc}
         if any(met in termo_lower for met in metodologias):
             return "metodologias"
         
-        return "outros"
\ No newline at end of file
+        return "outros"
+
+
+_extrator_global = None
+_extrator_lock = threading.Lock()
+
+
+def obter_extrator_lotes() -> BatchKeywordExtractor:
+    """
+    Extrator em lotes compartilhado (um por processo)
+
+    Além de evitar recriar o extrator a cada requisição, faz o limite de
+    requisições por minuto ao Gemini valer para o processo inteiro.
+    """
+    global _extrator_global
+    if _extrator_global is None:
+        with _extrator_lock:
+            if _extrator_global is None:
+                _extrator_global = BatchKeywordExtractor()
+    return _extrator_global
@@ -0,0 +1,135 @@
+"""
+Análise de currículos em lote - Sistema HELIO
+Analisa N currículos (turma de mentorados) com DiagnosticoCarolinaMartins
+distribuindo extração de texto e analisadores de regex entre processos,
+e agrega os resultados por arquivo com estatísticas de tempo.
+"""
+
+import os
+import time
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.services.agente_0_diagnostico import DiagnosticoCarolinaMartins
+from core.services.parallel_extraction import descartar_pool, nucleos_disponiveis, obter_pool, processos_do_pool
+
+# Pool próprio: não disputa nem herda o tamanho do pool da extração do MPC
+USO_POOL = "curriculos"
+
+# Diagnóstico de cada processo (sem banco: a análise de currículo não o usa)
+_diagnostico_processo: Optional[DiagnosticoCarolinaMartins] = None
+
+
+def analisar_curriculo_processo(nome_arquivo: str, conteudo: bytes) -> Dict[str, Any]:
+    """
+    Analisa um currículo e mede extração e análise separadamente
+
+    Executada nos processos do pool (ou no próprio processo, no modo local).
+    """
+    global _diagnostico_processo
+    if _diagnostico_processo is None:
+        _diagnostico_processo = DiagnosticoCarolinaMartins(None)
+    diagnostico = _diagnostico_processo
+
+    inicio = time.perf_counter()
+    texto = diagnostico.document_processor.extrair_texto_documento(nome_arquivo, conteudo)
+    fim_extracao = time.perf_counter()
+    analise = diagnostico.analisar_texto_curriculo(texto, nome_arquivo)
+    fim = time.perf_counter()
+
+    return {
+        "arquivo": nome_arquivo,
+        "sucesso": "erro" not in analise,
+        "analise": analise,
+        "tempos": {
+            "extracao": round(fim_extracao - inicio, 4),
+            "analise": round(fim - fim_extracao, 4),
+            "total": round(fim - inicio, 4)
+        }
+    }
+
+
+class AnalisadorCurriculosLote:
+    """
+    Análise de um lote de currículos em paralelo
+
+    Cada currículo vai inteiro para um processo do pool de currículos
+    (extração + analisadores), então arquivos diferentes são analisados
+    ao mesmo tempo. No máximo 2 arquivos por processo ficam em trânsito,
+    para não serializar o lote inteiro de uma vez. Lotes pequenos rodam
+    no próprio processo.
+
+    Configuração por variáveis de ambiente:
+        CURRICULOS_LOTE_MAX_PROCESSOS: processos do pool (padrão: núcleos disponíveis)
+        CURRICULOS_LOTE_MINIMO_PARALELO: abaixo disso analisa no próprio processo (padrão 4)
+    """
+
+    def __init__(self, max_processos: int = None, minimo_paralelo: int = None):
+        self.max_processos = max_processos or int(os.getenv('CURRICULOS_LOTE_MAX_PROCESSOS', '0')) or nucleos_disponiveis()
+        self.minimo_paralelo = minimo_paralelo if minimo_paralelo is not None else int(os.getenv('CURRICULOS_LOTE_MINIMO_PARALELO', '4'))
+
+    async def analisar_lote(self, arquivos: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+        """
+        Analisa os arquivos (nome, bytes)
+
+        Returns:
+            {"resultados": [...na ordem de entrada], "estatisticas": {...}}
+        """
+        inicio = time.perf_counter()
+        modo = "local"
+        processos = 1
+
+        if self.max_processos > 1 and len(arquivos) >= self.minimo_paralelo:
+            try:
+                resultados = await self._analisar_em_processos(arquivos)
+                modo = "paralelo"
+                processos = processos_do_pool(USO_POOL)
+            except Exception as e:
+                print(f"⚠️ Pool de análise indisponível ({e}); analisando no próprio processo")
+                if isinstance(e, (BrokenProcessPool, OSError)):
+                    descartar_pool(USO_POOL)
+                resultados = None
+        else:
+            resultados = None
+
+        if resultados is None:
+            resultados = [analisar_curriculo_processo(nome, conteudo) for nome, conteudo in arquivos]
+
+        return {
+            "resultados": resultados,
+            "estatisticas": self._estatisticas(resultados, time.perf_counter() - inicio, modo, processos)
+        }
+
+    async def _analisar_em_processos(self, arquivos: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        pool = obter_pool(self.max_processos, USO_POOL)
+        em_transito = asyncio.Semaphore(processos_do_pool(USO_POOL) * 2)
+
+        async def analisar(nome: str, conteudo: bytes) -> Dict[str, Any]:
+            async with em_transito:
+                return await asyncio.wrap_future(pool.submit(analisar_curriculo_processo, nome, conteudo))
+
+        return await asyncio.gather(*(analisar(nome, conteudo) for nome, conteudo in arquivos))
+
+    def _estatisticas(self, resultados: List[Dict[str, Any]], tempo_total: float, modo: str, processos: int) -> Dict[str, Any]:
+        tempos = sorted(r["tempos"]["total"] for r in resultados)
+        soma = sum(tempos)
+        sucesso = sum(1 for r in resultados if r["sucesso"])
+
+        return {
+            "arquivos": len(resultados),
+            "sucesso": sucesso,
+            "erros": len(resultados) - sucesso,
+            "modo": modo,
+            # Processos reais do pool (o tamanho é fixado quando ele é criado)
+            "processos": processos,
+            "tempo_total_segundos": round(tempo_total, 3),
+            "tempo_extracao_segundos": round(sum(r["tempos"]["extracao"] for r in resultados), 3),
+            "tempo_analise_segundos": round(sum(r["tempos"]["analise"] for r in resultados), 3),
+            "tempo_medio_segundos": round(soma / len(tempos), 4) if tempos else 0.0,
+            "tempo_p95_segundos": tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))] if tempos else 0.0,
+            "tempo_maximo_segundos": tempos[-1] if tempos else 0.0,
+            "arquivos_por_minuto": round(len(resultados) / tempo_total * 60, 1) if tempo_total > 0 else 0.0,
+            # Soma dos tempos individuais / tempo de parede (≈ processos ocupados em média)
+            "ganho_paralelismo": round(soma / tempo_total, 2) if tempo_total > 0 else 0.0
+        }
@@ -0,0 +1,123 @@
+"""
+Matcher de termos compostos compilado uma única vez - Sistema HELIO
+Substitui o laço "um re.finditer por padrão" por uma única varredura
+do texto, preservando exatamente o resultado do laço original.
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+# Palavra literal inicial de um padrão (ex.: "gestão" em r'gestão\s+de\s+...')
+_PALAVRA_INICIAL = re.compile(r'^[^\W\d_]+')
+
+# Limite de pedaços de texto memorizados (o vocabulário das vagas se repete muito)
+_MAX_CACHE_PEDACOS = 200_000
+
+
+class CompoundTermMatcher:
+    """
+    Encontra todas as ocorrências de uma lista de padrões de termos compostos
+
+    Cada padrão é indexado pela sua palavra literal inicial. O texto é
+    percorrido uma vez, pedaço a pedaço (separados por espaço), e as
+    palavras iniciais presentes em cada pedaço são memorizadas. Só os
+    padrões cuja palavra inicial aparece são testados, ancorados na
+    posição exata (`match`), em vez de varrer o texto inteiro por padrão.
+
+    O resultado é idêntico a:
+
+        for padrao in padroes:
+            for m in re.finditer(padrao, texto, re.IGNORECASE):
+                termo = m.group().lower().strip()
+                if termo not in termos: termos.append(termo)
+    """
+
+    def __init__(self, padroes: Sequence[str], flags: int = re.IGNORECASE):
+        self.padroes = list(padroes)
+        self._compilados = [re.compile(p, flags) for p in self.padroes]
+
+        # Palavra inicial -> índices dos padrões que começam com ela
+        self._por_inicial: Dict[str, List[int]] = {}
+        # Padrões sem palavra literal inicial: varridos do jeito tradicional
+        self._sem_inicial: List[int] = []
+
+        for i, padrao in enumerate(self.padroes):
+            inicio = _PALAVRA_INICIAL.match(padrao)
+            if inicio:
+                self._por_inicial.setdefault(inicio.group().casefold(), []).append(i)
+            else:
+                self._sem_inicial.append(i)
+
+        self._iniciais = list(self._por_inicial)
+        self._cache_pedacos: Dict[str, Tuple[Tuple[int, str], ...]] = {}
+
+    def _iniciais_no_pedaco(self, pedaco: str) -> Tuple[Tuple[int, str], ...]:
+        """(deslocamento, palavra inicial) de cada ocorrência no pedaço, em ordem"""
+        try:
+            return self._cache_pedacos[pedaco]
+        except KeyError:
+            pass
+
+        ocorrencias = []
+        for inicial in self._iniciais:
+            pos = pedaco.find(inicial)
+            while pos != -1:
+                ocorrencias.append((pos, inicial))
+                pos = pedaco.find(inicial, pos + 1)
+        ocorrencias.sort()
+
+        if len(self._cache_pedacos) >= _MAX_CACHE_PEDACOS:
+            self._cache_pedacos.clear()
+        resultado = tuple(ocorrencias)
+        self._cache_pedacos[pedaco] = resultado
+        return resultado
+
+    def encontrar(self, texto: str) -> List[str]:
+        """Retorna os termos encontrados na ordem (padrão, posição), sem repetições"""
+        dobrado = texto.casefold()
+        if len(dobrado) != len(texto):
+            # Caracteres cuja dobra muda o tamanho (ex.: "ß"): posições não batem
+            return self._encontrar_por_padrao(texto, range(len(self.padroes)))
+
+        acertos: List[Tuple[int, int, str]] = []
+        fim_ultimo = [-1] * len(self.padroes)
+
+        # Uma palavra inicial nunca contém espaço, então cada ocorrência cabe num pedaço
+        inicio_pedaco = 0
+        for pedaco in dobrado.split(' '):
+            if pedaco:
+                for deslocamento, inicial in self._iniciais_no_pedaco(pedaco):
+                    pos = inicio_pedaco + deslocamento
+                    for i in self._por_inicial[inicial]:
+                        # Mesma semântica de finditer: sem sobreposição dentro de um padrão
+                        if pos < fim_ultimo[i]:
+                            continue
+                        m = self._compilados[i].match(texto, pos)
+                        if m:
+                            fim_ultimo[i] = max(m.end(), pos + 1)
+                            acertos.append((i, pos, m.group().lower().strip()))
+            inicio_pedaco += len(pedaco) + 1
+
+        for i in self._sem_inicial:
+            for m in self._compilados[i].finditer(texto):
+                acertos.append((i, m.start(), m.group().lower().strip()))
+
+        acertos.sort(key=lambda a: (a[0], a[1]))
+        return self._sem_repeticoes(termo for _, _, termo in acertos)
+
+    def _encontrar_por_padrao(self, texto: str, indices) -> List[str]:
+        return self._sem_repeticoes(
+            m.group().lower().strip()
+            for i in indices
+            for m in self._compilados[i].finditer(texto)
+        )
+
+    @staticmethod
+    def _sem_repeticoes(termos) -> List[str]:
+        vistos = set()
+        unicos = []
+        for termo in termos:
+            if termo not in vistos:
+                vistos.add(termo)
+                unicos.append(termo)
+        return unicos
@@ -3,16 +3,75 @@ Processador de Documentos - Sistema HELIO
 Análise real de currículos em PDF e DOCX seguindo metodologia Carolina Martins
 """
 
+import io
 import os
 import re
 import json
-from typing import Dict, List, Any, Optional, Tuple
+import mmap
+import zipfile
+from contextlib import closing, contextmanager
+from typing import Dict, List, Any, Optional, Tuple, Iterator, BinaryIO
 from datetime import datetime
 import PyPDF2
 import docx
 from io import BytesIO
-import openai
-from anthropic import Anthropic
+from .ai_providers import ClienteIA
+
+# ----------------------------------------------------------------------
+# Padrões da análise de currículo (compilados uma vez por processo)
+# ----------------------------------------------------------------------
+
+# Elementos dos 13 passos da metodologia Carolina Martins
+ELEMENTOS_METODOLOGIA = {
+    "dados_pessoais": ["nome", "telefone", "email", "linkedin"],
+    "objetivo": ["objetivo", "cargo", "posição"],
+    "resumo": ["resumo", "perfil", "sobre"],
+    "experiencias": ["experiência", "trabalho", "empresa"],
+    "resultados": ["resultado", "alcançou", "aumentou", "reduziu", "%"],
+    "formacao": ["formação", "educação", "graduação", "curso"],
+    "idiomas": ["idioma", "inglês", "espanhol", "francês"],
+    "tecnologia": ["excel", "power bi", "python", "sql"],
+    "conhecimentos": ["conhecimento", "competência", "habilidade"],
+    "voluntario": ["voluntário", "social", "ong"]
+}
+
+# Padrões para identificar competências técnicas e comportamentais
+PADROES_COMPETENCIAS = [
+    # Tecnologias
+    r'\b(Excel|Power BI|Python|SQL|Tableau|SAP|Oracle|Java|JavaScript|React|Angular)\b',
+    # Soft skills
+    r'\b(liderança|gestão|comunicação|negociação|analítico|estratégico|proativo)\b',
+    # Áreas funcionais
+    r'\b(marketing|vendas|financeiro|recursos humanos|logística|operações|TI|tecnologia)\b',
+    # Metodologias
+    r'\b(Scrum|Agile|Six Sigma|Lean|Kanban|PMBOK|ITIL)\b'
+]
+
+PALAVRAS_VAGAS = ["responsável por", "participou", "auxiliou", "apoiou"]
+PALAVRAS_ESPECIFICAS = ["gerenciei", "liderei", "desenvolvi", "implementei", "alcancei"]
+
+SECOES_PADRAO = [
+    "dados pessoais", "objetivo", "resumo", "experiência",
+    "formação", "educação", "idiomas", "competências"
+]
+
+# Os 4 padrões de competência numa única alternância, um grupo por padrão
+# (o grupo que casou indica o padrão de origem). Nenhuma palavra de um
+# padrão sobrepõe palavra de outro, então uma varredura encontra o mesmo
+# que as 4. Sobre o texto já em minúsculas basta casar sem IGNORECASE;
+# a versão IGNORECASE fica para textos com 'ı'/'ſ', que o re equipara a i/s.
+_ALTERNATIVAS_COMPETENCIAS = '|'.join(f'({padrao[3:-3]})' for padrao in PADROES_COMPETENCIAS)
+_RE_COMPETENCIAS = re.compile(rf'\b(?:{_ALTERNATIVAS_COMPETENCIAS.lower()})\b')
+_RE_COMPETENCIAS_IGNORECASE = re.compile(rf'\b(?:{_ALTERNATIVAS_COMPETENCIAS})\b', re.IGNORECASE)
+
+_RE_SECOES = re.compile(r'(EXPERIÊNCIA|FORMAÇÃO|EDUCAÇÃO|OBJETIVO)')
+# Também responde "tem datas": 20\d{2} já é um caso de \d{4}
+_RE_DATAS = re.compile(r'(\d{4})|(\d{2}/\d{4})')
+_RE_EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_RE_TELEFONE = re.compile(r'\(\d{2}\)|\d{2}\s*9?\d{4}-?\d{4}')
+# Equivale a \d+%|\d+\s*(...) sem o retrocesso sobre sequências de dígitos
+_RE_NUMEROS = re.compile(r'\d%|\d\s*(?:milhão|mil|reais|R\$)')
+
 
 class DocumentProcessor:
     """
@@ -20,17 +79,16 @@ class DocumentProcessor:
     Substitui as funções placeholder do sistema original
     """
     
+    # APIs de IA se disponíveis (clientes compartilhados, criados no primeiro uso)
+    openai_client = ClienteIA("openai")
+    anthropic_client = ClienteIA("anthropic")
+    
     def __init__(self):
-        # Inicializa APIs de IA se disponíveis
-        self.openai_client = None
-        self.anthropic_client = None
-        
-        if os.getenv('OPENAI_API_KEY') and os.getenv('OPENAI_API_KEY') != 'your_openai_api_key_here':
-            openai.api_key = os.getenv('OPENAI_API_KEY')
-            self.openai_client = openai
-            
-        if os.getenv('ANTHROPIC_API_KEY') and os.getenv('ANTHROPIC_API_KEY') != 'your_anthropic_api_key_here':
-            self.anthropic_client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        # Orçamentos de extração: uploads grandes ou maliciosos não estouram memória/latência
+        self.max_bytes = int(os.getenv('DOC_MAX_BYTES', str(10 * 1024 * 1024)))
+        self.max_bytes_descompactados = int(os.getenv('DOC_MAX_BYTES_DESCOMPACTADOS', str(50 * 1024 * 1024)))
+        self.max_paginas = int(os.getenv('DOC_MAX_PAGINAS', '30'))
+        self.max_caracteres = int(os.getenv('DOC_MAX_CARACTERES', '200000'))
     
     def extrair_texto_documento(self, arquivo_path: str, arquivo_bytes: bytes = None) -> str:
         """
@@ -41,80 +99,146 @@ class DocumentProcessor:
             arquivo_bytes: Bytes do arquivo (se enviado via upload)
             
         Returns:
-            str: Texto extraído do documento
+            str: Texto extraído do documento (parcial se a extração falhar no meio)
         """
+        trechos = []
         try:
-            extensao = arquivo_path.lower().split('.')[-1]
-            
-            if arquivo_bytes:
-                if extensao == 'pdf':
-                    return self._extrair_texto_pdf_bytes(arquivo_bytes)
-                elif extensao in ['docx', 'doc']:
-                    return self._extrair_texto_docx_bytes(arquivo_bytes)
-                elif extensao == 'txt':
-                    return arquivo_bytes.decode('utf-8', errors='ignore')
-            else:
-                if extensao == 'pdf':
-                    return self._extrair_texto_pdf(arquivo_path)
-                elif extensao in ['docx', 'doc']:
-                    return self._extrair_texto_docx(arquivo_path)
-                elif extensao == 'txt':
-                    with open(arquivo_path, 'r', encoding='utf-8') as f:
-                        return f.read()
-                    
-            raise ValueError(f"Formato de arquivo não suportado: {extensao}")
-            
+            for trecho in self.iterar_texto_documento(arquivo_path, arquivo_bytes):
+                trechos.append(trecho)
         except Exception as e:
             print(f"Erro ao extrair texto do documento: {e}")
-            return ""
+        return "".join(trechos)
     
-    def _extrair_texto_pdf(self, arquivo_path: str) -> str:
-        """Extrai texto de arquivo PDF"""
-        texto = ""
-        try:
-            with open(arquivo_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    texto += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"Erro ao processar PDF: {e}")
-        return texto
+    def iterar_texto_documento(
+        self,
+        arquivo_path: str,
+        arquivo_bytes: bytes = None,
+        max_paginas: int = None,
+        max_caracteres: int = None
+    ) -> Iterator[str]:
+        """
+        Extrai o texto em trechos: uma página do PDF, um parágrafo do DOCX
+        ou um bloco do TXT por vez. A concatenação dos trechos é o texto
+        completo.
+        
+        Orçamentos (padrões nas variáveis de ambiente DOC_MAX_*):
+            - arquivos acima de max_bytes são recusados antes de qualquer parsing
+            - DOCX cujo conteúdo descompactado passa de max_bytes_descompactados é recusado
+            - PDF: só as primeiras max_paginas páginas são lidas
+            - a extração para ao atingir max_caracteres (último trecho truncado)
+        
+        Raises:
+            ValueError: formato não suportado ou arquivo acima do orçamento
+        """
+        max_paginas = max_paginas or self.max_paginas
+        max_caracteres = max_caracteres or self.max_caracteres
+        extensao = arquivo_path.lower().split('.')[-1]
+        
+        if extensao == 'pdf':
+            trechos = self._iterar_pdf(arquivo_path, arquivo_bytes, max_paginas)
+        elif extensao in ['docx', 'doc']:
+            trechos = self._iterar_docx(arquivo_path, arquivo_bytes)
+        elif extensao == 'txt':
+            trechos = self._iterar_txt(arquivo_path, arquivo_bytes)
+        else:
+            raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+        
+        restante = max_caracteres
+        with closing(trechos):
+            for trecho in trechos:
+                if len(trecho) >= restante:
+                    yield trecho[:restante]
+                    print(f"⚠️ Texto limitado a {max_caracteres} caracteres: restante ignorado")
+                    return
+                restante -= len(trecho)
+                yield trecho
     
-    def _extrair_texto_pdf_bytes(self, arquivo_bytes: bytes) -> str:
-        """Extrai texto de PDF a partir de bytes"""
-        texto = ""
-        try:
-            pdf_reader = PyPDF2.PdfReader(BytesIO(arquivo_bytes))
-            for page in pdf_reader.pages:
-                texto += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"Erro ao processar PDF bytes: {e}")
-        return texto
+    def _iterar_pdf(self, arquivo_path: str, arquivo_bytes: Optional[bytes], max_paginas: int) -> Iterator[str]:
+        """Texto página a página; o parser só lê as páginas pedidas"""
+        with self._abrir_binario(arquivo_path, arquivo_bytes, mapear=True) as stream:
+            pdf_reader = PyPDF2.PdfReader(stream)
+            total_paginas = len(pdf_reader.pages)
+            if total_paginas > max_paginas:
+                print(f"⚠️ PDF com {total_paginas} páginas: lendo apenas as {max_paginas} primeiras")
+            
+            for indice in range(min(total_paginas, max_paginas)):
+                yield (pdf_reader.pages[indice].extract_text() or "") + "\n"
     
-    def _extrair_texto_docx(self, arquivo_path: str) -> str:
-        """Extrai texto de arquivo DOCX"""
-        try:
-            doc = docx.Document(arquivo_path)
-            texto = ""
+    def _iterar_docx(self, arquivo_path: str, arquivo_bytes: Optional[bytes]) -> Iterator[str]:
+        """Texto parágrafo a parágrafo"""
+        with self._abrir_binario(arquivo_path, arquivo_bytes, mapear=False) as stream:
+            # DOCX é um zip: recusa conteúdo descompactado desproporcional (zip bomb)
+            with zipfile.ZipFile(stream) as pacote:
+                descompactado = sum(info.file_size for info in pacote.infolist())
+            if descompactado > self.max_bytes_descompactados:
+                raise ValueError(
+                    f"DOCX descompactado com {descompactado} bytes excede o limite de {self.max_bytes_descompactados}"
+                )
+            stream.seek(0)
+            
+            doc = docx.Document(stream)
             for paragraph in doc.paragraphs:
-                texto += paragraph.text + "\n"
-            return texto
-        except Exception as e:
-            print(f"Erro ao processar DOCX: {e}")
-            return ""
+                yield paragraph.text + "\n"
     
-    def _extrair_texto_docx_bytes(self, arquivo_bytes: bytes) -> str:
-        """Extrai texto de DOCX a partir de bytes"""
-        try:
-            doc = docx.Document(BytesIO(arquivo_bytes))
-            texto = ""
-            for paragraph in doc.paragraphs:
-                texto += paragraph.text + "\n"
-            return texto
-        except Exception as e:
-            print(f"Erro ao processar DOCX bytes: {e}")
-            return ""
+    def _iterar_txt(self, arquivo_path: str, arquivo_bytes: Optional[bytes]) -> Iterator[str]:
+        """Texto em blocos de 64 KB (decodificação incremental)"""
+        with self._abrir_binario(arquivo_path, arquivo_bytes, mapear=False) as stream:
+            erros = 'ignore' if arquivo_bytes else 'strict'
+            leitor = io.TextIOWrapper(stream, encoding='utf-8', errors=erros)
+            try:
+                for bloco in iter(lambda: leitor.read(65536), ''):
+                    yield bloco
+            finally:
+                leitor.detach()
     
+    @contextmanager
+    def _abrir_binario(self, arquivo_path: str, arquivo_bytes: Optional[bytes], mapear: bool) -> Iterator[BinaryIO]:
+        """
+        Stream binário do documento, recusado se maior que max_bytes
+        
+        Arquivos em disco com mapear=True são mapeados em memória (mmap):
+        o sistema operacional carrega sob demanda só as regiões que o
+        parser acessa, em vez de ler o arquivo inteiro.
+        """
+        if arquivo_bytes:
+            self._verificar_tamanho(len(arquivo_bytes))
+            yield BytesIO(arquivo_bytes)
+            return
+        
+        with open(arquivo_path, 'rb') as arquivo:
+            self._verificar_tamanho(os.fstat(arquivo.fileno()).st_size)
+            if not mapear:
+                yield arquivo
+                return
+            with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                yield mapa
+    
+    def _verificar_tamanho(self, tamanho: int):
+        if tamanho > self.max_bytes:
+            raise ValueError(f"Arquivo com {tamanho} bytes excede o limite de {self.max_bytes}")
+    
+    def analisar_curriculo(self, texto_curriculo: str, arquivo_path: str = None) -> Dict[str, Any]:
+        """
+        Estrutura, honestidade, formatação e palavras-chave numa passada
+
+        Minúsculas, datas e padrões são calculados uma vez e compartilhados
+        pelos 4 analisadores; o resultado de cada chave é o mesmo das
+        chamadas individuais.
+
+        Returns:
+            Dict com estrutura_metodologica, validacoes_honestidade,
+            formatacao e palavras_chave_atuais
+        """
+        texto_lower = texto_curriculo.lower()
+        datas = _RE_DATAS.findall(texto_curriculo)
+
+        return {
+            "estrutura_metodologica": self._analisar_estrutura(texto_curriculo, texto_lower, datas),
+            "validacoes_honestidade": self._verificar_honestidade(texto_curriculo, texto_lower, datas),
+            "formatacao": self._analisar_formatacao(texto_curriculo, texto_lower),
+            "palavras_chave_atuais": self._extrair_palavras_chave(texto_curriculo, texto_lower)
+        }
+
     def analisar_estrutura_curriculo(self, texto_curriculo: str) -> Dict[str, Any]:
         """
         Analisa estrutura do currículo seguindo metodologia Carolina Martins
@@ -122,30 +246,20 @@ class DocumentProcessor:
         Returns:
             Dict com análise da estrutura metodológica
         """
-        # Elementos dos 13 passos da metodologia Carolina Martins
-        elementos_metodologia = {
-            "dados_pessoais": ["nome", "telefone", "email", "linkedin"],
-            "objetivo": ["objetivo", "cargo", "posição"],
-            "resumo": ["resumo", "perfil", "sobre"],
-            "experiencias": ["experiência", "trabalho", "empresa"],
-            "resultados": ["resultado", "alcançou", "aumentou", "reduziu", "%"],
-            "formacao": ["formação", "educação", "graduação", "curso"],
-            "idiomas": ["idioma", "inglês", "espanhol", "francês"],
-            "tecnologia": ["excel", "power bi", "python", "sql"],
-            "conhecimentos": ["conhecimento", "competência", "habilidade"],
-            "voluntario": ["voluntário", "social", "ong"]
-        }
-        
+        return self._analisar_estrutura(
+            texto_curriculo, texto_curriculo.lower(), _RE_DATAS.findall(texto_curriculo)
+        )
+
+    def _analisar_estrutura(self, texto_curriculo: str, texto_lower: str, datas: List[Tuple[str, str]]) -> Dict[str, Any]:
         # Verifica presença de cada elemento
         elementos_encontrados = {}
-        texto_lower = texto_curriculo.lower()
         
-        for categoria, palavras_chave in elementos_metodologia.items():
+        for categoria, palavras_chave in ELEMENTOS_METODOLOGIA.items():
             encontrado = any(palavra in texto_lower for palavra in palavras_chave)
             elementos_encontrados[categoria] = encontrado
         
         # Calcula score de aderência à metodologia
-        total_elementos = len(elementos_metodologia)
+        total_elementos = len(ELEMENTOS_METODOLOGIA)
         elementos_presentes = sum(elementos_encontrados.values())
         score_metodologia = (elementos_presentes / total_elementos) * 100
         
@@ -158,7 +272,7 @@ class DocumentProcessor:
         return {
             "possui_13_passos": score_metodologia >= 80,  # 80% dos elementos presentes
             "estrutura_adequada": score_metodologia >= 60,
-            "formatacao_profissional": self._verificar_formatacao_texto(texto_curriculo),
+            "formatacao_profissional": self._verificar_formatacao_texto(texto_curriculo, bool(datas)),
             "elementos_encontrados": elementos_encontrados,
             "elementos_faltando": elementos_faltando,
             "score_metodologia": score_metodologia,
@@ -166,14 +280,17 @@ class DocumentProcessor:
             "elementos_presentes": elementos_presentes
         }
     
-    def _verificar_formatacao_texto(self, texto: str) -> bool:
+    def _verificar_formatacao_texto(self, texto: str, tem_datas: bool = None) -> bool:
         """Verifica indicadores básicos de formatação profissional no texto"""
+        if tem_datas is None:
+            tem_datas = bool(_RE_DATAS.search(texto))
+
         # Indicadores de boa formatação
         indicadores = {
-            "tem_estrutura_secoes": bool(re.search(r'(EXPERIÊNCIA|FORMAÇÃO|EDUCAÇÃO|OBJETIVO)', texto.upper())),
-            "tem_datas": bool(re.search(r'\d{4}|\d{2}/\d{4}|20\d{2}', texto)),
-            "tem_email": bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', texto)),
-            "tem_telefone": bool(re.search(r'\(\d{2}\)|\d{2}\s*9?\d{4}-?\d{4}', texto)),
+            "tem_estrutura_secoes": bool(_RE_SECOES.search(texto.upper())),
+            "tem_datas": tem_datas,
+            "tem_email": bool(_RE_EMAIL.search(texto)),
+            "tem_telefone": bool(_RE_TELEFONE.search(texto)),
             "tamanho_adequado": 500 < len(texto) < 3000  # Entre 500 e 3000 caracteres
         }
         
@@ -187,24 +304,22 @@ class DocumentProcessor:
         Returns:
             Lista de palavras-chave extraídas
         """
-        # Padrões para identificar competências técnicas e comportamentais
-        padroes_competencias = [
-            # Tecnologias
-            r'\b(Excel|Power BI|Python|SQL|Tableau|SAP|Oracle|Java|JavaScript|React|Angular)\b',
-            # Soft skills
-            r'\b(liderança|gestão|comunicação|negociação|analítico|estratégico|proativo)\b',
-            # Áreas funcionais
-            r'\b(marketing|vendas|financeiro|recursos humanos|logística|operações|TI|tecnologia)\b',
-            # Metodologias
-            r'\b(Scrum|Agile|Six Sigma|Lean|Kanban|PMBOK|ITIL)\b'
-        ]
-        
-        palavras_encontradas = set()
-        texto_lower = texto_curriculo.lower()
-        
-        for padrao in padroes_competencias:
-            matches = re.findall(padrao, texto_lower, re.IGNORECASE)
-            palavras_encontradas.update(match.lower() for match in matches)
+        return self._extrair_palavras_chave(texto_curriculo, texto_curriculo.lower())
+
+    def _extrair_palavras_chave(self, texto_curriculo: str, texto_lower: str) -> List[str]:
+        if 'ı' in texto_lower or 'ſ' in texto_lower:
+            padrao = _RE_COMPETENCIAS_IGNORECASE
+        else:
+            padrao = _RE_COMPETENCIAS
+
+        # Primeira ocorrência de cada palavra e o padrão que a encontrou
+        primeiras: Dict[str, Tuple[int, int]] = {}
+        for match in padrao.finditer(texto_lower):
+            primeiras.setdefault(match.group(match.lastindex).lower(), (match.lastindex, match.start()))
+
+        # Inserção na ordem em que as 4 varreduras separadas encontravam
+        # (padrão, depois posição): a ordem do set resultante não muda
+        palavras_encontradas = set(sorted(primeiras, key=primeiras.__getitem__))
         
         # Se poucas palavras encontradas, usar IA para extração mais sofisticada
         if len(palavras_encontradas) < 5 and (self.openai_client or self.anthropic_client):
@@ -255,10 +370,14 @@ class DocumentProcessor:
         """
         Verifica indicadores de honestidade no currículo
         """
+        return self._verificar_honestidade(
+            texto_curriculo, texto_curriculo.lower(), _RE_DATAS.findall(texto_curriculo)
+        )
+
+    def _verificar_honestidade(self, texto_curriculo: str, texto_lower: str, datas_encontradas: List[Tuple[str, str]]) -> Dict[str, Any]:
         alertas = []
         
         # Verifica consistência de datas
-        datas_encontradas = re.findall(r'(\d{4})|(\d{2}/\d{4})', texto_curriculo)
         if datas_encontradas:
             anos = []
             for data in datas_encontradas:
@@ -278,16 +397,13 @@ class DocumentProcessor:
                     alertas.append("Período profissional muito extenso (>30 anos)")
         
         # Verifica nível de detalhamento
-        palavras_vagas = ["responsável por", "participou", "auxiliou", "apoiou"]
-        palavras_especificas = ["gerenciei", "liderei", "desenvolvi", "implementei", "alcancei"]
-        
-        vagas_count = sum(1 for palavra in palavras_vagas if palavra in texto_curriculo.lower())
-        especificas_count = sum(1 for palavra in palavras_especificas if palavra in texto_curriculo.lower())
+        vagas_count = sum(1 for palavra in PALAVRAS_VAGAS if palavra in texto_lower)
+        especificas_count = sum(1 for palavra in PALAVRAS_ESPECIFICAS if palavra in texto_lower)
         
         detalhamento_adequado = especificas_count > vagas_count
         
         # Verifica presença de resultados quantificados
-        tem_numeros = bool(re.search(r'\d+%|\d+\s*(milhão|mil|reais|R\$)', texto_curriculo))
+        tem_numeros = bool(_RE_NUMEROS.search(texto_curriculo))
         
         return {
             "datas_consistentes": len(alertas) == 0,
@@ -305,6 +421,9 @@ class DocumentProcessor:
         """
         Analisa formatação do documento seguindo padrões Carolina Martins
         """
+        return self._analisar_formatacao(texto_curriculo, texto_curriculo.lower())
+
+    def _analisar_formatacao(self, texto_curriculo: str, texto_lower: str) -> Dict[str, Any]:
         # Análise baseada no texto extraído
         linhas = texto_curriculo.split('\n')
         linhas_nao_vazias = [linha for linha in linhas if linha.strip()]
@@ -314,15 +433,7 @@ class DocumentProcessor:
         paginas_estimadas = len(texto_curriculo) / caracteres_por_pagina
         
         # Verifica estrutura de seções
-        secoes_identificadas = []
-        secoes_padrao = [
-            "dados pessoais", "objetivo", "resumo", "experiência", 
-            "formação", "educação", "idiomas", "competências"
-        ]
-        
-        for secao in secoes_padrao:
-            if secao in texto_curriculo.lower():
-                secoes_identificadas.append(secao)
+        secoes_identificadas = [secao for secao in SECOES_PADRAO if secao in texto_lower]
         
         return {
             "formato_adequado": len(secoes_identificadas) >= 4,
@@ -0,0 +1,210 @@
+"""
+Cliente HTTP compartilhado - Sistema HELIO
+Uma sessão requests por processo, com keep-alive (pool de conexões
+limitado por host), retentativas com backoff exponencial + jitter e timeouts padrão.
+Evita um handshake TCP+TLS novo a cada início de run, polling de status
+e página de dataset do Apify. Os long-polls do Apify usam uma sessão à
+parte, sem limite, para não disputar as conexões das demais chamadas.
+"""
+
+import os
+import random
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.retry import Retry
+
+# Erros transitórios que valem nova tentativa (rate limit e indisponibilidade)
+STATUS_RETENTATIVA = (429, 500, 502, 503, 504)
+
+
+class RetryComJitter(Retry):
+    """Retry do urllib3 com jitter aleatório somado ao backoff exponencial"""
+
+    jitter_max = 0.5
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, self.jitter_max)
+
+
+class _EsperaConexao:
+    """
+    Pool do urllib3 que espera no máximo `timeout_pool` por uma conexão livre
+
+    O requests chama urlopen sem pool_timeout: com pool_block=True, uma
+    requisição esperaria para sempre se o pool do host estivesse ocupado.
+    """
+
+    timeout_pool = None
+
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(self.timeout_pool if timeout is None else timeout)
+
+
+class AdaptadorLimitado(HTTPAdapter):
+    """
+    HTTPAdapter em que `pool_maxsize` é um limite real de conexões por host
+
+    Com pool_block=False o urllib3 abre conexões extras quando o pool está
+    cheio (e só as descarta na devolução), então o tamanho do pool não limita
+    nada. Aqui a requisição espera uma conexão livre por até `timeout_pool`
+    segundos e então falha com requests.ConnectionError.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['timeout_pool']
+
+    def __init__(self, timeout_pool: float, **kwargs):
+        self.timeout_pool = timeout_pool
+        super().__init__(pool_block=True, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            esquema: type(classe.__name__, (_EsperaConexao, classe), {'timeout_pool': self.timeout_pool})
+            for esquema, classe in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, **kwargs):
+        try:
+            return super().send(request, **kwargs)
+        except EmptyPoolError as e:
+            raise requests.ConnectionError(e, request=request)
+
+
+class _SemCookies(DefaultCookiePolicy):
+    """A sessão é compartilhada entre requisições de usuários diferentes: nunca guarda cookies"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class SessaoHTTP(requests.Session):
+    """
+    Sessão requests com timeout padrão (connect, read)
+
+    Chamadas que informam `timeout` explicitamente mantêm o valor informado.
+    """
+
+    def __init__(self, timeout: tuple):
+        super().__init__()
+        self.timeout_padrao = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout_padrao)
+        return super().request(method, url, **kwargs)
+
+
+def criar_sessao(
+    max_conexoes_por_host: int = None,
+    max_retentativas: int = None,
+    fator_backoff: float = None,
+    timeout_conexao: float = None,
+    timeout_leitura: float = None,
+    timeout_pool: float = None,
+    limitar_por_host: bool = True
+) -> SessaoHTTP:
+    """
+    Cria uma sessão configurada
+
+    Com limitar_por_host=False o pool não bloqueia: `max_conexoes_por_host`
+    é só quantas conexões keep-alive ficam guardadas, e requisições além
+    disso abrem conexões extras (para long-polls, um por stream).
+
+    Configuração por variáveis de ambiente:
+        HTTP_MAX_CONEXOES_POR_HOST: conexões simultâneas por host (padrão 20)
+        HTTP_MAX_RETENTATIVAS: novas tentativas em erro transitório (padrão 3)
+        HTTP_FATOR_BACKOFF: base do backoff exponencial em segundos (padrão 0.5)
+        HTTP_TIMEOUT_CONEXAO / HTTP_TIMEOUT_LEITURA: timeouts padrão (5s / 30s)
+        HTTP_TIMEOUT_POOL: espera por uma conexão livre com o pool cheio (padrão 10s)
+    """
+    max_conexoes_por_host = max_conexoes_por_host or int(os.getenv('HTTP_MAX_CONEXOES_POR_HOST', '20'))
+    max_retentativas = max_retentativas if max_retentativas is not None else int(os.getenv('HTTP_MAX_RETENTATIVAS', '3'))
+    fator_backoff = fator_backoff if fator_backoff is not None else float(os.getenv('HTTP_FATOR_BACKOFF', '0.5'))
+    timeout_conexao = timeout_conexao or float(os.getenv('HTTP_TIMEOUT_CONEXAO', '5'))
+    timeout_leitura = timeout_leitura or float(os.getenv('HTTP_TIMEOUT_LEITURA', '30'))
+    timeout_pool = timeout_pool or float(os.getenv('HTTP_TIMEOUT_POOL', '10'))
+
+    # POST (início de run) só é repetido em falha de conexão, nunca após envio
+    retry = RetryComJitter(
+        total=max_retentativas,
+        backoff_factor=fator_backoff,
+        status_forcelist=STATUS_RETENTATIVA,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    if limitar_por_host:
+        adaptador = AdaptadorLimitado(
+            timeout_pool,
+            pool_connections=10,  # hosts distintos mantidos em cache
+            pool_maxsize=max_conexoes_por_host,
+            max_retries=retry
+        )
+    else:
+        adaptador = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=max_conexoes_por_host,
+            pool_block=False,
+            max_retries=retry
+        )
+
+    sessao = SessaoHTTP(timeout=(timeout_conexao, timeout_leitura))
+    sessao.mount('https://', adaptador)
+    sessao.mount('http://', adaptador)
+    sessao.cookies.set_policy(_SemCookies())
+    return sessao
+
+
+_sessoes: Dict[str, SessaoHTTP] = {}
+_pid_sessoes: Optional[int] = None
+_sessao_lock = threading.Lock()
+
+
+def _sessao_do_processo(nome: str, fabrica: Callable[[], SessaoHTTP]) -> SessaoHTTP:
+    """Uma sessão por nome e processo (recriadas após fork: cada worker do gunicorn tem os próprios pools)"""
+    global _pid_sessoes
+    pid = os.getpid()
+    sessao = _sessoes.get(nome) if _pid_sessoes == pid else None
+    if sessao is None:
+        with _sessao_lock:
+            if _pid_sessoes != pid:
+                _sessoes.clear()
+                _pid_sessoes = pid
+            sessao = _sessoes.get(nome)
+            if sessao is None:
+                sessao = _sessoes[nome] = fabrica()
+    return sessao
+
+
+def obter_sessao() -> SessaoHTTP:
+    """
+    Retorna a sessão compartilhada do processo
+
+    Limitada a HTTP_MAX_CONEXOES_POR_HOST conexões simultâneas por host.
+    """
+    return _sessao_do_processo('padrao', criar_sessao)
+
+
+def obter_sessao_long_poll() -> SessaoHTTP:
+    """
+    Sessão do acompanhamento de runs do Apify (long-poll e leitura de dataset)
+
+    Cada stream segura uma conexão por até 60s no long-poll: com o limite
+    da sessão padrão, streams além do limite esperariam HTTP_TIMEOUT_POOL
+    e falhariam. Aqui o pool não bloqueia e guarda até
+    HTTP_LONG_POLL_CONEXOES_POR_HOST conexões keep-alive (padrão 200).
+    """
+    return _sessao_do_processo('long_poll', lambda: criar_sessao(
+        max_conexoes_por_host=int(os.getenv('HTTP_LONG_POLL_CONEXOES_POR_HOST', '200')),
+        limitar_por_host=False
+    ))
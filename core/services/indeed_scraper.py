@@ -8,11 +8,21 @@ import time
 import json
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-import requests
 from dotenv import load_dotenv
 
+from .http_client import obter_sessao
+from .apify_runs import STATUS_FINAIS, CursorDataset, consultar_run, aguardar_run
+
 load_dotenv()
 
+# Campos do item do Indeed usados por _processar_vaga_indeed (projeção `fields`)
+CAMPOS_VAGA_INDEED = (
+    'title', 'companyName', 'location', 'descriptionText', 'descriptionHtml',
+    'jobUrl', 'datePublished', 'age', 'salary', 'jobType', 'requirements',
+    'attributes', 'benefits', 'isRemote', 'companyLogoUrl', 'rating',
+    'applyUrl', 'hiringDemand'
+)
+
 class IndeedScraper:
     """
     Coleta vagas do Indeed usando Apify Actor borderline/indeed-scraper
@@ -27,6 +37,13 @@ class IndeedScraper:
         self.base_url = "https://api.apify.com/v2"
         self.actor_id = "borderline/indeed-scraper"
         
+        # Sessão HTTP compartilhada (keep-alive com api.apify.com)
+        self.http = obter_sessao()
+        
+        # Se a última coleta terminou com o run SUCCEEDED e todos os resultados
+        # baixados (resultados parciais ou de fallback não vão para o cache)
+        self.ultima_coleta_completa = False
+        
         if not self.apify_token:
             print("⚠️  APIFY_API_TOKEN não encontrado. Usando dados de fallback.")
     
@@ -68,6 +85,7 @@ class IndeedScraper:
         print(f"🔑 Token APIFY: {'✅ PRESENTE' if self.apify_token else '❌ AUSENTE'}")
         print("=" * 50)
         
+        self.ultima_coleta_completa = False
         if not self.apify_token:
             print("🚨 Token Apify não configurado. Usando fallback.")
             return self._fallback_indeed_data(cargo, localizacao, limite)
@@ -110,7 +128,7 @@ class IndeedScraper:
             # Formatar actor_id corretamente para a API
             actor_id_formatted = self.actor_id.replace('/', '~')
             
-            run_response = requests.post(
+            run_response = self.http.post(
                 f"{self.base_url}/acts/{actor_id_formatted}/runs",
                 headers={
                     "Authorization": f"Bearer {self.apify_token}",
@@ -129,53 +147,25 @@ class IndeedScraper:
             
             run_data = run_response.json()
             run_id = run_data["data"]["id"]
+            dataset_id = run_data["data"]["defaultDatasetId"]
             print(f"✅ Scraping iniciado - ID: {run_id}")
             
-            # Aguardar conclusão
-            max_attempts = 30  # ~5 minutos máximo
-            attempt = 0
-            
-            while attempt < max_attempts:
-                time.sleep(10)  # Check a cada 10 segundos
-                attempt += 1
-                
-                status_response = requests.get(
-                    f"{self.base_url}/actor-runs/{run_id}",
-                    headers={"Authorization": f"Bearer {self.apify_token}"},
-                    timeout=10
-                )
-                
-                if status_response.status_code == 200:
-                    status_data = status_response.json()
-                    status = status_data["data"]["status"]
-                    
-                    if attempt % 3 == 0:  # Log a cada 30 segundos
-                        print(f"⏳ Aguardando... {attempt*10}s | Status: {status}")
-                    
-                    if status == "SUCCEEDED":
-                        print(f"🎉 Scraping concluído em {attempt*10}s!")
-                        break
-                    elif status in ["FAILED", "ABORTED", "TIMED-OUT"]:
-                        print(f"❌ Scraping falhou: {status}")
-                        return self._fallback_indeed_data(cargo, localizacao, limite)
-            
-            # Obter dataset ID
-            run_info_response = requests.get(
-                f"{self.base_url}/actor-runs/{run_id}",
-                headers={"Authorization": f"Bearer {self.apify_token}"},
-                timeout=30
-            )
+            # Aguardar conclusão com long-poll (~5 minutos máximo)
+            inicio_espera = time.time()
+            run_final = aguardar_run(run_id, self.apify_token, timeout_segundos=300, base_url=self.base_url)
+            status = (run_final or {}).get("status")
             
-            if run_info_response.status_code == 200:
-                run_info = run_info_response.json()
-                dataset_id = run_info["data"]["defaultDatasetId"]
-            else:
-                print(f"⚠️ Erro ao obter dataset ID")
+            if status == "SUCCEEDED":
+                print(f"🎉 Scraping concluído em {time.time() - inicio_espera:.1f}s!")
+            elif status in STATUS_FINAIS:
+                print(f"❌ Scraping falhou: {status}")
                 return self._fallback_indeed_data(cargo, localizacao, limite)
+            else:
+                print(f"⏰ Run ainda em andamento ({status}); baixando resultados parciais")
             
             # Baixar resultados
             print(f"📥 Baixando resultados...")
-            results_response = requests.get(
+            results_response = self.http.get(
                 f"{self.base_url}/datasets/{dataset_id}/items",
                 headers={"Authorization": f"Bearer {self.apify_token}"},
                 timeout=60
@@ -190,6 +180,7 @@ class IndeedScraper:
             
             # Processar resultados
             processed_jobs = self._processar_resultados_indeed(raw_jobs, cargo)
+            self.ultima_coleta_completa = status == "SUCCEEDED"
             
             print(f"🎉 RESULTADO FINAL: {len(processed_jobs)} vagas processadas!")
             return processed_jobs
@@ -405,7 +396,7 @@ class IndeedScraper:
             print(f"🔍 Actor ID formatado: {actor_id_formatted}")
             print(f"📍 URL completa: {self.base_url}/acts/{actor_id_formatted}/runs")
             
-            run_response = requests.post(
+            run_response = self.http.post(
                 f"{self.base_url}/acts/{actor_id_formatted}/runs",
                 headers={
                     "Authorization": f"Bearer {self.apify_token}",
@@ -430,30 +421,19 @@ class IndeedScraper:
             print(f"❌ Erro na execução Apify: {e}")
             return None, None
     
-    def verificar_status_run(self, run_id: str) -> str:
+    def verificar_status_run(self, run_id: str, espera_segundos: float = 0) -> str:
         """
         Verifica status de um run específico
+        
+        Com espera_segundos > 0 faz long-poll: a resposta chega assim que o
+        run termina ou quando a espera acaba, o que vier primeiro.
         """
         
         if not self.apify_token or not run_id:
             return "UNKNOWN"
         
-        try:
-            response = requests.get(
-                f"{self.base_url}/actor-runs/{run_id}",
-                headers={"Authorization": f"Bearer {self.apify_token}"},
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                status = response.json()["data"]["status"]
-                return status
-            else:
-                return "ERROR"
-                
-        except Exception as e:
-            print(f"❌ Erro ao verificar status: {e}")
-            return "ERROR"
+        run = consultar_run(run_id, self.apify_token, espera_segundos=espera_segundos, base_url=self.base_url)
+        return run["status"] if run else "ERROR"
     
     def obter_resultados_parciais(self, dataset_id: str, offset: int = 0, limit: int = 100) -> List[Dict]:
         """
@@ -468,10 +448,11 @@ class IndeedScraper:
                 "format": "json",
                 "clean": "true",
                 "offset": offset,
-                "limit": limit
+                "limit": limit,
+                "fields": ",".join(CAMPOS_VAGA_INDEED)
             }
             
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/datasets/{dataset_id}/items",
                 headers={"Authorization": f"Bearer {self.apify_token}"},
                 params=params,
@@ -497,6 +478,38 @@ class IndeedScraper:
             print(f"❌ Erro ao obter resultados parciais: {e}")
             return []
     
+    def abrir_cursor_dataset(self, dataset_id: str) -> CursorDataset:
+        """
+        Cursor para leitura incremental do dataset de um run (streaming)
+        """
+        return CursorDataset(
+            dataset_id,
+            self.apify_token,
+            campos=CAMPOS_VAGA_INDEED,
+            base_url=self.base_url
+        )
+    
+    def ler_novas_vagas(self, cursor: CursorDataset, limite: int = None, cargo_pesquisado: str = None) -> List[Dict[str, Any]]:
+        """
+        Lê apenas os itens escritos desde a última leitura do cursor e
+        processa cada um uma única vez
+        
+        Com `cargo_pesquisado`, as vagas saem no mesmo formato de
+        _processar_resultados_indeed (a coleta completa)
+        """
+        if not self.apify_token or not cursor:
+            return []
+        
+        vagas_processadas = []
+        for job in cursor.ler_novos(limite):
+            vaga_processada = self._processar_vaga_indeed(job)
+            if vaga_processada:
+                if cargo_pesquisado is not None:
+                    vaga_processada['cargo_pesquisado'] = cargo_pesquisado
+                vagas_processadas.append(vaga_processada)
+        
+        return vagas_processadas
+    
     def cancelar_run(self, run_id: str) -> bool:
         """
         Cancela uma execução em andamento
@@ -506,7 +519,7 @@ class IndeedScraper:
             return False
         
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/actor-runs/{run_id}/abort",
                 headers={"Authorization": f"Bearer {self.apify_token}"},
                 timeout=10
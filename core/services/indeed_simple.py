@@ -6,13 +6,16 @@ import os
 import time
 import json
 from datetime import datetime
-import requests
+
+from core.services.http_client import obter_sessao
+from core.services.apify_runs import aguardar_run
 
 class IndeedScraper:
     def __init__(self):
         self.apify_token = os.getenv('APIFY_API_TOKEN')
         self.base_url = "https://api.apify.com/v2"
         self.actor_id = "borderline/indeed-scraper"
+        self.http = obter_sessao()
         
     def coletar_vagas_indeed(self, cargo, localizacao="são paulo", limite=20, **kwargs):
         """Coleta vagas do Indeed via Apify"""
@@ -34,7 +37,7 @@ class IndeedScraper:
             # Fazer request
             actor_id_formatted = self.actor_id.replace('/', '~')
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/acts/{actor_id_formatted}/runs",
                 headers={"Authorization": f"Bearer {self.apify_token}"},
                 json=actor_input,
@@ -46,27 +49,14 @@ class IndeedScraper:
             
             run_id = response.json()["data"]["id"]
             
-            # Aguardar conclusão (máximo 2 minutos)
-            for _ in range(24):  # 24 * 5 = 120 segundos
-                time.sleep(5)
-                
-                status_resp = requests.get(
-                    f"{self.base_url}/actor-runs/{run_id}",
-                    headers={"Authorization": f"Bearer {self.apify_token}"}
-                )
-                
-                if status_resp.status_code == 200:
-                    status = status_resp.json()["data"]["status"]
-                    if status == "SUCCEEDED":
-                        dataset_id = status_resp.json()["data"]["defaultDatasetId"]
-                        break
-                    elif status in ["FAILED", "ABORTED"]:
-                        return self._fallback_data(cargo, localizacao, limite)
-            else:
+            # Aguardar conclusão com long-poll (máximo 2 minutos)
+            run = aguardar_run(run_id, self.apify_token, timeout_segundos=120, base_url=self.base_url)
+            if not run or run.get("status") != "SUCCEEDED":
                 return self._fallback_data(cargo, localizacao, limite)
+            dataset_id = run["defaultDatasetId"]
             
             # Obter resultados
-            results_resp = requests.get(
+            results_resp = self.http.get(
                 f"{self.base_url}/datasets/{dataset_id}/items",
                 headers={"Authorization": f"Bearer {self.apify_token}"}
             )
@@ -125,7 +115,7 @@ class IndeedScraper:
         """Para compatibilidade com streaming"""
         return None, None
     
-    def verificar_status_run(self, run_id):
+    def verificar_status_run(self, run_id, espera_segundos=0):
         return "UNKNOWN"
     
     def obter_resultados_parciais(self, dataset_id, offset=0, limit=100):
@@ -0,0 +1,348 @@
+"""
+Cache compartilhado de coletas de vagas - Sistema HELIO
+Buscas com os mesmos parâmetros (cargo, localização e filtros, já
+normalizados) reaproveitam o resultado de uma coleta recente em vez de
+disparar outro run pago no Apify. A validade acompanha a janela de
+publicação pedida e buscas idênticas simultâneas compartilham um único
+run em andamento (single-flight).
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def normalizar_parametro(valor: Any) -> Any:
+    """Texto sem acentos, minúsculo e com espaços simples; outros tipos ficam como estão"""
+    if not isinstance(valor, str):
+        return valor
+    texto = unicodedata.normalize('NFKD', valor)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', texto).strip().casefold()
+
+
+def chave_vaga(vaga: Dict[str, Any]) -> str:
+    """Identidade de uma vaga entre runs diferentes: a URL ou, sem ela, título, empresa e local"""
+    if vaga.get('url'):
+        return vaga['url']
+    return '|'.join(normalizar_parametro(str(vaga.get(campo, ''))) for campo in ('titulo', 'empresa', 'localizacao'))
+
+
+class ColetaCompartilhada:
+    """
+    Coleta em andamento que outras requisições podem acompanhar
+
+    O líder publica as vagas à medida que chegam; os demais recebem as
+    mesmas vagas por `acompanhar` até o líder encerrar.
+    """
+
+    def __init__(self, chave: str, quantidade: int):
+        self.chave = chave
+        self.quantidade = quantidade
+        self.vagas: List[Dict[str, Any]] = []
+        self.run_id = None
+        self.concluida = False
+        self.completa = False
+        self._condicao = threading.Condition()
+
+    def publicar(self, novas: List[Dict[str, Any]]):
+        """Acrescenta vagas recebidas pelo líder e acorda quem acompanha"""
+        if not novas:
+            return
+        with self._condicao:
+            self.vagas.extend(novas)
+            self._condicao.notify_all()
+
+    def encerrar(self, completa: bool):
+        with self._condicao:
+            self.concluida = True
+            self.completa = completa
+            self._condicao.notify_all()
+
+    def acompanhar(self, quantidade: int, timeout: float) -> Iterator[List[Dict[str, Any]]]:
+        """Entrega as vagas já publicadas e as próximas, até `quantidade` ou o fim da coleta"""
+        entregues = 0
+        limite = time.monotonic() + timeout
+        while entregues < quantidade:
+            with self._condicao:
+                while len(self.vagas) <= entregues and not self.concluida:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        return
+                    self._condicao.wait(restante)
+                novas = self.vagas[entregues:quantidade]
+                terminou = self.concluida
+            if novas:
+                entregues += len(novas)
+                yield novas
+            if terminou and entregues >= min(quantidade, len(self.vagas)):
+                return
+
+
+class CacheColetas:
+    """
+    Resultados de coletas em SQLite, endereçados pelos parâmetros da busca
+
+    A quantidade pedida não entra na chave: uma coleta de 100 vagas atende
+    pedidos de até 100, e uma coleta que trouxe menos vagas do que pediu
+    (a fonte esgotou) atende qualquer quantidade.
+
+    Configuração por variáveis de ambiente:
+        JOB_CACHE_PATH: caminho do arquivo (padrão .cache/coletas_vagas.sqlite3)
+        JOB_CACHE_TTL_HORAS_POR_DIA: validade por dia da janela de publicação (padrão 1h)
+        JOB_CACHE_TTL_MAX_HORAS: validade máxima, usada também sem filtro de data (padrão 12h)
+        JOB_CACHE_MAX_MB: tamanho máximo somado das coletas (padrão 32 MB)
+        JOB_CACHE_DESATIVADO: "1" para sempre coletar de novo
+    """
+
+    def __init__(
+        self,
+        caminho: str = None,
+        ttl_por_dia_segundos: float = None,
+        ttl_maximo_segundos: float = None,
+        max_bytes: int = None
+    ):
+        self.caminho = caminho or os.getenv('JOB_CACHE_PATH', os.path.join('.cache', 'coletas_vagas.sqlite3'))
+        self.ttl_por_dia_segundos = ttl_por_dia_segundos if ttl_por_dia_segundos is not None else float(os.getenv('JOB_CACHE_TTL_HORAS_POR_DIA', '1')) * 3600
+        self.ttl_maximo_segundos = ttl_maximo_segundos if ttl_maximo_segundos is not None else float(os.getenv('JOB_CACHE_TTL_MAX_HORAS', '12')) * 3600
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv('JOB_CACHE_MAX_MB', '32')) * 1024 * 1024)
+        self.ativo = os.getenv('JOB_CACHE_DESATIVADO', '0') != '1'
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._em_andamento: Dict[str, ColetaCompartilhada] = {}
+        self.hits = 0
+        self.misses = 0
+        self.compartilhadas = 0
+
+    @staticmethod
+    def gerar_chave(parametros: Dict[str, Any]) -> str:
+        """SHA-256 dos parâmetros normalizados (ordem e caixa não importam; None é omitido)"""
+        canonicos = {
+            nome: normalizar_parametro(valor)
+            for nome, valor in parametros.items()
+            if valor is not None
+        }
+        serializado = json.dumps(canonicos, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serializado.encode('utf-8')).hexdigest()
+
+    def ttl_para(self, dias_publicacao: Any) -> float:
+        """
+        Validade de uma coleta pela janela de publicação: quanto mais curta a
+        janela, maior a fração de vagas novas em uma hora, então mais cedo a
+        coleta fica desatualizada
+        """
+        try:
+            dias = float(dias_publicacao)
+        except (TypeError, ValueError):
+            return self.ttl_maximo_segundos  # 'todos' ou ausente
+        return min(self.ttl_maximo_segundos, max(dias, 1.0) * self.ttl_por_dia_segundos)
+
+    def _conexao(self) -> sqlite3.Connection:
+        if self._conn is None:
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            self._conn = sqlite3.connect(self.caminho, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS coletas_vagas (
+                    chave TEXT PRIMARY KEY,
+                    vagas TEXT NOT NULL,
+                    quantidade INTEGER NOT NULL,
+                    total INTEGER NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    expira_em REAL NOT NULL,
+                    acessado_em REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_coletas_vagas_acesso ON coletas_vagas (acessado_em)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def obter(self, parametros: Dict[str, Any], quantidade: int) -> Optional[List[Dict[str, Any]]]:
+        """Vagas de uma coleta ainda válida que atende a quantidade pedida (ou None)"""
+        if not self.ativo:
+            return None
+
+        chave = self.gerar_chave(parametros)
+        try:
+            with self._lock:
+                conn = self._conexao()
+                linha = conn.execute(
+                    "SELECT vagas, quantidade, total, expira_em FROM coletas_vagas WHERE chave = ?", (chave,)
+                ).fetchone()
+
+                agora = time.time()
+                if linha is not None and agora > linha[3]:
+                    conn.execute("DELETE FROM coletas_vagas WHERE chave = ?", (chave,))
+                    conn.commit()
+                    linha = None
+
+                # Coleta menor que o pedido só serve se a fonte já tinha se esgotado
+                if linha is None or (linha[1] < quantidade and linha[2] >= linha[1]):
+                    self.misses += 1
+                    return None
+
+                conn.execute("UPDATE coletas_vagas SET acessado_em = ? WHERE chave = ?", (agora, chave))
+                conn.commit()
+                self.hits += 1
+                return json.loads(linha[0])[:quantidade]
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️ Cache de coletas indisponível (leitura): {e}")
+            return None
+
+    def salvar(self, parametros: Dict[str, Any], quantidade: int, vagas: List[Dict[str, Any]]):
+        """Grava o resultado de uma coleta concluída com sucesso"""
+        if not self.ativo or not vagas:
+            return
+
+        try:
+            serializado = json.dumps(vagas, ensure_ascii=False)
+            agora = time.time()
+            expira_em = agora + self.ttl_para(parametros.get('dias_publicacao'))
+            with self._lock:
+                conn = self._conexao()
+                conn.execute(
+                    "INSERT OR REPLACE INTO coletas_vagas "
+                    "(chave, vagas, quantidade, total, tamanho, criado_em, expira_em, acessado_em) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.gerar_chave(parametros), serializado, quantidade, len(vagas),
+                     len(serializado.encode('utf-8')), agora, expira_em, agora)
+                )
+                self._remover_excedente(conn, agora)
+                conn.commit()
+
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"⚠️ Cache de coletas indisponível (escrita): {e}")
+
+    def _remover_excedente(self, conn: sqlite3.Connection, agora: float):
+        """Remove coletas expiradas e, se ainda acima do limite, as menos usadas recentemente"""
+        conn.execute("DELETE FROM coletas_vagas WHERE expira_em < ?", (agora,))
+
+        total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM coletas_vagas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excedente = total - self.max_bytes
+        removidas = []
+        for chave, tamanho in conn.execute("SELECT chave, tamanho FROM coletas_vagas ORDER BY acessado_em ASC"):
+            removidas.append((chave,))
+            excedente -= tamanho
+            if excedente <= 0:
+                break
+        conn.executemany("DELETE FROM coletas_vagas WHERE chave = ?", removidas)
+
+    # ------------------------------------------------------------------
+    # Single-flight
+    # ------------------------------------------------------------------
+
+    def iniciar_coleta(self, parametros: Dict[str, Any], quantidade: int) -> Tuple[ColetaCompartilhada, bool]:
+        """
+        Entra numa coleta idêntica em andamento ou registra uma nova
+
+        Returns:
+            (coleta, lider): se `lider` for True quem chamou deve executar o
+            run, publicar as vagas e chamar `finalizar_coleta`; senão basta
+            acompanhar a coleta do líder
+        """
+        chave = self.gerar_chave(parametros)
+        with self._lock:
+            coleta = self._em_andamento.get(chave)
+            if self.ativo and coleta is not None and not coleta.concluida and coleta.quantidade >= quantidade:
+                self.compartilhadas += 1
+                return coleta, False
+            coleta = ColetaCompartilhada(chave, quantidade)
+            if self.ativo:
+                self._em_andamento[chave] = coleta
+            return coleta, True
+
+    def finalizar_coleta(self, coleta: ColetaCompartilhada, parametros: Dict[str, Any], completa: bool):
+        """Libera quem acompanha a coleta e, se ela terminou bem, grava o resultado"""
+        with self._lock:
+            if self._em_andamento.get(coleta.chave) is coleta:
+                del self._em_andamento[coleta.chave]
+        coleta.encerrar(completa)
+        if completa:
+            self.salvar(parametros, coleta.quantidade, coleta.vagas)
+
+    def coletar(
+        self,
+        parametros: Dict[str, Any],
+        quantidade: int,
+        coletor: Callable[[], Tuple[List[Dict[str, Any]], bool]],
+        timeout: float = 600
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Resultado da busca pelo cache, por uma coleta idêntica em andamento
+        ou, em último caso, executando `coletor`
+
+        Args:
+            coletor: executa o run e retorna (vagas, completa); só coletas
+                completas são gravadas
+            timeout: espera máxima pela coleta de outra requisição
+
+        Returns:
+            (vagas, origem), com origem "cache", "compartilhada" ou "coleta"
+        """
+        vagas = self.obter(parametros, quantidade)
+        if vagas is not None:
+            return vagas, "cache"
+
+        coleta, lider = self.iniciar_coleta(parametros, quantidade)
+        if not lider:
+            vagas = [vaga for novas in coleta.acompanhar(quantidade, timeout) for vaga in novas]
+            if coleta.completa:
+                return vagas, "compartilhada"
+            # O run do líder falhou: esta requisição tenta o seu, sem registrar
+            coleta = ColetaCompartilhada(coleta.chave, quantidade)
+
+        completa = False
+        try:
+            vagas, completa = coletor()
+            coleta.publicar(vagas)
+        finally:
+            self.finalizar_coleta(coleta, parametros, completa)
+        return vagas, "coleta"
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Resumo de uso do cache neste processo
+
+        Lê os contadores sem o lock, que fica preso durante o I/O do SQLite:
+        um banco lento não pode travar quem só quer as estatísticas.
+        """
+        hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 3) if total else 0.0,
+            "coletas_compartilhadas": self.compartilhadas,
+            "coletas_em_andamento": len(self._em_andamento),
+            "ativo": self.ativo
+        }
+
+
+_cache_global = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_coletas() -> CacheColetas:
+    """Retorna a instância compartilhada do cache (uma por processo)"""
+    global _cache_global
+    if _cache_global is None:
+        with _cache_lock:
+            if _cache_global is None:
+                _cache_global = CacheColetas()
+    return _cache_global
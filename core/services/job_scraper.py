@@ -6,6 +6,8 @@ Arquitetura simplificada focada em delegação e orquestração inteligente
 import os
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
@@ -13,6 +15,9 @@ from dotenv import load_dotenv
 
 from .query_expander import QueryExpanderV2
 from .location_expander import LocationExpander
+from .query_plan import PlanejadorBuscas
+from .search_planner import FONTE_GOOGLE_JOBS, PlanejadorAdaptativo
+from .near_duplicate_index import NearDuplicateIndex
 from .google_jobs_scraper import GoogleJobsScraper
 
 # Configurar logging
@@ -41,6 +46,10 @@ class JobScraper:
         # Serviços de expansão
         self.query_expander = QueryExpanderV2()
         self.location_expander = LocationExpander()
+        self.planejador = PlanejadorBuscas(self.query_expander, self.location_expander)
+        
+        # Ordem e poda das combinações pelo rendimento histórico de cada uma
+        self.planejador_adaptativo = PlanejadorAdaptativo()
         
         # Serviço único de scraping (Google Jobs via Apify)
         self.scraper = GoogleJobsScraper()
@@ -53,13 +62,18 @@ class JobScraper:
         self.max_retries = 3
         self.retry_delay = 2  # segundos
         
+        # Coleta paralela: runs simultâneos e quantas combinações do topo usar
+        self.max_concorrencia = int(os.getenv('JOB_SCRAPER_MAX_CONCORRENCIA', '5'))
+        self.top_combinacoes = int(os.getenv('JOB_SCRAPER_TOP_COMBINACOES', '15'))
+        
     def coletar_vagas_multiplas_fontes(
         self,
         area_interesse: str,
         cargo_objetivo: str,
         localizacao: str = "Brasil",
         tipo_vaga: str = "hibrido",  # presencial, hibrido, remoto
-        total_vagas_desejadas: int = 50
+        total_vagas_desejadas: int = 50,
+        paralelo: bool = True
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Orquestra a coleta inteligente de vagas
@@ -70,6 +84,7 @@ class JobScraper:
             localizacao: Cidade/estado base do usuário
             tipo_vaga: Preferência de trabalho (presencial/hibrido/remoto)
             total_vagas_desejadas: Quantidade alvo de vagas
+            paralelo: Executa as combinações simultaneamente (False = cascata)
             
         Returns:
             Tupla com (lista de vagas, metadados da coleta)
@@ -100,22 +115,26 @@ class JobScraper:
         logger.info(f"💼 Tipo: {tipo_vaga}")
         logger.info(f"🎯 Meta: {total_vagas_desejadas} vagas")
         
-        # 1. EXPANSÃO INTELIGENTE DE QUERIES
-        logger.info(f"\n📊 FASE 1: Expansão de queries...")
-        cargos_expandidos = self.query_expander.expandir_cargo(
-            cargo_objetivo, 
-            area_interesse
-        )
-        logger.info(f"✅ {len(cargos_expandidos)} variações de cargo geradas")
-        
-        # 2. EXPANSÃO GEOGRÁFICA COM IA
-        logger.info(f"\n📍 FASE 2: Expansão geográfica inteligente...")
-        locais_expandidos = self.location_expander.expandir_localizacao(
+        # 1-2. PLANO DE BUSCA: variações de cargo + expansão geográfica com IA
+        # (determinístico e memorizado: buscas repetidas não voltam à IA)
+        logger.info(f"\n📊 FASE 1-2: Plano de busca (queries e localizações)...")
+        plano = self.planejador.planejar(
+            cargo_objetivo,
+            area_interesse,
             localizacao,
             tipo_vaga,
-            limite=10  # Top 10 locais mais relevantes
+            limite_locais=10  # Top 10 locais mais relevantes
         )
-        logger.info(f"✅ {len(locais_expandidos)} localizações priorizadas")
+        cargos_expandidos = plano.cargos
+        locais_expandidos = plano.locais
+        metadados["plano_busca"] = {
+            "chave": plano.chave[:16],
+            "memorizado": plano.memorizado,
+            "cargos": cargos_expandidos,
+            "locais": [local["nome"] for local in locais_expandidos]
+        }
+        logger.info(f"✅ {len(cargos_expandidos)} variações de cargo e {len(locais_expandidos)} localizações priorizadas"
+                    f"{' (plano memorizado)' if plano.memorizado else ''}")
         
         # 3. GERAR COMBINAÇÕES PRIORIZADAS
         logger.info(f"\n🔄 FASE 3: Gerando combinações de busca...")
@@ -126,55 +145,34 @@ class JobScraper:
         )
         logger.info(f"✅ {len(combinacoes)} combinações geradas")
         
-        # 4. COLETA EM CASCATA COM PARADA INTELIGENTE
-        logger.info(f"\n🚀 FASE 4: Iniciando coleta em cascata...")
-        
-        for idx, combo in enumerate(combinacoes):
-            # Verificar se já atingiu a meta
-            if len(vagas_coletadas) >= total_vagas_desejadas:
-                logger.info(f"\n✅ Meta atingida! {len(vagas_coletadas)} vagas coletadas")
-                break
-            
-            # Calcular quantas vagas ainda precisamos
-            vagas_faltantes = total_vagas_desejadas - len(vagas_coletadas)
-            
-            logger.info(f"\n🔍 Tentativa {idx + 1}/{len(combinacoes)}")
-            logger.info(f"   Cargo: {combo.cargo}")
-            logger.info(f"   Local: {combo.localizacao}")
-            logger.info(f"   Coletando até: {vagas_faltantes} vagas")
-            
-            # Tentar coletar com retry automático
-            vagas_combo = self._coletar_com_retry(
-                combo.cargo,
-                combo.localizacao,
-                vagas_faltantes  # Coleta exatamente o que falta para atingir a meta do usuário
+        # Combinações que já renderam bem sobem, as que seguidamente voltam
+        # vazias são podadas (sem histórico, a ordem estática é mantida)
+        combinacoes, metadados["planejador"] = self.planejador_adaptativo.ordenar(combinacoes, FONTE_GOOGLE_JOBS)
+        if metadados["planejador"].get("combinacoes_com_historico"):
+            logger.info(
+                f"🧭 Planejador: {metadados['planejador']['combinacoes_com_historico']} combinações com histórico, "
+                f"{metadados['planejador']['podadas']} podadas"
             )
-            
-            if vagas_combo:
-                vagas_coletadas.extend(vagas_combo)
-                logger.info(f"   ✅ {len(vagas_combo)} vagas coletadas")
-                
-                metadados["combinacoes_tentadas"].append({
-                    "cargo": combo.cargo,
-                    "local": combo.localizacao,
-                    "vagas_coletadas": len(vagas_combo),
-                    "sucesso": True
-                })
-            else:
-                logger.warning(f"   ⚠️ Nenhuma vaga encontrada")
-                metadados["combinacoes_tentadas"].append({
-                    "cargo": combo.cargo,
-                    "local": combo.localizacao,
-                    "vagas_coletadas": 0,
-                    "sucesso": False
-                })
+        
+        # 4. COLETA (PARALELA OU EM CASCATA) COM PARADA INTELIGENTE
+        # Quase duplicatas (mesma vaga em várias fontes) são removidas à medida que chegam
+        indice = NearDuplicateIndex()
+        
+        if paralelo and self.max_concorrencia > 1:
+            logger.info(f"\n🚀 FASE 4: Iniciando coleta paralela ({self.max_concorrencia} simultâneas)...")
+            vagas_unicas = self._coletar_paralelo(combinacoes, total_vagas_desejadas, metadados, indice)
+        else:
+            logger.info(f"\n🚀 FASE 4: Iniciando coleta em cascata...")
+            vagas_unicas = self._coletar_em_cascata(combinacoes, total_vagas_desejadas, metadados, indice)
         
         # 5. PROCESSAMENTO FINAL
         logger.info(f"\n📊 FASE 5: Processamento final...")
         
-        # Remover duplicatas
-        vagas_unicas = self._remover_duplicatas(vagas_coletadas)
-        logger.info(f"✅ {len(vagas_coletadas) - len(vagas_unicas)} duplicatas removidas")
+        metadados["deduplicacao"] = indice.estatisticas()
+        logger.info(
+            f"✅ {indice.duplicatas_exatas + indice.duplicatas_aproximadas} duplicatas removidas "
+            f"({indice.duplicatas_aproximadas} quase idênticas, {indice.total_clusters} clusters)"
+        )
         
         # Estatísticas finais
         tempo_total = time.time() - inicio
@@ -245,16 +243,189 @@ class JobScraper:
         
         return combinacoes
     
+    def _coletar_em_cascata(
+        self,
+        combinacoes: List[SearchCombination],
+        total_vagas_desejadas: int,
+        metadados: Dict[str, Any],
+        indice: NearDuplicateIndex
+    ) -> List[Dict[str, Any]]:
+        """
+        Coleta uma combinação por vez, parando quando a meta é atingida
+        
+        Só vagas novas segundo o índice de quase duplicatas são mantidas.
+        """
+        vagas_coletadas = []
+        metadados["modo_coleta"] = "cascata"
+        
+        for idx, combo in enumerate(combinacoes):
+            # Verificar se já atingiu a meta
+            if len(vagas_coletadas) >= total_vagas_desejadas:
+                logger.info(f"\n✅ Meta atingida! {len(vagas_coletadas)} vagas coletadas")
+                break
+            
+            # Calcular quantas vagas ainda precisamos
+            vagas_faltantes = total_vagas_desejadas - len(vagas_coletadas)
+            
+            logger.info(f"\n🔍 Tentativa {idx + 1}/{len(combinacoes)}")
+            logger.info(f"   Cargo: {combo.cargo}")
+            logger.info(f"   Local: {combo.localizacao}")
+            logger.info(f"   Coletando até: {vagas_faltantes} vagas")
+            
+            # Tentar coletar com retry automático
+            inicio_combo = time.time()
+            vagas_combo = self._coletar_com_retry(
+                combo.cargo,
+                combo.localizacao,
+                vagas_faltantes  # Coleta exatamente o que falta para atingir a meta do usuário
+            )
+            latencia = time.time() - inicio_combo
+            falhou = vagas_combo is None
+            vagas_combo = vagas_combo or []
+            
+            novas = indice.filtrar(vagas_combo) if vagas_combo else []
+            # Erro do scraper não é rendimento zero: só runs concluídos entram no histórico
+            if not falhou:
+                self.planejador_adaptativo.registrar(combo, vagas_faltantes, len(novas), latencia, FONTE_GOOGLE_JOBS)
+            
+            if vagas_combo:
+                vagas_coletadas.extend(novas)
+                logger.info(f"   ✅ {len(vagas_combo)} vagas coletadas ({len(novas)} novas)")
+                
+                metadados["combinacoes_tentadas"].append({
+                    "cargo": combo.cargo,
+                    "local": combo.localizacao,
+                    "vagas_coletadas": len(vagas_combo),
+                    "vagas_novas": len(novas),
+                    "sucesso": True
+                })
+            else:
+                logger.warning(f"   ⚠️ Nenhuma vaga encontrada")
+                metadados["combinacoes_tentadas"].append({
+                    "cargo": combo.cargo,
+                    "local": combo.localizacao,
+                    "vagas_coletadas": 0,
+                    "vagas_novas": 0,
+                    "sucesso": False
+                })
+        
+        return vagas_coletadas
+    
+    def _coletar_paralelo(
+        self,
+        combinacoes: List[SearchCombination],
+        total_vagas_desejadas: int,
+        metadados: Dict[str, Any],
+        indice: NearDuplicateIndex
+    ) -> List[Dict[str, Any]]:
+        """
+        Executa as top-N combinações simultaneamente (até max_concorrencia runs)
+        
+        Os resultados entram na deduplicação à medida que cada run termina.
+        Novas combinações só são iniciadas enquanto faltarem vagas únicas e
+        cada uma pede apenas o que falta no momento do disparo. Ao atingir a
+        meta, combinações ainda não iniciadas são canceladas e as em execução
+        deixam de fazer novas tentativas (o run em andamento não é interrompido:
+        termina em segundo plano e o resultado é descartado).
+        """
+        vagas_coletadas = []
+        pendentes = list(combinacoes[:self.top_combinacoes])
+        parar = threading.Event()
+        em_execucao = {}
+        
+        metadados["modo_coleta"] = "paralelo"
+        metadados["max_concorrencia"] = self.max_concorrencia
+        metadados["combinacoes_canceladas"] = 0
+        metadados["combinacoes_descartadas_em_execucao"] = 0
+        
+        def disparar(executor):
+            while pendentes and len(em_execucao) < self.max_concorrencia and not parar.is_set():
+                combo = pendentes.pop(0)
+                vagas_faltantes = total_vagas_desejadas - len(vagas_coletadas)
+                logger.info(f"\n🔍 Disparando: {combo.cargo} em {combo.localizacao} (até {vagas_faltantes} vagas)")
+                futuro = executor.submit(
+                    self._coletar_com_retry, combo.cargo, combo.localizacao, vagas_faltantes, parar
+                )
+                em_execucao[futuro] = (combo, time.time(), vagas_faltantes)
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_concorrencia, thread_name_prefix="coleta")
+        try:
+            disparar(executor)
+            while em_execucao:
+                concluidos, _ = wait(list(em_execucao), return_when=FIRST_COMPLETED)
+                
+                for futuro in concluidos:
+                    combo, inicio_combo, pedidas = em_execucao.pop(futuro)
+                    vagas_combo = futuro.result()
+                    latencia = time.time() - inicio_combo
+                    falhou = vagas_combo is None
+                    vagas_combo = vagas_combo or []
+                    
+                    # Deduplicação em fluxo: só vagas novas contam para a meta
+                    novas = examinadas = 0
+                    for vaga in vagas_combo:
+                        if len(vagas_coletadas) >= total_vagas_desejadas:
+                            break
+                        examinadas += 1
+                        if indice.adicionar(vaga):
+                            vagas_coletadas.append(vaga)
+                            novas += 1
+                    
+                    # Histórico só com runs concluídos e examinados: erro, interrupção ou
+                    # run descartado inteiro pela meta não dizem nada do rendimento. Run
+                    # cortado pela meta: extrapola a proporção de novas das examinadas
+                    if not falhou and (examinadas or not vagas_combo):
+                        novas_estimadas = novas * len(vagas_combo) / examinadas if examinadas else 0
+                        self.planejador_adaptativo.registrar(combo, pedidas, novas_estimadas, latencia, FONTE_GOOGLE_JOBS)
+                    
+                    logger.info(f"   ✅ {combo.cargo} em {combo.localizacao}: {len(vagas_combo)} vagas ({novas} novas)")
+                    metadados["combinacoes_tentadas"].append({
+                        "cargo": combo.cargo,
+                        "local": combo.localizacao,
+                        "vagas_coletadas": len(vagas_combo),
+                        "vagas_novas": novas,
+                        "tempo_segundos": round(latencia, 2),
+                        "sucesso": bool(vagas_combo)
+                    })
+                
+                if len(vagas_coletadas) >= total_vagas_desejadas and not parar.is_set():
+                    logger.info(f"\n✅ Meta atingida! {len(vagas_coletadas)} vagas coletadas")
+                    parar.set()
+                    # cancel() só impede o que ainda não começou; o run já em
+                    # andamento segue até o fim e o resultado é descartado
+                    canceladas = sum(1 for futuro in em_execucao if futuro.cancel())
+                    metadados["combinacoes_canceladas"] = len(pendentes) + canceladas
+                    metadados["combinacoes_descartadas_em_execucao"] = len(em_execucao) - canceladas
+                    pendentes.clear()
+                    break
+                
+                disparar(executor)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return vagas_coletadas
+    
     def _coletar_com_retry(
         self,
         cargo: str,
         localizacao: str,
-        limite: int
-    ) -> List[Dict[str, Any]]:
+        limite: int,
+        parar: Optional[threading.Event] = None
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         Coleta vagas com retry automático em caso de falha
+        
+        `parar` (coleta paralela) interrompe as novas tentativas quando a
+        meta já foi atingida por outras combinações.
+        
+        Returns:
+            As vagas, [] se a fonte não trouxe nenhuma ou None se a última
+            tentativa falhou ou a coleta foi interrompida
         """
+        falhou = False
         for tentativa in range(self.max_retries):
+            if parar is not None and parar.is_set():
+                return None
             try:
                 # Delegar para o serviço de scraping
                 vagas = self.scraper.coletar_vagas_google(
@@ -265,33 +436,31 @@ class JobScraper:
                 
                 if vagas:
                     return vagas
+                falhou = False
                     
             except Exception as e:
+                falhou = True
                 logger.warning(f"   Tentativa {tentativa + 1}/{self.max_retries} falhou: {str(e)}")
                 
                 if tentativa < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    if parar is not None:
+                        parar.wait(self.retry_delay)
+                    else:
+                        time.sleep(self.retry_delay)
                 else:
                     logger.error(f"   ❌ Todas as tentativas falharam para {cargo} em {localizacao}")
         
-        return []
+        return None if falhou else []
     
-    def _remover_duplicatas(self, vagas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _remover_duplicatas(
+        self,
+        vagas: List[Dict[str, Any]],
+        indice: Optional[NearDuplicateIndex] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Remove vagas duplicadas baseado em título + empresa
+        Remove vagas duplicadas e quase duplicadas (título + empresa + descrição)
         """
-        vagas_unicas = []
-        chaves_vistas = set()
-        
-        for vaga in vagas:
-            # Criar chave única
-            chave = f"{vaga.get('titulo', '').lower()}_{vaga.get('empresa', '').lower()}"
-            
-            if chave not in chaves_vistas:
-                chaves_vistas.add(chave)
-                vagas_unicas.append(vaga)
-        
-        return vagas_unicas
+        return (indice or NearDuplicateIndex()).filtrar(vagas)
     
     def iniciar_coleta_streaming(self, area_interesse: str, cargo_objetivo: str, localizacao: str, total_vagas_desejadas: int = 800) -> tuple:
         """
@@ -0,0 +1,144 @@
+"""
+Parser incremental de respostas JSON das IAs - Sistema HELIO
+Consome o texto da resposta à medida que o provedor o transmite e entrega
+cada objeto de um array (ex.: "palavras") assim que ele fecha, sem esperar
+o fim da resposta. Se a resposta vier truncada ou com JSON inválido, os
+objetos já completos continuam aproveitáveis.
+"""
+
+import re
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def interpretar_json(texto: str) -> Dict[str, Any]:
+    """
+    Interpreta a resposta completa tolerando cercas de markdown e texto extra
+
+    Raises:
+        ValueError: se não houver um objeto JSON válido na resposta
+    """
+    texto = texto.strip()
+    try:
+        return json.loads(texto)
+    except ValueError:
+        pass
+
+    # Cercas ```json ... ``` ou texto antes/depois do objeto
+    inicio = texto.find('{')
+    fim = texto.rfind('}') + 1
+    if inicio < 0 or fim <= inicio:
+        raise ValueError("JSON não encontrado na resposta")
+    return json.loads(texto[inicio:fim])
+
+
+class ParserArrayJSON:
+    """
+    Extrai os objetos do array `chave` de um JSON recebido em pedaços
+
+        parser = ParserArrayJSON("palavras")
+        for pedaco in resposta_em_stream:
+            for palavra in parser.alimentar(pedaco):
+                ...  # {"termo": ..., "frequencia": ...} completo
+
+    Cada caractere é examinado uma única vez (strings e escapes são
+    respeitados), então o custo total é linear no tamanho da resposta.
+    """
+
+    def __init__(self, chave: str):
+        self.chave = chave
+        self._re_inicio = re.compile(r'"%s"\s*:\s*\[' % re.escape(chave))
+        self.texto = ""
+        self.itens: List[Dict[str, Any]] = []
+        self._pos = None  # próximo caractere do array a examinar (None = array não encontrado)
+        self._fim_array = False
+        self._profundidade = 0
+        self._em_string = False
+        self._escape = False
+        self._inicio_objeto = None
+
+    def alimentar(self, pedaco: str) -> List[Dict[str, Any]]:
+        """Acrescenta um pedaço da resposta e retorna os objetos que fecharam nele"""
+        self.texto += pedaco
+        if self._fim_array:
+            return []
+        if self._pos is None:
+            # A chave pode ter chegado dividida entre pedaços: procura no texto todo
+            encontrado = self._re_inicio.search(self.texto)
+            if not encontrado:
+                return []
+            self._pos = encontrado.end()
+
+        novos = []
+        texto = self.texto
+        i = self._pos
+        while i < len(texto):
+            c = texto[i]
+            i += 1
+            if self._em_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._em_string = False
+            elif c == '"':
+                self._em_string = True
+            elif c == '{' or c == '[':
+                if self._profundidade == 0 and c == '{':
+                    self._inicio_objeto = i - 1
+                self._profundidade += 1
+            elif c == '}' or c == ']':
+                if self._profundidade == 0:
+                    self._fim_array = True  # ']' do próprio array
+                    break
+                self._profundidade -= 1
+                if self._profundidade == 0 and self._inicio_objeto is not None:
+                    try:
+                        objeto = json.loads(texto[self._inicio_objeto:i])
+                    except ValueError:
+                        objeto = None
+                    if isinstance(objeto, dict):
+                        novos.append(objeto)
+                    self._inicio_objeto = None
+        self._pos = i
+
+        self.itens.extend(novos)
+        return novos
+
+    def resultado(self) -> Dict[str, Any]:
+        """
+        Resposta completa interpretada ou, se ela estiver truncada/inválida,
+        só os objetos recuperados (com "resposta_truncada": True)
+
+        Raises:
+            ValueError: se a resposta é inválida e nenhum objeto foi recuperado
+        """
+        try:
+            return interpretar_json(self.texto)
+        except ValueError:
+            if not self.itens:
+                raise
+            return {self.chave: list(self.itens), "resposta_truncada": True}
+
+
+def consumir_stream(
+    pedacos: Iterable[str],
+    chave: str,
+    ao_receber_item: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> ParserArrayJSON:
+    """
+    Lê a resposta em stream, chamando `ao_receber_item` para cada objeto do
+    array `chave` assim que ele fica completo
+
+    Returns:
+        O parser, com `texto` completo, `itens` recuperados e `resultado()`
+    """
+    parser = ParserArrayJSON(chave)
+    for pedaco in pedacos:
+        if not pedaco:
+            continue
+        for item in parser.alimentar(pedaco):
+            if ao_receber_item:
+                ao_receber_item(item)
+    return parser
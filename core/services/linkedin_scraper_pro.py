@@ -6,8 +6,9 @@ Usa APIs pagas e métodos avançados para coletar vagas reais do LinkedIn
 import os
 import time
 import json
-import requests
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import urllib.parse
 from selenium import webdriver
@@ -19,70 +20,280 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from seleniumwire import webdriver as wire_webdriver
 import undetected_chromedriver as uc
 
+from .http_client import obter_sessao
+from .apify_runs import STATUS_FINAIS, aguardar_run, consultar_run
+from .near_duplicate_index import NearDuplicateIndex
+from .rate_limiter import obter_limitador
+from .job_collection_cache import chave_vaga
+
+# Provedor da coleta: (nome, função(limite, evento de cancelamento) -> vagas)
+Provedor = Tuple[str, Callable[[int, threading.Event], List[Dict[str, Any]]]]
+
+
+class RepasseVagas:
+    """
+    Repassa ao consumidor as vagas parciais de uma coleta em andamento
+
+    Uma vaga repetida (mesma url) substitui a anterior, como o detalhe do
+    ScrapingBee que chega depois da listagem. Vagas novas só até `limite`
+    e nada depois de `fechar()`: o que vale no fim é a lista retornada
+    pela coleta, já deduplicada.
+    """
+
+    def __init__(self, ao_receber_vaga: Callable[[Dict[str, Any]], None], limite: int):
+        self.ao_receber_vaga = ao_receber_vaga
+        self.limite = limite
+        self._repassadas = set()
+        self._fechado = False
+        self._lock = threading.Lock()
+
+    def __call__(self, vaga: Dict[str, Any]):
+        chave = chave_vaga(vaga)
+        with self._lock:
+            if self._fechado:
+                return
+            if chave not in self._repassadas:
+                if len(self._repassadas) >= self.limite:
+                    return
+                self._repassadas.add(chave)
+        self.ao_receber_vaga(vaga)
+
+    def fechar(self):
+        with self._lock:
+            self._fechado = True
+
 class LinkedInScraperPro:
     """
     Scraper profissional do LinkedIn com múltiplas estratégias
     """
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Sessão HTTP compartilhada do processo (keep-alive, retentativas, timeouts)
+        self.session = obter_sessao()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        }
+        # Latência e rendimento de cada provedor na última coleta
+        self.estatisticas_provedores: Dict[str, Dict[str, Any]] = {}
+        self._indice_coleta: Optional[NearDuplicateIndex] = None
     
     def coletar_vagas_linkedin(
         self, 
         cargo: str, 
         localizacao: str = "Brazil",
-        limite: int = 100
+        limite: int = 100,
+        paralelo: bool = None,
+        cotas: Dict[str, int] = None,
+        ao_receber_vaga: Callable[[Dict[str, Any]], None] = None
     ) -> List[Dict[str, Any]]:
         """
         Coleta vagas do LinkedIn usando múltiplas estratégias
+        
+        No modo paralelo (padrão), os provedores configurados (ScraperAPI,
+        Apify, ScrapingBee, Voyager) começam ao mesmo tempo, cada um pedindo
+        no máximo a sua cota; os resultados passam pela deduplicação na ordem
+        em que chegam e, quando `limite` é atingido, os provedores ainda em
+        curso são cancelados. O Selenium (navegador local) só roda se os
+        demais não completarem o limite. Latência e rendimento de cada
+        provedor ficam em `self.estatisticas_provedores`.
+        
+        Args:
+            paralelo: False para a cascata sequencial original
+                (padrão: LINKEDIN_COLETA_PARALELA, "0" desativa)
+            cotas: opcional; máximo de vagas pedidas a cada provedor
+                (padrão: LINKEDIN_COTAS, ex.: "scraperapi=50,apify=100")
+            ao_receber_vaga: opcional; recebe as vagas parciais durante a
+                coleta (ver RepasseVagas): as de cada provedor assim que
+                entram na junção e as do ScrapingBee já na listagem, antes
+                dos detalhes
         """
-        vagas_total = []
+        if paralelo is None:
+            paralelo = os.getenv('LINKEDIN_COLETA_PARALELA', '1') != '0'
+        if cotas is None:
+            cotas = self._cotas_configuradas()
         
         print(f"🚀 LinkedIn Scraper PRO - Coletando {limite} vagas para '{cargo}'")
         
-        # 1. ESTRATÉGIA 1: ScraperAPI (Paga por requisição - $0.001/request)
+        repasse = RepasseVagas(ao_receber_vaga, limite) if ao_receber_vaga else None
+        provedores = self._provedores_configurados(cargo, localizacao, repasse)
+        selenium = ("selenium", lambda n, cancelado: self._coletar_via_selenium_undetected(cargo, localizacao, n, cancelado))
+        
+        try:
+            if not paralelo:
+                # Ordem original: Voyager por último, depois do Selenium
+                apis = [p for p in provedores if p[0] != "voyager"]
+                vagas_total = self._coletar_em_sequencia(apis + [selenium] + provedores[len(apis):], limite, repasse)
+            else:
+                vagas_total = self._coletar_em_paralelo(provedores, limite, cotas, ao_receber_vaga=repasse)
+                
+                # Selenium abre um navegador: só como último recurso
+                if len(vagas_total) < limite:
+                    vagas_total.extend(self._coletar_em_paralelo(
+                        [selenium], limite - len(vagas_total), cotas, self._indice_coleta, repasse
+                    ))
+        finally:
+            # Provedores cancelados ainda podem terminar em segundo plano
+            if repasse:
+                repasse.fechar()
+        
+        print(f"\n✅ TOTAL COLETADO: {len(vagas_total)} vagas do LinkedIn")
+        return vagas_total[:limite]
+    
+    def _provedores_configurados(
+        self,
+        cargo: str,
+        localizacao: str,
+        ao_receber_vaga: Callable[[Dict[str, Any]], None] = None
+    ) -> List[Provedor]:
+        """
+        APIs com credencial configurada, na ordem de preferência original
+        
+        `ao_receber_vaga` vai para o ScrapingBee, o único que entrega a
+        listagem antes de terminar
+        """
+        provedores = []
+        
+        # ScraperAPI (paga por requisição - $0.001/request)
         scraperapi_key = os.getenv('SCRAPERAPI_KEY')
         if scraperapi_key:
-            print("\n🔧 Usando ScraperAPI (paga por requisição)...")
-            vagas_scraper = self._coletar_via_scraperapi(cargo, localizacao, limite, scraperapi_key)
-            vagas_total.extend(vagas_scraper)
-            print(f"   ✅ ScraperAPI: {len(vagas_scraper)} vagas")
+            provedores.append(("scraperapi", lambda n, cancelado: self._coletar_via_scraperapi(cargo, localizacao, n, scraperapi_key)))
         
-        # 2. ESTRATÉGIA 2: Apify (Paga por requisição - desde $0.04/request)
+        # Apify (paga por requisição - desde $0.04/request)
         apify_token = os.getenv('APIFY_TOKEN')
-        if apify_token and len(vagas_total) < limite:
-            print("\n🤖 Usando Apify LinkedIn Scraper...")
-            vagas_apify = self._coletar_via_apify(cargo, localizacao, limite - len(vagas_total), apify_token)
-            vagas_total.extend(vagas_apify)
-            print(f"   ✅ Apify: {len(vagas_apify)} vagas")
+        if apify_token:
+            provedores.append(("apify", lambda n, cancelado: self._coletar_via_apify(cargo, localizacao, n, apify_token, cancelado)))
         
-        # 3. ESTRATÉGIA 3: ScrapingBee API (1000 créditos grátis, depois $0.002/request)
+        # ScrapingBee (1000 créditos grátis, depois $0.002/request)
         scrapingbee_key = os.getenv('SCRAPINGBEE_API_KEY')
-        if scrapingbee_key and len(vagas_total) < limite:
-            print("\n🐝 Usando ScrapingBee...")
-            vagas_bee = self._coletar_via_scrapingbee(cargo, localizacao, limite - len(vagas_total), scrapingbee_key)
-            vagas_total.extend(vagas_bee)
-            print(f"   ✅ ScrapingBee: {len(vagas_bee)} vagas")
-        
-        # 3. ESTRATÉGIA 3: Selenium Undetected
-        if len(vagas_total) < limite:
-            print("\n🤖 Usando Selenium Undetected...")
-            vagas_selenium = self._coletar_via_selenium_undetected(cargo, localizacao, limite - len(vagas_total))
-            vagas_total.extend(vagas_selenium)
-            print(f"   ✅ Selenium: {len(vagas_selenium)} vagas")
-        
-        # 4. ESTRATÉGIA 4: LinkedIn Voyager API (não oficial mas funciona)
-        if len(vagas_total) < limite:
-            print("\n🚢 Usando LinkedIn Voyager API...")
-            vagas_voyager = self._coletar_via_voyager_api(cargo, localizacao, limite - len(vagas_total))
-            vagas_total.extend(vagas_voyager)
-            print(f"   ✅ Voyager: {len(vagas_voyager)} vagas")
+        if scrapingbee_key:
+            provedores.append(("scrapingbee", lambda n, cancelado: self._coletar_via_scrapingbee(cargo, localizacao, n, scrapingbee_key, cancelado, ao_receber_vaga)))
         
-        print(f"\n✅ TOTAL COLETADO: {len(vagas_total)} vagas do LinkedIn")
-        return vagas_total[:limite]
+        # LinkedIn Voyager API (não oficial, requer o cookie li_at)
+        if os.getenv('LINKEDIN_LI_AT_COOKIE'):
+            provedores.append(("voyager", lambda n, cancelado: self._coletar_via_voyager_api(cargo, localizacao, n)))
+        
+        return provedores
+    
+    @staticmethod
+    def _cotas_configuradas() -> Dict[str, int]:
+        """Cotas por provedor em LINKEDIN_COTAS ("scraperapi=50,apify=100")"""
+        cotas = {}
+        for item in os.getenv('LINKEDIN_COTAS', '').split(','):
+            nome, _, valor = item.partition('=')
+            if nome.strip() and valor.strip().isdigit():
+                cotas[nome.strip().lower()] = int(valor)
+        return cotas
+    
+    def _coletar_em_sequencia(
+        self,
+        provedores: List[Provedor],
+        limite: int,
+        ao_receber_vaga: Callable[[Dict[str, Any]], None] = None
+    ) -> List[Dict[str, Any]]:
+        """Cascata original: cada provedor só começa depois do anterior, com o que faltar"""
+        vagas_total = []
+        self.estatisticas_provedores = {}
+        for nome, coletar in provedores:
+            if len(vagas_total) >= limite:
+                break
+            print(f"\n🔧 Usando {nome}...")
+            inicio = time.monotonic()
+            vagas = coletar(limite - len(vagas_total), threading.Event())
+            vagas_total.extend(vagas)
+            if ao_receber_vaga:
+                for vaga in vagas:
+                    ao_receber_vaga(dict(vaga))
+            self.estatisticas_provedores[nome] = {
+                "status": "ok" if vagas else "vazio",
+                "latencia_segundos": round(time.monotonic() - inicio, 2),
+                "recebidas": len(vagas),
+                "novas": len(vagas)
+            }
+            print(f"   ✅ {nome}: {len(vagas)} vagas")
+        return vagas_total
+    
+    def _coletar_em_paralelo(
+        self,
+        provedores: List[Provedor],
+        limite: int,
+        cotas: Dict[str, int],
+        indice: NearDuplicateIndex = None,
+        ao_receber_vaga: Callable[[Dict[str, Any]], None] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Dispara os provedores juntos e junta as vagas novas conforme chegam
+        (cada vaga nova também vai para `ao_receber_vaga`, se informado)
+        
+        Provedores que ainda não terminaram quando o limite é atingido (ou
+        quando LINKEDIN_TIMEOUT_SEGUNDOS expira) recebem o sinal de
+        cancelamento; as chamadas HTTP já em curso terminam na thread delas
+        e o resultado é descartado.
+        """
+        if indice is None:
+            self._indice_coleta = indice = NearDuplicateIndex()
+            self.estatisticas_provedores = {}
+        if not provedores or limite <= 0:
+            return []
+        
+        timeout = float(os.getenv('LINKEDIN_TIMEOUT_SEGUNDOS', '180'))
+        cancelado = threading.Event()
+        vagas_total = []
+        inicio = time.monotonic()
+        
+        executor = ThreadPoolExecutor(max_workers=len(provedores), thread_name_prefix="linkedin")
+        futuros = {}
+        for nome, coletar in provedores:
+            cota = min(limite, cotas.get(nome, limite))
+            futuros[executor.submit(coletar, cota, cancelado)] = nome
+            self.estatisticas_provedores[nome] = {"status": "executando", "cota": cota}
+        print(f"\n⚡ Coletando em paralelo: {', '.join(futuros.values())}")
+        
+        try:
+            for futuro in as_completed(futuros, timeout=timeout):
+                nome = futuros.pop(futuro)
+                stats = self.estatisticas_provedores[nome]
+                stats["latencia_segundos"] = round(time.monotonic() - inicio, 2)
+                try:
+                    vagas = futuro.result()
+                except Exception as e:
+                    print(f"   ❌ {nome}: {e}")
+                    stats.update(status="erro", erro=str(e), recebidas=0, novas=0)
+                    continue
+                
+                novas = 0
+                for vaga in vagas:
+                    if len(vagas_total) >= limite:
+                        break
+                    if indice.adicionar(vaga):
+                        vagas_total.append(vaga)
+                        novas += 1
+                        if ao_receber_vaga:
+                            ao_receber_vaga(dict(vaga))
+                stats.update(
+                    status="ok" if vagas else "vazio",
+                    recebidas=len(vagas),
+                    novas=novas,
+                    rendimento=round(novas / len(vagas), 3) if vagas else 0.0
+                )
+                print(f"   ✅ {nome}: {len(vagas)} vagas, {novas} novas em {stats['latencia_segundos']}s")
+                
+                if len(vagas_total) >= limite:
+                    break
+        except FuturesTimeout:
+            print(f"   ⏰ Timeout de {timeout:.0f}s: cancelando provedores lentos")
+        finally:
+            # Limite atingido (ou timeout): os que faltam não seguram a coleta
+            cancelado.set()
+            for futuro, nome in futuros.items():
+                futuro.cancel()
+                self.estatisticas_provedores[nome].update(
+                    status="cancelado",
+                    latencia_segundos=round(time.monotonic() - inicio, 2)
+                )
+                print(f"   🛑 {nome}: cancelado")
+            executor.shutdown(wait=False)
+        
+        return vagas_total
     
     def _coletar_via_scraperapi(self, cargo: str, localizacao: str, limite: int, api_key: str) -> List[Dict[str, Any]]:
         """
@@ -108,7 +319,7 @@ class LinkedInScraperPro:
             }
             
             print(f"   🔍 Buscando vagas no LinkedIn para '{cargo}'...")
-            response = requests.get(url, params=params, timeout=60)
+            response = self.session.get(url, params=params, timeout=60)
             
             if response.status_code == 200:
                 # Se retornou Markdown, processa de forma diferente
@@ -264,7 +475,14 @@ class LinkedInScraperPro:
         
         return ""
     
-    def _coletar_via_apify(self, cargo: str, localizacao: str, limite: int, api_token: str) -> List[Dict[str, Any]]:
+    def _coletar_via_apify(
+        self,
+        cargo: str,
+        localizacao: str,
+        limite: int,
+        api_token: str,
+        cancelado: threading.Event = None
+    ) -> List[Dict[str, Any]]:
         """
         Apify - LinkedIn Jobs Scraper
         https://apify.com/bebity/linkedin-jobs-scraper
@@ -297,43 +515,57 @@ class LinkedInScraperPro:
             }
             
             # Inicia o scraper
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.session.post(url, json=payload, headers=headers)
             
             if response.status_code in [200, 201]:
                 run_info = response.json()
                 run_id = run_info['data']['id']
                 
-                # Aguarda conclusão (polling)
+                # Aguarda conclusão com long-poll (até 60 segundos); na coleta
+                # paralela, em fatias curtas para atender ao cancelamento
+                if cancelado is None:
+                    aguardar_run(run_id, api_token, timeout_segundos=60)
+                else:
+                    prazo = time.monotonic() + 60
+                    while time.monotonic() < prazo and not cancelado.is_set():
+                        run = consultar_run(run_id, api_token, espera_segundos=max(1, min(10, prazo - time.monotonic())))
+                        if run is None:
+                            time.sleep(1)
+                        elif run.get('status') in STATUS_FINAIS:
+                            break
+                
+                if cancelado and cancelado.is_set():
+                    # Outros provedores já completaram o limite: não pagar pelo resto do run
+                    self.session.post(f"https://api.apify.com/v2/actor-runs/{run_id}/abort", headers=headers, timeout=10)
+                    return vagas
+                
                 dataset_url = f"https://api.apify.com/v2/actor-runs/{run_id}/dataset/items"
                 
-                for _ in range(60):  # Tenta por até 60 segundos
-                    time.sleep(1)
-                    result = requests.get(dataset_url, headers=headers)
+                result = self.session.get(dataset_url, headers=headers)
+                
+                if result.status_code == 200:
+                    jobs = result.json()
                     
-                    if result.status_code == 200:
-                        jobs = result.json()
-                        
-                        for job in jobs[:limite]:
-                            vaga = {
-                                "titulo": job.get('title', cargo),
-                                "empresa": job.get('companyName', ''),
-                                "localizacao": job.get('location', localizacao),
-                                "descricao": job.get('description', ''),
-                                "fonte": "linkedin_apify",
-                                "url": job.get('link', ''),
-                                "data_coleta": datetime.now().isoformat(),
-                                "cargo_pesquisado": cargo,
-                                "salario": job.get('salary', ''),
-                                "tipo_emprego": job.get('employmentType', ''),
-                                "nivel_experiencia": job.get('experienceLevel', ''),
-                                "aplicantes": job.get('applicantCount', 0),
-                                "data_publicacao": job.get('postedAt', ''),
-                                "habilidades": job.get('skills', []),
-                                "api_paga_por_request": True,
-                                "custo_estimado": "$0.04-$0.10"
-                            }
-                            vagas.append(vaga)
-                        break
+                    for job in jobs[:limite]:
+                        vaga = {
+                            "titulo": job.get('title', cargo),
+                            "empresa": job.get('companyName', ''),
+                            "localizacao": job.get('location', localizacao),
+                            "descricao": job.get('description', ''),
+                            "fonte": "linkedin_apify",
+                            "url": job.get('link', ''),
+                            "data_coleta": datetime.now().isoformat(),
+                            "cargo_pesquisado": cargo,
+                            "salario": job.get('salary', ''),
+                            "tipo_emprego": job.get('employmentType', ''),
+                            "nivel_experiencia": job.get('experienceLevel', ''),
+                            "aplicantes": job.get('applicantCount', 0),
+                            "data_publicacao": job.get('postedAt', ''),
+                            "habilidades": job.get('skills', []),
+                            "api_paga_por_request": True,
+                            "custo_estimado": "$0.04-$0.10"
+                        }
+                        vagas.append(vaga)
                         
         except Exception as e:
             print(f"   ❌ Erro Apify: {e}")
@@ -369,7 +601,7 @@ class LinkedInScraperPro:
                 }
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.session.post(url, json=payload, headers=headers)
             
             if response.status_code == 200:
                 # Aguarda processamento
@@ -380,7 +612,7 @@ class LinkedInScraperPro:
                 
                 for _ in range(30):  # Tenta por 30 segundos
                     time.sleep(1)
-                    result = requests.get(result_url, headers=headers)
+                    result = self.session.get(result_url, headers=headers)
                     
                     if result.status_code == 200:
                         data = result.json()
@@ -416,10 +648,23 @@ class LinkedInScraperPro:
         
         return vagas
     
-    def _coletar_via_scrapingbee(self, cargo: str, localizacao: str, limite: int, api_key: str) -> List[Dict[str, Any]]:
+    def _coletar_via_scrapingbee(
+        self,
+        cargo: str,
+        localizacao: str,
+        limite: int,
+        api_key: str,
+        cancelado: threading.Event = None,
+        ao_receber_vaga: Callable[[Dict[str, Any]], None] = None
+    ) -> List[Dict[str, Any]]:
         """
         ScrapingBee - API de scraping com renderização JavaScript
         https://www.scrapingbee.com/
+        
+        Cada vaga da listagem é repassada na hora a `ao_receber_vaga`, ainda
+        sem descrição ("detalhes_pendentes": True); os detalhes são buscados
+        em paralelo (_enriquecer_vagas_scrapingbee) e cada vaga completa é
+        repassada de novo, com a mesma url, assim que o detalhe chega.
         """
         vagas = []
         
@@ -454,42 +699,121 @@ class LinkedInScraperPro:
                 })
             }
             
-            response = requests.get(url, params=params)
+            self._limitador_scrapingbee().adquirir()
+            response = self.session.get(url, params=params, timeout=self._timeout_scrapingbee())
             
             if response.status_code == 200:
                 data = response.json()
                 jobs = data.get('jobs', [])
                 
-                for i, job in enumerate(jobs[:limite]):
-                    # Para cada vaga, faz scraping detalhado
-                    if job.get('link'):
-                        detalhes = self._get_job_details_scrapingbee(job['link'], api_key)
-                        
-                        vaga = {
-                            "titulo": job.get('title', cargo),
-                            "empresa": job.get('company', ''),
-                            "localizacao": job.get('location', localizacao),
-                            "descricao": detalhes.get('description', ''),
-                            "fonte": "linkedin_scrapingbee",
-                            "url": job.get('link', ''),
-                            "data_coleta": datetime.now().isoformat(),
-                            "cargo_pesquisado": cargo,
-                            "requisitos": detalhes.get('requirements', ''),
-                            "beneficios": detalhes.get('benefits', ''),
-                            "tipo_emprego": detalhes.get('employment_type', ''),
-                            "api_paga": True
-                        }
-                        vagas.append(vaga)
-                        
-                        # Rate limiting
-                        if i < len(jobs) - 1:
-                            time.sleep(1)
+                # Vagas da listagem seguem imediatamente; os detalhes completam depois
+                for job in jobs[:limite]:
+                    if not job.get('link'):
+                        continue
+                    vaga = {
+                        "titulo": job.get('title', cargo),
+                        "empresa": job.get('company', ''),
+                        "localizacao": job.get('location', localizacao),
+                        "descricao": '',
+                        "fonte": "linkedin_scrapingbee",
+                        "url": job.get('link', ''),
+                        "data_coleta": datetime.now().isoformat(),
+                        "cargo_pesquisado": cargo,
+                        "requisitos": '',
+                        "beneficios": '',
+                        "tipo_emprego": '',
+                        "api_paga": True,
+                        "detalhes_pendentes": True
+                    }
+                    vagas.append(vaga)
+                    if ao_receber_vaga:
+                        ao_receber_vaga(dict(vaga))
+                
+                self._enriquecer_vagas_scrapingbee(vagas, api_key, cancelado, ao_receber_vaga)
                             
         except Exception as e:
             print(f"   ❌ Erro ScrapingBee: {e}")
         
         return vagas
     
+    def _limitador_scrapingbee(self):
+        """Limite de requisições por minuto ao ScrapingBee, compartilhado no processo"""
+        return obter_limitador("scrapingbee", float(os.getenv('SCRAPINGBEE_REQUISICOES_POR_MINUTO', '60')))
+    
+    @staticmethod
+    def _timeout_scrapingbee() -> tuple:
+        """(conexão, leitura): a renderização com JavaScript passa bem do timeout padrão"""
+        return (10, float(os.getenv('SCRAPINGBEE_TIMEOUT_SEGUNDOS', '60')))
+    
+    def _enriquecer_vagas_scrapingbee(
+        self,
+        vagas: List[Dict[str, Any]],
+        api_key: str,
+        cancelado: threading.Event = None,
+        ao_receber_vaga: Callable[[Dict[str, Any]], None] = None
+    ) -> int:
+        """
+        Busca os detalhes das vagas em paralelo e preenche cada uma conforme chega
+        
+        Até SCRAPINGBEE_MAX_CONCORRENCIA renderizações simultâneas, dentro do
+        limite de requisições por minuto do provedor. Vagas cujo detalhe falha
+        ou não chega até SCRAPINGBEE_PRAZO_DETALHES_SEGUNDOS (ou à coleta ser
+        cancelada) ficam só com os dados da listagem. As vagas só são
+        alteradas nesta thread: uma busca que termina depois do prazo é
+        descartada.
+        
+        Returns:
+            Quantidade de vagas enriquecidas
+        """
+        if not vagas:
+            return 0
+        
+        max_concorrencia = int(os.getenv('SCRAPINGBEE_MAX_CONCORRENCIA', '5'))
+        prazo = float(os.getenv('SCRAPINGBEE_PRAZO_DETALHES_SEGUNDOS', '120'))
+        limitador = self._limitador_scrapingbee()
+        
+        def buscar(vaga: Dict[str, Any]) -> Dict[str, Any]:
+            if cancelado and cancelado.is_set():
+                return {}
+            limitador.adquirir()
+            if cancelado and cancelado.is_set():
+                return {}
+            return self._get_job_details_scrapingbee(vaga['url'], api_key)
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_concorrencia, len(vagas)), thread_name_prefix="scrapingbee")
+        futuros = {executor.submit(buscar, vaga): vaga for vaga in vagas}
+        enriquecidas = 0
+        inicio = time.monotonic()
+        
+        try:
+            for futuro in as_completed(futuros, timeout=prazo):
+                if cancelado and cancelado.is_set():
+                    break
+                detalhes = futuro.result()
+                if not detalhes:
+                    continue
+                
+                vaga = futuros[futuro]
+                vaga.update(
+                    descricao=detalhes.get('description', ''),
+                    requisitos=detalhes.get('requirements', ''),
+                    beneficios=detalhes.get('benefits', ''),
+                    tipo_emprego=detalhes.get('employment_type', ''),
+                    detalhes_pendentes=False
+                )
+                enriquecidas += 1
+                if ao_receber_vaga:
+                    ao_receber_vaga(dict(vaga))
+        except FuturesTimeout:
+            print(f"   ⏰ ScrapingBee: prazo de {prazo:.0f}s para os detalhes esgotado")
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+            executor.shutdown(wait=False)
+        
+        print(f"   🐝 ScrapingBee: detalhes de {enriquecidas}/{len(vagas)} vagas em {time.monotonic() - inicio:.1f}s")
+        return enriquecidas
+    
     def _get_job_details_scrapingbee(self, job_url: str, api_key: str) -> Dict[str, Any]:
         """
         Obtém detalhes de uma vaga específica
@@ -509,7 +833,7 @@ class LinkedInScraperPro:
                 })
             }
             
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=self._timeout_scrapingbee())
             
             if response.status_code == 200:
                 return response.json()
@@ -519,7 +843,13 @@ class LinkedInScraperPro:
         
         return {}
     
-    def _coletar_via_selenium_undetected(self, cargo: str, localizacao: str, limite: int) -> List[Dict[str, Any]]:
+    def _coletar_via_selenium_undetected(
+        self,
+        cargo: str,
+        localizacao: str,
+        limite: int,
+        cancelado: threading.Event = None
+    ) -> List[Dict[str, Any]]:
         """
         Selenium com undetected-chromedriver para evitar detecção
         """
@@ -557,6 +887,8 @@ class LinkedInScraperPro:
             )
             
             for i, card in enumerate(job_cards[:limite]):
+                if cancelado and cancelado.is_set():
+                    break
                 try:
                     # Extrai informações
                     titulo = card.find_element(By.CSS_SELECTOR, "h3.base-search-card__title").text
@@ -628,7 +960,7 @@ class LinkedInScraperPro:
                 'start': 0
             }
             
-            response = self.session.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers={**self.headers, **headers}, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,174 @@
+"""
+Cache persistente de respostas de LLM - Sistema HELIO
+Endereçado por conteúdo: a chave é o hash do texto normalizado enviado ao
+modelo + versão do prompt + modelo. Armazenado em SQLite com TTL e
+remoção LRU quando o arquivo ultrapassa o tamanho máximo configurado.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+
+class LLMCache:
+    """
+    Cache chave/valor em SQLite para resultados de extração via IA
+
+    Configuração por variáveis de ambiente:
+        LLM_CACHE_PATH: caminho do arquivo (padrão .cache/llm_cache.sqlite3)
+        LLM_CACHE_TTL_HORAS: validade de cada entrada (padrão 168h = 7 dias)
+        LLM_CACHE_MAX_MB: tamanho máximo somado dos valores (padrão 64 MB)
+        LLM_CACHE_DESATIVADO: "1" para ignorar o cache completamente
+    """
+
+    def __init__(
+        self,
+        caminho: str = None,
+        ttl_segundos: float = None,
+        max_bytes: int = None
+    ):
+        self.caminho = caminho or os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_cache.sqlite3'))
+        self.ttl_segundos = ttl_segundos if ttl_segundos is not None else float(os.getenv('LLM_CACHE_TTL_HORAS', '168')) * 3600
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv('LLM_CACHE_MAX_MB', '64')) * 1024 * 1024)
+        self.ativo = os.getenv('LLM_CACHE_DESATIVADO', '0') != '1'
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalizar_texto(texto: str) -> str:
+        """Normaliza unicode e espaços para que textos equivalentes gerem a mesma chave"""
+        texto = unicodedata.normalize('NFC', texto or '')
+        return re.sub(r'\s+', ' ', texto).strip()
+
+    @classmethod
+    def gerar_chave(cls, partes: Iterable[str], versao_prompt: str, modelo: str) -> str:
+        """Gera a chave SHA-256 a partir do conteúdo normalizado, versão do prompt e modelo"""
+        h = hashlib.sha256()
+        h.update(f"{versao_prompt}\x1f{modelo}".encode('utf-8'))
+        for parte in partes:
+            h.update(b'\x1e')
+            h.update(cls.normalizar_texto(parte).encode('utf-8'))
+        return h.hexdigest()
+
+    def _conexao(self) -> sqlite3.Connection:
+        if self._conn is None:
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            self._conn = sqlite3.connect(self.caminho, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS respostas_llm (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT NOT NULL,
+                    modelo TEXT,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    acessado_em REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_respostas_llm_acesso ON respostas_llm (acessado_em)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        """Retorna o valor em cache (ou None se ausente/expirado)"""
+        if not self.ativo:
+            return None
+
+        try:
+            with self._lock:
+                conn = self._conexao()
+                linha = conn.execute(
+                    "SELECT valor, criado_em FROM respostas_llm WHERE chave = ?", (chave,)
+                ).fetchone()
+
+                agora = time.time()
+                if linha is None or agora - linha[1] > self.ttl_segundos:
+                    if linha is not None:
+                        conn.execute("DELETE FROM respostas_llm WHERE chave = ?", (chave,))
+                        conn.commit()
+                    self.misses += 1
+                    return None
+
+                conn.execute("UPDATE respostas_llm SET acessado_em = ? WHERE chave = ?", (agora, chave))
+                conn.commit()
+                self.hits += 1
+                return json.loads(linha[0])
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️ Cache LLM indisponível (leitura): {e}")
+            return None
+
+    def salvar(self, chave: str, valor: Dict[str, Any], modelo: str = None):
+        """Grava um resultado e aplica a remoção LRU se necessário"""
+        if not self.ativo or valor is None:
+            return
+
+        try:
+            serializado = json.dumps(valor, ensure_ascii=False)
+            agora = time.time()
+            with self._lock:
+                conn = self._conexao()
+                conn.execute(
+                    "INSERT OR REPLACE INTO respostas_llm (chave, valor, modelo, tamanho, criado_em, acessado_em) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (chave, serializado, modelo, len(serializado.encode('utf-8')), agora, agora)
+                )
+                self._remover_excedente(conn, agora)
+                conn.commit()
+
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"⚠️ Cache LLM indisponível (escrita): {e}")
+
+    def _remover_excedente(self, conn: sqlite3.Connection, agora: float):
+        """Remove entradas expiradas e, se ainda acima do limite, as menos usadas recentemente"""
+        conn.execute("DELETE FROM respostas_llm WHERE criado_em < ?", (agora - self.ttl_segundos,))
+
+        total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas_llm").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excedente = total - self.max_bytes
+        removidas = []
+        for chave, tamanho in conn.execute("SELECT chave, tamanho FROM respostas_llm ORDER BY acessado_em ASC"):
+            removidas.append((chave,))
+            excedente -= tamanho
+            if excedente <= 0:
+                break
+        conn.executemany("DELETE FROM respostas_llm WHERE chave = ?", removidas)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Resumo de uso do cache neste processo"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "ativo": self.ativo
+        }
+
+
+_cache_global = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_llm() -> LLMCache:
+    """Retorna a instância compartilhada do cache (uma por processo)"""
+    global _cache_global
+    if _cache_global is None:
+        with _cache_lock:
+            if _cache_global is None:
+                _cache_global = LLMCache()
+    return _cache_global
@@ -0,0 +1,306 @@
+"""
+Roteador de LLMs - Sistema HELIO
+Escolhe o provedor de IA pela saúde e latência recentes (p50/p95 e taxa de
+erro numa janela móvel), dispara uma requisição reserva (hedge) quando a
+principal passa do p95 do seu provedor, fica com a primeira resposta
+válida e limita as chamadas simultâneas de cada provedor no processo.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .native_threads import Condicao, FilaVazia, criar_executor, criar_fila, criar_lock, executar_em_thread
+
+
+@dataclass
+class ProvedorLLM:
+    """
+    Um provedor candidato para uma chamada
+
+    `nome` identifica o provedor nas estatísticas (ex.: "gemini-2.5-flash");
+    `chamar` faz a chamada síncrona ao SDK e roda numa thread do roteador.
+    """
+    nome: str
+    chamar: Callable[[], Any]
+
+
+class EstatisticasProvedor:
+    """Janela móvel das últimas chamadas de um provedor"""
+
+    def __init__(self, janela: int):
+        self.latencias = deque(maxlen=janela)  # só chamadas com sucesso
+        self.resultados = deque(maxlen=janela)  # True = sucesso
+        self.em_uso = 0
+        self.chamadas = 0
+        self.erros = 0
+        self.hedges = 0  # reservas disparadas porque este provedor demorou
+        self.descartadas = 0  # chamadas que perderam a corrida
+
+    def registrar(self, latencia: float, sucesso: bool):
+        self.chamadas += 1
+        self.resultados.append(sucesso)
+        if sucesso:
+            self.latencias.append(latencia)
+        else:
+            self.erros += 1
+
+    def percentil(self, p: float) -> Optional[float]:
+        if not self.latencias:
+            return None
+        ordenadas = sorted(self.latencias)
+        return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+    @property
+    def taxa_erro(self) -> float:
+        return self.resultados.count(False) / len(self.resultados) if self.resultados else 0.0
+
+
+class RoteadorLLM:
+    """
+    Roteamento com failover, hedge e orçamento de concorrência
+
+    Ordem de tentativa: provedores saudáveis primeiro (na ordem de
+    preferência recebida, ou pelo p50 quando todos já têm amostras
+    suficientes), depois os com taxa de erro acima do limite. Uma falha
+    dispara o próximo provedor na hora; uma demora acima do p95 do
+    principal dispara o próximo em paralelo (uma reserva por chamada).
+
+    Os SDKs são síncronos, então a chamada que perde a corrida não pode
+    ser interrompida: se ainda não começou é cancelada, senão segue até o
+    fim numa thread, com o resultado descartado e a vaga do orçamento
+    ocupada até lá (a latência dela ainda entra nas estatísticas).
+
+    Configuração por variáveis de ambiente:
+        LLM_ROUTER_MAX_CONCORRENCIA: chamadas simultâneas por provedor (padrão 4)
+        LLM_ROUTER_JANELA: chamadas na janela móvel de cada provedor (padrão 50)
+        LLM_ROUTER_AMOSTRAS_MINIMAS: amostras para confiar no p50/p95 (padrão 5)
+        LLM_ROUTER_ERRO_MAXIMO: taxa de erro que rebaixa o provedor (padrão 0.5)
+        LLM_ROUTER_ATRASO_HEDGE_SEGUNDOS: espera antes da reserva sem p95 conhecido (padrão 20)
+        LLM_ROUTER_HEDGE: "0" desativa as requisições reserva
+    """
+
+    def __init__(
+        self,
+        max_concorrencia: int = None,
+        janela: int = None,
+        amostras_minimas: int = None,
+        erro_maximo: float = None,
+        atraso_hedge_padrao: float = None,
+        hedge: bool = None,
+        espera_orcamento: float = 60.0
+    ):
+        self.max_concorrencia = max_concorrencia or int(os.getenv('LLM_ROUTER_MAX_CONCORRENCIA', '4'))
+        self.janela = janela or int(os.getenv('LLM_ROUTER_JANELA', '50'))
+        self.amostras_minimas = amostras_minimas or int(os.getenv('LLM_ROUTER_AMOSTRAS_MINIMAS', '5'))
+        self.erro_maximo = erro_maximo if erro_maximo is not None else float(os.getenv('LLM_ROUTER_ERRO_MAXIMO', '0.5'))
+        self.atraso_hedge_padrao = atraso_hedge_padrao if atraso_hedge_padrao is not None else float(os.getenv('LLM_ROUTER_ATRASO_HEDGE_SEGUNDOS', '20'))
+        self.hedge = hedge if hedge is not None else os.getenv('LLM_ROUTER_HEDGE', '1') != '0'
+        self.espera_orcamento = espera_orcamento
+
+        self._estatisticas: Dict[str, EstatisticasProvedor] = {}
+        # Locks do sistema: as chamadas terminam em threads nativas também sob gevent
+        self._lock = criar_lock()
+        self._vaga_liberada = Condicao(self._lock)
+        self._executor = criar_executor(32, "llm-router")
+
+    # ------------------------------------------------------------------
+    # Estado por provedor
+    # ------------------------------------------------------------------
+
+    def _stats(self, nome: str) -> EstatisticasProvedor:
+        stats = self._estatisticas.get(nome)
+        if stats is None:
+            stats = self._estatisticas.setdefault(nome, EstatisticasProvedor(self.janela))
+        return stats
+
+    def _reservar(self, nome: str) -> bool:
+        with self._lock:
+            stats = self._stats(nome)
+            if stats.em_uso >= self.max_concorrencia:
+                return False
+            stats.em_uso += 1
+            return True
+
+    def _liberar(self, nome: str):
+        with self._lock:
+            self._stats(nome).em_uso -= 1
+            self._vaga_liberada.notify_all()
+
+    def _saudavel(self, stats: EstatisticasProvedor) -> bool:
+        return len(stats.resultados) < self.amostras_minimas or stats.taxa_erro <= self.erro_maximo
+
+    def ordenar(self, provedores: List[ProvedorLLM]) -> List[ProvedorLLM]:
+        """Ordem de tentativa: saudáveis (por latência quando conhecida), depois os demais"""
+        with self._lock:
+            stats = {p.nome: self._stats(p.nome) for p in provedores}
+            saudaveis = [p for p in provedores if self._saudavel(stats[p.nome])]
+            rebaixados = [p for p in provedores if not self._saudavel(stats[p.nome])]
+            if all(len(stats[p.nome].latencias) >= self.amostras_minimas for p in saudaveis):
+                saudaveis.sort(key=lambda p: stats[p.nome].percentil(0.5))
+        return saudaveis + rebaixados
+
+    def _atraso_hedge(self, nome: str) -> float:
+        with self._lock:
+            stats = self._stats(nome)
+            if len(stats.latencias) >= self.amostras_minimas:
+                return stats.percentil(0.95)
+        return self.atraso_hedge_padrao
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def _executar_chamada(self, provedor: ProvedorLLM, validar: Optional[Callable[[Any], bool]]) -> Any:
+        inicio = time.perf_counter()
+        sucesso = False
+        try:
+            resultado = provedor.chamar()
+            if validar is not None and not validar(resultado):
+                raise ValueError(f"Resposta inválida de {provedor.nome}")
+            sucesso = True
+            return resultado
+        finally:
+            with self._lock:
+                self._stats(provedor.nome).registrar(time.perf_counter() - inicio, sucesso)
+            self._liberar(provedor.nome)
+
+    def executar_sincrono(
+        self,
+        provedores: List[ProvedorLLM],
+        validar: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, str]:
+        """
+        Executa a chamada no melhor provedor disponível
+
+        Args:
+            provedores: candidatos em ordem de preferência
+            validar: opcional; resposta que retorna False conta como erro
+
+        Returns:
+            (resultado, nome do provedor que respondeu)
+
+        Raises:
+            O último erro, se todos os provedores falharem
+        """
+        if not provedores:
+            raise RuntimeError("Nenhum provedor de IA disponível")
+
+        fila = self.ordenar(provedores)
+        pendentes: Dict[Future, Tuple[ProvedorLLM, float]] = {}
+        # Futuros concluídos chegam por uma fila nativa (wait() do concurrent.futures
+        # usa Event do gevent quando monkey-patched e não bloqueia threads nativas)
+        concluidos = criar_fila()
+        ultimo_erro: Optional[BaseException] = None
+        hedge_disparado = not self.hedge
+
+        def lancar() -> bool:
+            """Dispara o próximo provedor da fila com vaga no orçamento"""
+            limite = time.monotonic() + self.espera_orcamento
+            while fila:
+                for i, provedor in enumerate(fila):
+                    if self._reservar(provedor.nome):
+                        del fila[i]
+                        futuro = self._executor.submit(self._executar_chamada, provedor, validar)
+                        pendentes[futuro] = (provedor, time.monotonic())
+                        futuro.add_done_callback(concluidos.put)
+                        return True
+                # Todos sem vaga: se há chamada em curso, ela decide; senão espera uma vaga
+                if pendentes:
+                    return False
+                with self._lock:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise TimeoutError("Orçamento de concorrência dos provedores de IA esgotado")
+                    self._vaga_liberada.wait(restante)
+            return False
+
+        lancar()
+        while pendentes:
+            timeout = None
+            if not hedge_disparado and fila and len(pendentes) == 1:
+                principal, inicio = next(iter(pendentes.values()))
+                timeout = max(0.0, inicio + self._atraso_hedge(principal.nome) - time.monotonic())
+
+            try:
+                feitos = [concluidos.get(timeout=timeout)]
+            except FilaVazia:
+                feitos = []
+
+            if not feitos:
+                # Principal acima do p95: dispara a reserva sem cancelar o principal
+                hedge_disparado = True
+                if lancar():
+                    with self._lock:
+                        self._stats(principal.nome).hedges += 1
+                    print(f"⏱️ {principal.nome} acima do p95; reserva disparada")
+                continue
+
+            for futuro in feitos:
+                provedor, _ = pendentes.pop(futuro)
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    print(f"⚠️ {provedor.nome} falhou: {e}")
+                    ultimo_erro = e
+                    continue
+
+                # Vencedor: descarta as demais (canceladas se ainda na fila)
+                for perdedor, (outro, _) in pendentes.items():
+                    if perdedor.cancel():
+                        self._liberar(outro.nome)
+                    with self._lock:
+                        self._stats(outro.nome).descartadas += 1
+                return resultado, provedor.nome
+
+            # Falhas: o próximo provedor entra imediatamente
+            if not pendentes:
+                lancar()
+
+        raise ultimo_erro or RuntimeError("Nenhum provedor de IA disponível")
+
+    async def executar(
+        self,
+        provedores: List[ProvedorLLM],
+        validar: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, str]:
+        """Como executar_sincrono, sem bloquear o event loop"""
+        return await executar_em_thread(self.executar_sincrono, provedores, validar)
+
+    def estatisticas(self) -> Dict[str, Dict[str, Any]]:
+        """p50/p95, taxa de erro, uso do orçamento e hedges por provedor"""
+        with self._lock:
+            resumo = {}
+            for nome, stats in self._estatisticas.items():
+                p50, p95 = stats.percentil(0.5), stats.percentil(0.95)
+                resumo[nome] = {
+                    "p50_segundos": round(p50, 3) if p50 is not None else None,
+                    "p95_segundos": round(p95, 3) if p95 is not None else None,
+                    "taxa_erro": round(stats.taxa_erro, 3),
+                    "saudavel": self._saudavel(stats),
+                    "em_uso": stats.em_uso,
+                    "limite_concorrencia": self.max_concorrencia,
+                    "chamadas": stats.chamadas,
+                    "erros": stats.erros,
+                    "hedges": stats.hedges,
+                    "descartadas": stats.descartadas
+                }
+            return resumo
+
+
+_roteador_global = None
+_roteador_lock = threading.Lock()
+
+
+def obter_roteador_llm() -> RoteadorLLM:
+    """Retorna o roteador compartilhado (um por processo, como os clientes)"""
+    global _roteador_global
+    if _roteador_global is None:
+        with _roteador_lock:
+            if _roteador_global is None:
+                _roteador_global = RoteadorLLM()
+    return _roteador_global
@@ -8,14 +8,24 @@ import json
 import logging
 from typing import List, Dict, Any
 from dataclasses import dataclass
-import google.generativeai as genai
-from anthropic import Anthropic
-import openai
 from dotenv import load_dotenv
 
+from .ai_providers import ClienteIA
+from .llm_router import ProvedorLLM, obter_roteador_llm
+from .llm_cache import obter_cache_llm
+from .lru_cache import CacheLRU
+from .job_collection_cache import normalizar_parametro
+
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+# Versão do prompt de expansão (entra na chave do cache persistente)
+VERSAO_PROMPT_LOCALIZACAO = "localizacao-v1"
+
+# Expansões já feitas neste processo, compartilhadas entre requisições
+# (o JobScraper, e com ele o LocationExpander, é recriado a cada coleta)
+_expansoes = CacheLRU(int(os.getenv('QUERY_PLAN_CACHE_MAX', '256')))
+
 
 @dataclass
 class LocalidadeExpandida:
@@ -33,31 +43,17 @@ class LocationExpander:
     Considera mobilidade urbana, mercado de trabalho e preferências
     """
     
+    # Clientes de IA compartilhados, criados só quando a expansão chama a IA.
+    # Gemini é o preferencial (conhecimento geográfico brasileiro), com
+    # Claude e OpenAI como alternativas no roteador (expandir_localizacao)
+    gemini_client = ClienteIA("gemini", "gemini-1.5-pro")
+    anthropic_client = ClienteIA("anthropic")
+    openai_client = ClienteIA("openai")
+    
     def __init__(self):
-        # Configurar clientes de IA
-        self.gemini_client = None
-        self.anthropic_client = None
-        self.openai_client = None
-        
-        # Tentar configurar Gemini (preferencial por ter conhecimento geográfico brasileiro)
-        if os.getenv('GOOGLE_API_KEY'):
-            genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-            self.gemini_client = genai.GenerativeModel('gemini-1.5-pro')
-            logger.info("✅ Gemini configurado para expansão geográfica")
-        
-        # Fallback para Claude
-        elif os.getenv('ANTHROPIC_API_KEY'):
-            self.anthropic_client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-            logger.info("✅ Claude configurado para expansão geográfica")
-        
-        # Fallback para OpenAI
-        elif os.getenv('OPENAI_API_KEY'):
-            openai.api_key = os.getenv('OPENAI_API_KEY')
-            self.openai_client = openai
-            logger.info("✅ OpenAI configurado para expansão geográfica")
-        
-        # Cache de expansões para economizar chamadas
-        self.cache = {}
+        # Se a última expansão pode ser reaproveitada (False quando a IA falhou
+        # e a expansão básica entrou só para não interromper a coleta)
+        self.ultima_expansao_definitiva = True
     
     def expandir_localizacao(
         self,
@@ -77,38 +73,83 @@ class LocationExpander:
             Lista de localizações ordenadas por relevância
         """
         
-        # Verificar cache
-        cache_key = f"{local_base}_{tipo_vaga}_{limite}"
-        if cache_key in self.cache:
-            logger.info(f"📍 Usando cache para {local_base}")
-            return self.cache[cache_key]
+        self.ultima_expansao_definitiva = True
         
         # Para vagas remotas, retornar conjunto padrão
         if tipo_vaga == "remoto":
             return self._locais_remotos_padrao()
         
+        # Cache do processo e, atrás dele, o cache persistente de respostas de
+        # IA: a mesma cidade (sem diferença de acentos/maiúsculas) só vai à
+        # IA uma vez, e todos os processos recebem a mesma expansão
+        chave = (normalizar_parametro(local_base), normalizar_parametro(tipo_vaga), limite)
+        locais_expandidos = _expansoes.obter(chave)
+        if locais_expandidos is not None:
+            logger.info(f"📍 Usando cache para {local_base}")
+            return locais_expandidos
+        
+        cache = obter_cache_llm()
+        chave_persistente = cache.gerar_chave([chave[0], chave[1], str(limite)], VERSAO_PROMPT_LOCALIZACAO, "localizacao")
+        guardado = cache.obter(chave_persistente)
+        if guardado is not None:
+            logger.info(f"📍 Expansão de {local_base} recuperada do cache persistente")
+            _expansoes.salvar(chave, guardado["locais"])
+            return guardado["locais"]
+        
         # Usar IA para expansão inteligente
         locais_expandidos = []
         
         try:
+            # Todos os provedores configurados entram no roteador (Gemini
+            # preferencial); resposta vazia conta como falha e passa ao próximo
+            provedores = []
             if self.gemini_client:
-                locais_expandidos = self._expandir_com_gemini(local_base, tipo_vaga, limite)
-            elif self.anthropic_client:
-                locais_expandidos = self._expandir_com_claude(local_base, tipo_vaga, limite)
-            elif self.openai_client:
-                locais_expandidos = self._expandir_com_openai(local_base, tipo_vaga, limite)
+                provedores.append(ProvedorLLM("gemini-1.5-pro", lambda: self._expandir_com_gemini(local_base, tipo_vaga, limite)))
+            if self.anthropic_client:
+                provedores.append(ProvedorLLM("claude-3-sonnet", lambda: self._expandir_com_claude(local_base, tipo_vaga, limite)))
+            if self.openai_client:
+                provedores.append(ProvedorLLM("gpt-4-turbo", lambda: self._expandir_com_openai(local_base, tipo_vaga, limite)))
+            
+            if provedores:
+                locais_expandidos, modelo = obter_roteador_llm().executar_sincrono(provedores, validar=bool)
+                locais_expandidos = self._ordenar_locais(locais_expandidos)[:limite]
+                cache.salvar(chave_persistente, {"locais": locais_expandidos}, modelo)
             else:
                 logger.warning("⚠️ Nenhuma IA configurada, usando expansão básica")
-                locais_expandidos = self._expansao_basica(local_base, tipo_vaga)
+                locais_expandidos = self._expansao_basica(local_base, tipo_vaga)[:limite]
         
         except Exception as e:
+            # Falha passageira da IA: a expansão básica atende esta coleta,
+            # mas não fica em cache para a próxima tentar a IA de novo
             logger.error(f"❌ Erro na expansão com IA: {e}")
-            locais_expandidos = self._expansao_basica(local_base, tipo_vaga)
+            self.ultima_expansao_definitiva = False
+            return self._expansao_basica(local_base, tipo_vaga)[:limite]
         
-        # Cachear resultado
-        self.cache[cache_key] = locais_expandidos
+        _expansoes.salvar(chave, locais_expandidos)
+        
+        return locais_expandidos
+    
+    @staticmethod
+    def _ordenar_locais(locais: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Ordem estável para a resposta da IA: relevância decrescente, depois
+        distância, sem cidades repetidas (a IA nem sempre respeita o pedido
+        de ordenação)
+        """
+        def numero(valor, padrao):
+            try:
+                return float(valor)
+            except (TypeError, ValueError):
+                return padrao
         
-        return locais_expandidos[:limite]
+        unicos = {}
+        for local in locais:
+            if isinstance(local, dict) and local.get("nome"):
+                unicos.setdefault(normalizar_parametro(local["nome"]), local)
+        return sorted(
+            unicos.values(),
+            key=lambda l: (-numero(l.get("relevancia"), 0.0), numero(l.get("distancia_km"), float("inf")))
+        )
     
     def _expandir_com_gemini(self, local_base: str, tipo_vaga: str, limite: int) -> List[Dict[str, Any]]:
         """
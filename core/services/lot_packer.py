@@ -0,0 +1,159 @@
+"""
+Empacotamento de vagas em lotes por orçamento de tokens - Sistema HELIO
+Estima os tokens de cada vaga, compacta descrições longas preservando as
+seções de requisitos e distribui as vagas em lotes que enchem o prompt
+até o orçamento configurado (bin-packing first-fit decreasing), em vez
+de lotes de tamanho fixo com descrições cortadas em 400 caracteres.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# Estimativa conservadora para português no tokenizador do Gemini
+# (acentos e palavras longas rendem menos caracteres por token que inglês)
+CARACTERES_POR_TOKEN = 3.5
+
+# Cabeçalhos de seção (linha curta começando pela palavra-chave)
+_RE_CABECALHO_REQUISITOS = re.compile(
+    r'^[\W\d_]*(?:requisitos?|pr[eé]-requisitos?|qualifica[çc](?:ão|ões|ao|oes)|exig[eê]ncias?'
+    r'|o que (?:esperamos|buscamos|procuramos)|o que voc[eê] (?:precisa|deve ter|precisa ter)'
+    r'|voc[eê] precisa|perfil|conhecimentos?|habilidades?|compet[eê]ncias?|diferenciais?'
+    r'|desej[aá]vel|desej[aá]veis|experi[eê]ncias?|forma[çc][ãa]o|requirements?|qualifications?'
+    r'|skills?|must[- ]haves?|nice[- ]to[- ]haves?|what you(?:\'ll| will) need'
+    r'|what we(?:\'re| are) looking for)\b',
+    re.IGNORECASE
+)
+_RE_CABECALHO_DESCARTAVEL = re.compile(
+    r'^[\W\d_]*(?:benef[ií]cios?|o que oferecemos|oferecemos|sobre (?:a empresa|n[óo]s)|quem somos'
+    r'|nossa empresa|remunera[çc][ãa]o|sal[áa]rio|regime de contrata[çc][ãa]o|local de trabalho'
+    r'|hor[áa]rio|processo seletivo|etapas do processo|informa[çc](?:ões|oes) adicionais'
+    r'|diversidade|benefits?|perks|about (?:us|the company)|who we are|what we offer'
+    r'|equal opportunit(?:y|ies))\b',
+    re.IGNORECASE
+)
+_RE_CABECALHO_NEUTRO = re.compile(
+    r'^[\W\d_]*(?:responsabilidades?|atividades|atribui[çc](?:ões|oes)|principais atividades'
+    r'|o que voc[eê] (?:vai|ir[áa]) fazer|sobre a vaga|descri[çc][ãa]o da vaga|desafios'
+    r'|responsibilities|what you(?:\'ll| will) do|about the (?:role|job))\b',
+    re.IGNORECASE
+)
+_TAMANHO_MAXIMO_CABECALHO = 60
+
+_RE_ESPACOS = re.compile(r'[ \t\u00a0]+')
+
+# Prioridade das seções quando a descrição não cabe inteira
+PRIORIDADE_REQUISITOS = 0
+PRIORIDADE_NEUTRA = 1
+PRIORIDADE_DESCARTAVEL = 2
+
+
+def estimar_tokens(texto: str) -> int:
+    """Tokens aproximados do texto (sem chamar a API de contagem)"""
+    return int(len(texto) / CARACTERES_POR_TOKEN + 0.999)
+
+
+def _normalizar_espacos(texto: str) -> str:
+    """Remove espaços repetidos e linhas vazias (tokens que não ajudam a IA)"""
+    linhas = (_RE_ESPACOS.sub(' ', linha).strip() for linha in texto.splitlines())
+    return '\n'.join(linha for linha in linhas if linha)
+
+
+def _prioridade_cabecalho(linha: str) -> Optional[int]:
+    """Prioridade da seção que a linha abre, ou None se não é cabeçalho"""
+    if len(linha) > _TAMANHO_MAXIMO_CABECALHO or linha.endswith('.'):
+        return None
+    if _RE_CABECALHO_REQUISITOS.match(linha):
+        return PRIORIDADE_REQUISITOS
+    if _RE_CABECALHO_DESCARTAVEL.match(linha):
+        return PRIORIDADE_DESCARTAVEL
+    if _RE_CABECALHO_NEUTRO.match(linha):
+        return PRIORIDADE_NEUTRA
+    return None
+
+
+def dividir_secoes(texto: str) -> List[Tuple[int, str]]:
+    """
+    Divide a descrição (já normalizada) em seções pelos cabeçalhos
+
+    Returns:
+        Lista de (prioridade, texto da seção) na ordem original; o trecho
+        antes do primeiro cabeçalho tem prioridade neutra
+    """
+    secoes = []
+    prioridade, linhas = PRIORIDADE_NEUTRA, []
+    for linha in texto.split('\n'):
+        nova = _prioridade_cabecalho(linha)
+        if nova is not None:
+            if linhas:
+                secoes.append((prioridade, '\n'.join(linhas)))
+            prioridade, linhas = nova, []
+        linhas.append(linha)
+    if linhas:
+        secoes.append((prioridade, '\n'.join(linhas)))
+    return secoes
+
+
+def compactar_descricao(descricao: str, limite_tokens: int) -> str:
+    """
+    Reduz a descrição ao limite de tokens preservando os requisitos
+
+    Descrições que cabem no limite só têm os espaços normalizados. As
+    demais mantêm as seções por prioridade (requisitos, depois
+    responsabilidades e texto sem cabeçalho, nunca benefícios e
+    institucional), na ordem original; a última seção que não cabe inteira
+    é cortada no limite de uma palavra.
+    """
+    texto = _normalizar_espacos(descricao or '')
+    if estimar_tokens(texto) <= limite_tokens:
+        return texto
+
+    secoes = dividir_secoes(texto)
+    restante = int(limite_tokens * CARACTERES_POR_TOKEN)
+    mantidas = {}
+    for i in sorted(range(len(secoes)), key=lambda i: (secoes[i][0], i)):
+        prioridade, trecho = secoes[i]
+        if prioridade == PRIORIDADE_DESCARTAVEL or restante <= 0:
+            break
+        custo = len(trecho) + (1 if mantidas else 0)  # quebra de linha entre seções
+        if custo <= restante:
+            mantidas[i] = trecho
+            restante -= custo
+            continue
+        corte = trecho[:max(0, restante - 4)].rsplit(' ', 1)[0].rstrip()
+        if corte:
+            mantidas[i] = corte + '...'
+        break
+
+    return '\n'.join(mantidas[i] for i in sorted(mantidas))
+
+
+def empacotar(tokens: Sequence[int], orcamento: int, max_itens: int = None) -> List[List[int]]:
+    """
+    Distribui itens em lotes que respeitam o orçamento (first-fit decreasing)
+
+    Args:
+        tokens: custo estimado de cada item
+        orcamento: tokens disponíveis por lote
+        max_itens: opcional; máximo de itens por lote
+
+    Returns:
+        Índices dos itens de cada lote, em ordem crescente dentro do lote e
+        entre lotes (determinístico, para que o cache de respostas funcione).
+        Um item maior que o orçamento fica sozinho no seu lote.
+    """
+    lotes: List[List[int]] = []
+    livres: List[int] = []
+    for i in sorted(range(len(tokens)), key=lambda i: (-tokens[i], i)):
+        for b, livre in enumerate(livres):
+            if tokens[i] <= livre and (max_itens is None or len(lotes[b]) < max_itens):
+                lotes[b].append(i)
+                livres[b] -= tokens[i]
+                break
+        else:
+            lotes.append([i])
+            livres.append(orcamento - tokens[i])
+
+    for lote in lotes:
+        lote.sort()
+    lotes.sort(key=lambda lote: lote[0])
+    return lotes
@@ -0,0 +1,54 @@
+"""
+Cache LRU em memória - Sistema HELIO
+Memoização compartilhada pelo processo (as instâncias dos serviços são
+recriadas a cada requisição, então um dict por instância nunca acerta).
+Os valores são copiados na entrada e na saída: quem recebe pode alterar
+o resultado sem corromper o que ficou guardado.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class CacheLRU:
+    """Dicionário limitado que descarta a entrada usada há mais tempo"""
+
+    def __init__(self, max_itens: int = 256):
+        self.max_itens = max_itens
+        self._itens: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        """Cópia do valor guardado (ou None) e marca a entrada como usada"""
+        with self._lock:
+            if chave not in self._itens:
+                self.misses += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return copy.deepcopy(self._itens[chave])
+
+    def salvar(self, chave: Hashable, valor: Any):
+        with self._lock:
+            self._itens[chave] = copy.deepcopy(valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "itens": len(self._itens),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0
+            }
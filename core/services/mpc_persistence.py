@@ -0,0 +1,173 @@
+"""
+Persistência em lote do MPC - Sistema HELIO
+Grava vagas, palavras-chave e logs de processamento com poucos comandos
+SQL (INSERT multi-linha / UPDATE em lote) e um único commit por etapa,
+em vez de um db.add + commit por linha.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from core.models import VagaAnalisada, PalavraChave, ProcessamentoMPC
+
+# Limite de parâmetros por comando (SQLite aceita 32766, PostgreSQL 65535)
+_MAX_PARAMETROS_POR_COMANDO = 32000
+
+_CAMPOS_VAGA = ("titulo", "empresa", "localizacao", "descricao", "requisitos", "fonte", "url_original")
+
+
+class PersistenciaMPC:
+    """
+    Camada de gravação em lote usada pelo Agente 1
+
+    Uso típico (uma transação por etapa do pipeline):
+
+        with persistencia.etapa(mpc.id, "coleta_vagas") as log:
+            total = persistencia.inserir_vagas(mpc.id, vagas)
+            log["vagas_processadas"] = total
+
+    Configuração por variável de ambiente:
+        MPC_BULK_TAMANHO_LOTE: linhas por comando INSERT/UPDATE (padrão 500)
+    """
+
+    def __init__(self, db: Session, tamanho_lote: int = None):
+        self.db = db
+        self.tamanho_lote = tamanho_lote or int(os.getenv('MPC_BULK_TAMANHO_LOTE', '500'))
+        self._logs_pendentes: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------
+    # Transação por etapa
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def etapa(self, mpc_id: int, nome: str) -> Iterator[Dict[str, Any]]:
+        """
+        Executa uma etapa do pipeline numa única transação
+
+        O log da etapa (ProcessamentoMPC) é preenchido pelo chamador através
+        do dicionário retornado e gravado junto com os dados, no mesmo commit.
+        Em caso de erro a transação é desfeita e a exceção propagada.
+        """
+        inicio = time.perf_counter()
+        log = self.registrar_log(mpc_id, nome, "executando")
+
+        try:
+            yield log
+            log["status"] = "concluido"
+            log["tempo_processamento"] = round(time.perf_counter() - inicio, 3)
+            self.gravar_logs()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._logs_pendentes.clear()
+            raise
+
+    # ------------------------------------------------------------------
+    # Logs de processamento
+    # ------------------------------------------------------------------
+
+    def registrar_log(self, mpc_id: int, etapa: str, status: str, **campos) -> Dict[str, Any]:
+        """Acumula um log de processamento; só vai ao banco em gravar_logs()"""
+        agora = datetime.utcnow()
+        log = {
+            "mpc_id": mpc_id,
+            "etapa": etapa,
+            "status": status,
+            "vagas_processadas": campos.get("vagas_processadas", 0),
+            "palavras_encontradas": campos.get("palavras_encontradas", 0),
+            "tempo_processamento": campos.get("tempo_processamento"),
+            "erro": campos.get("erro"),
+            "created_at": agora,
+            "updated_at": agora
+        }
+        self._logs_pendentes.append(log)
+        return log
+
+    def gravar_logs(self) -> int:
+        """Grava todos os logs acumulados num único INSERT (sem commit)"""
+        if not self._logs_pendentes:
+            return 0
+
+        agora = datetime.utcnow()
+        for log in self._logs_pendentes:
+            log["updated_at"] = agora
+
+        total = self._inserir(ProcessamentoMPC, self._logs_pendentes)
+        self._logs_pendentes = []
+        return total
+
+    # ------------------------------------------------------------------
+    # Vagas
+    # ------------------------------------------------------------------
+
+    def inserir_vagas(self, mpc_id: int, vagas: Iterable[Dict[str, Any]]) -> int:
+        """Insere as vagas coletadas com INSERT multi-linha (sem commit)"""
+        agora = datetime.utcnow()
+        linhas = []
+        for vaga in vagas:
+            linha = {campo: vaga.get(campo) or "" for campo in _CAMPOS_VAGA}
+            # O scraper usa "url"; a tabela guarda "url_original"
+            linha["url_original"] = vaga.get("url_original") or vaga.get("url") or ""
+            linha.update(mpc_id=mpc_id, processada=False, created_at=agora, updated_at=agora)
+            linhas.append(linha)
+
+        return self._inserir(VagaAnalisada, linhas)
+
+    def atualizar_palavras_vagas(self, palavras_por_vaga: Dict[int, List[str]]) -> int:
+        """Marca as vagas como processadas e grava as palavras extraídas (UPDATE em lote)"""
+        agora = datetime.utcnow()
+        mapeamentos = [
+            {"id": vaga_id, "palavras_extraidas": palavras, "processada": True, "updated_at": agora}
+            for vaga_id, palavras in palavras_por_vaga.items()
+        ]
+
+        for inicio in range(0, len(mapeamentos), self.tamanho_lote):
+            self.db.bulk_update_mappings(VagaAnalisada, mapeamentos[inicio:inicio + self.tamanho_lote])
+
+        return len(mapeamentos)
+
+    # ------------------------------------------------------------------
+    # Palavras-chave
+    # ------------------------------------------------------------------
+
+    def inserir_palavras_chave(self, mpc_id: int, palavras: Iterable[Dict[str, Any]]) -> int:
+        """Insere as palavras-chave categorizadas com INSERT multi-linha (sem commit)"""
+        agora = datetime.utcnow()
+        linhas = [
+            {
+                "mpc_id": mpc_id,
+                "termo": palavra["termo"],
+                "categoria": palavra["categoria"],
+                "frequencia_absoluta": palavra.get("frequencia_absoluta", 0),
+                "frequencia_relativa": palavra.get("frequencia_relativa", 0.0),
+                "importancia": palavra.get("importancia", 0.0),
+                "validada_ia": False,
+                "recomendada_ia": False,
+                "created_at": agora,
+                "updated_at": agora
+            }
+            for palavra in palavras
+        ]
+
+        return self._inserir(PalavraChave, linhas)
+
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+
+    def _inserir(self, modelo, linhas: List[Dict[str, Any]]) -> int:
+        """INSERT ... VALUES (...), (...) em blocos que respeitam o limite de parâmetros"""
+        if not linhas:
+            return 0
+
+        por_comando = max(1, min(self.tamanho_lote, _MAX_PARAMETROS_POR_COMANDO // len(linhas[0])))
+        for inicio in range(0, len(linhas), por_comando):
+            self.db.execute(insert(modelo).values(linhas[inicio:inicio + por_comando]))
+
+        return len(linhas)
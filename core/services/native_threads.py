@@ -0,0 +1,175 @@
+"""
+Threads nativas para chamadas bloqueantes - Sistema HELIO
+Sob o worker gevent (threading monkey-patched), ThreadPoolExecutor e
+asyncio.to_thread criam greenlets dentro da thread atual: as chamadas dos
+SDKs de IA (gRPC nativo do Gemini) passam a rodar uma depois da outra, e um
+executor criado numa thread do hub não pode ser usado por outra. Aqui os
+trabalhadores são threads do sistema com fila nativa, seguras para usar de
+qualquer thread ou greenlet; sem gevent, é o ThreadPoolExecutor de sempre.
+"""
+
+import asyncio
+import functools
+import threading
+from _queue import Empty as FilaVazia, SimpleQueue as _FilaNativa
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+try:
+    from gevent import monkey as gevent_monkey
+except ImportError:
+    gevent_monkey = None
+
+
+def threading_cooperativo() -> bool:
+    """Indica se o módulo threading foi trocado pelo do gevent"""
+    return gevent_monkey is not None and gevent_monkey.is_module_patched('threading')
+
+
+class ExecutorNativo(Executor):
+    """
+    Pool de threads do sistema que ignora o monkey-patching do gevent
+
+    As threads são criadas sob demanda até `max_workers` e encerram após
+    `ocioso_segundos` sem trabalho. Os Futures são os de concurrent.futures,
+    então wait(), as_completed() e asyncio.wrap_future() funcionam normalmente.
+    """
+
+    def __init__(self, max_workers: int, ocioso_segundos: float = 60.0):
+        self._iniciar_thread = gevent_monkey.get_original('_thread', 'start_new_thread')
+        self._lock = criar_lock()
+        self._fila = criar_fila()
+        self.max_workers = max_workers
+        self.ocioso_segundos = ocioso_segundos
+        self._threads = 0
+        self._ociosas = 0
+        self._encerrado = False
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._encerrado:
+                raise RuntimeError("Executor encerrado")
+            futuro = Future()
+            self._fila.put((futuro, fn, args, kwargs))
+            # Só cria thread se as ociosas não dão conta da fila
+            if self._fila.qsize() > self._ociosas and self._threads < self.max_workers:
+                self._threads += 1
+                self._iniciar_thread(self._trabalhar, ())
+        return futuro
+
+    def _trabalhar(self):
+        while True:
+            with self._lock:
+                self._ociosas += 1
+            try:
+                item = self._fila.get(timeout=self.ocioso_segundos)
+            except FilaVazia:
+                item = None
+            with self._lock:
+                self._ociosas -= 1
+                if item is None:
+                    # Timeout ocioso ou encerramento (trabalho que chegou no meio ainda é atendido)
+                    if not self._encerrado and not self._fila.empty():
+                        continue
+                    self._threads -= 1
+                    return
+
+            futuro, fn, args, kwargs = item
+            if futuro.set_running_or_notify_cancel():
+                try:
+                    futuro.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    futuro.set_exception(e)
+            del futuro, fn, args, kwargs, item
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """Encerra as threads (as tarefas já na fila ainda rodam, salvo cancel_futures)"""
+        with self._lock:
+            self._encerrado = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._fila.get_nowait()
+                    except FilaVazia:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            for _ in range(self._threads):
+                self._fila.put(None)
+
+
+def criar_lock():
+    """Lock do sistema: sob gevent, o threading.Lock não bloqueia uma thread nativa"""
+    if threading_cooperativo():
+        return gevent_monkey.get_original('_thread', 'allocate_lock')()
+    return threading.Lock()
+
+
+class Condicao:
+    """
+    threading.Condition sobre locks do sistema
+
+    Sob gevent, a Condition padrão espera num lock do gevent, que não pode
+    bloquear uma thread nativa; esta serve para qualquer thread.
+    """
+
+    def __init__(self, lock=None):
+        self._lock = lock or criar_lock()
+        self._esperando = []
+
+    def __enter__(self):
+        return self._lock.__enter__()
+
+    def __exit__(self, *args):
+        return self._lock.__exit__(*args)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Como Condition.wait: chamar com o lock adquirido"""
+        espera = criar_lock()
+        espera.acquire()
+        self._esperando.append(espera)
+        self._lock.release()
+        try:
+            return espera.acquire(True, -1 if timeout is None else timeout)
+        finally:
+            self._lock.acquire()
+            if espera in self._esperando:
+                self._esperando.remove(espera)
+
+    def notify_all(self):
+        for espera in self._esperando:
+            espera.release()
+        self._esperando.clear()
+
+
+def criar_fila() -> _FilaNativa:
+    """Fila do sistema (a queue.SimpleQueue do gevent não atravessa threads)"""
+    return _FilaNativa()
+
+
+def criar_executor(max_workers: int, prefixo: str = "") -> Executor:
+    """Executor de threads do sistema (nativas também sob gevent)"""
+    if threading_cooperativo():
+        return ExecutorNativo(max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=prefixo)
+
+
+_executor_global = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor_nativo() -> Executor:
+    """Executor compartilhado para chamadas bloqueantes (um por processo)"""
+    global _executor_global
+    if _executor_global is None:
+        with _executor_lock:
+            if _executor_global is None:
+                _executor_global = criar_executor(32, "bloqueante")
+    return _executor_global
+
+
+async def executar_em_thread(fn: Callable, /, *args, **kwargs) -> Any:
+    """Como asyncio.to_thread, mas numa thread do sistema também sob gevent"""
+    if not threading_cooperativo():
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return await asyncio.wrap_future(obter_executor_nativo().submit(functools.partial(fn, *args, **kwargs)))
@@ -0,0 +1,195 @@
+"""
+Índice de vagas quase duplicadas - Sistema HELIO
+MinHash + LSH sobre shingles de título + empresa + descrição, para
+detectar a mesma vaga replicada em Indeed, LinkedIn e Google Jobs com
+títulos ou descrições levemente diferentes.
+"""
+
+import os
+import re
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_RE_PALAVRAS = re.compile(r'\w+')
+
+_MASCARA_64 = (1 << 64) - 1
+
+
+def _hash64(texto: str) -> int:
+    """Hash estável de 64 bits (não depende de PYTHONHASHSEED)"""
+    return int.from_bytes(hashlib.blake2b(texto.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _parametros_lsh(limiar: float, num_permutacoes: int) -> Tuple[int, int]:
+    """
+    Escolhe (bandas, linhas por banda) cujo limiar de colisão
+    (1/bandas) ** (1/linhas) fica mais próximo do limiar desejado
+    """
+    melhor = (num_permutacoes, 1)
+    menor_diferenca = float('inf')
+    for linhas in range(1, num_permutacoes + 1):
+        if num_permutacoes % linhas:
+            continue
+        bandas = num_permutacoes // linhas
+        diferenca = abs((1 / bandas) ** (1 / linhas) - limiar)
+        if diferenca < menor_diferenca:
+            melhor, menor_diferenca = (bandas, linhas), diferenca
+    return melhor
+
+
+class NearDuplicateIndex:
+    """
+    Índice incremental de quase duplicatas
+
+    Cada vaga vira um conjunto de shingles (n-gramas de palavras) e uma
+    assinatura MinHash calculada com uma única passada de hash por shingle
+    (one-permutation hashing com densificação). A assinatura é dividida em
+    bandas; vagas que colidem em alguma banda são candidatas e só então a
+    similaridade estimada é comparada com o limiar. Cada inserção custa
+    O(shingles + bandas + candidatos), independente do total já indexado.
+
+    Só o representante de cada cluster é indexado: duplicatas apenas
+    incrementam o tamanho do cluster.
+
+    Configuração por variáveis de ambiente:
+        DEDUP_LIMIAR_SIMILARIDADE: Jaccard mínimo para considerar duplicata (padrão 0.8)
+        DEDUP_NUM_PERMUTACOES: tamanho da assinatura MinHash (padrão 64)
+    """
+
+    def __init__(
+        self,
+        limiar: float = None,
+        num_permutacoes: int = None,
+        tamanho_shingle: int = 3
+    ):
+        self.limiar = limiar if limiar is not None else float(os.getenv('DEDUP_LIMIAR_SIMILARIDADE', '0.8'))
+        self.num_permutacoes = num_permutacoes or int(os.getenv('DEDUP_NUM_PERMUTACOES', '64'))
+        self.tamanho_shingle = tamanho_shingle
+        self.bandas, self.linhas = _parametros_lsh(self.limiar, self.num_permutacoes)
+
+        # Maior valor possível dentro de um compartimento + 1 (usado na densificação)
+        self._largura = _MASCARA_64 // self.num_permutacoes + 1
+
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bandas)]
+        self._assinaturas: List[Tuple[int, ...]] = []
+        self._tamanhos_clusters: List[int] = []
+        self._chaves_exatas: Dict[str, int] = {}
+
+        self.duplicatas_exatas = 0
+        self.duplicatas_aproximadas = 0
+
+    # ------------------------------------------------------------------
+    # Assinaturas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def texto_vaga(vaga: Dict[str, Any]) -> str:
+        return f"{vaga.get('titulo') or ''} {vaga.get('empresa') or ''} {vaga.get('descricao') or ''}"
+
+    def shingles(self, texto: str) -> set:
+        """n-gramas de palavras do texto em minúsculas"""
+        palavras = _RE_PALAVRAS.findall(texto.casefold())
+        n = self.tamanho_shingle
+        if len(palavras) <= n:
+            return {' '.join(palavras)} if palavras else set()
+        return {' '.join(palavras[i:i + n]) for i in range(len(palavras) - n + 1)}
+
+    def assinatura(self, texto: str) -> Tuple[int, ...]:
+        """
+        Assinatura MinHash por one-permutation hashing
+
+        O hash de cada shingle escolhe um compartimento (resto da divisão)
+        e disputa o mínimo dentro dele (quociente). Compartimentos vazios
+        herdam o valor do próximo compartimento preenchido, deslocado pela
+        distância, para manter a propriedade de colisão do MinHash.
+        """
+        k = self.num_permutacoes
+        minimos: List[Optional[int]] = [None] * k
+        for shingle in self.shingles(texto):
+            h = _hash64(shingle)
+            valor, compartimento = divmod(h, k)
+            atual = minimos[compartimento]
+            if atual is None or valor < atual:
+                minimos[compartimento] = valor
+
+        if all(m is None for m in minimos):
+            return tuple([0] * k)
+
+        # Densificação por rotação
+        assinatura = list(minimos)
+        for i in range(k):
+            if assinatura[i] is None:
+                distancia = 1
+                while minimos[(i + distancia) % k] is None:
+                    distancia += 1
+                assinatura[i] = minimos[(i + distancia) % k] + distancia * self._largura
+        return tuple(assinatura)
+
+    @staticmethod
+    def similaridade_estimada(a: Sequence[int], b: Sequence[int]) -> float:
+        """Fração de posições iguais entre duas assinaturas (estimativa do Jaccard)"""
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+    # ------------------------------------------------------------------
+    # Índice
+    # ------------------------------------------------------------------
+
+    def adicionar(self, vaga: Dict[str, Any]) -> bool:
+        """
+        Indexa uma vaga
+
+        Returns:
+            True se a vaga é nova (abre um cluster), False se é duplicata
+        """
+        # Caminho rápido: mesmo título + empresa (critério original)
+        chave = f"{(vaga.get('titulo') or '').lower()}_{(vaga.get('empresa') or '').lower()}"
+        if chave in self._chaves_exatas:
+            self._tamanhos_clusters[self._chaves_exatas[chave]] += 1
+            self.duplicatas_exatas += 1
+            return False
+
+        assinatura = self.assinatura(self.texto_vaga(vaga))
+        faixas = [
+            assinatura[b * self.linhas:(b + 1) * self.linhas]
+            for b in range(self.bandas)
+        ]
+
+        candidatos = set()
+        for banda, faixa in enumerate(faixas):
+            candidatos.update(self._buckets[banda].get(faixa, ()))
+
+        for cluster in sorted(candidatos):
+            if self.similaridade_estimada(assinatura, self._assinaturas[cluster]) >= self.limiar:
+                self._tamanhos_clusters[cluster] += 1
+                self._chaves_exatas[chave] = cluster
+                self.duplicatas_aproximadas += 1
+                return False
+
+        cluster = len(self._assinaturas)
+        self._assinaturas.append(assinatura)
+        self._tamanhos_clusters.append(1)
+        self._chaves_exatas[chave] = cluster
+        for banda, faixa in enumerate(faixas):
+            self._buckets[banda].setdefault(faixa, []).append(cluster)
+        return True
+
+    def filtrar(self, vagas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Indexa as vagas e retorna apenas as novas, na ordem original"""
+        return [vaga for vaga in vagas if self.adicionar(vaga)]
+
+    @property
+    def total_clusters(self) -> int:
+        return len(self._assinaturas)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Resumo do índice para os metadados da coleta"""
+        return {
+            "clusters": self.total_clusters,
+            "duplicatas_exatas": self.duplicatas_exatas,
+            "duplicatas_aproximadas": self.duplicatas_aproximadas,
+            "maior_cluster": max(self._tamanhos_clusters, default=0),
+            "limiar_similaridade": self.limiar,
+            "num_permutacoes": self.num_permutacoes,
+            "bandas": self.bandas,
+            "linhas_por_banda": self.linhas
+        }
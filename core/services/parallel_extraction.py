@@ -0,0 +1,134 @@
+"""
+Extração paralela por processos - Sistema HELIO
+Distribui textos de vagas entre um pool de processos, em lotes (um
+pickle por lote, não por vaga), sem bloquear o event loop. Entradas
+pequenas rodam no próprio processo, onde o custo de IPC não compensa.
+"""
+
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+R = TypeVar('R')
+
+# Um pool por uso (extração do MPC, lote de currículos), cada um com o
+# tamanho configurado pelo próprio uso
+_pools: Dict[str, Tuple[ProcessPoolExecutor, int]] = {}
+_pid_pools: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def nucleos_disponiveis() -> int:
+    """Núcleos que este processo pode usar (respeita affinity/cpuset do container)"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def obter_pool(max_processos: int, uso: str = "extracao") -> ProcessPoolExecutor:
+    """
+    Pool do processo para um uso (criado sob demanda)
+
+    O número de processos é fixado na criação: chamadas seguintes do mesmo
+    uso reaproveitam o pool (ver processos_do_pool). Usa o contexto
+    "spawn": o processo pai roda threads (gevent/SQLAlchemy) e um fork
+    herdaria locks e conexões abertas. Recriado após fork do próprio pai
+    (cada worker do gunicorn tem o seu).
+    """
+    global _pid_pools
+    pid = os.getpid()
+    existente = _pools.get(uso) if _pid_pools == pid else None
+    if existente is None:
+        with _pool_lock:
+            if _pid_pools != pid:
+                _pools.clear()
+                _pid_pools = pid
+            existente = _pools.get(uso)
+            if existente is None:
+                pool = ProcessPoolExecutor(
+                    max_workers=max_processos,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                existente = _pools[uso] = (pool, max_processos)
+    return existente[0]
+
+
+def processos_do_pool(uso: str = "extracao") -> int:
+    """Processos do pool do uso (0 se ainda não foi criado neste processo)"""
+    existente = _pools.get(uso) if _pid_pools == os.getpid() else None
+    return existente[1] if existente else 0
+
+
+def descartar_pool(uso: str = "extracao"):
+    """Descarta um pool quebrado (worker morto); o próximo uso cria outro"""
+    with _pool_lock:
+        existente = _pools.pop(uso, None)
+        if existente is not None:
+            existente[0].shutdown(wait=False, cancel_futures=True)
+
+
+class ExtracaoParalela:
+    """
+    Aplica uma função de lote a uma lista de textos usando processos
+
+    `funcao_lote` recebe uma lista de textos e devolve um resultado por
+    texto; precisa ser uma função de módulo (importável pelo processo
+    filho). `funcao_local` é o equivalente por texto, usado no caminho
+    sem paralelismo. A ordem dos resultados é sempre a ordem de entrada.
+
+    Configuração por variáveis de ambiente:
+        MPC_EXTRACAO_MAX_PROCESSOS: processos do pool (padrão: núcleos disponíveis)
+        MPC_EXTRACAO_TAMANHO_LOTE: textos por lote enviado a um processo (padrão 64)
+        MPC_EXTRACAO_MINIMO_PARALELO: abaixo disso extrai no próprio processo (padrão 200)
+    """
+
+    def __init__(
+        self,
+        funcao_lote: Callable[[List[str]], List[R]],
+        funcao_local: Callable[[str], R],
+        max_processos: int = None,
+        tamanho_lote: int = None,
+        minimo_paralelo: int = None
+    ):
+        self.funcao_lote = funcao_lote
+        self.funcao_local = funcao_local
+        self.max_processos = max_processos or int(os.getenv('MPC_EXTRACAO_MAX_PROCESSOS', '0')) or nucleos_disponiveis()
+        self.tamanho_lote = tamanho_lote or int(os.getenv('MPC_EXTRACAO_TAMANHO_LOTE', '64'))
+        self.minimo_paralelo = minimo_paralelo if minimo_paralelo is not None else int(os.getenv('MPC_EXTRACAO_MINIMO_PARALELO', '200'))
+        self.ultimo_modo = None
+
+    def _lotes(self, textos: List[str]) -> List[List[str]]:
+        # Lotes menores que o configurado quando há poucos textos, para
+        # que todos os processos recebam trabalho
+        por_lote = max(1, min(self.tamanho_lote, -(-len(textos) // (self.max_processos * 4))))
+        return [textos[i:i + por_lote] for i in range(0, len(textos), por_lote)]
+
+    async def extrair(self, textos: List[str]) -> List[R]:
+        """Resultados por texto, na ordem de entrada"""
+        if self.max_processos <= 1 or len(textos) < self.minimo_paralelo:
+            self.ultimo_modo = "local"
+            return [self.funcao_local(texto) for texto in textos]
+
+        try:
+            pool = obter_pool(self.max_processos)
+            futures = [
+                asyncio.wrap_future(pool.submit(self.funcao_lote, lote))
+                for lote in self._lotes(textos)
+            ]
+            parciais = await asyncio.gather(*futures)
+        except Exception as e:
+            # Pool quebrado ou erro no processo filho (ex.: import): o
+            # caminho local refaz o trabalho e propaga erros reais de extração
+            print(f"⚠️ Pool de extração indisponível ({e}); extraindo no próprio processo")
+            if isinstance(e, (BrokenProcessPool, OSError)):
+                descartar_pool()
+            self.ultimo_modo = "local"
+            return [self.funcao_local(texto) for texto in textos]
+
+        self.ultimo_modo = "paralelo"
+        return [resultado for parcial in parciais for resultado in parcial]
@@ -138,6 +138,13 @@ class QueryExpanderV2:
         """
         Expande um cargo em múltiplas variações relevantes
         
+        A ordem é determinística (mesma entrada, mesma lista em qualquer
+        processo) e segue a relevância: cargo original, variações diretas da
+        base de conhecimento na ordem cadastrada, variações genéricas, termos
+        da área e, por último, as variações com nível (buscas mais estreitas,
+        cujas vagas já aparecem na busca sem nível). Repetições que diferem
+        só em maiúsculas/espaços contam uma vez.
+        
         Args:
             cargo: Cargo original (ex: "desenvolvedor")
             area: Área de atuação para contexto adicional
@@ -145,24 +152,34 @@ class QueryExpanderV2:
         Returns:
             Lista de variações do cargo ordenadas por relevância
         """
-        cargo_lower = cargo.lower().strip()
-        expansoes = set()
+        cargo = ' '.join(cargo.split())
+        cargo_lower = cargo.lower()
+        expansoes: List[str] = []
+        vistos = set()
         
-        # 1. Adicionar cargo original
-        expansoes.add(cargo)
+        def adicionar(termo: str):
+            termo = ' '.join(termo.split())
+            if termo and termo.casefold() not in vistos:
+                vistos.add(termo.casefold())
+                expansoes.append(termo)
+        
+        # 1. Cargo original sempre primeiro
+        adicionar(cargo)
         
         # 2. Buscar expansões diretas
+        variacoes_nivel = []
         for termo_base, variacoes in self.expansoes_base.items():
             if termo_base in cargo_lower:
-                expansoes.update(variacoes)
+                for variacao in variacoes:
+                    adicionar(variacao)
                 
-                # Se encontrou match, também adicionar com níveis
+                # Se encontrou match, também gerar com níveis (entram no fim)
                 nivel_detectado = self._detectar_nivel(cargo_lower)
                 if not nivel_detectado:
                     # Adicionar principais níveis se não especificado
                     for variacao in variacoes[:3]:  # Top 3 variações
-                        expansoes.add(f"{variacao} Pleno")
-                        expansoes.add(f"{variacao} Senior")
+                        variacoes_nivel.append(f"{variacao} Pleno")
+                        variacoes_nivel.append(f"{variacao} Senior")
                 break
         
         # 3. Se não encontrou expansão direta, criar variações genéricas
@@ -170,20 +187,13 @@ class QueryExpanderV2:
             base = cargo.replace("junior", "").replace("pleno", "").replace("senior", "").strip()
             
             # Variações em português
-            expansoes.update([
-                base,
-                f"Especialista em {base}",
-                f"Analista de {base}",
-                f"Consultor de {base}"
-            ])
+            for termo in (base, f"Especialista em {base}", f"Analista de {base}", f"Consultor de {base}"):
+                adicionar(termo)
             
             # Variações em inglês se aplicável
             if area and area.lower() in ["tecnologia", "tech", "ti"]:
-                expansoes.update([
-                    f"{base} Engineer",
-                    f"{base} Developer",
-                    f"{base} Specialist"
-                ])
+                for termo in (f"{base} Engineer", f"{base} Developer", f"{base} Specialist"):
+                    adicionar(termo)
         
         # 4. Adicionar termos específicos da área
         if area:
@@ -193,18 +203,14 @@ class QueryExpanderV2:
             # Combinar com termos da área
             base_limpo = cargo.split()[0] if ' ' in cargo else cargo
             for termo in termos_area[:2]:  # Top 2 termos da área
-                expansoes.add(f"{termo} {base_limpo}")
-        
-        # 5. Remover duplicatas e ordenar por relevância
-        expansoes_lista = list(expansoes)
+                adicionar(f"{termo} {base_limpo}")
         
-        # Priorizar: cargo original primeiro, depois mais específicos
-        if cargo in expansoes_lista:
-            expansoes_lista.remove(cargo)
-            expansoes_lista.insert(0, cargo)
+        # 5. Variações com nível
+        for termo in variacoes_nivel:
+            adicionar(termo)
         
         # Limitar quantidade para otimizar buscas
-        return expansoes_lista[:15]
+        return expansoes[:15]
     
     def _detectar_nivel(self, cargo: str) -> str:
         """
@@ -0,0 +1,87 @@
+"""
+Planos de busca - Sistema HELIO
+Monta, a partir do cargo e da localização pedidos, a lista ranqueada de
+variações de cargo e de locais que a coleta vai percorrer. O plano é
+determinístico (mesma entrada, mesmo plano em qualquer processo) e fica
+memorizado no processo; a parte cara e variável, a expansão geográfica
+por IA, também fica no cache persistente de respostas de IA.
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from .query_expander import QueryExpanderV2
+from .location_expander import LocationExpander
+from .lru_cache import CacheLRU
+from .job_collection_cache import normalizar_parametro
+
+# Planos já montados neste processo (os serviços são recriados a cada coleta)
+_planos = CacheLRU(int(os.getenv('QUERY_PLAN_CACHE_MAX', '256')))
+
+
+@dataclass
+class PlanoBusca:
+    """Variações de cargo e locais, em ordem de prioridade"""
+    chave: str
+    cargos: List[str]
+    locais: List[Dict[str, Any]]
+    memorizado: bool = field(default=False, compare=False)
+
+
+class PlanejadorBuscas:
+    """
+    Monta e memoriza planos de busca
+
+        plano = PlanejadorBuscas(query_expander, location_expander).planejar(
+            "Desenvolvedor", "tecnologia", "São Paulo", "hibrido"
+        )
+        plano.cargos, plano.locais
+    """
+
+    def __init__(self, query_expander: QueryExpanderV2 = None, location_expander: LocationExpander = None):
+        self.query_expander = query_expander or QueryExpanderV2()
+        self.location_expander = location_expander or LocationExpander()
+
+    @staticmethod
+    def gerar_chave(cargo: str, area: str, localizacao: str, tipo_vaga: str, limite_locais: int) -> str:
+        """Chave estável do plano (maiúsculas, acentos e espaços não contam)"""
+        partes = [normalizar_parametro(valor or '') for valor in (cargo, area, localizacao, tipo_vaga)]
+        partes.append(limite_locais)
+        return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def planejar(
+        self,
+        cargo: str,
+        area: str,
+        localizacao: str,
+        tipo_vaga: str,
+        limite_locais: int = 10
+    ) -> PlanoBusca:
+        """
+        Plano memorizado para a busca ou, na primeira vez, um plano novo
+
+        Um plano cuja expansão geográfica caiu na expansão básica por falha
+        da IA não é memorizado: a próxima busca tenta a IA de novo.
+        """
+        chave = self.gerar_chave(cargo, area, localizacao, tipo_vaga, limite_locais)
+        plano = _planos.obter(chave)
+        if plano is not None:
+            plano.memorizado = True
+            return plano
+
+        plano = PlanoBusca(
+            chave=chave,
+            cargos=self.query_expander.expandir_cargo(cargo, area),
+            locais=self.location_expander.expandir_localizacao(localizacao, tipo_vaga, limite=limite_locais)
+        )
+        if self.location_expander.ultima_expansao_definitiva:
+            _planos.salvar(chave, plano)
+        return plano
+
+
+def estatisticas_planos() -> Dict[str, Any]:
+    """Uso da memória de planos neste processo"""
+    return _planos.estatisticas()
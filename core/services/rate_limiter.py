@@ -0,0 +1,80 @@
+"""
+Limitador de taxa (token bucket) compartilhado pelos serviços HELIO
+Usado para respeitar limites de requisições por minuto das APIs de IA e scraping
+"""
+
+import time
+import asyncio
+import threading
+
+
+class TokenBucket:
+    """
+    Token bucket simples e thread-safe
+
+    Cada requisição consome um token. Os tokens são repostos continuamente
+    à taxa de `requisicoes_por_minuto / 60` por segundo, até `capacidade`.
+    """
+
+    def __init__(self, requisicoes_por_minuto: float, capacidade: int = None):
+        if requisicoes_por_minuto <= 0:
+            raise ValueError("requisicoes_por_minuto deve ser maior que zero")
+
+        self.taxa_por_segundo = requisicoes_por_minuto / 60.0
+        self.capacidade = capacidade or max(1, int(requisicoes_por_minuto // 6))
+        self._tokens = float(self.capacidade)
+        self._ultima_reposicao = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _tentar_consumir(self) -> float:
+        """
+        Tenta consumir um token. Retorna 0 em caso de sucesso ou
+        quantos segundos faltam para o próximo token ficar disponível.
+        """
+        with self._lock:
+            agora = time.monotonic()
+            decorrido = agora - self._ultima_reposicao
+            self._tokens = min(self.capacidade, self._tokens + decorrido * self.taxa_por_segundo)
+            self._ultima_reposicao = agora
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self.taxa_por_segundo
+
+    def adquirir(self):
+        """Bloqueia a thread atual até haver um token disponível"""
+        while True:
+            espera = self._tentar_consumir()
+            if espera <= 0:
+                return
+            time.sleep(espera)
+
+    async def adquirir_async(self):
+        """Aguarda (sem bloquear o event loop) até haver um token disponível"""
+        while True:
+            espera = self._tentar_consumir()
+            if espera <= 0:
+                return
+            await asyncio.sleep(espera)
+
+
+_limitadores = {}
+_limitadores_lock = threading.Lock()
+
+
+def obter_limitador(nome: str, requisicoes_por_minuto: float) -> TokenBucket:
+    """
+    Limitador compartilhado de um provedor (um por nome no processo)
+
+    Todas as coletas simultâneas do mesmo provedor dividem o mesmo limite
+    de requisições por minuto; a taxa é a da primeira chamada.
+    """
+    limitador = _limitadores.get(nome)
+    if limitador is None:
+        with _limitadores_lock:
+            limitador = _limitadores.get(nome)
+            if limitador is None:
+                limitador = _limitadores[nome] = TokenBucket(requisicoes_por_minuto)
+    return limitador
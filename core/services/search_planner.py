@@ -0,0 +1,294 @@
+"""
+Planejador adaptativo de combinações de busca - Sistema HELIO
+Guarda, por (variação de cargo, local, fonte), quantas vagas novas cada
+run rendeu e quanto demorou, e usa esse histórico para reordenar as
+combinações do JobScraper (pontuação estilo bandit UCB: rendimento
+médio + bônus de exploração, dividido pela latência) e podar as que
+seguidamente não rendem vagas. Sem histórico, a ordem estática do plano
+é mantida.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .job_collection_cache import normalizar_parametro
+
+# Fonte das combinações do JobScraper (Google Jobs via Apify)
+FONTE_GOOGLE_JOBS = "google_jobs"
+
+
+class HistoricoRendimento:
+    """
+    Rendimento e latência dos runs por combinação, em SQLite
+
+    As somas são reescaladas quando passam da janela, então o histórico
+    acompanha mudanças no mercado em vez de ficar preso aos primeiros runs.
+
+    Configuração por variáveis de ambiente:
+        JOB_PLANNER_PATH: caminho do arquivo (padrão .cache/rendimento_buscas.sqlite3)
+        JOB_PLANNER_JANELA: runs considerados por combinação (padrão 20)
+        JOB_PLANNER_DESATIVADO: "1" para manter a ordem estática
+    """
+
+    def __init__(self, caminho: str = None, janela: int = None):
+        self.caminho = caminho or os.getenv('JOB_PLANNER_PATH', os.path.join('.cache', 'rendimento_buscas.sqlite3'))
+        self.janela = janela or int(os.getenv('JOB_PLANNER_JANELA', '20'))
+        self.ativo = os.getenv('JOB_PLANNER_DESATIVADO', '0') != '1'
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def gerar_chave(cargo: str, local: str, fonte: str) -> str:
+        """Chave da combinação (maiúsculas, acentos e espaços não contam)"""
+        return '\x1f'.join(normalizar_parametro(parte or '') for parte in (cargo, local, fonte))
+
+    def _conexao(self) -> sqlite3.Connection:
+        if self._conn is None:
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            self._conn = sqlite3.connect(self.caminho, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS rendimento_buscas (
+                    chave TEXT PRIMARY KEY,
+                    cargo TEXT,
+                    local TEXT,
+                    fonte TEXT,
+                    execucoes REAL NOT NULL,
+                    soma_taxa REAL NOT NULL,
+                    soma_latencia REAL NOT NULL,
+                    ultima_execucao REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def registrar(
+        self,
+        cargo: str,
+        local: str,
+        fonte: str,
+        pedidas: int,
+        novas: int,
+        latencia_segundos: float
+    ):
+        """
+        Registra um run concluído
+
+        A taxa do run é vagas novas / vagas pedidas (0 a 1): um run que
+        trouxe só duplicatas de outras combinações rende tão pouco quanto
+        um run vazio.
+        """
+        if not self.ativo:
+            return
+
+        taxa = min(1.0, novas / max(1, pedidas))
+        chave = self.gerar_chave(cargo, local, fonte)
+        try:
+            with self._lock:
+                conn = self._conexao()
+                linha = conn.execute(
+                    "SELECT execucoes, soma_taxa, soma_latencia FROM rendimento_buscas WHERE chave = ?", (chave,)
+                ).fetchone()
+                execucoes, soma_taxa, soma_latencia = linha or (0.0, 0.0, 0.0)
+
+                execucoes, soma_taxa, soma_latencia = execucoes + 1, soma_taxa + taxa, soma_latencia + latencia_segundos
+                if execucoes > self.janela:
+                    escala = self.janela / execucoes
+                    execucoes, soma_taxa, soma_latencia = self.janela, soma_taxa * escala, soma_latencia * escala
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO rendimento_buscas "
+                    "(chave, cargo, local, fonte, execucoes, soma_taxa, soma_latencia, ultima_execucao) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (chave, cargo, local, fonte, execucoes, soma_taxa, soma_latencia, time.time())
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"⚠️ Histórico de rendimento indisponível (escrita): {e}")
+
+    def consultar(self, chaves: Sequence[str]) -> Dict[str, Dict[str, float]]:
+        """Histórico das combinações pedidas (as sem histórico ficam de fora)"""
+        if not self.ativo or not chaves:
+            return {}
+
+        try:
+            with self._lock:
+                conn = self._conexao()
+                marcadores = ','.join('?' * len(chaves))
+                linhas = conn.execute(
+                    "SELECT chave, execucoes, soma_taxa, soma_latencia, ultima_execucao "
+                    f"FROM rendimento_buscas WHERE chave IN ({marcadores})",
+                    list(chaves)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Histórico de rendimento indisponível (leitura): {e}")
+            return {}
+
+        return {
+            chave: {
+                "execucoes": execucoes,
+                "taxa_media": soma_taxa / execucoes,
+                "latencia_media": soma_latencia / execucoes,
+                "ultima_execucao": ultima
+            }
+            for chave, execucoes, soma_taxa, soma_latencia, ultima in linhas
+            if execucoes > 0
+        }
+
+
+class PlanejadorAdaptativo:
+    """
+    Reordena e poda combinações pelo histórico de rendimento
+
+    Pontuação de cada combinação (UCB1 com prior):
+        rendimento = (soma das taxas + PESO_PRIOR * prior) / (execuções + PESO_PRIOR)
+        bônus = exploracao * sqrt(ln(total de execuções + 1) / (execuções + 1))
+        pontuação = (rendimento + bônus) / (1 + latência média / latencia_referencia)
+
+    O prior é a taxa média das combinações com histórico (PRIOR_TAXA
+    quando não há nenhuma): combinações novas recebem o rendimento e a
+    latência médios das demais mais o bônus de exploração, então competem
+    com as conhecidas sem passar na frente das que comprovadamente rendem
+    bem; empates mantêm a ordem estática. Uma combinação é podada depois de `amostras_poda` runs com
+    taxa média até `limiar_poda`, e volta a ser tentada quando a poda
+    passa de `validade_poda_segundos` sem novos runs.
+
+    Configuração por variáveis de ambiente:
+        JOB_PLANNER_EXPLORACAO: peso do bônus de exploração (padrão 0.3)
+        JOB_PLANNER_LATENCIA_REFERENCIA: segundos que dividem a pontuação por 2 (padrão 60)
+        JOB_PLANNER_AMOSTRAS_PODA: runs antes de podar (padrão 3)
+        JOB_PLANNER_LIMIAR_PODA: taxa média que leva à poda (padrão 0.02)
+        JOB_PLANNER_VALIDADE_PODA_HORAS: quanto tempo a poda vale (padrão 72h)
+    """
+
+    PRIOR_TAXA = 0.5
+    PESO_PRIOR = 1.0
+
+    def __init__(
+        self,
+        historico: HistoricoRendimento = None,
+        exploracao: float = None,
+        latencia_referencia: float = None,
+        amostras_poda: int = None,
+        limiar_poda: float = None,
+        validade_poda_segundos: float = None
+    ):
+        self.historico = historico or obter_historico_rendimento()
+        self.exploracao = exploracao if exploracao is not None else float(os.getenv('JOB_PLANNER_EXPLORACAO', '0.3'))
+        self.latencia_referencia = latencia_referencia or float(os.getenv('JOB_PLANNER_LATENCIA_REFERENCIA', '60'))
+        self.amostras_poda = amostras_poda or int(os.getenv('JOB_PLANNER_AMOSTRAS_PODA', '3'))
+        self.limiar_poda = limiar_poda if limiar_poda is not None else float(os.getenv('JOB_PLANNER_LIMIAR_PODA', '0.02'))
+        self.validade_poda_segundos = validade_poda_segundos if validade_poda_segundos is not None else float(os.getenv('JOB_PLANNER_VALIDADE_PODA_HORAS', '72')) * 3600
+
+    def ordenar(self, combinacoes: List[Any], fonte: str = FONTE_GOOGLE_JOBS) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        Ordem de execução das combinações (objetos com `cargo` e `localizacao`)
+
+        Returns:
+            (combinações na nova ordem, sem as podadas; resumo das decisões
+            para os metadados da coleta)
+        """
+        if not self.historico.ativo or not combinacoes:
+            return list(combinacoes), {"ativo": False}
+
+        chaves = [self.historico.gerar_chave(c.cargo, c.localizacao, fonte) for c in combinacoes]
+        historico = self.historico.consultar(chaves)
+
+        total_execucoes = sum(h["execucoes"] for h in historico.values())
+        if total_execucoes:
+            prior = sum(h["taxa_media"] * h["execucoes"] for h in historico.values()) / total_execucoes
+            latencia_padrao = sum(h["latencia_media"] * h["execucoes"] for h in historico.values()) / total_execucoes
+        else:
+            prior, latencia_padrao = self.PRIOR_TAXA, self.latencia_referencia
+        agora = time.time()
+
+        avaliadas = []
+        for posicao, (combo, chave) in enumerate(zip(combinacoes, chaves)):
+            h = historico.get(chave)
+            execucoes = h["execucoes"] if h else 0.0
+            soma_taxa = h["taxa_media"] * execucoes if h else 0.0
+            latencia = h["latencia_media"] if h else latencia_padrao
+
+            rendimento = (soma_taxa + self.PESO_PRIOR * prior) / (execucoes + self.PESO_PRIOR)
+            bonus = self.exploracao * math.sqrt(math.log(total_execucoes + 1) / (execucoes + 1))
+            pontuacao = (rendimento + bonus) / (1 + latencia / self.latencia_referencia)
+            podada = (
+                h is not None
+                and execucoes >= self.amostras_poda
+                and h["taxa_media"] <= self.limiar_poda
+                and agora - h["ultima_execucao"] < self.validade_poda_segundos
+            )
+            avaliadas.append({
+                "combo": combo,
+                "posicao_original": posicao,
+                "execucoes": execucoes,
+                "taxa_media": h["taxa_media"] if h else None,
+                "latencia_media": h["latencia_media"] if h else None,
+                "pontuacao": pontuacao,
+                "podada": podada
+            })
+
+        avaliadas.sort(key=lambda a: (-a["pontuacao"], a["posicao_original"]))
+        mantidas = [a for a in avaliadas if not a["podada"]]
+        if not mantidas:
+            # Tudo podado: a melhor ainda é tentada para a coleta não sair vazia
+            avaliadas[0]["podada"] = False
+            mantidas = avaliadas[:1]
+
+        decisoes = []
+        for posicao, a in enumerate(avaliadas):
+            if a["podada"]:
+                decisao = "podada"
+            elif not a["execucoes"]:
+                decisao = "sem_historico"
+            elif posicao < a["posicao_original"]:
+                decisao = "promovida"
+            elif posicao > a["posicao_original"]:
+                decisao = "rebaixada"
+            else:
+                decisao = "mantida"
+            decisoes.append({
+                "cargo": a["combo"].cargo,
+                "local": a["combo"].localizacao,
+                "posicao_original": a["posicao_original"],
+                "execucoes": round(a["execucoes"], 1),
+                "taxa_media": round(a["taxa_media"], 3) if a["taxa_media"] is not None else None,
+                "latencia_media_segundos": round(a["latencia_media"], 1) if a["latencia_media"] is not None else None,
+                "pontuacao": round(a["pontuacao"], 4),
+                "decisao": decisao
+            })
+
+        resumo = {
+            "ativo": True,
+            "fonte": fonte,
+            "combinacoes_com_historico": len(historico),
+            "podadas": sum(1 for a in avaliadas if a["podada"]),
+            "decisoes": decisoes
+        }
+        return [a["combo"] for a in mantidas], resumo
+
+    def registrar(self, combo: Any, pedidas: int, novas: int, latencia_segundos: float, fonte: str = FONTE_GOOGLE_JOBS):
+        """Alimenta o histórico com o resultado de um run concluído"""
+        self.historico.registrar(combo.cargo, combo.localizacao, fonte, pedidas, novas, latencia_segundos)
+
+
+_historico_global = None
+_historico_lock = threading.Lock()
+
+
+def obter_historico_rendimento() -> HistoricoRendimento:
+    """Retorna o histórico compartilhado (um por processo)"""
+    global _historico_global
+    if _historico_global is None:
+        with _historico_lock:
+            if _historico_global is None:
+                _historico_global = HistoricoRendimento()
+    return _historico_global
@@ -0,0 +1,283 @@
+"""
+Matriz termo-documento do MPC - Sistema HELIO
+Estatísticas de corpus (frequência de documento, TF-IDF e recortes por
+fonte/localização) construídas uma única vez por MPC, em memória, e
+compartilhadas pelas etapas de extração, categorização e priorização.
+Também calcula a similaridade currículo x vagas do ranking do Agente 2.
+"""
+
+import math
+import heapq
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class MatrizTermoDocumento:
+    """
+    Matriz esparsa termo x documento (uma linha por vaga)
+
+    Cada linha guarda só os índices dos termos presentes e suas contagens
+    (arrays compactos, como uma linha CSR); o vocabulário mapeia termo ->
+    índice. A frequência de documento é mantida incrementalmente, então
+    ranking, TF-IDF e recortes não precisam percorrer o corpus de novo.
+
+    Uso típico:
+
+        matriz = MatrizTermoDocumento()
+        for vaga in vagas:
+            matriz.adicionar_documento(vaga.id, palavras, fonte=vaga.fonte)
+        matriz.mais_frequentes(20)
+        matriz.frequencia_por_grupo("fonte", ["python", "sql"])
+        matriz.similaridades(termos_curriculo, 10)
+    """
+
+    def __init__(self):
+        self.termos: List[str] = []
+        self._indice: Dict[str, int] = {}
+        self._frequencia_documento = array('I')
+        self._linhas_termos: List[array] = []
+        self._linhas_contagens: List[array] = []
+        self.documentos: List[Any] = []
+        self._grupos: Dict[str, Dict[str, List[int]]] = {}
+        self.total_ocorrencias = 0
+        # Pesos TF-IDF por coluna (termo -> linhas) para similaridade;
+        # montados sob demanda e descartados quando entra documento novo
+        self._colunas_linhas: Optional[List[array]] = None
+        self._colunas_pesos: Optional[List[array]] = None
+        self._normas_linhas: Optional[array] = None
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+
+    def adicionar_documento(self, doc_id: Any, termos: Iterable[str], **grupos: Optional[str]) -> int:
+        """
+        Adiciona uma linha à matriz
+
+        Args:
+            doc_id: identificador da vaga
+            termos: termos extraídos (repetições viram contagem)
+            grupos: dimensões de recorte, ex. fonte="linkedin", localizacao="SP"
+
+        Returns:
+            Índice da linha
+        """
+        contagens: Dict[int, int] = {}
+        for termo in termos:
+            indice = self._indice.get(termo)
+            if indice is None:
+                indice = len(self.termos)
+                self._indice[termo] = indice
+                self.termos.append(termo)
+                self._frequencia_documento.append(0)
+            contagens[indice] = contagens.get(indice, 0) + 1
+
+        for indice in contagens:
+            self._frequencia_documento[indice] += 1
+
+        linha = len(self.documentos)
+        self.documentos.append(doc_id)
+        self._linhas_termos.append(array('I', contagens.keys()))
+        self._linhas_contagens.append(array('I', contagens.values()))
+        self.total_ocorrencias += sum(contagens.values())
+
+        for dimensao, valor in grupos.items():
+            self._grupos.setdefault(dimensao, {}).setdefault(valor or "desconhecido", []).append(linha)
+
+        self._colunas_linhas = self._colunas_pesos = self._normas_linhas = None
+        return linha
+
+    # ------------------------------------------------------------------
+    # Estatísticas de corpus
+    # ------------------------------------------------------------------
+
+    @property
+    def total_documentos(self) -> int:
+        return len(self.documentos)
+
+    @property
+    def total_termos(self) -> int:
+        return len(self.termos)
+
+    def frequencia_documento(self, termo: str) -> int:
+        """Em quantas vagas o termo aparece"""
+        indice = self._indice.get(termo)
+        return 0 if indice is None else self._frequencia_documento[indice]
+
+    def mais_frequentes(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        (termo, frequência de documento) em ordem decrescente
+
+        Empates seguem a ordem de primeira aparição, como Counter.most_common.
+        """
+        df = self._frequencia_documento
+        if n is None:
+            ordem = sorted(range(len(df)), key=df.__getitem__, reverse=True)
+        else:
+            ordem = heapq.nlargest(n, range(len(df)), key=df.__getitem__)
+        return [(self.termos[i], df[i]) for i in ordem]
+
+    def contador(self) -> Counter:
+        """Frequências de documento como Counter (termo -> vagas)"""
+        return Counter(dict(zip(self.termos, self._frequencia_documento)))
+
+    def idf(self, termo: str) -> float:
+        """IDF suavizado: log((1 + N) / (1 + df)) + 1"""
+        return math.log((1 + self.total_documentos) / (1 + self.frequencia_documento(termo))) + 1
+
+    def tfidf_medio(self, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        TF-IDF médio de cada termo no corpus, em ordem decrescente
+
+        TF normalizado pelo tamanho da vaga (termos da linha), para que
+        descrições longas não dominem o ranking.
+        """
+        total = self.total_documentos
+        if not total:
+            return []
+
+        soma_tf = [0.0] * len(self.termos)
+        for termos, contagens in zip(self._linhas_termos, self._linhas_contagens):
+            tamanho = sum(contagens)
+            if not tamanho:
+                continue
+            for indice, contagem in zip(termos, contagens):
+                soma_tf[indice] += contagem / tamanho
+
+        log_n = math.log(1 + total)
+        pontuacoes = [
+            soma * (log_n - math.log(1 + df) + 1) / total
+            for soma, df in zip(soma_tf, self._frequencia_documento)
+        ]
+        ordem = sorted(range(len(pontuacoes)), key=pontuacoes.__getitem__, reverse=True)
+        if n is not None:
+            ordem = ordem[:n]
+        return [(self.termos[i], round(pontuacoes[i], 6)) for i in ordem]
+
+    def termos_documento(self, linha: int) -> List[str]:
+        """Termos presentes numa linha, na ordem de primeira aparição"""
+        return [self.termos[i] for i in self._linhas_termos[linha]]
+
+    # ------------------------------------------------------------------
+    # Similaridade
+    # ------------------------------------------------------------------
+
+    def _montar_colunas(self):
+        """
+        Transpõe as linhas em colunas com peso TF-IDF (formato CSC)
+
+        Cada coluna lista as linhas que contêm o termo e o peso do termo
+        nelas; a norma de cada linha fica pronta para o cosseno.
+        """
+        total = self.total_documentos
+        log_n = math.log(1 + total)
+        idf = [log_n - math.log(1 + df) + 1 for df in self._frequencia_documento]
+
+        colunas_linhas = [array('I') for _ in self.termos]
+        colunas_pesos = [array('d') for _ in self.termos]
+        normas = array('d', bytes(8 * total))
+
+        for linha, (termos, contagens) in enumerate(zip(self._linhas_termos, self._linhas_contagens)):
+            tamanho = sum(contagens)
+            if not tamanho:
+                continue
+            soma_quadrados = 0.0
+            for indice, contagem in zip(termos, contagens):
+                peso = contagem / tamanho * idf[indice]
+                colunas_linhas[indice].append(linha)
+                colunas_pesos[indice].append(peso)
+                soma_quadrados += peso * peso
+            normas[linha] = math.sqrt(soma_quadrados)
+
+        self._colunas_linhas = colunas_linhas
+        self._colunas_pesos = colunas_pesos
+        self._normas_linhas = normas
+
+    def similaridades(self, termos_consulta: Iterable[str], n: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """
+        Cosseno TF-IDF entre a consulta (ex.: termos de um currículo) e
+        cada documento, em ordem decrescente
+
+        Produto matriz x vetor esparso: só as colunas dos termos da
+        consulta são percorridas, então o custo depende das vagas que
+        compartilham termos com ela, não do corpus inteiro. Termos fora do
+        vocabulário não pesam (não existem em nenhuma vaga).
+
+        Returns:
+            (doc_id, similaridade 0-1); documentos sem termo em comum ficam
+            com 0 e só aparecem depois dos demais
+        """
+        if self._colunas_linhas is None:
+            self._montar_colunas()
+
+        contagens_consulta: Dict[int, int] = {}
+        for termo in termos_consulta:
+            indice = self._indice.get(termo)
+            if indice is not None:
+                contagens_consulta[indice] = contagens_consulta.get(indice, 0) + 1
+
+        total = self.total_documentos
+        pontuacoes = [0.0] * total
+        tamanho_consulta = sum(contagens_consulta.values())
+        if tamanho_consulta:
+            log_n = math.log(1 + total)
+            soma_quadrados = 0.0
+            for indice, contagem in contagens_consulta.items():
+                peso = contagem / tamanho_consulta * (log_n - math.log(1 + self._frequencia_documento[indice]) + 1)
+                soma_quadrados += peso * peso
+                for linha, peso_linha in zip(self._colunas_linhas[indice], self._colunas_pesos[indice]):
+                    pontuacoes[linha] += peso * peso_linha
+
+            norma_consulta = math.sqrt(soma_quadrados)
+            normas = self._normas_linhas
+            for linha in range(total):
+                if pontuacoes[linha]:
+                    pontuacoes[linha] /= normas[linha] * norma_consulta
+
+        if n is None:
+            ordem = sorted(range(total), key=pontuacoes.__getitem__, reverse=True)
+        else:
+            ordem = heapq.nlargest(n, range(total), key=pontuacoes.__getitem__)
+        return [(self.documentos[i], round(pontuacoes[i], 6)) for i in ordem]
+
+    # ------------------------------------------------------------------
+    # Recortes
+    # ------------------------------------------------------------------
+
+    def dimensoes(self) -> List[str]:
+        return list(self._grupos)
+
+    def tamanho_grupos(self, dimensao: str) -> Dict[str, int]:
+        """Vagas por valor da dimensão (ex.: vagas por fonte)"""
+        return {valor: len(linhas) for valor, linhas in self._grupos.get(dimensao, {}).items()}
+
+    def frequencia_por_grupo(
+        self,
+        dimensao: str,
+        termos: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Frequência de documento de cada termo dentro de cada grupo
+
+        Returns:
+            {termo: {valor_do_grupo: vagas}}; com `termos` informado só
+            esses termos são contados (uma passada pelas linhas do grupo).
+        """
+        if termos is None:
+            alvo = None
+            resultado: Dict[str, Dict[str, int]] = {}
+        else:
+            alvo = {self._indice[t]: t for t in termos if t in self._indice}
+            resultado = {t: {} for t in alvo.values()}
+
+        for valor, linhas in self._grupos.get(dimensao, {}).items():
+            contagem: Dict[int, int] = {}
+            for linha in linhas:
+                for indice in self._linhas_termos[linha]:
+                    if alvo is None or indice in alvo:
+                        contagem[indice] = contagem.get(indice, 0) + 1
+            for indice, df in contagem.items():
+                resultado.setdefault(self.termos[indice], {})[valor] = df
+
+        return resultado
@@ -344,6 +344,7 @@ const CollectionResults = ({
   analysisStatus, 
   analysisMessage, 
   analysisProgress, 
+  partialKeywords = [],
   onCancelAnalysis 
 }) => {
   const [showVagas, setShowVagas] = useState(false)
@@ -530,6 +531,25 @@ const CollectionResults = ({
                     </div>
                   )}
 
+                  {/* Palavras-chave parciais, à medida que a IA as completa */}
+                  {partialKeywords.length > 0 && (
+                    <div className="mt-3">
+                      <p className="text-xs font-medium text-purple-800 mb-1">
+                        Primeiras palavras-chave ({partialKeywords.length})
+                      </p>
+                      <div className="flex flex-wrap gap-1">
+                        {partialKeywords.map((palavra) => (
+                          <span
+                            key={palavra.termo}
+                            className="px-2 py-0.5 text-xs bg-white border border-purple-200 text-purple-700 rounded-full"
+                          >
+                            {palavra.termo}
+                          </span>
+                        ))}
+                      </div>
+                    </div>
+                  )}
+
                   <div className="mt-2 space-y-1">
                     <div className={`flex items-center text-xs ${analysisStatus === 'preparando' || analysisStatus === 'iniciando' ? 'text-purple-600 font-medium' : 'text-purple-500'}`}>
                       <div className={`mr-2 ${analysisStatus === 'preparando' || analysisStatus === 'iniciando' ? 'animate-pulse' : ''}`}>●</div>
@@ -1223,6 +1243,8 @@ const StreamingJobCollection = ({ isVisible, onClose, onJobsCollected, searchCon
         const reader = response.body.getReader()
         const decoder = new TextDecoder()
         let buffer = ''
+        // Vagas recebidas nos eventos novas_vagas (o evento final traz só o resumo)
+        const vagasRecebidas = []
         
         while (true) {
           const { done, value } = await reader.read()
@@ -1254,13 +1276,14 @@ const StreamingJobCollection = ({ isVisible, onClose, onJobsCollected, searchCon
                     }
                     
                     if (data.type === 'novas_vagas') {
+                      vagasRecebidas.push(...data.novas_vagas)
                       setVagasColetadas(prev => [...prev, ...data.novas_vagas])
                       setProgress(data.total_atual)
                       setIsInitialLoad(false)
                     }
                     
-                    if (data.status === 'finalizado' && data.vagas) {
-                      onJobsCollected(data.vagas)
+                    if (data.status === 'finalizado') {
+                      onJobsCollected(data.vagas || vagasRecebidas)
                       return
                     }
                     
@@ -1414,6 +1437,7 @@ const Agent1 = () => {
   const [analysisStatus, setAnalysisStatus] = useState('')
   const [analysisMessage, setAnalysisMessage] = useState('')
   const [analysisProgress, setAnalysisProgress] = useState(0)
+  const [partialKeywords, setPartialKeywords] = useState([])
   const [analysisAbortController, setAnalysisAbortController] = useState(null)
 
   const stepLabels = [
@@ -1657,6 +1681,7 @@ const Agent1 = () => {
     setAnalysisStatus('iniciando')
     setAnalysisMessage('Preparando análise...')
     setAnalysisProgress(0)
+    setPartialKeywords([])
 
     const controller = new AbortController()
     setAnalysisAbortController(controller)
@@ -1695,6 +1720,26 @@ const Agent1 = () => {
               try {
                 const data = JSON.parse(line.slice(6))
                 
+                // Palavra-chave completa na resposta em stream (mesmo termo só uma vez)
+                if (data.type === 'palavra_chave') {
+                  const termo = data.palavra?.termo
+                  if (termo) {
+                    setPartialKeywords(prev => (
+                      prev.some(p => p.termo.toLowerCase() === termo.toLowerCase())
+                        ? prev
+                        : [...prev, data.palavra]
+                    ))
+                  }
+                  continue
+                }
+                // Outro provedor venceu: a lista final substitui as parciais
+                if (data.type === 'palavras_chave_finais') {
+                  if (data.substituir_parciais) {
+                    setPartialKeywords(data.palavras || [])
+                  }
+                  continue
+                }
+                
                 if (data.status) {
                   setAnalysisStatus(data.status)
                   
@@ -1756,6 +1801,7 @@ const Agent1 = () => {
       setAnalysisStatus('')
       setAnalysisMessage('')
       setAnalysisProgress(0)
+      setPartialKeywords([])
       setAnalysisAbortController(null)
     }
   }
@@ -1870,6 +1916,7 @@ const Agent1 = () => {
             analysisStatus={analysisStatus}
             analysisMessage={analysisMessage}
             analysisProgress={analysisProgress}
+            partialKeywords={partialKeywords}
             onCancelAnalysis={handleCancelAnalysis}
           />
         ) : results ? (
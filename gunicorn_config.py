@@ -19,8 +19,13 @@ accesslog = '-'
 errorlog = '-'
 loglevel = 'info'
 
-# Worker class - sync para SSE funcionar corretamente
-worker_class = 'sync'
+# Worker class - gevent: cada conexão SSE é um greenlet e os polls
+# (time.sleep, requests ao Apify) cedem o controle ao hub em vez de
+# prender o worker inteiro. Use HELIO_WORKER_CLASS=sync para o modo antigo.
+worker_class = os.environ.get('HELIO_WORKER_CLASS', 'gevent')
+
+# Conexões simultâneas por worker (streams SSE abertos + requests comuns)
+worker_connections = int(os.environ.get('HELIO_WORKER_CONNECTIONS', 2000))
 
 # Max requests per worker
 max_requests = 1000
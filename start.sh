@@ -1,2 +1,2 @@
 #!/bin/bash
-exec gunicorn app_streaming:app --bind 0.0.0.0:${PORT:-8000} --timeout 300 
\ No newline at end of file
+exec gunicorn app_streaming:app -c gunicorn_config.py --bind 0.0.0.0:${PORT:-8000} --timeout 300 
\ No newline at end of file
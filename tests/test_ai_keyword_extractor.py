@@ -0,0 +1,39 @@
+"""
+Testes do repasse em stream das palavras-chave da análise por IA
+"""
+
+import time
+
+from core.services.ai_keyword_extractor import EmissorPalavras
+from core.services.llm_router import ProvedorLLM, RoteadorLLM
+
+
+def test_hedge_repassa_so_um_provedor_e_sinaliza_divergencia():
+    recebidas = []
+    emissor = EmissorPalavras(lambda palavra, lote: recebidas.append(palavra['termo']))
+
+    def transmitir(provedor, termos, atraso):
+        emitir = emissor.para(provedor)
+        def chamar():
+            for termo in termos:
+                emitir({'termo': termo})
+                time.sleep(atraso)
+            return {'top_10_palavras_chave': [{'termo': t} for t in termos]}
+        return ProvedorLLM(provedor, chamar)
+
+    # O principal começa a transmitir e fica lento; a reserva vence o hedge
+    roteador = RoteadorLLM(atraso_hedge_padrao=0.05)
+    resultado, vencedor = roteador.executar_sincrono([
+        transmitir("gemini", ["Python", "SQL", "Docker", "AWS"], 0.1),
+        transmitir("claude", ["Python", "Kubernetes"], 0.0),
+    ])
+
+    assert vencedor == "claude"
+    assert "Kubernetes" not in recebidas and recebidas[0] == "Python"
+    assert emissor.divergiu(vencedor) and not emissor.divergiu("gemini")
+
+
+def test_sem_callback_nao_emite():
+    emissor = EmissorPalavras(None)
+    assert emissor.para("gemini") is None
+    assert not emissor.divergiu("gemini")
@@ -0,0 +1,77 @@
+"""
+Testes do registro de provedores de IA (SDKs e clientes sob demanda)
+"""
+
+import sys
+import subprocess
+
+import pytest
+from core.services import ai_providers
+from core.services.ai_providers import ClienteIA, obter_cliente, provedor_configurado
+
+
+class Servico:
+    anthropic_client = ClienteIA("anthropic")
+    gemini_model = ClienteIA("gemini", "gemini-teste")
+
+
+@pytest.fixture
+def criacoes(monkeypatch):
+    """Substitui a criação real dos clientes e registra cada chamada"""
+    chamadas = []
+
+    def criar(provedor, chave, modelo):
+        chamadas.append((provedor, chave, modelo))
+        if chave == "falha":
+            raise RuntimeError("SDK incompatível")
+        return object()
+
+    monkeypatch.setattr(ai_providers, "_criar_cliente", criar)
+    ai_providers.descartar_clientes()
+    yield chamadas
+    ai_providers.descartar_clientes()
+
+
+def test_servicos_nao_importam_sdks_no_import():
+    codigo = (
+        "import sys\n"
+        "import core.services.ai_keyword_extractor, core.services.batch_keyword_extractor\n"
+        "import core.services.location_expander, core.services.ai_validator, core.services.document_processor\n"
+        "print([m for m in ('openai', 'anthropic', 'google.generativeai') if m in sys.modules])"
+    )
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == "[]"
+
+
+def test_um_cliente_por_provedor_reaproveitado(criacoes, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "chave-1")
+    monkeypatch.setenv("GOOGLE_API_KEY", "chave-g")
+
+    a, b = Servico(), Servico()
+    assert a.anthropic_client is b.anthropic_client is obter_cliente("anthropic")
+    assert a.gemini_model is b.gemini_model
+    assert criacoes == [("anthropic", "chave-1", None), ("gemini", "chave-g", "gemini-teste")]
+
+    # Troca de chave cria outro cliente
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "chave-2")
+    assert a.anthropic_client is not None
+    assert criacoes[-1] == ("anthropic", "chave-2", None)
+
+
+def test_sem_chave_falha_e_substituicao_na_instancia(criacoes, monkeypatch):
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "your_anthropic_api_key_here")
+    assert not provedor_configurado("anthropic")
+    assert Servico().anthropic_client is None
+    assert Servico().gemini_model is None
+
+    # Falha na criação é registrada uma vez e vira None
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "falha")
+    assert Servico().anthropic_client is None
+    assert Servico().anthropic_client is None
+    assert criacoes == [("anthropic", "falha", None)]
+
+    servico = Servico()
+    servico.anthropic_client = "cliente de teste"
+    assert servico.anthropic_client == "cliente de teste"
+    assert Servico().anthropic_client is None
@@ -0,0 +1,138 @@
+"""
+Testes do acompanhamento de runs do Apify (long-poll + backoff)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from core.services import http_client
+from core.services.apify_runs import CursorDataset, EsperaAdaptativa, aguardar_run
+
+
+class _ApifyFalso(BaseHTTPRequestHandler):
+    """Simula GET /actor-runs/{id}?waitForFinish=N para um run que dura `duracao` segundos"""
+    protocol_version = "HTTP/1.1"
+    inicio = 0.0
+    duracao = 0.3
+    requisicoes = 0
+
+    def do_GET(self):
+        _ApifyFalso.requisicoes += 1
+        espera = float(parse_qs(urlparse(self.path).query).get("waitForFinish", ["0"])[0])
+        fim = _ApifyFalso.inicio + _ApifyFalso.duracao
+        time.sleep(max(0.0, min(fim, time.monotonic() + espera) - time.monotonic()))
+
+        status = "SUCCEEDED" if time.monotonic() >= fim else "RUNNING"
+        corpo = json.dumps({"data": {"id": "run1", "status": status, "defaultDatasetId": "ds1"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def apify():
+    _ApifyFalso.inicio = time.monotonic()
+    _ApifyFalso.requisicoes = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ApifyFalso)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_long_poll_retorna_assim_que_o_run_termina(apify):
+    inicio = time.monotonic()
+    run = aguardar_run("run1", "token", timeout_segundos=10, base_url=apify)
+
+    assert run["status"] == "SUCCEEDED"
+    assert run["defaultDatasetId"] == "ds1"
+    assert time.monotonic() - inicio < 1.0
+    assert _ApifyFalso.requisicoes == 1
+
+
+def test_espera_adaptativa_dobra_e_reinicia():
+    espera = EsperaAdaptativa(minimo=1, maximo=8)
+
+    assert [espera.proxima() for _ in range(5)] == [1, 2, 4, 8, 8]
+    espera.reiniciar()
+    assert espera.proxima() == 1
+
+
+class _DatasetFalso(BaseHTTPRequestHandler):
+    """Simula GET /datasets/{id}/items com offset/limit/fields; itens vazios somem com clean=true"""
+    protocol_version = "HTTP/1.1"
+    itens = []
+    consultas = []
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        _DatasetFalso.consultas.append(params)
+        offset, limit = int(params["offset"]), int(params["limit"])
+        campos = params["fields"].split(",")
+        pagina = [
+            {c: item[c] for c in campos if c in item}
+            for item in _DatasetFalso.itens[offset:offset + limit] if item
+        ]
+        corpo = json.dumps(pagina).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("X-Apify-Pagination-Total", str(len(_DatasetFalso.itens)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def dataset():
+    _DatasetFalso.itens = []
+    _DatasetFalso.consultas = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _DatasetFalso)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_cursor_le_cada_item_uma_unica_vez(dataset):
+    cursor = CursorDataset("ds1", "token", campos=["title"], tamanho_pagina=2, base_url=dataset)
+
+    _DatasetFalso.itens = [{"title": "a", "extra": 1}, {}, {"title": "c"}]
+    assert cursor.ler_novos() == [{"title": "a"}, {"title": "c"}]
+    assert cursor.offset == 3
+
+    # Nada novo: uma única leitura vazia a partir do offset atual
+    assert cursor.ler_novos() == []
+
+    _DatasetFalso.itens += [{"title": "d"}, {"title": "e"}, {"title": "f"}]
+    assert cursor.ler_novos(limite=2) == [{"title": "d"}, {"title": "e"}]
+    assert cursor.ler_novos() == [{"title": "f"}]
+
+    assert [c["offset"] for c in _DatasetFalso.consultas] == ["0", "2", "3", "3", "5"]
+    assert all(c["fields"] == "title" and c["clean"] == "true" for c in _DatasetFalso.consultas)
+
+
+def test_long_polls_alem_do_limite_da_sessao_padrao(apify, monkeypatch):
+    # Sessão padrão limitada a 2 conexões: os long-polls não podem depender dela
+    monkeypatch.setenv("HTTP_MAX_CONEXOES_POR_HOST", "2")
+    monkeypatch.setenv("HTTP_TIMEOUT_POOL", "0.1")
+    monkeypatch.setattr(http_client, "_sessoes", {})
+    monkeypatch.setattr(_ApifyFalso, "duracao", 0.5)
+
+    inicio = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        runs = list(executor.map(lambda _: aguardar_run("run1", "token", timeout_segundos=10, base_url=apify), range(8)))
+
+    assert [run["status"] for run in runs] == ["SUCCEEDED"] * 8
+    # Um long-poll por run: nenhum esperou conexão até falhar e voltou em backoff (>= 1s)
+    assert time.monotonic() - inicio < 1.0
+    assert _ApifyFalso.requisicoes == 8
@@ -0,0 +1,168 @@
+"""
+Testes do processamento de lotes do extrator de palavras-chave
+"""
+
+import os
+import re
+import sys
+import time
+import asyncio
+import textwrap
+import threading
+import subprocess
+
+import pytest
+
+from core.services.batch_keyword_extractor import BatchKeywordExtractor
+from core.services.json_stream_parser import consumir_stream
+from core.services.rate_limiter import TokenBucket
+
+
+class CacheFalso:
+    """Cache em memória: só os lotes em `hits` (por título) já estão salvos"""
+
+    def __init__(self, hits=()):
+        self.hits = set(hits)
+
+    def gerar_chave(self, partes, versao_prompt, modelo):
+        return "|".join(partes)
+
+    def obter(self, chave):
+        for titulo in self.hits:
+            if titulo in chave:
+                return {"palavras": [{"termo": titulo, "frequencia": 1}]}
+        return None
+
+    def salvar(self, chave, valor, modelo=None):
+        pass
+
+
+class LimitadorFalso:
+    def __init__(self):
+        self.tokens = 0
+
+    async def adquirir_async(self):
+        self.tokens += 1
+
+
+class ExtratorFalso(BatchKeywordExtractor):
+    """Gemini substituído: cada lote dorme `duracoes[titulo]` e devolve o próprio título"""
+
+    def __init__(self, duracoes, **kwargs):
+        super().__init__(**kwargs)
+        self.duracoes = duracoes
+        self.cache = CacheFalso()
+        self.limitador = LimitadorFalso()
+        self.inicios = []
+        self.em_voo = 0
+        self.max_em_voo = 0
+        self._contador = threading.Lock()
+
+    def _gerar_conteudo(self, prompt, ao_receber_palavra=None):
+        titulo = re.search(r"Vaga \d+", prompt).group()
+        with self._contador:
+            self.inicios.append((titulo, time.monotonic()))
+            self.em_voo += 1
+            self.max_em_voo = max(self.max_em_voo, self.em_voo)
+        try:
+            time.sleep(self.duracoes.get(titulo, 0.05))
+        finally:
+            with self._contador:
+                self.em_voo -= 1
+        resposta = '{"palavras": [{"termo": "Python", "frequencia": 2}, {"termo": "%s", "frequencia": 1}]}' % titulo
+        return consumir_stream([resposta], "palavras", ao_receber_palavra)
+
+
+def _lotes(n):
+    return [[{"titulo": f"Vaga {i}", "descricao": f"Descrição {i}"}] for i in range(1, n + 1)]
+
+
+def _coletar(extrator, lotes):
+    async def processar():
+        return [r async for r in extrator._processar_lotes_concorrentes(lotes, "Dev")]
+    return asyncio.run(processar())
+
+
+@pytest.fixture(autouse=True)
+def chave_gemini(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "teste")
+
+
+def test_concorrentes_respeitam_o_limite_em_voo():
+    extrator = ExtratorFalso({}, max_concorrencia=2, requisicoes_por_minuto=6000)
+
+    resultados = _coletar(extrator, _lotes(6))
+
+    assert sorted(idx for idx, _ in resultados) == [1, 2, 3, 4, 5, 6]
+    assert all(resultado for _, resultado in resultados)
+    assert extrator.max_em_voo == 2
+    assert extrator.limitador.tokens == 6
+
+
+def test_lotes_chegam_por_conclusao_e_consolidacao_nao_depende_da_ordem():
+    duracoes = {"Vaga 1": 0.3, "Vaga 2": 0.05, "Vaga 3": 0.15}
+    extrator = ExtratorFalso(duracoes, max_concorrencia=3, requisicoes_por_minuto=6000)
+
+    assert [idx for idx, _ in _coletar(extrator, _lotes(3))] == [2, 3, 1]
+
+    vagas = [vaga for lote in _lotes(3) for vaga in lote]
+    resultado = asyncio.run(extrator.extract_keywords_batch(vagas, "Dev", batch_size=1))
+
+    assert [l["lote"] for l in resultado["cache"]["lotes"]] == [1, 2, 3]
+    top_10 = resultado["top_10_palavras_chave"]
+    assert (top_10[0]["termo"], top_10[0]["frequencia"]) == ("Python", 6)
+    assert {p["termo"]: p["frequencia"] for p in top_10[1:]} == {"Vaga 1": 1, "Vaga 2": 1, "Vaga 3": 1}
+
+
+def test_token_bucket_espaca_lotes_e_cache_nao_consome_token():
+    extrator = ExtratorFalso({}, max_concorrencia=4, requisicoes_por_minuto=600)
+    extrator.limitador = TokenBucket(600, capacidade=1)  # 1 token a cada 0,1s
+    extrator.cache = CacheFalso(hits={"Vaga 3"})
+
+    resultados = dict(_coletar(extrator, _lotes(4)))
+
+    assert resultados[3]["origem_cache"] == "hit"
+    assert sorted(titulo for titulo, _ in extrator.inicios) == ["Vaga 1", "Vaga 2", "Vaga 4"]
+    inicios = sorted(instante for _, instante in extrator.inicios)
+    # A janela permite 4 em voo, mas o bucket só libera uma chamada por token
+    assert all(depois - antes >= 0.08 for antes, depois in zip(inicios, inicios[1:]))
+
+
+def test_lotes_rodam_em_paralelo_sob_gevent():
+    """Worker gevent: asyncio.run numa thread do hub não pode enfileirar as chamadas ao SDK"""
+    pytest.importorskip("gevent")
+    script = textwrap.dedent("""
+        from gevent import monkey; monkey.patch_all()
+        import asyncio, os, time, gevent
+        from core.services.batch_keyword_extractor import BatchKeywordExtractor
+        from core.services.json_stream_parser import consumir_stream
+
+        dormir = monkey.get_original('time', 'sleep')  # bloqueio nativo, como o gRPC
+
+        class Extrator(BatchKeywordExtractor):
+            def _gerar_conteudo(self, prompt, ao_receber_palavra=None):
+                dormir(1.0)
+                return consumir_stream(['{"palavras": [{"termo": "Python", "frequencia": 1}]}'], "palavras", ao_receber_palavra)
+
+        extrator = Extrator(max_concorrencia=4, requisicoes_por_minuto=6000)
+        lotes = [[{'titulo': f'Vaga {i}', 'descricao': f'Descrição {i}'}] for i in range(4)]
+
+        async def processar():
+            return [r async for r in extrator._processar_lotes_concorrentes(lotes, 'Dev')]
+
+        for _ in range(2):
+            inicio = time.time()
+            resultados = gevent.get_hub().threadpool.apply(asyncio.run, (processar(),))
+            print('resultado', len([r for _, r in resultados if r]), round(time.time() - inicio, 1))
+        os._exit(0)
+    """)
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ambiente = {**os.environ, 'GOOGLE_API_KEY': 'teste', 'LLM_CACHE_DESATIVADO': '1'}
+    saida = subprocess.run([sys.executable, "-c", script], cwd=raiz, env=ambiente, capture_output=True, text=True, timeout=60)
+
+    assert saida.returncode == 0, saida.stderr
+    linhas = [l.split()[1:] for l in saida.stdout.splitlines() if l.startswith('resultado ')]
+    assert len(linhas) == 2
+    for lotes, segundos in linhas:
+        assert lotes == "4"
+        assert float(segundos) < 2.0  # em fila seriam 4s
@@ -0,0 +1,81 @@
+"""
+Testes da análise de currículos em lote
+"""
+
+import asyncio
+from io import BytesIO
+
+import docx
+import pytest
+from core.services.agente_0_diagnostico import DiagnosticoCarolinaMartins
+from core.services.batch_resume_analyzer import USO_POOL, AnalisadorCurriculosLote
+from core.services.parallel_extraction import obter_pool, processos_do_pool
+
+CURRICULO = (
+    "Maria Silva - maria@email.com - (11) 99999-8888\n"
+    "OBJETIVO: Analista de Dados\n"
+    "RESUMO: liderei projetos de análise de dados com Python, SQL e Power BI\n"
+    "EXPERIÊNCIA: Empresa X (2019 - 2024) - implementei dashboards e reduzi custos em 20%\n"
+    "FORMAÇÃO: Graduação em Estatística\n"
+    "IDIOMAS: inglês avançado\n"
+)
+
+
+def gerar_docx(texto):
+    documento = docx.Document()
+    for linha in texto.splitlines():
+        documento.add_paragraph(linha)
+    saida = BytesIO()
+    documento.save(saida)
+    return saida.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def sem_ia(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+
+
+def sem_ordem(analise):
+    """palavras_chave_atuais vem de um set: a ordem varia entre processos"""
+    return {**analise, "palavras_chave_atuais": sorted(analise.get("palavras_chave_atuais", []))}
+
+
+def arquivos_lote():
+    return [
+        ("maria.txt", CURRICULO.encode()),
+        ("maria.docx", gerar_docx(CURRICULO)),
+        ("vazio.txt", b"   "),
+        ("planilha.xlsx", b"nao suportado"),
+    ] * 3
+
+
+@pytest.mark.parametrize("max_processos", [1, 2])
+def test_lote_igual_a_analise_individual(max_processos):
+    arquivos = arquivos_lote()
+    diagnostico = DiagnosticoCarolinaMartins(None)
+    esperado = [sem_ordem(diagnostico.analisar_curriculo_atual(nome, conteudo)) for nome, conteudo in arquivos]
+
+    lote = asyncio.run(AnalisadorCurriculosLote(max_processos=max_processos, minimo_paralelo=2).analisar_lote(arquivos))
+
+    assert [sem_ordem(r["analise"]) for r in lote["resultados"]] == esperado
+    assert [r["arquivo"] for r in lote["resultados"]] == [nome for nome, _ in arquivos]
+    estatisticas = lote["estatisticas"]
+    assert estatisticas["modo"] == ("paralelo" if max_processos > 1 else "local")
+    assert (estatisticas["arquivos"], estatisticas["sucesso"], estatisticas["erros"]) == (12, 6, 6)
+    assert estatisticas["tempo_p95_segundos"] <= estatisticas["tempo_maximo_segundos"]
+
+
+def test_pool_proprio_e_processos_reais_nas_estatisticas():
+    # A extração do MPC criou o pool dela antes: o de currículos é outro
+    pool_extracao = obter_pool(3)
+    analisador = AnalisadorCurriculosLote(max_processos=2, minimo_paralelo=2)
+
+    lote = asyncio.run(analisador.analisar_lote(arquivos_lote()))
+
+    assert obter_pool(2, USO_POOL) is not pool_extracao
+    assert lote["estatisticas"]["processos"] == processos_do_pool(USO_POOL) == 2
+
+    # Pool já criado: o tamanho pedido depois não muda o pool, e a estatística diz o real
+    lote = asyncio.run(AnalisadorCurriculosLote(max_processos=4, minimo_paralelo=2).analisar_lote(arquivos_lote()))
+    assert lote["estatisticas"]["processos"] == 2
@@ -0,0 +1,52 @@
+"""
+Testes do matcher de termos compostos pré-compilado
+"""
+
+import re
+import pytest
+from core.services.compound_term_matcher import CompoundTermMatcher
+
+PADROES = [
+    r'excel\s+(avançado|intermediário|básico)',
+    r'power\s+bi',
+    r'gestão\s+de\s+(projetos|pessoas)',
+    r'gestão\s+de\s+talentos',
+    r'marketing\s+(digital|de\s+conteúdo)',
+    r'email\s+marketing',
+    r'análise\s+de\s+dados',
+    r'análise\s+financeira',
+    r'(?:ci|cd)\s+pipeline',
+]
+
+
+def referencia(texto):
+    """Laço original: um re.finditer por padrão"""
+    termos = []
+    for padrao in PADROES:
+        for match in re.finditer(padrao, texto, re.IGNORECASE):
+            termo = match.group().lower().strip()
+            if termo not in termos:
+                termos.append(termo)
+    return termos
+
+
+@pytest.mark.parametrize("texto", [
+    "experiência com excel avançado e power bi",
+    "email marketing digital e marketing de conteúdo",  # padrões sobrepostos
+    "autogestão de pessoas, gestão de talentos e gestão de projetos",  # dentro de palavra
+    "Power   BI\ne Excel\tBásico",  # espaços múltiplos e maiúsculas
+    "análise de dados, análise financeira, análise de dados de novo",
+    "ci pipeline e cd pipeline",  # padrão sem palavra literal inicial
+    "straße power bi",  # dobra de caixa que muda o tamanho do texto
+    "",
+])
+def test_resultado_identico_ao_laco_original(texto):
+    matcher = CompoundTermMatcher(PADROES)
+    assert matcher.encontrar(texto) == referencia(texto)
+
+
+def test_reuso_do_cache_entre_textos():
+    matcher = CompoundTermMatcher(PADROES)
+    texto = "power bi e gestão de projetos"
+
+    assert matcher.encontrar(texto) == matcher.encontrar(texto) == ["power bi", "gestão de projetos"]
@@ -0,0 +1,110 @@
+"""
+Testes da extração de texto em trechos (PDF/DOCX/TXT) com orçamentos
+e da análise de currículo em passada única
+"""
+
+import zipfile
+from io import BytesIO
+
+import docx
+import pytest
+from core.services.document_processor import DocumentProcessor
+
+
+def gerar_pdf(textos_paginas):
+    """PDF mínimo com uma linha de texto por página (Helvetica)"""
+    objetos = []
+    n = len(textos_paginas)
+    # 1 catálogo, 2 árvore de páginas, 3 fonte; depois pares página/conteúdo
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objetos.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objetos.append(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    objetos.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, texto in enumerate(textos_paginas):
+        conteudo = f"BT /F1 12 Tf 72 712 Td ({texto}) Tj ET".encode()
+        objetos.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode())
+        objetos.append(b"<< /Length %d >>\nstream\n" % len(conteudo) + conteudo + b"\nendstream")
+    saida = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objetos, 1):
+        offsets.append(len(saida))
+        saida += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(saida)
+    saida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    for off in offsets:
+        saida += b"%010d 00000 n \n" % off
+    saida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return bytes(saida)
+
+
+def gerar_docx(paragrafos):
+    documento = docx.Document()
+    for texto in paragrafos:
+        documento.add_paragraph(texto)
+    saida = BytesIO()
+    documento.save(saida)
+    return saida.getvalue()
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+    return DocumentProcessor()
+
+
+def test_pdf_em_disco_pagina_a_pagina_com_orcamento(processor, tmp_path):
+    caminho = tmp_path / "curriculo.pdf"
+    caminho.write_bytes(gerar_pdf([f"Pagina {i}" for i in range(50)]))
+
+    assert list(processor.iterar_texto_documento(str(caminho), max_paginas=3)) == [
+        "Pagina 0\n", "Pagina 1\n", "Pagina 2\n"
+    ]
+    processor.max_paginas = 2
+    assert processor.extrair_texto_documento(str(caminho)) == "Pagina 0\nPagina 1\n"
+
+
+def test_docx_e_txt_respeitam_limite_de_caracteres(processor):
+    arquivo = gerar_docx(["Experiência", "Python e SQL"])
+    assert processor.extrair_texto_documento("cv.docx", arquivo) == "Experiência\nPython e SQL\n"
+
+    processor.max_caracteres = 15
+    assert processor.extrair_texto_documento("cv.docx", arquivo) == "Experiência\nPyt"
+    assert processor.extrair_texto_documento("cv.txt", ("á" * 100).encode()) == "á" * 15
+
+
+def test_uploads_acima_do_orcamento_sao_recusados(processor):
+    processor.max_bytes = 1024
+    assert processor.extrair_texto_documento("cv.pdf", b"%PDF" + b"0" * 2048) == ""
+
+    # DOCX pequeno compactado, enorme descompactado
+    bomba = BytesIO()
+    with zipfile.ZipFile(bomba, "w", zipfile.ZIP_DEFLATED) as pacote:
+        pacote.writestr("word/document.xml", "a" * 10_000_000)
+    processor.max_bytes = 1024 * 1024
+    processor.max_bytes_descompactados = 1024 * 1024
+    with pytest.raises(ValueError, match="descompactado"):
+        list(processor.iterar_texto_documento("cv.docx", bomba.getvalue()))
+
+
+def test_analise_em_passada_unica_igual_as_chamadas_separadas(processor):
+    texto = (
+        "OBJETIVO\nAnalista de Dados\nEXPERIÊNCIA\nEmpresa X | 03/2019 - 2023\n"
+        "Liderei a migração para Power BI e SQL; reduziu custos em 30%.\n"
+        "Responsável por relatórios de vendas. Scrum, Kanban e gestão de TI."
+    )
+    analise = processor.analisar_curriculo(texto)
+
+    assert analise == {
+        "estrutura_metodologica": processor.analisar_estrutura_curriculo(texto),
+        "validacoes_honestidade": processor.verificar_honestidade_curriculo(texto),
+        "formatacao": processor.analisar_formatacao_documento(texto),
+        "palavras_chave_atuais": processor.extrair_palavras_chave_curriculo(texto)
+    }
+    assert set(analise["palavras_chave_atuais"]) == {
+        "power bi", "sql", "gestão", "vendas", "ti", "scrum", "kanban"
+    }
+    assert analise["validacoes_honestidade"]["informacoes_verificaveis"]
+
+    # 'ı' casa com "i" sob IGNORECASE, como nas varreduras originais
+    assert set(processor.extrair_palavras_chave_curriculo("Lıderança e Pythın")) == {"lıderança"}
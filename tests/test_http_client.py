@@ -0,0 +1,101 @@
+"""
+Testes do cliente HTTP compartilhado
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from core.services.http_client import criar_sessao, obter_sessao, RetryComJitter
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    falhas_restantes = 0
+    atraso = 0
+    portas_cliente = []
+
+    def do_GET(self):
+        _Handler.portas_cliente.append(self.client_address[1])
+        time.sleep(_Handler.atraso)
+        if _Handler.falhas_restantes > 0:
+            _Handler.falhas_restantes -= 1
+            status, corpo = 503, b"indisponivel"
+        else:
+            status, corpo = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("Set-Cookie", "sessao=abc")
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    _Handler.falhas_restantes = 0
+    _Handler.atraso = 0
+    _Handler.portas_cliente = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_conexao_reutilizada_entre_requisicoes(servidor):
+    sessao = criar_sessao()
+    for _ in range(5):
+        assert sessao.get(servidor).text == "ok"
+
+    # Mesma porta de origem: uma única conexão TCP para as 5 requisições
+    assert len(set(_Handler.portas_cliente)) == 1
+    # Cookies nunca são guardados na sessão compartilhada
+    assert len(sessao.cookies) == 0
+
+
+def test_retentativa_em_erro_transitorio(servidor):
+    _Handler.falhas_restantes = 2
+    sessao = criar_sessao(max_retentativas=3, fator_backoff=0.01)
+
+    assert sessao.get(servidor).status_code == 200
+    assert len(_Handler.portas_cliente) == 3
+
+
+def test_timeout_padrao_e_sessao_unica():
+    assert obter_sessao() is obter_sessao()
+    assert criar_sessao(timeout_conexao=2, timeout_leitura=7).timeout_padrao == (2, 7)
+
+
+def test_backoff_com_jitter():
+    retry = RetryComJitter(total=3, backoff_factor=1).increment(method="GET", url="/").increment(method="GET", url="/")
+    assert retry.get_backoff_time() >= 2
+    assert retry.get_backoff_time() <= 2 + RetryComJitter.jitter_max
+
+
+def test_pool_limita_conexoes_por_host(servidor):
+    _Handler.atraso = 0.1
+    sessao = criar_sessao(max_conexoes_por_host=2)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        respostas = list(executor.map(lambda _: sessao.get(servidor).text, range(6)))
+
+    assert respostas == ["ok"] * 6
+    # As 6 requisições simultâneas esperam uma das 2 conexões do host
+    assert len(set(_Handler.portas_cliente)) == 2
+
+
+def test_pool_cheio_falha_apos_timeout(servidor):
+    _Handler.atraso = 0.5
+    sessao = criar_sessao(max_conexoes_por_host=1, timeout_pool=0.1)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        primeira = executor.submit(sessao.get, servidor)
+        time.sleep(0.1)
+        with pytest.raises(requests.ConnectionError):
+            sessao.get(servidor)
+        assert primeira.result().text == "ok"
@@ -0,0 +1,90 @@
+"""
+Testes do cache compartilhado de coletas de vagas
+"""
+
+import time
+import threading
+from core.services.job_collection_cache import CacheColetas, chave_vaga
+
+PARAMETROS = {'fonte': 'indeed', 'cargo': 'Analista de Dados', 'localizacao': 'São Paulo', 'raio_km': 25}
+
+
+def _vagas(n):
+    return [{'titulo': f'Vaga {i}', 'empresa': f'Empresa {i}'} for i in range(n)]
+
+
+def test_chave_normaliza_parametros():
+    """Caixa, acentos, espaços e ordem não mudam a chave; os filtros sim"""
+    a = CacheColetas.gerar_chave(PARAMETROS)
+    b = CacheColetas.gerar_chave({'raio_km': 25, 'localizacao': ' sao  PAULO', 'cargo': 'analista de dados', 'fonte': 'indeed'})
+    assert a == b
+    assert a != CacheColetas.gerar_chave({**PARAMETROS, 'raio_km': 50})
+    assert a != CacheColetas.gerar_chave({**PARAMETROS, 'nivel': 'senior_level'})
+
+
+def test_quantidade_e_ttl_por_janela(tmp_path):
+    cache = CacheColetas(caminho=str(tmp_path / "coletas.sqlite3"), ttl_por_dia_segundos=3600, ttl_maximo_segundos=12 * 3600)
+    assert cache.ttl_para('1') == 3600
+    assert cache.ttl_para('7') == 7 * 3600
+    assert cache.ttl_para('30') == cache.ttl_para('todos') == 12 * 3600
+
+    cache.salvar(PARAMETROS, 50, _vagas(50))
+    assert cache.obter(PARAMETROS, 20) == _vagas(20)
+    assert cache.obter(PARAMETROS, 100) is None  # coleta menor que o pedido
+
+    # A fonte esgotou (pediu 100, vieram 30): atende qualquer quantidade
+    cache.salvar(PARAMETROS, 100, _vagas(30))
+    assert cache.obter(PARAMETROS, 100) == _vagas(30)
+    assert cache.estatisticas()['hit_ratio'] == round(2 / 3, 3)
+
+    expirando = CacheColetas(caminho=str(tmp_path / "expira.sqlite3"), ttl_por_dia_segundos=0.05)
+    expirando.salvar({**PARAMETROS, 'dias_publicacao': '1'}, 10, _vagas(10))
+    time.sleep(0.1)
+    assert expirando.obter({**PARAMETROS, 'dias_publicacao': '1'}, 10) is None
+
+
+def test_buscas_simultaneas_compartilham_um_run(tmp_path):
+    cache = CacheColetas(caminho=str(tmp_path / "coletas.sqlite3"))
+    runs = []
+    liberar = threading.Event()
+
+    def coletor():
+        runs.append(1)
+        liberar.wait(5)
+        return _vagas(20), True
+
+    resultados = []
+
+    def buscar(quantidade):
+        resultados.append(cache.coletar(PARAMETROS, quantidade, coletor))
+
+    threads = [threading.Thread(target=buscar, args=(20 - i,)) for i in range(4)]
+    threads[0].start()
+    while not cache.estatisticas()['coletas_em_andamento']:
+        time.sleep(0.01)
+    for t in threads[1:]:
+        t.start()
+    while cache.estatisticas()['coletas_compartilhadas'] < 3:
+        time.sleep(0.01)
+    liberar.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(runs) == 1
+    assert sorted(origem for _, origem in resultados) == ['coleta', 'compartilhada', 'compartilhada', 'compartilhada']
+    assert sorted(len(vagas) for vagas, _ in resultados) == [17, 18, 19, 20]
+
+    # Depois do run, a mesma busca vem do cache
+    assert cache.coletar(PARAMETROS, 20, coletor) == (_vagas(20), 'cache')
+    assert len(runs) == 1
+
+
+def test_run_incompleto_nao_e_gravado(tmp_path):
+    cache = CacheColetas(caminho=str(tmp_path / "coletas.sqlite3"))
+    cache.coletar(PARAMETROS, 20, lambda: (_vagas(5), False))
+    assert cache.obter(PARAMETROS, 5) is None
+
+
+def test_chave_vaga_identifica_a_mesma_vaga_em_runs_diferentes():
+    assert chave_vaga({'url': 'https://br.indeed.com/viewjob?jk=1', 'data_coleta': 'a'}) == 'https://br.indeed.com/viewjob?jk=1'
+    assert chave_vaga({'titulo': 'Analista ', 'empresa': 'ACME'}) == chave_vaga({'titulo': 'analista', 'empresa': 'Acme', 'url': ''})
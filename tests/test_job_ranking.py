@@ -0,0 +1,65 @@
+"""
+Testes do ranking de vagas por compatibilidade com o currículo base
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from core.models import Base, Curriculo, TipoCurriculo, VagaAnalisada
+from core.services.agente_2_curriculo import CurriculoCarolinaMartins
+
+
+class ExtratorEspacos:
+    """Extração simplificada: uma palavra por termo"""
+
+    def _extrair_palavras_texto_detalhado(self, texto):
+        return texto.split()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    sessao = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield sessao
+    finally:
+        sessao.close()
+
+
+def test_ranking_das_vagas_do_mpc_sem_gravar(db):
+    curriculo = Curriculo(
+        usuario_id=1, tipo=TipoCurriculo.BASE.value,
+        objetivo="analista de dados", palavras_chave_priorizadas={"digital": ["python", "sql"]}
+    )
+    db.add(curriculo)
+    palavras = [
+        ["excel", "vendas", "negociação"],
+        ["python", "sql", "dados", "excel"],
+        ["python", "kubernetes", "docker"],
+        None,  # vaga ainda não processada: extraída no ranking
+    ]
+    for i, termos in enumerate(palavras):
+        db.add(VagaAnalisada(
+            mpc_id=7, titulo=f"Vaga {i}", empresa="ACME", palavras_extraidas=termos,
+            descricao="analista de dados sql" if termos is None else ""
+        ))
+    db.commit()
+
+    agente = CurriculoCarolinaMartins(db)
+    agente._extrator = ExtratorEspacos()
+    comandos = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: comandos.append(args[2]))
+
+    resultado = agente.ranquear_vagas_compativeis(curriculo.id, mpc_id=7, top_k=3)
+
+    assert not [c for c in comandos if not c.startswith("SELECT")]
+    assert resultado["total_vagas"] == 4
+    ranking = resultado["ranking"]
+    assert [v["cargo"] for v in ranking][:2] == ["Vaga 3", "Vaga 1"]
+    assert ranking[0]["compatibilidade"] > ranking[1]["compatibilidade"] > ranking[2]["compatibilidade"] > 0
+    assert ranking[1]["termos_em_comum"] == ["python", "sql", "dados"]
+    assert ranking[1]["termos_faltando"] == ["excel"]
+
+    # A compatibilidade do ranking segue para a personalização
+    assert agente._calcular_compatibilidade_vaga(curriculo, ranking[0]) == ranking[0]["compatibilidade"]
@@ -0,0 +1,126 @@
+"""
+Testes da orquestração de coleta do JobScraper (sem Apify)
+"""
+
+import sys
+import time
+import types
+import importlib
+from concurrent.futures import wait as esperar_todos
+
+import pytest
+
+from core.services.near_duplicate_index import NearDuplicateIndex
+
+
+@pytest.fixture
+def job_scraper(monkeypatch):
+    """Módulo job_scraper com o scraper do Google Jobs substituído (o serviço real chama o Apify)"""
+    falso = types.ModuleType("core.services.google_jobs_scraper")
+    falso.GoogleJobsScraper = object
+    monkeypatch.setitem(sys.modules, "core.services.google_jobs_scraper", falso)
+    monkeypatch.delitem(sys.modules, "core.services.job_scraper", raising=False)
+    yield importlib.import_module("core.services.job_scraper")
+    sys.modules.pop("core.services.job_scraper", None)
+
+
+class ScraperFalso:
+    """Respostas por cargo: lista de vagas ou exceção (com atraso opcional por cargo)"""
+
+    def __init__(self, respostas, atrasos=None):
+        self.respostas = respostas
+        self.atrasos = atrasos or {}
+        self.chamadas = []
+
+    def coletar_vagas_google(self, cargo, localizacao, limite):
+        self.chamadas.append((cargo, limite))
+        time.sleep(self.atrasos.get(cargo, 0))
+        resposta = self.respostas[cargo]
+        if isinstance(resposta, Exception):
+            raise resposta
+        return resposta[:limite]
+
+
+class PlanejadorFalso:
+    def __init__(self):
+        self.registros = []
+
+    def registrar(self, combo, pedidas, novas, latencia, fonte):
+        self.registros.append((combo.cargo, pedidas, novas))
+
+
+def _scraper(modulo, respostas, max_concorrencia=2):
+    scraper = modulo.JobScraper.__new__(modulo.JobScraper)
+    scraper.scraper = ScraperFalso(respostas)
+    scraper.planejador_adaptativo = PlanejadorFalso()
+    scraper.max_retries = 2
+    scraper.retry_delay = 0
+    scraper.max_concorrencia = max_concorrencia
+    scraper.top_combinacoes = 15
+    return scraper
+
+
+def _vagas(prefixo, n):
+    return [
+        {"titulo": f"{prefixo} vaga {i}", "empresa": f"Empresa {prefixo}{i}", "descricao": f"Descrição única {prefixo} {i} " * 5}
+        for i in range(n)
+    ]
+
+
+def _combos(modulo, *cargos):
+    return [modulo.SearchCombination(cargo, "São Paulo, SP", 10, "hibrido") for cargo in cargos]
+
+
+def _metadados():
+    return {"combinacoes_tentadas": []}
+
+
+def test_cascata_nao_registra_run_com_erro(job_scraper):
+    scraper = _scraper(job_scraper, {"erro": RuntimeError("apify fora"), "vazio": [], "bom": _vagas("b", 3)})
+
+    vagas = scraper._coletar_em_cascata(_combos(job_scraper, "erro", "vazio", "bom"), 10, _metadados(), NearDuplicateIndex())
+
+    assert len(vagas) == 3
+    # Erro fica fora do histórico; a busca que de fato não trouxe nada rende 0
+    assert scraper.planejador_adaptativo.registros == [("vazio", 10, 0), ("bom", 10, 3)]
+
+
+def test_paralelo_nao_registra_erro_nem_run_descartado_pela_meta(job_scraper, monkeypatch):
+    # Os dois runs terminam juntos: o segundo é descartado inteiro pela meta
+    monkeypatch.setattr(job_scraper, "wait", lambda futuros, return_when: esperar_todos(futuros))
+    scraper = _scraper(job_scraper, {"a": _vagas("a", 3), "b": _vagas("b", 3)})
+
+    vagas = scraper._coletar_paralelo(_combos(job_scraper, "a", "b"), 3, _metadados(), NearDuplicateIndex())
+
+    assert len(vagas) == 3
+    assert len(scraper.planejador_adaptativo.registros) == 1
+    assert scraper.planejador_adaptativo.registros[0][1:] == (3, 3)
+
+    scraper = _scraper(job_scraper, {"erro": RuntimeError("timeout"), "vazio": []})
+    scraper._coletar_paralelo(_combos(job_scraper, "erro", "vazio"), 3, _metadados(), NearDuplicateIndex())
+    assert scraper.planejador_adaptativo.registros == [("vazio", 3, 0)]
+
+
+def test_paralelo_para_na_meta_e_separa_canceladas_de_descartadas(job_scraper):
+    scraper = _scraper(job_scraper, {c: _vagas(c, 3) for c in "abcd"})
+    scraper.scraper.atrasos = {"b": 0.3}  # "b" ainda está rodando quando "a" fecha a meta
+    metadados = _metadados()
+
+    vagas = scraper._coletar_paralelo(_combos(job_scraper, "a", "b", "c", "d"), 3, metadados, NearDuplicateIndex())
+
+    assert [v["titulo"] for v in vagas] == ["a vaga 0", "a vaga 1", "a vaga 2"]
+    assert sorted(cargo for cargo, _ in scraper.scraper.chamadas) == ["a", "b"]
+    assert metadados["combinacoes_canceladas"] == 2
+    assert metadados["combinacoes_descartadas_em_execucao"] == 1
+
+
+def test_paralelo_deduplica_entre_combinacoes(job_scraper):
+    repetidas = _vagas("a", 2)
+    scraper = _scraper(job_scraper, {"a": repetidas, "b": repetidas + _vagas("b", 1)})
+    metadados = _metadados()
+
+    vagas = scraper._coletar_paralelo(_combos(job_scraper, "a", "b"), 10, metadados, NearDuplicateIndex())
+
+    assert sorted(v["titulo"] for v in vagas) == ["a vaga 0", "a vaga 1", "b vaga 0"]
+    assert sum(c["vagas_novas"] for c in metadados["combinacoes_tentadas"]) == 3
+    assert metadados["combinacoes_canceladas"] == metadados["combinacoes_descartadas_em_execucao"] == 0
@@ -0,0 +1,99 @@
+"""
+Testes do parser incremental de respostas JSON das IAs
+"""
+
+import asyncio
+
+import pytest
+from core.services import batch_keyword_extractor
+from core.services.batch_keyword_extractor import BatchKeywordExtractor
+from core.services.json_stream_parser import ParserArrayJSON, consumir_stream
+
+RESPOSTA = """```json
+{
+  "palavras": [
+    {"termo": "React", "frequencia": 3, "categoria": "framework"},
+    {"termo": "C# {.NET}", "frequencia": 2, "categoria": "linguagem \\"core\\""},
+    {"termo": "Git", "frequencia": 2, "categoria": "ferramenta"}
+  ]
+}
+```"""
+
+
+def test_objetos_saem_assim_que_fecham():
+    parser = ParserArrayJSON("palavras")
+    recebidos = []
+    for i, caractere in enumerate(RESPOSTA):
+        for item in parser.alimentar(caractere):
+            recebidos.append((item["termo"], i))
+
+    termos = [termo for termo, _ in recebidos]
+    assert termos == ["React", "C# {.NET}", "Git"]
+    # O primeiro termo sai bem antes do fim da resposta
+    assert recebidos[0][1] < len(RESPOSTA) // 2
+    assert parser.resultado()["palavras"][1]["categoria"] == 'linguagem "core"'
+    assert "resposta_truncada" not in parser.resultado()
+
+
+def test_resposta_truncada_recupera_palavras_completas():
+    truncada = RESPOSTA[:RESPOSTA.index('"Git"') + 8]
+    parser = consumir_stream([truncada[:40], truncada[40:]], "palavras")
+
+    assert parser.resultado() == {
+        "palavras": [
+            {"termo": "React", "frequencia": 3, "categoria": "framework"},
+            {"termo": "C# {.NET}", "frequencia": 2, "categoria": 'linguagem "core"'},
+        ],
+        "resposta_truncada": True,
+    }
+
+    with pytest.raises(ValueError):
+        consumir_stream(['{"palavras": [{"termo": "Re'], "palavras").resultado()
+
+
+class Pedaco:
+    def __init__(self, text):
+        self.text = text
+
+
+class ModeloFalso:
+    def __init__(self, resposta):
+        self.resposta = resposta
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        assert stream
+        return [Pedaco(self.resposta[i:i + 7]) for i in range(0, len(self.resposta), 7)]
+
+
+class CacheFalso:
+    def __init__(self):
+        self.salvos = {}
+
+    def gerar_chave(self, partes, versao, modelo):
+        return repr(partes)
+
+    def obter(self, chave):
+        return self.salvos.get(chave)
+
+    def salvar(self, chave, valor, modelo):
+        self.salvos[chave] = valor
+
+
+def test_lote_truncado_entrega_palavras_e_nao_vai_ao_cache(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "chave-teste")
+    cache = CacheFalso()
+    monkeypatch.setattr(batch_keyword_extractor, "obter_cache_llm", lambda: cache)
+    truncada = RESPOSTA[:RESPOSTA.index('"Git"')]
+    monkeypatch.setattr(batch_keyword_extractor, "obter_cliente", lambda *args: ModeloFalso(truncada))
+
+    extrator = BatchKeywordExtractor()
+    recebidas = []
+    vagas = [{"titulo": "Dev", "empresa": "ACME", "descricao": "React e Git"}]
+    resultado = asyncio.run(extrator.extract_keywords_batch(
+        vagas, "desenvolvedor", ao_receber_palavra=lambda palavra, lote: recebidas.append((palavra["termo"], lote))
+    ))
+
+    assert recebidas == [("React", 1), ("C# {.NET}", 1)]
+    assert resultado["total_palavras_unicas"] == 2
+    assert resultado["cache"]["lotes"] == [{"lote": 1, "cache": "miss", "truncado": True}]
+    assert cache.salvos == {}
@@ -0,0 +1,166 @@
+"""
+Testes da coleta paralela do LinkedInScraperPro (cotas, dedup e cancelamento)
+e do enriquecimento concorrente das vagas do ScrapingBee
+"""
+
+import sys
+import time
+import importlib
+import threading
+import importlib.util
+from unittest import mock
+
+import pytest
+
+from core.services.rate_limiter import TokenBucket
+
+# Navegador local (só usado pelo provedor Selenium, que estes testes não abrem)
+MODULOS_NAVEGADOR = {
+    "selenium": [
+        "selenium", "selenium.webdriver", "selenium.webdriver.common", "selenium.webdriver.common.by",
+        "selenium.webdriver.chrome", "selenium.webdriver.chrome.options", "selenium.webdriver.support",
+        "selenium.webdriver.support.ui", "selenium.webdriver.support.expected_conditions",
+        "selenium.common", "selenium.common.exceptions",
+    ],
+    "seleniumwire": ["seleniumwire", "seleniumwire.webdriver"],
+    "undetected_chromedriver": ["undetected_chromedriver"],
+}
+
+
+@pytest.fixture
+def linkedin_scraper_pro(monkeypatch):
+    """Módulo do scraper, com os pacotes de navegador ausentes substituídos em sys.modules"""
+    for pacote, modulos in MODULOS_NAVEGADOR.items():
+        if importlib.util.find_spec(pacote) is None:
+            for nome in modulos:
+                monkeypatch.setitem(sys.modules, nome, mock.MagicMock())
+    monkeypatch.delitem(sys.modules, "core.services.linkedin_scraper_pro", raising=False)
+    yield importlib.import_module("core.services.linkedin_scraper_pro")
+    sys.modules.pop("core.services.linkedin_scraper_pro", None)
+
+
+def vagas(prefixo, quantidade):
+    return [
+        {"titulo": f"Analista {prefixo} {i}", "empresa": f"Empresa {prefixo} {i}", "descricao": f"{prefixo} vaga {i} " * 5}
+        for i in range(quantidade)
+    ]
+
+
+def provedor(resultado, atraso=0.0):
+    chamadas = []
+
+    def coletar(limite, cancelado):
+        chamadas.append(limite)
+        if cancelado.wait(atraso):
+            return []
+        return resultado[:limite]
+    return coletar, chamadas
+
+
+def test_provedor_lento_nao_segura_a_coleta(linkedin_scraper_pro, monkeypatch):
+    monkeypatch.setenv("LINKEDIN_TIMEOUT_SEGUNDOS", "5")
+    scraper = linkedin_scraper_pro.LinkedInScraperPro()
+    rapido, chamadas_rapido = provedor(vagas("a", 30))
+    repetido, _ = provedor(vagas("a", 5) + vagas("b", 5), atraso=0.05)
+    lento, _ = provedor(vagas("c", 30), atraso=3)
+
+    inicio = time.monotonic()
+    coletadas = scraper._coletar_em_paralelo(
+        [("lento", lento), ("rapido", rapido), ("repetido", repetido)], 20, {"rapido": 15}
+    )
+
+    assert time.monotonic() - inicio < 1
+    assert chamadas_rapido == [15]
+    assert len(coletadas) == 20
+    stats = scraper.estatisticas_provedores
+    assert (stats["rapido"]["novas"], stats["repetido"]["recebidas"], stats["repetido"]["novas"]) == (15, 10, 5)
+    assert stats["lento"]["status"] == "cancelado"
+
+
+def test_modo_sequencial_preserva_cascata(linkedin_scraper_pro, monkeypatch):
+    scraper = linkedin_scraper_pro.LinkedInScraperPro()
+    primeiro, chamadas_primeiro = provedor(vagas("a", 4))
+    segundo, chamadas_segundo = provedor(vagas("b", 10))
+    coletadas = scraper._coletar_em_sequencia([("primeiro", primeiro), ("segundo", segundo)], 10)
+
+    assert (chamadas_primeiro, chamadas_segundo) == ([10], [6])
+    assert len(coletadas) == 10
+
+
+class Resposta:
+    status_code = 200
+
+    def __init__(self, dados):
+        self.dados = dados
+
+    def json(self):
+        return self.dados
+
+
+class SessaoScrapingBee:
+    """Listagem instantânea; cada detalhe leva 0.2s (renderização)"""
+
+    def __init__(self, total):
+        self.total = total
+        self.simultaneas = self.pico = 0
+        self.timeouts = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        self.timeouts.append(timeout)
+        if 'linkedin.com/jobs/search' in params['url']:
+            return Resposta({"jobs": [
+                {"title": f"Vaga {i}", "company": "ACME", "link": f"https://linkedin.com/jobs/view/{i}"}
+                for i in range(self.total)
+            ]})
+        with self.lock:
+            self.simultaneas += 1
+            self.pico = max(self.pico, self.simultaneas)
+        time.sleep(0.2)
+        with self.lock:
+            self.simultaneas -= 1
+        if params['url'].endswith('/3'):
+            return Resposta({})  # detalhe indisponível: a vaga segue com a listagem
+        return Resposta({"description": f"Descrição {params['url']}", "requirements": "Python"})
+
+
+def test_detalhes_scrapingbee_em_paralelo_com_vagas_parciais(linkedin_scraper_pro, monkeypatch):
+    monkeypatch.setenv("SCRAPINGBEE_MAX_CONCORRENCIA", "4")
+    scraper = linkedin_scraper_pro.LinkedInScraperPro()
+    scraper.session = sessao = SessaoScrapingBee(8)
+    monkeypatch.setattr(scraper, "_limitador_scrapingbee", lambda: TokenBucket(6000))
+
+    recebidas = []
+    inicio = time.monotonic()
+    vagas = scraper._coletar_via_scrapingbee("dev", "Brasil", 10, "chave", ao_receber_vaga=recebidas.append)
+
+    # 8 detalhes de 0.2s com 4 simultâneos (antes: 8 x (0.2s + 1s de pausa))
+    assert time.monotonic() - inicio < 1.0
+    assert sessao.pico == 4
+    assert all(timeout is not None for timeout in sessao.timeouts)
+
+    # Listagem primeiro, sem descrição; depois cada vaga completa
+    assert [v["detalhes_pendentes"] for v in recebidas[:8]] == [True] * 8
+    assert len(recebidas) == 8 + 7
+    assert len(vagas) == 8
+    assert vagas[3]["detalhes_pendentes"] and vagas[3]["descricao"] == ""
+    assert vagas[0]["descricao"] == "Descrição https://linkedin.com/jobs/view/0"
+
+
+def test_vagas_parciais_chegam_ao_consumidor_da_coleta(linkedin_scraper_pro, monkeypatch):
+    monkeypatch.setenv("SCRAPINGBEE_API_KEY", "chave")
+    for variavel in ("SCRAPERAPI_KEY", "APIFY_TOKEN", "LINKEDIN_LI_AT_COOKIE"):
+        monkeypatch.delenv(variavel, raising=False)
+    scraper = linkedin_scraper_pro.LinkedInScraperPro()
+    scraper.session = SessaoScrapingBee(5)
+    monkeypatch.setattr(scraper, "_limitador_scrapingbee", lambda: TokenBucket(6000))
+    monkeypatch.setattr(scraper, "_coletar_via_selenium_undetected", lambda *args: [])
+
+    recebidas = []
+    coletadas = scraper.coletar_vagas_linkedin("dev", "Brasil", 3, paralelo=True, ao_receber_vaga=recebidas.append)
+
+    # Listagem antes dos detalhes; no fim, as mesmas vagas (por url) da lista retornada
+    assert [v["detalhes_pendentes"] for v in recebidas[:3]] == [True] * 3
+    assert any(not v["detalhes_pendentes"] for v in recebidas[3:])
+    assert {v["url"] for v in recebidas} == {v["url"] for v in coletadas}
+    assert len(coletadas) == 3
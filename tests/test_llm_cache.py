@@ -0,0 +1,51 @@
+"""
+Testes do cache persistente de respostas de LLM
+"""
+
+import time
+from core.services.llm_cache import LLMCache
+
+
+def test_chave_ignora_diferencas_de_espacos():
+    """Textos equivalentes após normalização geram a mesma chave"""
+    a = LLMCache.gerar_chave(["Vaga  de\nPython "], "v1", "gemini")
+    b = LLMCache.gerar_chave(["Vaga de Python"], "v1", "gemini")
+    assert a == b
+
+    # Versão do prompt e modelo fazem parte da chave
+    assert a != LLMCache.gerar_chave(["Vaga de Python"], "v2", "gemini")
+    assert a != LLMCache.gerar_chave(["Vaga de Python"], "v1", "claude")
+
+
+def test_salvar_e_obter(tmp_path):
+    cache = LLMCache(caminho=str(tmp_path / "cache.sqlite3"))
+    chave = cache.gerar_chave(["lote"], "v1", "gemini")
+
+    assert cache.obter(chave) is None
+    cache.salvar(chave, {"palavras": [{"termo": "Python", "frequencia": 2}]})
+
+    assert cache.obter(chave) == {"palavras": [{"termo": "Python", "frequencia": 2}]}
+    assert cache.estatisticas()["hits"] == 1
+    assert cache.estatisticas()["misses"] == 1
+
+
+def test_entrada_expirada_nao_e_retornada(tmp_path):
+    cache = LLMCache(caminho=str(tmp_path / "cache.sqlite3"), ttl_segundos=0.05)
+    cache.salvar("chave", {"ok": True})
+    time.sleep(0.1)
+
+    assert cache.obter("chave") is None
+
+
+def test_remocao_lru_por_tamanho(tmp_path):
+    cache = LLMCache(caminho=str(tmp_path / "cache.sqlite3"), max_bytes=60)
+    cache.salvar("a", {"valor": "x" * 10})
+    cache.salvar("b", {"valor": "y" * 10})
+
+    # Acessar "a" torna "b" a entrada menos usada recentemente
+    assert cache.obter("a") is not None
+    cache.salvar("c", {"valor": "z" * 10})
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") is not None
+    assert cache.obter("c") is not None
@@ -0,0 +1,122 @@
+"""
+Testes do roteador de LLMs (failover, hedge e orçamento por provedor)
+"""
+
+import os
+import sys
+import time
+import textwrap
+import threading
+import subprocess
+
+import pytest
+from core.services.llm_router import ProvedorLLM, RoteadorLLM
+
+
+def provedor(nome, resposta=None, atraso=0.0, erro=None):
+    def chamar():
+        time.sleep(atraso)
+        if erro:
+            raise erro
+        return resposta if resposta is not None else nome
+    return ProvedorLLM(nome, chamar)
+
+
+def test_failover_imediato_e_validacao():
+    roteador = RoteadorLLM(hedge=False)
+    resultado = roteador.executar_sincrono([
+        provedor("gemini", erro=RuntimeError("quota")),
+        provedor("claude", resposta=[]),
+        provedor("gpt", resposta=["sp"]),
+    ], validar=bool)
+
+    assert resultado == (["sp"], "gpt")
+    stats = roteador.estatisticas()
+    assert (stats["gemini"]["erros"], stats["claude"]["erros"], stats["gpt"]["erros"]) == (1, 1, 0)
+
+    with pytest.raises(RuntimeError, match="quota"):
+        roteador.executar_sincrono([provedor("gemini", erro=RuntimeError("quota"))])
+
+
+def test_reserva_vence_principal_lento():
+    roteador = RoteadorLLM(atraso_hedge_padrao=0.05)
+    inicio = time.perf_counter()
+    resultado = roteador.executar_sincrono([provedor("lento", atraso=0.5), provedor("rapido", atraso=0.01)])
+
+    assert resultado == ("rapido", "rapido")
+    assert time.perf_counter() - inicio < 0.3
+    stats = roteador.estatisticas()
+    assert (stats["lento"]["hedges"], stats["lento"]["descartadas"]) == (1, 1)
+
+
+def test_atraso_da_reserva_segue_p95_do_provedor():
+    roteador = RoteadorLLM(atraso_hedge_padrao=0.01, amostras_minimas=3)
+    for _ in range(3):
+        roteador.executar_sincrono([provedor("gemini", atraso=0.1)])
+
+    # p95 ≈ 0.1s: uma resposta em 0.05s não dispara a reserva
+    assert roteador.executar_sincrono([provedor("gemini", atraso=0.05), provedor("claude")])[1] == "gemini"
+    assert roteador.estatisticas()["gemini"]["hedges"] == 0
+
+
+def test_orcamento_de_concorrencia_por_provedor():
+    roteador = RoteadorLLM(max_concorrencia=1, hedge=False)
+    liberar = threading.Event()
+    ocupado = ProvedorLLM("gemini", lambda: liberar.wait(2) and "gemini")
+
+    fundo = threading.Thread(target=roteador.executar_sincrono, args=([ocupado],))
+    fundo.start()
+    time.sleep(0.05)
+    try:
+        assert roteador.estatisticas()["gemini"]["em_uso"] == 1
+        assert roteador.executar_sincrono([ocupado, provedor("claude")])[1] == "claude"
+    finally:
+        liberar.set()
+        fundo.join()
+    assert roteador.estatisticas()["gemini"]["em_uso"] == 0
+
+
+def test_ordem_por_saude_e_latencia():
+    roteador = RoteadorLLM(amostras_minimas=2, hedge=False)
+    for _ in range(2):
+        roteador.executar_sincrono([provedor("gemini", atraso=0.05)])
+        roteador.executar_sincrono([provedor("claude", atraso=0.0)])
+        with pytest.raises(RuntimeError):
+            roteador.executar_sincrono([provedor("gpt", erro=RuntimeError("500"))])
+
+    candidatos = [provedor("gpt"), provedor("gemini"), provedor("claude")]
+    assert [p.nome for p in roteador.ordenar(candidatos)] == ["claude", "gemini", "gpt"]
+    assert roteador.estatisticas()["gpt"]["saudavel"] is False
+
+
+def test_chamadas_de_threads_diferentes_sob_gevent():
+    """Worker gevent: cada análise roda asyncio.run numa thread do hub; o roteador é o mesmo"""
+    pytest.importorskip("gevent")
+    script = textwrap.dedent("""
+        from gevent import monkey; monkey.patch_all()
+        import asyncio, os, time, gevent
+        from core.services.llm_router import ProvedorLLM, RoteadorLLM
+
+        dormir = monkey.get_original('time', 'sleep')  # bloqueio nativo, como o gRPC
+        def lento(): dormir(0.5); return 'lento'
+        def rapido(): dormir(0.1); return 'rapido'
+
+        roteador = RoteadorLLM(max_concorrencia=1, atraso_hedge_padrao=0.05, espera_orcamento=5)
+        async def analisar():
+            return await roteador.executar([ProvedorLLM('lento', lento), ProvedorLLM('rapido', rapido)])
+
+        hub = gevent.get_hub()
+        for _ in range(2):
+            print(hub.threadpool.spawn(asyncio.run, analisar()).get(timeout=5))
+        # Concorrentes: além do hedge, passam pela espera de vaga no orçamento
+        analises = [hub.threadpool.spawn(asyncio.run, analisar()) for _ in range(3)]
+        print(sorted(a.get(timeout=10)[1] for a in analises))
+        os._exit(0)
+    """)
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    saida = subprocess.run([sys.executable, "-c", script], cwd=raiz, capture_output=True, text=True, timeout=60)
+
+    assert saida.returncode == 0, saida.stderr
+    linhas = [l for l in saida.stdout.splitlines() if l.startswith(("(", "["))]
+    assert linhas[:2] == ["('rapido', 'rapido')", "('rapido', 'rapido')"]
+    assert linhas[2] == "['rapido', 'rapido', 'rapido']"
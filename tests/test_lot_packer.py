@@ -0,0 +1,64 @@
+"""
+Testes do empacotamento de vagas por orçamento de tokens
+"""
+
+from core.services import batch_keyword_extractor
+from core.services.batch_keyword_extractor import BatchKeywordExtractor
+from core.services.lot_packer import compactar_descricao, empacotar, estimar_tokens
+
+DESCRICAO_LONGA = """Sobre a empresa
+Somos líderes em tecnologia há 20 anos, com escritórios em 5 países. """ + "Cultura incrível. " * 80 + """
+
+Responsabilidades
+Desenvolver APIs em   Python e manter pipelines de dados.
+
+Requisitos
+- Python, Django e PostgreSQL
+- Docker e Kubernetes
+- Inglês avançado
+
+Benefícios
+Vale refeição, plano de saúde, gympass e PLR."""
+
+
+def test_compactacao_preserva_requisitos_e_descarta_beneficios():
+    compacta = compactar_descricao(DESCRICAO_LONGA, 60)
+
+    assert estimar_tokens(compacta) <= 60
+    assert "Requisitos\n- Python, Django e PostgreSQL\n- Docker e Kubernetes\n- Inglês avançado" in compacta
+    assert "Desenvolver APIs em Python" in compacta
+    assert "Benefícios" not in compacta and "Cultura incrível" not in compacta
+    # Requisitos continuam depois das responsabilidades, como no original
+    assert compacta.index("Responsabilidades") < compacta.index("Requisitos")
+
+
+def test_descricao_curta_so_normaliza_espacos():
+    assert compactar_descricao("  React   e\tTypeScript \n\n\n Git ", 100) == "React e TypeScript\nGit"
+    assert compactar_descricao(None, 100) == ""
+
+
+def test_empacotar_respeita_orcamento_e_limite_de_itens():
+    tokens = [50, 400, 120, 300, 80, 900, 60]
+    lotes = empacotar(tokens, 500, max_itens=3)
+
+    assert sorted(i for lote in lotes for i in lote) == list(range(len(tokens)))
+    assert all(len(lote) <= 3 for lote in lotes)
+    # Só o item maior que o orçamento ultrapassa, sozinho no seu lote
+    assert all(sum(tokens[i] for i in lote) <= 500 for lote in lotes if lote != [5])
+    assert [5] in lotes
+    assert lotes == empacotar(tokens, 500, max_itens=3)
+    assert len(lotes) == 4
+
+
+def test_extrator_enche_lotes_ate_o_orcamento(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "chave-teste")
+    monkeypatch.setattr(batch_keyword_extractor, "obter_cache_llm", lambda: None)
+    extrator = BatchKeywordExtractor(tokens_por_lote=3000, tokens_por_vaga=200, max_vagas_por_lote=30)
+
+    vagas = [{"titulo": f"Dev {i}", "empresa": "ACME", "descricao": DESCRICAO_LONGA} for i in range(40)]
+    lotes, tokens_lotes = extrator._montar_lotes(vagas, "desenvolvedor", 30)
+
+    assert sum(len(lote) for lote in lotes) == 40
+    assert all(tokens <= 3000 for tokens in tokens_lotes)
+    assert len(lotes) < 4  # lotes fixos de 10 vagas seriam 4 chamadas
+    assert "Docker e Kubernetes" in extrator._preparar_texto_lote(lotes[0])
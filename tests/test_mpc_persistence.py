@@ -0,0 +1,73 @@
+"""
+Testes da persistência em lote do MPC
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from core.models import Base, VagaAnalisada, PalavraChave, ProcessamentoMPC
+from core.services.mpc_persistence import PersistenciaMPC
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    sessao = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield sessao
+    finally:
+        sessao.close()
+
+
+def contar_comandos(db):
+    """Conta os comandos SQL enviados ao banco"""
+    comandos = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: comandos.append(args[2]))
+    return comandos
+
+
+def test_etapa_grava_vagas_e_log_em_poucos_comandos(db):
+    persistencia = PersistenciaMPC(db, tamanho_lote=500)
+    vagas = [
+        {"titulo": f"Analista {i}", "empresa": "ACME", "descricao": "python e sql", "url": f"https://x/{i}"}
+        for i in range(800)
+    ]
+    comandos = contar_comandos(db)
+
+    with persistencia.etapa(1, "coleta_vagas") as log:
+        log["vagas_processadas"] = persistencia.inserir_vagas(1, vagas)
+
+    # 2 INSERTs de vagas (500 + 300) + 1 INSERT de log
+    assert len([c for c in comandos if c.startswith("INSERT")]) == 3
+    assert db.query(VagaAnalisada).count() == 800
+    assert db.query(VagaAnalisada).first().url_original == "https://x/0"
+
+    log_db = db.query(ProcessamentoMPC).one()
+    assert (log_db.etapa, log_db.status, log_db.vagas_processadas) == ("coleta_vagas", "concluido", 800)
+
+
+def test_atualizacao_em_lote_das_palavras(db):
+    persistencia = PersistenciaMPC(db)
+    with persistencia.etapa(1, "coleta_vagas"):
+        persistencia.inserir_vagas(1, [{"titulo": "A"}, {"titulo": "B"}])
+
+    ids = [vaga_id for (vaga_id,) in db.query(VagaAnalisada.id).order_by(VagaAnalisada.id)]
+    with persistencia.etapa(1, "extracao_palavras"):
+        persistencia.atualizar_palavras_vagas({ids[0]: ["python"], ids[1]: ["sql", "excel"]})
+
+    vagas = db.query(VagaAnalisada).order_by(VagaAnalisada.id).all()
+    assert [v.palavras_extraidas for v in vagas] == [["python"], ["sql", "excel"]]
+    assert all(v.processada for v in vagas)
+
+
+def test_erro_desfaz_a_etapa_inteira(db):
+    persistencia = PersistenciaMPC(db)
+
+    with pytest.raises(RuntimeError):
+        with persistencia.etapa(1, "categorizacao"):
+            persistencia.inserir_palavras_chave(1, [{"termo": "python", "categoria": "tecnica"}])
+            raise RuntimeError("falha")
+
+    assert db.query(PalavraChave).count() == 0
+    assert db.query(ProcessamentoMPC).count() == 0
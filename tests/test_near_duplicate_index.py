@@ -0,0 +1,49 @@
+"""
+Testes do índice de quase duplicatas (MinHash + LSH)
+"""
+
+from core.services.near_duplicate_index import NearDuplicateIndex
+
+DESCRICAO = (
+    "Buscamos analista de dados para atuar com sql, python e power bi na construção "
+    "de dashboards, modelagem de dados e análise de indicadores de negócio. Requisitos: "
+    "experiência com bancos relacionais, etl, estatística e comunicação com áreas de negócio."
+)
+
+
+def test_mesma_vaga_em_fontes_diferentes_e_agrupada():
+    indice = NearDuplicateIndex(limiar=0.7)
+
+    assert indice.adicionar({"titulo": "Analista de Dados", "empresa": "ACME", "descricao": DESCRICAO})
+    # Título levemente diferente e descrição com um trecho extra (outra fonte)
+    assert not indice.adicionar({
+        "titulo": "Analista de Dados Pleno",
+        "empresa": "ACME S.A.",
+        "descricao": DESCRICAO + " Benefícios: vale refeição."
+    })
+
+    assert indice.total_clusters == 1
+    assert indice.duplicatas_aproximadas == 1
+
+
+def test_vagas_diferentes_nao_sao_agrupadas():
+    indice = NearDuplicateIndex()
+    novas = indice.filtrar([
+        {"titulo": "Analista de Dados", "empresa": "ACME", "descricao": DESCRICAO},
+        {"titulo": "Designer UX", "empresa": "ACME", "descricao": "Criação de protótipos no figma e pesquisa com usuários."},
+        {"titulo": "Analista de Dados", "empresa": "ACME", "descricao": "texto qualquer"},  # mesmo título + empresa
+    ])
+
+    assert [v["titulo"] for v in novas] == ["Analista de Dados", "Designer UX"]
+    assert indice.estatisticas()["clusters"] == 2
+    assert indice.estatisticas()["duplicatas_exatas"] == 1
+
+
+def test_assinatura_estavel_e_similaridade():
+    indice = NearDuplicateIndex(num_permutacoes=64)
+    a = indice.assinatura(DESCRICAO)
+
+    assert a == NearDuplicateIndex(num_permutacoes=64).assinatura(DESCRICAO)
+    assert len(a) == 64
+    assert indice.similaridade_estimada(a, a) == 1.0
+    assert indice.similaridade_estimada(a, indice.assinatura("outro texto sem relação")) < 0.2
@@ -0,0 +1,44 @@
+"""
+Testes da extração paralela por processos
+"""
+
+import asyncio
+
+from core.services.parallel_extraction import ExtracaoParalela
+
+
+def contar_palavras(texto):
+    return len(texto.split())
+
+
+def contar_lote(textos):
+    return [contar_palavras(texto) for texto in textos]
+
+
+def lote_com_erro(textos):
+    raise RuntimeError("falha no processo filho")
+
+
+TEXTOS = [" ".join(["palavra"] * (i % 17)) for i in range(500)]
+
+
+def test_entrada_pequena_roda_no_proprio_processo():
+    extracao = ExtracaoParalela(lote_com_erro, contar_palavras, max_processos=4, minimo_paralelo=1000)
+
+    assert asyncio.run(extracao.extrair(TEXTOS)) == [i % 17 for i in range(500)]
+    assert extracao.ultimo_modo == "local"
+
+
+def test_lotes_em_processos_preservam_a_ordem():
+    extracao = ExtracaoParalela(contar_lote, contar_palavras, max_processos=2, tamanho_lote=16, minimo_paralelo=0)
+
+    assert asyncio.run(extracao.extrair(TEXTOS)) == [i % 17 for i in range(500)]
+    assert extracao.ultimo_modo == "paralelo"
+    assert all(len(lote) <= 16 for lote in extracao._lotes(TEXTOS))
+
+
+def test_erro_no_pool_refaz_no_proprio_processo():
+    extracao = ExtracaoParalela(lote_com_erro, contar_palavras, max_processos=2, minimo_paralelo=0)
+
+    assert asyncio.run(extracao.extrair(TEXTOS[:50])) == [i % 17 for i in range(50)]
+    assert extracao.ultimo_modo == "local"
@@ -0,0 +1,88 @@
+"""
+Testes dos planos de busca (variações de cargo e expansão geográfica)
+"""
+
+import os
+import sys
+import subprocess
+
+from core.services import location_expander as modulo_local
+from core.services import query_plan
+from core.services.llm_cache import LLMCache
+from core.services.location_expander import LocationExpander
+from core.services.query_expander import QueryExpanderV2
+from core.services.query_plan import PlanejadorBuscas
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_expansao_de_cargo_estavel_entre_processos():
+    """A ordem não depende da semente de hash do processo (antes vinha de um set)"""
+    codigo = (
+        "from core.services.query_expander import QueryExpanderV2\n"
+        "print(QueryExpanderV2().expandir_cargo('Desenvolvedor Python', 'tecnologia'))\n"
+    )
+    saidas = {
+        subprocess.run(
+            [sys.executable, "-c", codigo], capture_output=True, text=True, check=True, cwd=RAIZ,
+            env={**os.environ, "PYTHONHASHSEED": semente}
+        ).stdout.strip().splitlines()[-1]
+        for semente in ("1", "2", "3")
+    }
+    assert len(saidas) == 1
+
+    cargos = QueryExpanderV2().expandir_cargo("Desenvolvedor Python", "tecnologia")
+    assert cargos[:3] == ["Desenvolvedor Python", "Software Engineer", "Desenvolvedor de Software"]
+    assert cargos.index("Tech Desenvolvedor") < cargos.index("Software Engineer Pleno")
+
+
+def _expander_com_ia(monkeypatch, tmp_path, chamadas):
+    def expandir(self, local_base, tipo_vaga, limite):
+        chamadas.append(local_base)
+        return [
+            {"nome": "Guarulhos, SP", "distancia_km": 20, "relevancia": 0.9},
+            {"nome": "São Paulo, SP", "distancia_km": 0, "relevancia": 1.0},
+            {"nome": "sao paulo, sp", "distancia_km": 0, "relevancia": 1.0},
+        ]
+
+    cache = LLMCache(caminho=str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(modulo_local, "obter_cache_llm", lambda: cache)
+    monkeypatch.setattr(LocationExpander, "_expandir_com_gemini", expandir)
+    expander = LocationExpander()
+    expander.gemini_client = object()
+    expander.anthropic_client = None
+    expander.openai_client = None
+    return expander
+
+
+def test_expansao_geografica_vai_a_ia_uma_vez_por_cidade(monkeypatch, tmp_path):
+    modulo_local._expansoes.limpar()
+    chamadas = []
+
+    locais = _expander_com_ia(monkeypatch, tmp_path, chamadas).expandir_localizacao("São Paulo", "hibrido")
+    assert [l["nome"] for l in locais] == ["São Paulo, SP", "Guarulhos, SP"]
+
+    # Outra instância (outra requisição), grafia diferente: memória do processo
+    assert _expander_com_ia(monkeypatch, tmp_path, chamadas).expandir_localizacao("sao  paulo", "hibrido") == locais
+
+    # Processo novo (memória vazia): cache persistente
+    modulo_local._expansoes.limpar()
+    assert _expander_com_ia(monkeypatch, tmp_path, chamadas).expandir_localizacao("São Paulo", "hibrido") == locais
+    assert chamadas == ["São Paulo"]
+
+
+def test_plano_memorizado_e_isolado(monkeypatch, tmp_path):
+    modulo_local._expansoes.limpar()
+    query_plan._planos.limpar()
+    chamadas = []
+
+    planejador = PlanejadorBuscas(location_expander=_expander_com_ia(monkeypatch, tmp_path, chamadas))
+    plano = planejador.planejar("Analista", "tecnologia", "São Paulo", "hibrido")
+    assert not plano.memorizado
+
+    # Alterar o plano recebido não afeta o memorizado
+    plano.cargos.clear()
+    repetido = PlanejadorBuscas().planejar("analista", "Tecnologia", "São Paulo", "hibrido")
+    assert repetido.memorizado
+    assert repetido.cargos == QueryExpanderV2().expandir_cargo("Analista", "tecnologia")
+    assert chamadas == ["São Paulo"]
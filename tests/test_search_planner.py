@@ -0,0 +1,56 @@
+"""
+Testes do planejador adaptativo de combinações de busca
+"""
+
+from dataclasses import dataclass
+
+from core.services.search_planner import HistoricoRendimento, PlanejadorAdaptativo
+
+
+@dataclass
+class Combo:
+    cargo: str
+    localizacao: str
+
+
+COMBOS = [Combo("Desenvolvedor", "São Paulo, SP"), Combo("Software Engineer", "São Paulo, SP"), Combo("Programador", "Osasco, SP")]
+
+
+def _planejador(tmp_path, **kwargs):
+    return PlanejadorAdaptativo(HistoricoRendimento(caminho=str(tmp_path / "rendimento.sqlite3")), **kwargs)
+
+
+def test_sem_historico_mantem_ordem_estatica(tmp_path):
+    ordem, resumo = _planejador(tmp_path).ordenar(COMBOS)
+    assert ordem == COMBOS
+    assert resumo["podadas"] == 0
+    assert {d["decisao"] for d in resumo["decisoes"]} == {"sem_historico"}
+
+
+def test_rendimento_reordena_e_poda(tmp_path):
+    planejador = _planejador(tmp_path)
+    for _ in range(3):
+        planejador.registrar(COMBOS[0], pedidas=50, novas=0, latencia_segundos=40)
+        planejador.registrar(COMBOS[1], pedidas=50, novas=45, latencia_segundos=40)
+
+    ordem, resumo = planejador.ordenar(COMBOS)
+    assert ordem == [COMBOS[1], COMBOS[2]]  # a que nunca rende foi podada
+    decisoes = {d["cargo"]: d["decisao"] for d in resumo["decisoes"]}
+    assert decisoes == {"Software Engineer": "promovida", "Programador": "sem_historico", "Desenvolvedor": "podada"}
+
+    # Poda vencida: a combinação volta a ser tentada (no fim da fila)
+    ordem, _ = _planejador(tmp_path, validade_poda_segundos=0).ordenar(COMBOS)
+    assert ordem[-1] == COMBOS[0]
+
+
+def test_latencia_desempata_e_nunca_poda_tudo(tmp_path):
+    planejador = _planejador(tmp_path)
+    planejador.registrar(COMBOS[0], pedidas=10, novas=8, latencia_segundos=240)
+    planejador.registrar(COMBOS[1], pedidas=10, novas=8, latencia_segundos=20)
+    ordem, _ = planejador.ordenar(COMBOS[:2])
+    assert ordem == [COMBOS[1], COMBOS[0]]
+
+    vazio = _planejador(tmp_path / "vazio")
+    for _ in range(3):
+        vazio.registrar(COMBOS[2], pedidas=10, novas=0, latencia_segundos=30)
+    assert vazio.ordenar(COMBOS[2:])[0] == [COMBOS[2]]
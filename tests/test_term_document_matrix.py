@@ -0,0 +1,85 @@
+"""
+Testes da matriz termo-documento do MPC
+"""
+
+import math
+import random
+from collections import Counter
+
+from core.services.term_document_matrix import MatrizTermoDocumento
+
+
+def test_ranking_igual_ao_counter_original():
+    rng = random.Random(7)
+    vocabulario = [f"termo{i}" for i in range(60)]
+    documentos = [rng.sample(vocabulario, rng.randint(1, 15)) for _ in range(300)]
+
+    matriz = MatrizTermoDocumento()
+    contador = Counter()
+    for i, termos in enumerate(documentos):
+        matriz.adicionar_documento(i, termos)
+        contador.update(termos)
+
+    assert matriz.mais_frequentes(40) == contador.most_common(40)
+    assert matriz.mais_frequentes() == contador.most_common()
+    assert matriz.contador() == contador
+    assert matriz.total_ocorrencias == sum(contador.values())
+
+
+def test_recortes_por_fonte_e_localizacao():
+    matriz = MatrizTermoDocumento()
+    matriz.adicionar_documento(1, ["python", "sql"], fonte="linkedin", localizacao="SP")
+    matriz.adicionar_documento(2, ["python"], fonte="indeed", localizacao="SP")
+    matriz.adicionar_documento(3, ["python", "excel"], fonte="linkedin", localizacao=None)
+
+    assert matriz.tamanho_grupos("fonte") == {"linkedin": 2, "indeed": 1}
+    assert matriz.tamanho_grupos("localizacao") == {"SP": 2, "desconhecido": 1}
+    assert matriz.frequencia_por_grupo("fonte", ["python", "sql", "inexistente"]) == {
+        "python": {"linkedin": 2, "indeed": 1},
+        "sql": {"linkedin": 1},
+    }
+
+
+def test_tfidf_favorece_termo_raro_e_concentrado():
+    matriz = MatrizTermoDocumento()
+    matriz.adicionar_documento(1, ["comunicacao", "kubernetes"])
+    matriz.adicionar_documento(2, ["comunicacao", "excel", "word", "teams"])
+    matriz.adicionar_documento(3, ["comunicacao", "excel"])
+
+    pontuacoes = dict(matriz.tfidf_medio())
+    assert pontuacoes["kubernetes"] > pontuacoes["word"]
+    assert matriz.idf("comunicacao") == math.log(4 / 4) + 1
+    assert matriz.tfidf_medio(1)[0][0] == "comunicacao"
+
+
+def test_similaridade_igual_ao_cosseno_denso():
+    rng = random.Random(11)
+    vocabulario = [f"termo{i}" for i in range(40)]
+    documentos = [rng.choices(vocabulario, k=rng.randint(1, 12)) for _ in range(120)]
+    consulta = rng.choices(vocabulario, k=15) + ["fora_do_vocabulario"]
+
+    matriz = MatrizTermoDocumento()
+    for i, termos in enumerate(documentos):
+        matriz.adicionar_documento(i, termos)
+
+    def vetor(termos):
+        conhecidos = [t for t in termos if t in vocabulario]
+        contagem = Counter(conhecidos)
+        return {t: c / len(conhecidos) * matriz.idf(t) for t, c in contagem.items()}
+
+    def cosseno(a, b):
+        produto = sum(peso * b.get(t, 0.0) for t, peso in a.items())
+        normas = math.sqrt(sum(p * p for p in a.values())) * math.sqrt(sum(p * p for p in b.values()))
+        return produto / normas if produto else 0.0
+
+    esperado = {i: cosseno(vetor(consulta), vetor(termos)) for i, termos in enumerate(documentos)}
+    obtido = dict(matriz.similaridades(consulta))
+    assert obtido.keys() == esperado.keys()
+    assert all(abs(obtido[i] - esperado[i]) < 1e-6 for i in esperado)
+
+    top = matriz.similaridades(consulta, 5)
+    assert [s for _, s in top] == sorted(obtido.values(), reverse=True)[:5]
+
+    # Documento novo invalida os pesos (o IDF muda)
+    matriz.adicionar_documento(120, consulta)
+    assert matriz.similaridades(consulta, 1)[0][0] == 120